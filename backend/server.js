@@ -24,7 +24,7 @@ app.use(express.static(path.join(__dirname, '..', 'frontend')));
 
 // Routes imports
 const stocksRouter = require('./routes/stocks');
-const { PythonWorker } = require('./utils/pythonWorker');
+const { PythonWorker, tradeRows } = require('./utils/pythonWorker');
 const { getCache } = require('./utils/dataCache');
 
 // Backtesting Progress Tracking
@@ -98,6 +98,57 @@ app.delete('/api/cache/:code', (req, res) => {
   });
 });
 
+// Cache prefetch endpoint: 장 시작 전 종목 목록 일괄 수집 (Python DataCache 예열)
+app.post('/api/cache/prefetch', async (req, res) => {
+  const { stock_codes, period, batch_size, max_workers, force } = req.body;
+
+  try {
+    // 종목 미지정 시 기본 종목 목록(test-data/mock-stocks.json) 사용
+    let codes = stock_codes;
+    if (!codes || codes.length === 0) {
+      const listPath = path.join(__dirname, '..', 'test-data', 'mock-stocks.json');
+      codes = JSON.parse(fs.readFileSync(listPath, 'utf-8')).map(stock => stock.code);
+    }
+
+    const worker = await initPythonWorker();
+    if (!worker) {
+      return res.status(503).json({ success: false, error: 'Python Worker not available' });
+    }
+
+    const result = await worker.execute({
+      type: 'prefetch',
+      stock_codes: codes,
+      period: period || 60,
+      batch_size: batch_size || null,
+      max_workers: max_workers || null,
+      force: !!force
+    }, 600000);
+
+    console.log(`[API] Prefetch completed: ${result.fetched} fetched, ${result.already_cached} cached, ${result.failed.length} failed`);
+    res.json({ success: true, ...result });
+  } catch (error) {
+    console.error('[API] Prefetch error:', error.message);
+    res.status(500).json({ success: false, error: error.message });
+  }
+});
+
+// Worker metrics endpoint: 단계별 지연 히스토그램 + 캐시 적중률 (Prometheus 텍스트 형식)
+app.get('/api/metrics', async (req, res) => {
+  try {
+    const worker = await initPythonWorker();
+    if (!worker) {
+      return res.status(503).json({ success: false, error: 'Python Worker not available' });
+    }
+
+    const result = await worker.execute({ type: 'metrics' }, 10000);
+    res.set('Content-Type', result.content_type);
+    res.send(result.text);
+  } catch (error) {
+    console.error('[API] Metrics error:', error.message);
+    res.status(500).json({ success: false, error: error.message });
+  }
+});
+
 // ============================================
 // Basic Backtest API (Placeholder)
 // ============================================
@@ -179,6 +230,40 @@ app.post('/api/backtest/start', async (req, res) => {
         stock_mode: stock_mode
       };
 
+      // 다종목 모드 (all/filtered/specific 종목 목록 전달 시): Python 프로세스 풀에서 병렬 실행
+      // 단일 종목은 스트리밍 모드: 전략 실행 중 progress/trades partial 응답 수신
+      const stockCodes = Array.isArray(req.body.stock_codes) ? req.body.stock_codes : null;
+      if (stockCodes && stockCodes.length > 1) {
+        pythonRequest.type = 'multi_stock';
+        pythonRequest.stock_codes = stockCodes;
+        pythonRequest.max_workers = req.body.max_workers || null;
+        // 종목별 partial 결과는 진행률만 사용 → 작은 컬럼형 응답으로 수신
+        pythonRequest.response_format = 'columnar';
+      } else {
+        pythonRequest.stream = true;
+      }
+
+      // Python Worker가 보낸 실제 진행 상황 (live: 시간 기반 추정 사용 안 함)
+      backtestProgress[backtestId] = {
+        percent: 0, status: 'running', startTime: Date.now(), trades: 0,
+        currentDate: null, balance: initial_capital || 10000000, equityCurve: [], live: true
+      };
+      const onPartial = (frame) => {
+        const progress = backtestProgress[backtestId];
+        if (!progress) return;
+        if (frame.type === 'progress') {
+          progress.percent = Math.min(Math.floor(frame.percent), 100);
+          progress.trades = frame.trades;
+          if (frame.balance !== undefined) progress.balance = frame.balance;
+          if (frame.current_date) progress.currentDate = frame.current_date;
+        } else if (frame.type === 'trades') {
+          // 거래 배치 → 자산 곡선 점진 갱신
+          for (const trade of frame.trades) {
+            progress.equityCurve.push(trade.balance_after);
+          }
+        }
+      };
+
       console.log(`[API] Sending request to Python Worker for ${backtestId}`);
       console.log(`  Strategy config:`, JSON.stringify(strategyObj));
       console.log(`  Date range: ${effectiveStartDate} ~ ${effectiveEndDate}`);
@@ -186,7 +271,7 @@ app.post('/api/backtest/start', async (req, res) => {
       // Initialize result entry as running
       backtestResults[backtestId] = { status: 'running', data: null, error: null, completedAt: null };
 
-      worker.execute(pythonRequest)
+      worker.execute(pythonRequest, null, onPartial)
         .then((result) => {
           console.log(`[API] Python Worker returned result for ${backtestId}`);
           console.log(`  Result:`, JSON.stringify(result).substring(0, 200) + '...');
@@ -240,6 +325,50 @@ app.post('/api/backtest/start', async (req, res) => {
   }
 });
 
+// 파라미터 스윕: 주가 데이터 1회 로드 후 전략 파라미터 조합 일괄 평가
+app.post('/api/backtest/sweep', async (req, res) => {
+  const {
+    stock_code,
+    strategy_params,
+    start_date,
+    end_date,
+    initial_capital,
+    sort_by,
+    top_n
+  } = req.body;
+
+  if (!strategy_params) {
+    return res.status(400).json({
+      success: false,
+      error: 'Missing required field: strategy_params'
+    });
+  }
+
+  try {
+    const worker = await initPythonWorker();
+    if (!worker) {
+      return res.status(503).json({ success: false, error: 'Python Worker not available' });
+    }
+
+    const result = await worker.execute({
+      type: 'sweep',
+      stock_code: stock_code || '005930',
+      strategy: strategy_params,
+      initial_capital: initial_capital || 10000000,
+      start_date,
+      end_date,
+      sort_by: sort_by || 'return_rate',
+      top_n: top_n || null
+    }, 120000);
+
+    console.log(`[API] Sweep completed for ${result.stock_code}: ${result.combinations} combinations`);
+    res.json({ success: true, ...result });
+  } catch (error) {
+    console.error('[API] Sweep error:', error.message);
+    res.status(500).json({ success: false, error: error.message });
+  }
+});
+
 app.get('/api/backtest/progress', (req, res) => {
   const { id } = req.query;
 
@@ -263,26 +392,45 @@ app.get('/api/backtest/progress', (req, res) => {
   const progress = backtestProgress[id];
   const elapsed = (Date.now() - progress.startTime) / 1000; // Time in seconds
 
-  // Progress increases 10% every 1 second (max 100%)
-  progress.percent = Math.min(Math.floor(elapsed / 1) * 10, 100);
-  
-  // Update trades based on progress
-  progress.trades = Math.floor(progress.percent / 10) * 25;
+  if (!progress.live) {
+    // Worker 미연결(mock) 모드: 1초마다 10%씩 증가 (최대 100%)
+    progress.percent = Math.min(Math.floor(elapsed / 1) * 10, 100);
+    
+    // Update trades based on progress
+    progress.trades = Math.floor(progress.percent / 10) * 25;
 
-  // When progress reaches 100%, mark as completed
-  if (progress.percent >= 100) {
-    progress.status = 'completed';
+    // When progress reaches 100%, mark as completed
+    if (progress.percent >= 100) {
+      progress.status = 'completed';
+    }
   }
 
   res.json({
     backtest_id: id,
     status: progress.status,
     progress_percent: progress.percent,
-    current_date: '2024-06-15',
-    total_trades: progress.trades
+    current_date: progress.currentDate || null,
+    total_trades: progress.trades,
+    balance: progress.balance,
+    equity_curve: progress.equityCurve || []
   });
 });
 
+// 다종목 요약의 종목별 행 (Python _summarize_multi_stock) → 단일 종목 결과와 같은 표기
+function multiStockRow(row) {
+  if (!row) return null;
+  return {
+    stock_code: row.stock_code,
+    final_capital: row.final_capital || 0,
+    total_return: `${(row.return_rate || 0).toFixed(2)}%`,
+    total_profit: row.total_profit || 0,
+    max_drawdown: `${(-(row.mdd || 0)).toFixed(2)}%`,
+    win_rate: `${(row.win_rate || 0).toFixed(1)}%`,
+    profit_factor: parseFloat((row.profit_factor || 0).toFixed(2)),
+    total_trades: row.total_trades || 0
+  };
+}
+
 app.get('/api/backtest/result/:id', (req, res) => {
   const { id } = req.params;
 
@@ -318,6 +466,35 @@ app.get('/api/backtest/result/:id', (req, res) => {
 
   // Backtest completed - return actual results
   const data = stored.data || {};
+
+  // 다종목 백테스트 (multi_stock): 집계 요약 + 종목별 결과 행 (수익률 내림차순)
+  if (data.stock_count !== undefined) {
+    return res.json({
+      backtest_id: id,
+      status: 'completed',
+      type: 'multi_stock',
+      strategy: data.strategy || null,
+      stock_count: data.stock_count,
+      succeeded: data.succeeded || 0,
+      failed: data.failed || 0,
+      summary: {
+        avg_return: `${(data.avg_return_rate || 0).toFixed(2)}%`,
+        median_return: `${(data.median_return_rate || 0).toFixed(2)}%`,
+        avg_win_rate: `${(data.avg_win_rate || 0).toFixed(1)}%`,
+        avg_max_drawdown: `${(-(data.avg_mdd || 0)).toFixed(2)}%`,
+        max_drawdown: `${(-(data.max_mdd || 0)).toFixed(2)}%`,
+        total_trades: data.total_trades || 0,
+        profitable_stocks: data.profitable_stocks || 0
+      },
+      best: multiStockRow(data.best),
+      worst: multiStockRow(data.worst),
+      results: (data.results || []).map(multiStockRow),
+      errors: data.errors || [],
+      elapsed_sec: data.elapsed_sec || null,
+      completed_at: stored.completedAt
+    });
+  }
+
   const metrics = data.metrics || {};
 
   res.json({
@@ -348,7 +525,7 @@ app.get('/api/backtest/result/:id', (req, res) => {
     },
     sell_reason_stats: data.sell_reason_stats || null,
     equity_curve: data.equity_curve || [],
-    trading_log: data.trading_log || [],
+    trading_log: tradeRows(data.trading_log),
     completed_at: stored.completedAt
   });
 });
@@ -371,7 +548,7 @@ app.get('/api/backtest/result/:id/csv', (req, res) => {
   }
 
   const data = stored.data || {};
-  const tradingLog = data.trading_log || [];
+  const tradingLog = tradeRows(data.trading_log);
   const strategyType = data.strategy || '';
 
   if (!tradingLog.length) {
@@ -490,8 +667,14 @@ app.get('/', (req, res) => {
         },
         backtest: {
           start: 'POST /api/backtest/start',
+          sweep: 'POST /api/backtest/sweep',
           progress: 'GET /api/backtest/progress',
           result: 'GET /api/backtest/result/:id'
+        },
+        cache: {
+          stats: 'GET /api/cache/stats',
+          prefetch: 'POST /api/cache/prefetch',
+          invalidate: 'DELETE /api/cache/:code'
         }
       }
     });
@@ -514,8 +697,12 @@ app.use((req, res) => {
       'GET /api/stocks/specific',
       'DELETE /api/stocks/specific/:code',
       'POST /api/backtest/start',
+      'POST /api/backtest/sweep',
       'GET /api/backtest/progress',
-      'GET /api/backtest/result/:id'
+      'GET /api/backtest/result/:id',
+      'GET /api/cache/stats',
+      'POST /api/cache/prefetch',
+      'DELETE /api/cache/:code'
     ]
   });
 });
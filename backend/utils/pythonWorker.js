@@ -14,6 +14,7 @@ class PythonWorker {
     this.workerPath = path.join(__dirname, '..', '..', 'py_backtest', 'worker.py');
     this.process = null;
     this.requestQueue = [];
+    this.stdoutBuffer = ''; // 줄 단위로 끊기지 않은 stdout 조각
     this.timeoutMs = 30000; // 30초 타임아웃
   }
 
@@ -42,6 +43,7 @@ class PythonWorker {
         this.process.on('close', (code) => {
           console.log(`Python Worker exited with code ${code}`);
           this.process = null;
+          this.stdoutBuffer = '';
         });
 
         // 프로세스 에러
@@ -65,31 +67,39 @@ class PythonWorker {
    *   stock_code: "005930",
    *   strategy: {...},
    *   prices: {...},
-   *   initial_capital: 10000000
+   *   initial_capital: 10000000,
+   *   response_format: 'columnar'  // 선택: trading_log를 필드별 병렬 배열로 수신 (tradeRows로 변환)
    * }
-   * @param {number} timeout - 타임아웃 (ms)
-   * @return {Promise<Object>} 백테스팅 결과
+   * @param {number} timeout - 타임아웃 (ms, partial 응답 수신 시 재설정)
+   * @param {Function} onPartial - partial 응답 콜백 (다종목 종목별 결과, stream 요청의 progress/trades 프레임, 선택사항)
+   * @return {Promise<Object>} 백테스팅 결과 (Worker 단계별 소요 시간 timings 포함)
    */
-  async execute(config, timeout = null) {
+  async execute(config, timeout = null, onPartial = null) {
     if (!this.process) {
       throw new Error('Python Worker is not running');
     }
 
     return new Promise((resolve, reject) => {
-      const requestId = Date.now().toString(36) + Math.random().toString(36);
+      // 요청 ID: Worker가 모든 응답에 그대로 돌려줌 (응답은 완료 순서대로 도착)
+      const requestId = config.request_id || config.backtest_id ||
+        (Date.now().toString(36) + Math.random().toString(36));
       const timeoutMs = timeout || this.timeoutMs;
 
       // 타임아웃 처리
-      const timer = setTimeout(() => {
+      const onTimeout = () => {
         this._removeRequest(requestId);
         reject(new Error(`Backtest timeout after ${timeoutMs}ms for ${config.stock_code}`));
-      }, timeoutMs);
+      };
+      const timer = setTimeout(onTimeout, timeoutMs);
 
       // 요청 등록
       const request = {
         id: requestId,
         config: config,
         timer: timer,
+        timeoutMs: timeoutMs,
+        onTimeout: onTimeout,
+        onPartial: onPartial,
         resolve: resolve,
         reject: reject
       };
@@ -97,7 +107,7 @@ class PythonWorker {
 
       // JSON 요청 전송
       try {
-        const jsonRequest = JSON.stringify(config) + '\n';
+        const jsonRequest = JSON.stringify({ ...config, request_id: requestId }) + '\n';
         this.process.stdin.write(jsonRequest);
       } catch (err) {
         clearTimeout(timer);
@@ -112,7 +122,10 @@ class PythonWorker {
    * @private
    */
   _handleOutput(output) {
-    const lines = output.trim().split('\n');
+    // 큰 응답은 여러 data 이벤트로 나뉘어 올 수 있으므로 완성된 줄만 처리
+    this.stdoutBuffer += output;
+    const lines = this.stdoutBuffer.split('\n');
+    this.stdoutBuffer = lines.pop();
 
     for (const line of lines) {
       if (!line.trim()) continue;
@@ -120,16 +133,26 @@ class PythonWorker {
       try {
         const response = JSON.parse(line);
 
-        if (response.status === 'success') {
-          // 성공 응답
-          const request = this.requestQueue.shift();
+        if (response.status === 'partial') {
+          // 중간 응답 (요청은 계속 진행 중): 콜백 전달 + 타임아웃 재설정
+          const request = this._findRequest(response.request_id);
+          if (request) {
+            clearTimeout(request.timer);
+            request.timer = setTimeout(request.onTimeout, request.timeoutMs);
+            if (request.onPartial) {
+              request.onPartial(response);
+            }
+          }
+        } else if (response.status === 'success') {
+          // 성공 응답 (단계별 소요 시간 timings는 결과 데이터에 포함해 전달)
+          const request = this._takeRequest(response.request_id);
           if (request) {
             clearTimeout(request.timer);
-            request.resolve(response.data);
+            request.resolve(response.timings ? { ...response.data, timings: response.timings } : response.data);
           }
         } else if (response.status === 'error') {
           // 에러 응답
-          const request = this.requestQueue.shift();
+          const request = this._takeRequest(response.request_id);
           if (request) {
             clearTimeout(request.timer);
             request.reject(new Error(response.error));
@@ -141,6 +164,29 @@ class PythonWorker {
     }
   }
 
+  /**
+   * 응답의 request_id로 대기 중인 요청 찾기 (ID가 없으면 가장 오래된 요청)
+   * @private
+   */
+  _findRequest(requestId) {
+    if (requestId === undefined || requestId === null) {
+      return this.requestQueue[0];
+    }
+    return this.requestQueue.find(r => r.id === requestId);
+  }
+
+  /**
+   * 응답에 해당하는 요청을 큐에서 꺼내기
+   * @private
+   */
+  _takeRequest(requestId) {
+    const request = this._findRequest(requestId);
+    if (request) {
+      this._removeRequest(request.id);
+    }
+    return request;
+  }
+
   /**
    * 요청 제거
    * @private
@@ -188,6 +234,33 @@ async function runBacktest(config) {
   return worker.execute(config);
 }
 
+/**
+ * 거래 기록 → 거래별 객체 배열
+ * 
+ * response_format: 'columnar' 요청의 trading_log
+ * ({format: 'columnar', length, fields, columns: {필드: 배열}})를 기존 행 형식으로 변환
+ * (이미 배열이면 그대로 반환)
+ * 
+ * @param {Array|Object} tradingLog - trading_log (rows 또는 columnar)
+ * @return {Array<Object>} 거래별 객체 배열
+ */
+function tradeRows(tradingLog) {
+  if (!tradingLog) return [];
+  if (Array.isArray(tradingLog)) return tradingLog;
+  if (tradingLog.format !== 'columnar') return [];
+
+  const { fields, columns, length } = tradingLog;
+  const rows = new Array(length);
+  for (let i = 0; i < length; i++) {
+    const row = {};
+    for (const field of fields) {
+      row[field] = columns[field][i];
+    }
+    rows[i] = row;
+  }
+  return rows;
+}
+
 /**
  * Worker 종료
  */
@@ -202,5 +275,6 @@ module.exports = {
   PythonWorker,
   getPythonWorker,
   runBacktest,
-  closePythonWorker
+  closePythonWorker,
+  tradeRows
 };
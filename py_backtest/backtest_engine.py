@@ -6,10 +6,11 @@ BacktestEngine - 주식 백테스팅 엔진
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Callable, Dict, List, Tuple, Optional
 from dataclasses import dataclass, asdict
 import json
 import logging
+import os
 import sys
 
 # 데이터 캐시 모듈 (SRS NFR-301: 일일 1회 수집)
@@ -24,6 +25,28 @@ except ImportError:
         HAS_CACHE = False
         get_cache = None
 
+# 전략 실행 NumPy 커널
+try:
+    from strategy_kernels import (
+        SessionIndex, build_session_index, session_keys, nearest_candle_indices,
+        format_minute, day_labels, run_strategy1, run_strategy2, SELL_REASONS
+    )
+    from parameter_sweep import run_sweep
+    from trade_log import TradeLog, json_default
+    from signal_generator import time_of_day_masks
+    from metrics import PhaseTimings
+    from log_config import TRACE, TRADE_LOG_SAMPLE
+except ImportError:
+    from .strategy_kernels import (
+        SessionIndex, build_session_index, session_keys, nearest_candle_indices,
+        format_minute, day_labels, run_strategy1, run_strategy2, SELL_REASONS
+    )
+    from .parameter_sweep import run_sweep
+    from .trade_log import TradeLog, json_default
+    from .signal_generator import time_of_day_masks
+    from .metrics import PhaseTimings
+    from .log_config import TRACE, TRADE_LOG_SAMPLE
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -36,6 +59,16 @@ except ImportError:
     logger.warning("yfinance not installed. Install with: pip install yfinance")
     yf = None
 
+# 증분 갱신: 이전 날짜 캐시가 있으면 마지막 봉 이후만 Yahoo Finance에서 조회 (0이면 매일 전체 재수집)
+INCREMENTAL_REFRESH = os.environ.get('PRICE_CACHE_INCREMENTAL', '1') != '0'
+
+# 증분 갱신 기준 캐시의 첫 봉이 요청 기간 시작일보다 이만큼(일) 넘게 늦으면 전체 재수집
+# (주말·연휴로 기간 시작일에 봉이 없는 경우는 허용)
+COVERAGE_SLACK_DAYS = 5
+
+# 스트리밍 모드: progress/trades 프레임을 내보내는 거래일 간격
+PROGRESS_BATCH_DAYS = max(1, int(os.environ.get('BACKTEST_PROGRESS_DAYS', '5')))
+
 
 @dataclass
 class Position:
@@ -90,6 +123,89 @@ class Strategy2Trade:
     max_profit_pct: float = 0.0  # 최대 수익률(%)
 
 
+class ProgressReporter:
+    """
+    전략 실행 중간 결과 스트리밍 (거래일 batch_days 간격)
+    
+    callback으로 다음 프레임을 순서대로 전달한다:
+      - {"type": "trades", "offset", "trades": TradeLog}: 직전 프레임 이후 체결된 거래
+        (trading_log와 같은 형식, JSON 출력 시 rows/columnar로 변환)
+      - {"type": "progress", "days_processed", "total_days", "percent", "trades", "balance", "current_date"}
+    """
+    
+    def __init__(self, callback: Callable[[Dict[str, Any]], None], total_days: int,
+                 seed_money: float, batch_days: int = PROGRESS_BATCH_DAYS):
+        self.callback = callback
+        self.total_days = total_days
+        self.batch_days = max(1, batch_days)
+        self.balance = float(seed_money)
+        self.trade_count = 0
+        self.current_date = None
+        self._trades: Optional[TradeLog] = None
+        self._flushed = 0
+        self._next_mark = self.batch_days
+        self._emitted_days = -1
+        self._emit_progress(0)
+    
+    def add(self, trades: TradeLog, index: int, days_processed: int, current_date=None):
+        """
+        거래 1건 기록 (days_processed가 다음 배치 경계에 도달하면 프레임 출력)
+        
+        @param trades: 전체 거래 기록 (거래 순서대로 add 호출)
+        @param index: 이 거래의 번호
+        @param days_processed: 이 거래까지 처리한 거래일 수
+        @param current_date: 이 거래가 끝난 거래일 (datetime.date)
+        """
+        self._trades = trades
+        self.trade_count = index + 1
+        self.balance = float(trades.column('balance_after')[index])
+        self.current_date = current_date
+        if days_processed >= self._next_mark:
+            self._flush(days_processed)
+            self._next_mark = (days_processed // self.batch_days + 1) * self.batch_days
+    
+    def finish(self, current_date=None):
+        """남은 거래 + 완료(100%) progress 프레임 출력"""
+        if current_date is not None:
+            self.current_date = current_date
+        if self.trade_count > self._flushed or self._emitted_days < self.total_days:
+            self._flush(self.total_days)
+    
+    def _flush(self, days_processed: int):
+        if self.trade_count > self._flushed:
+            self.callback({
+                'type': 'trades',
+                'offset': self._flushed,
+                'trades': self._trades[self._flushed:self.trade_count]
+            })
+            self._flushed = self.trade_count
+        self._emit_progress(days_processed)
+    
+    def _emit_progress(self, days_processed: int):
+        days_processed = min(days_processed, self.total_days)
+        self._emitted_days = days_processed
+        self.callback({
+            'type': 'progress',
+            'days_processed': days_processed,
+            'total_days': self.total_days,
+            'percent': round(days_processed / self.total_days * 100, 1) if self.total_days else 100.0,
+            'trades': self.trade_count,
+            'balance': self.balance,
+            'current_date': str(self.current_date) if self.current_date is not None else None
+        })
+
+
+def _fills_summary(profit: np.ndarray) -> str:
+    """거래별 순수익 → 실행 요약 로그 문자열 (거래별 로그 대신 INFO 레벨 1줄)"""
+    if len(profit) == 0:
+        return "wins=0 losses=0"
+    wins = int(np.count_nonzero(profit > 0))
+    return (
+        f"wins={wins} losses={len(profit) - wins} | net={float(profit.sum()):+,.0f} "
+        f"best={float(profit.max()):+,.0f} worst={float(profit.min()):+,.0f}"
+    )
+
+
 class BacktestEngine:
     """
     주식 백테스팅 엔진
@@ -108,9 +224,85 @@ class BacktestEngine:
         self.positions: List[Position] = []
         self.trading_log: List[Trade] = []
         self.equity_curve: List[float] = [initial_capital]
+        self._preloaded_prices: Optional[pd.DataFrame] = None
+        # 세션 레이아웃 (frame, SessionIndex) - 같은 DataFrame이면 일자/분 인덱스 재계산 생략
+        self._session_layout: Optional[Tuple[pd.DataFrame, SessionIndex]] = None
+        # 스트리밍 모드 중간 결과 콜백 (stream_progress)
+        self._progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+        self._progress_batch_days = PROGRESS_BATCH_DAYS
+        # 단계별 소요 시간 (시세 조회/변환 등, Worker 응답 timings)
+        self.timings = PhaseTimings()
         logger.info(f"BacktestEngine initialized for {stock_code} with capital {initial_capital}")
     
-    def load_price_data(self, prices_dict: Optional[Dict] = None, period: int = 60) -> pd.DataFrame:
+    def use_price_data(self, prices: pd.DataFrame, layout: Optional[SessionIndex] = None):
+        """
+        미리 로드된 주가 데이터 지정 (이후 load_price_data는 조회 없이 이 데이터를 반환)
+        
+        Worker가 I/O 스레드에서 데이터를 먼저 로드하고, 전략 실행만 프로세스 풀에 넘길 때 사용.
+        
+        @param prices: OHLCV 데이터프레임 (load_price_data 반환 형식)
+        @param layout: prices의 세션 레이아웃 (load_price_data(with_layout=True) 반환값, 선택사항)
+        """
+        self._preloaded_prices = prices
+        self._session_layout = (prices, layout) if layout is not None else None
+    
+    def stream_progress(self, callback: Optional[Callable[[Dict[str, Any]], None]],
+                        batch_days: int = PROGRESS_BATCH_DAYS):
+        """
+        전략 1/2 실행 중 progress/trades 프레임 스트리밍 설정 (ProgressReporter 참고)
+        
+        @param callback: 프레임 수신 함수 (None이면 스트리밍 해제)
+        @param batch_days: 프레임 출력 간격 (거래일)
+        """
+        self._progress_callback = callback
+        self._progress_batch_days = batch_days
+    
+    def _progress_reporter(self, total_days: int, seed_money: float) -> Optional[ProgressReporter]:
+        """스트리밍 설정 시 ProgressReporter 생성 (0일차 progress 프레임 출력)"""
+        if self._progress_callback is None:
+            return None
+        return ProgressReporter(self._progress_callback, total_days, seed_money, self._progress_batch_days)
+    
+    def session_layout(self, prices: pd.DataFrame) -> SessionIndex:
+        """
+        주가 데이터의 세션 레이아웃 (일자/분 정수 인덱스)
+        
+        load_price_data가 캐시에서 받아 온 레이아웃이 있으면 그대로 사용하고,
+        다른 DataFrame이면 1회 계산 후 보관한다.
+        
+        @param prices: OHLCV 데이터프레임
+        @return: SessionIndex
+        """
+        if self._session_layout is not None and self._session_layout[0] is prices:
+            return self._session_layout[1]
+        with self.timings.phase('frame_build'):
+            layout = build_session_index(prices)
+        self._session_layout = (prices, layout)
+        return layout
+    
+    def load_price_data(self, prices_dict: Optional[Dict] = None, period: int = 60,
+                        with_layout: bool = False):
+        """
+        주가 데이터 로드 + 세션 레이아웃 (with_layout=True)
+        
+        @param with_layout: True면 (DataFrame, SessionIndex) 반환
+        @return: OHLCV 데이터프레임 또는 (데이터프레임, SessionIndex)
+        """
+        prices = self._load_price_frame(prices_dict, period)
+        if not with_layout:
+            return prices
+        
+        if self._session_layout is None or self._session_layout[0] is not prices:
+            # 메모리 캐시 항목이면 캐시에 보관된 레이아웃 재사용
+            layout = None
+            if HAS_CACHE and get_cache is not None and prices is not self._preloaded_prices:
+                with self.timings.phase('frame_build'):
+                    layout = get_cache().get_layout(self.stock_code, prices)
+            if layout is not None:
+                self._session_layout = (prices, layout)
+        return prices, self.session_layout(prices)
+    
+    def _load_price_frame(self, prices_dict: Optional[Dict] = None, period: int = 60) -> pd.DataFrame:
         """
         주가 데이터 로드 (2가지 방식 지원)
         
@@ -125,19 +317,28 @@ class BacktestEngine:
         @return: OHLCV 데이터프레임
         """
         try:
+            # 방식 0: use_price_data()로 미리 로드된 데이터
+            if self._preloaded_prices is not None:
+                logger.info(f"Using preloaded price data for {self.stock_code} ({len(self._preloaded_prices)} records)")
+                if self.timings.cache_tier is None:
+                    self.timings.cache_tier = 'preloaded'
+                return self._preloaded_prices
+            
             # 방식 1: prices_dict가 전달된 경우 (Backend 데이터 사용)
             if prices_dict and prices_dict.get('dates'):
                 logger.info(f"Using prices data from Backend (Node.js): {len(prices_dict.get('dates', []))} records")
-                df = pd.DataFrame({
-                    'Date': prices_dict.get('dates', []),
-                    'Open': prices_dict.get('opens', []),
-                    'High': prices_dict.get('highs', []),
-                    'Low': prices_dict.get('lows', []),
-                    'Close': prices_dict.get('closes', []),
-                    'Volume': prices_dict.get('volumes', [])
-                })
-                df['Date'] = pd.to_datetime(df['Date'])
-                df = df.sort_values('Date').reset_index(drop=True)
+                self.timings.cache_tier = 'inline'
+                with self.timings.phase('frame_build'):
+                    df = pd.DataFrame({
+                        'Date': prices_dict.get('dates', []),
+                        'Open': prices_dict.get('opens', []),
+                        'High': prices_dict.get('highs', []),
+                        'Low': prices_dict.get('lows', []),
+                        'Close': prices_dict.get('closes', []),
+                        'Volume': prices_dict.get('volumes', [])
+                    })
+                    df['Date'] = pd.to_datetime(df['Date'])
+                    df = df.sort_values('Date').reset_index(drop=True)
                 logger.info(f"Loaded {len(df)} price records from Backend")
                 return df
             
@@ -147,28 +348,54 @@ class BacktestEngine:
             # 2-1. 캐시에서 당일 데이터 조회
             if HAS_CACHE and get_cache is not None:
                 cache = get_cache()
-                cached_df = cache.get(self.stock_code)
+                with self.timings.phase('cache_lookup'):
+                    cached_df, self.timings.cache_tier = cache.lookup(self.stock_code)
                 if cached_df is not None:
                     logger.info(f"Using cached price data for {self.stock_code} ({len(cached_df)} records)")
                     return cached_df
             
-            # 2-2. 캐시 미스 → Yahoo Finance에서 직접 조회
-            logger.info(f"Fetching data from Yahoo Finance for {self.stock_code} (period={period}d)...")
-            
-            if not HAS_YFINANCE or yf is None:
-                raise ImportError(
-                    "yfinance is not installed and prices_dict not provided. "
-                    "Either install yfinance with 'pip install yfinance' "
-                    "or provide prices_dict from Backend"
-                )
+            # 2-2. 캐시 미스 → 증분 갱신 또는 Yahoo Finance 조회
+            #      (같은 종목의 동시 요청은 조회 1회로 합치고 결과를 공유)
+            if HAS_CACHE and get_cache is not None:
+                return get_cache().load_once(self.stock_code, lambda: self._fetch_price_data(period))
+            return self._fetch_price_data(period)
             
-            # 종목 코드를 Yahoo Finance Ticker로 변환 (캐시 활용)
+        except Exception as e:
+            logger.error(f"Error loading price data: {str(e)}")
+            raise ValueError(f"Failed to load price data: {str(e)}")
+    
+    def _fetch_price_data(self, period: int) -> pd.DataFrame:
+        """
+        캐시 미스 시 주가 데이터 조회 → 캐시 저장
+        
+        @param period: Yahoo Finance 조회 기간 (일)
+        @return: OHLCV 데이터프레임
+        """
+        # 1. 이전 날짜 캐시가 있으면 증분 갱신 (마지막 봉 이후만 조회해 append)
+        if INCREMENTAL_REFRESH and HAS_CACHE and get_cache is not None and HAS_YFINANCE and yf is not None:
+            refreshed = self._refresh_incremental(get_cache(), period)
+            if refreshed is not None:
+                return refreshed
+        
+        # 2. 캐시 미스 → Yahoo Finance에서 전체 기간 조회
+        logger.info(f"Fetching data from Yahoo Finance for {self.stock_code} (period={period}d)...")
+        
+        if not HAS_YFINANCE or yf is None:
+            raise ImportError(
+                "yfinance is not installed and prices_dict not provided. "
+                "Either install yfinance with 'pip install yfinance' "
+                "or provide prices_dict from Backend"
+            )
+        
+        # 종목 코드를 Yahoo Finance Ticker로 변환 (캐시 활용)
+        with self.timings.phase('ticker_resolve'):
             ticker = self._convert_to_ticker_safe(self.stock_code)
-            logger.info(f"Converted stock code {self.stock_code} to ticker: {ticker}")
-            
-            # Yahoo Finance에서 분봉 데이터 조회 시도
-            # yf.Ticker().history() 사용 (yf.download()는 MultiIndex 컬럼 문제 있음)
-            try:
+        logger.info(f"Converted stock code {self.stock_code} to ticker: {ticker}")
+        
+        # Yahoo Finance에서 분봉 데이터 조회 시도
+        # yf.Ticker().history() 사용 (yf.download()는 MultiIndex 컬럼 문제 있음)
+        try:
+            with self.timings.phase('yahoo_fetch'):
                 ticker_obj = yf.Ticker(ticker)
                 df = ticker_obj.history(
                     period=f"{period}d",
@@ -184,39 +411,109 @@ class BacktestEngine:
                         period=f"{period}d",
                         interval="2m"
                     )
-                
-                if df.empty:
-                    raise ValueError(f"No data available for {ticker}")
-                
-            except Exception as yf_error:
-                logger.error(f"Yahoo Finance error for {ticker}: {str(yf_error)}")
-                # Yahoo Finance 실패 시, 테스트 데이터로 대체 (개발용)
-                logger.warning("Using mock data for development/testing")
-                return self._generate_mock_data()
             
-            # 인덱스를 Date 컬럼으로 변환
-            # Ticker.history()는 인트라데이 데이터의 인덱스명이 'Datetime'
-            df = df.reset_index()
-            # 인덱스 컬럼명이 'Datetime' 또는 'Date'일 수 있음
-            date_col = 'Datetime' if 'Datetime' in df.columns else 'Date'
-            df = df.rename(columns={date_col: 'Date'})
-            # 필요한 OHLCV 컬럼만 선택
-            df = df[['Date', 'Open', 'High', 'Low', 'Close', 'Volume']]
-            df['Date'] = pd.to_datetime(df['Date'])
-            df = df.sort_values('Date').reset_index(drop=True)
+            if df.empty:
+                raise ValueError(f"No data available for {ticker}")
             
-            # 2-3. Yahoo Finance에서 수집한 데이터를 캐시에 저장 (일일 1회)
-            if HAS_CACHE and get_cache is not None:
-                cache = get_cache()
+        except Exception as yf_error:
+            logger.error(f"Yahoo Finance error for {ticker}: {str(yf_error)}")
+            # Yahoo Finance 실패 시, 테스트 데이터로 대체 (개발용)
+            logger.warning("Using mock data for development/testing")
+            return self._generate_mock_data()
+        
+        with self.timings.phase('frame_build'):
+            df = self._normalize_history(df)
+        
+        # 3. Yahoo Finance에서 수집한 데이터를 캐시에 저장 (일일 1회)
+        if HAS_CACHE and get_cache is not None:
+            cache = get_cache()
+            with self.timings.phase('cache_store'):
                 cache.put(self.stock_code, df)
-                logger.info(f"Cached price data for {self.stock_code} (daily cache)")
-            
-            logger.info(f"Loaded {len(df)} price records from Yahoo Finance")
-            return df
-            
-        except Exception as e:
-            logger.error(f"Error loading price data: {str(e)}")
-            raise ValueError(f"Failed to load price data: {str(e)}")
+            logger.info(f"Cached price data for {self.stock_code} (daily cache)")
+        
+        logger.info(f"Loaded {len(df)} price records from Yahoo Finance")
+        return df
+    
+    def _refresh_incremental(self, cache, period: int) -> Optional[pd.DataFrame]:
+        """
+        증분 갱신: 가장 최근 캐시의 마지막 봉이 속한 날짜부터만 조회해 캐시에 append
+        
+        마지막 날짜는 장중 수집으로 미완성일 수 있으므로 그날 전체를 다시 받아 교체한다.
+        기준 캐시가 요청 기간의 앞부분을 포함하지 않으면 (더 짧은 period로 수집된 경우) 전체 재수집.
+        
+        @param cache: DataCache
+        @param period: 보관 기간 (일)
+        @return: 병합된 DataFrame 또는 None (기준 캐시 없음/만료/기간 부족/조회 실패 → 전체 재수집)
+        """
+        with self.timings.phase('cache_lookup'):
+            latest = cache.get_latest(self.stock_code)
+        if latest is None or len(latest[0]) == 0:
+            return None
+        base_df, base_date = latest
+        
+        first_bar = base_df['Date'].iloc[0]
+        last_bar = base_df['Date'].iloc[-1]
+        now = pd.Timestamp.now(tz=last_bar.tz)
+        if now - last_bar > pd.Timedelta(days=period):
+            logger.info(f"Cached data for {self.stock_code} is older than {period}d, refetching full period")
+            return None
+        if first_bar.normalize() - (now - pd.Timedelta(days=period)) > pd.Timedelta(days=COVERAGE_SLACK_DAYS):
+            logger.info(
+                f"Cached data for {self.stock_code} starts at {first_bar:%Y-%m-%d}, "
+                f"shorter than requested {period}d, refetching full period"
+            )
+            return None
+        
+        with self.timings.phase('ticker_resolve'):
+            ticker = self._convert_to_ticker_safe(self.stock_code)
+        start = last_bar.strftime('%Y-%m-%d')
+        logger.info(f"Incremental fetch from Yahoo Finance for {ticker} (since {start}, base={base_date})...")
+        
+        try:
+            with self.timings.phase('yahoo_fetch'):
+                df = yf.Ticker(ticker).history(start=start, interval="2m")
+        except Exception as yf_error:
+            logger.error(f"Incremental fetch failed for {ticker}: {str(yf_error)}")
+            return None
+        
+        with self.timings.phase('frame_build'):
+            df = self._normalize_history(df) if not df.empty else base_df.iloc[0:0]
+        with self.timings.phase('cache_store'):
+            merged = cache.append(self.stock_code, df, period=period)
+        if merged is not None:
+            logger.info(f"Loaded {len(merged)} price records (incremental, +{len(df)} fetched)")
+        return merged
+    
+    @staticmethod
+    def _normalize_history(df: pd.DataFrame) -> pd.DataFrame:
+        """Ticker.history() 결과 → Date/OHLCV 컬럼 DataFrame"""
+        # 인덱스를 Date 컬럼으로 변환
+        # Ticker.history()는 인트라데이 데이터의 인덱스명이 'Datetime'
+        df = df.reset_index()
+        # 인덱스 컬럼명이 'Datetime' 또는 'Date'일 수 있음
+        date_col = 'Datetime' if 'Datetime' in df.columns else 'Date'
+        df = df.rename(columns={date_col: 'Date'})
+        # 필요한 OHLCV 컬럼만 선택
+        df = df[['Date', 'Open', 'High', 'Low', 'Close', 'Volume']]
+        df['Date'] = pd.to_datetime(df['Date'])
+        return df.sort_values('Date').reset_index(drop=True)
+    
+    @staticmethod
+    def to_prices_dict(df: pd.DataFrame) -> Dict[str, List[Any]]:
+        """
+        OHLCV 데이터프레임 → Node.js Backend prices 딕셔너리 (load_price_data 방식 1 입력 형식)
+        
+        @param df: Date/OHLCV 데이터프레임
+        @return: {"dates": [ISO 시각 문자열], "opens", "highs", "lows", "closes", "volumes"}
+        """
+        return {
+            'dates': [ts.isoformat() for ts in df['Date']],
+            'opens': df['Open'].tolist(),
+            'highs': df['High'].tolist(),
+            'lows': df['Low'].tolist(),
+            'closes': df['Close'].tolist(),
+            'volumes': df['Volume'].tolist()
+        }
     
     def _convert_to_ticker_safe(self, stock_code: str, market: str = None) -> str:
         """
@@ -228,7 +525,9 @@ class BacktestEngine:
         
         한국 종목 코드는 숫자 범위로 KOSPI/KOSDAQ를 구별할 수 없음.
         예: 005930(삼성전자)=KOSPI, 035420(NAVER)=KOSPI 모두 숫자값이 4000 이상.
-        따라서 market 파라미터로 명시하거나, yfinance로 실제 조회하여 판별.
+        따라서 market 파라미터로 명시하거나, 시장 인덱스(종목 목록 기반, 날짜 만료 없음)에서 찾고,
+        인덱스에 없는 종목만 yfinance로 실제 조회하여 판별한 뒤 ticker 캐시에 기록
+        (시장 인덱스는 종목 목록 적재/prefetch 일괄 조회로만 갱신).
         """
         # 1. market이 명시된 경우 바로 반환
         if market in ('KS', 'KQ'):
@@ -236,7 +535,16 @@ class BacktestEngine:
             logger.debug(f"Converted {stock_code} → {ticker} (market specified)")
             return ticker
         
-        # 2. ticker 캐시 확인 (일일 1회 - 동일 종목의 반복 조회 방지)
+        # 2. 시장 인덱스 확인 (O(1) dict 조회, 네트워크 호출 없음)
+        if HAS_CACHE and get_cache is not None:
+            cache = get_cache()
+            indexed_market = cache.get_market(stock_code)
+            if indexed_market:
+                ticker = f"{stock_code}.{indexed_market}"
+                logger.debug(f"Resolved {stock_code} → {ticker} (market index)")
+                return ticker
+        
+        # 3. ticker 캐시 확인 (일일 1회 - 동일 종목의 반복 조회 방지)
         if HAS_CACHE and get_cache is not None:
             cache = get_cache()
             cached_ticker = cache.get_ticker(stock_code)
@@ -244,7 +552,19 @@ class BacktestEngine:
                 logger.info(f"Resolved {stock_code} → {cached_ticker} (from cache)")
                 return cached_ticker
         
-        # 3. market 미지정 시: .KS(KOSPI) 우선 시도, 실패 시 .KQ(KOSDAQ)
+        # 4. 실제 조회로 판별 (같은 종목의 동시 요청은 조회 1회로 합치고 결과를 공유)
+        if HAS_CACHE and get_cache is not None:
+            return get_cache().single_flight(f"ticker:{stock_code}", lambda: self._probe_ticker(stock_code))
+        return self._probe_ticker(stock_code)
+    
+    def _probe_ticker(self, stock_code: str) -> str:
+        """
+        yfinance 조회로 시장 판별 → ticker 캐시 기록 (시장 인덱스는 일괄 갱신 경로에서만 기록)
+        
+        @param stock_code: KRX 종목 코드
+        @return: Yahoo Finance Ticker
+        """
+        # 1. market 미지정 시: .KS(KOSPI) 우선 시도, 실패 시 .KQ(KOSDAQ)
         #    대부분의 대형 종목(KOSPI 200 등)은 KOSPI이므로 .KS 우선
         resolved_ticker = None
         if HAS_YFINANCE and yf is not None:
@@ -261,15 +581,14 @@ class BacktestEngine:
                 except Exception:
                     continue
         
-        # 4. yfinance 미설치이거나 조회 실패 시 기본값 .KS 사용
+        # 2. yfinance 미설치이거나 조회 실패 시 기본값 .KS 사용
         if not resolved_ticker:
             resolved_ticker = f"{stock_code}.KS"
             logger.warning(f"Could not auto-detect market for {stock_code}, defaulting to {resolved_ticker}")
         
-        # 5. 결과를 ticker 캐시에 저장
+        # 3. 결과를 ticker 캐시에 저장
         if HAS_CACHE and get_cache is not None:
-            cache = get_cache()
-            cache.put_ticker(stock_code, resolved_ticker)
+            get_cache().put_ticker(stock_code, resolved_ticker)
         
         return resolved_ticker
     
@@ -344,6 +663,35 @@ class BacktestEngine:
         logger.info(f"Falling back to legacy backtest (strategy_type={strategy_type!r} not matched)")
         return self._run_legacy_backtest(strategy, prices_dict, period)
     
+    def run_parameter_sweep(self, strategy: Dict, prices_dict: Optional[Dict] = None, period: int = 60,
+                            sort_by: str = 'return_rate', top_n: Optional[int] = None) -> Dict:
+        """
+        전략 파라미터 스윕 (주가 데이터 1회 로드 → 전체 조합 일괄 평가)
+        
+        @param strategy: 파라미터 값에 리스트/범위 지정 가능
+            {"type": "daily_trading",
+             "buy_time": {"start": "09:00", "end": "11:00", "step": 10},
+             "sell_time": ["14:00", "15:00", "15:20"]}
+        @param prices_dict: 주가 데이터 (없으면 Yahoo Finance에서 조회)
+        @param period: 조회 기간 (일)
+        @param sort_by: 순위 기준 ('return_rate', 'mdd', 'win_rate', 'profit_factor' 등)
+        @param top_n: 상위 N개만 반환 (None이면 전체)
+        @return: 조합별 성과 순위표
+        """
+        prices, session = self.load_price_data(prices_dict=prices_dict, period=period, with_layout=True)
+        
+        logger.info(
+            f"Parameter sweep starting | stock={self.stock_code} | "
+            f"records={len(prices)} | trading_days={session.num_days} | strategy={strategy}"
+        )
+        
+        result = run_sweep(session, strategy, self.initial_capital, sort_by=sort_by, top_n=top_n)
+        result['stock_code'] = self.stock_code
+        result['initial_capital'] = float(self.initial_capital)
+        result['records'] = len(prices)
+        result['trading_days'] = session.num_days
+        return result
+    
     def run_strategy1_backtest(self, strategy: Dict, prices_dict: Optional[Dict] = None, period: int = 60) -> Dict:
         """
         전략 1: 고정시간 매수/매도 백테스팅 (LLD 3.3.2 준수)
@@ -359,7 +707,7 @@ class BacktestEngine:
         """
         try:
             # 1. 주가 데이터 로드
-            prices = self.load_price_data(prices_dict=prices_dict, period=period)
+            prices, _ = self.load_price_data(prices_dict=prices_dict, period=period, with_layout=True)
             
             # 2. 전략 1 실행
             buy_time = strategy.get('buy_time', '10:00')
@@ -419,38 +767,34 @@ class BacktestEngine:
             candidates = day_data[day_data['time_str'] <= target_time]
             if not candidates.empty:
                 matched = candidates.iloc[-1]
-                logger.debug(
-                    f"Nearest candle (backward): target={target_time} → matched={matched['time_str']} "
-                    f"(Close={matched['Close']})"
-                )
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Nearest candle (backward): target=%s → matched=%s (Close=%s)",
+                                 target_time, matched['time_str'], matched['Close'])
                 return matched
             # target_time보다 이른 캔들이 없으면 가장 빠른 캔들 반환
             fallback = day_data.iloc[0]
-            logger.debug(
-                f"Nearest candle (backward fallback): target={target_time} → first candle={fallback['time_str']} "
-                f"(Close={fallback['Close']})"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Nearest candle (backward fallback): target=%s → first candle=%s (Close=%s)",
+                             target_time, fallback['time_str'], fallback['Close'])
             return fallback
         else:  # forward
             # target_time 이상인 캔들 중 가장 빠른 것
             candidates = day_data[day_data['time_str'] >= target_time]
             if not candidates.empty:
                 matched = candidates.iloc[0]
-                logger.debug(
-                    f"Nearest candle (forward): target={target_time} → matched={matched['time_str']} "
-                    f"(Close={matched['Close']})"
-                )
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Nearest candle (forward): target=%s → matched=%s (Close=%s)",
+                                 target_time, matched['time_str'], matched['Close'])
                 return matched
             # target_time보다 늦은 캔들이 없으면 마지막 캔들 반환
             fallback = day_data.iloc[-1]
-            logger.debug(
-                f"Nearest candle (forward fallback): target={target_time} → last candle={fallback['time_str']} "
-                f"(Close={fallback['Close']})"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Nearest candle (forward fallback): target=%s → last candle=%s (Close=%s)",
+                             target_time, fallback['time_str'], fallback['Close'])
             return fallback
 
     def execute_strategy1(self, buy_time: str, sell_time: str, 
-                           ohlc_data: pd.DataFrame, seed_money: float) -> List[Strategy1Trade]:
+                           ohlc_data: pd.DataFrame, seed_money: float) -> TradeLog:
         """
         전략 1: 고정시간 매수/매도 (LLD 3.3.2 준수)
         
@@ -474,31 +818,21 @@ class BacktestEngine:
         @param sell_time: 매도 시간 (예: "15:00")
         @param ohlc_data: OHLCV 데이터프레임 (Date, Open, High, Low, Close, Volume)
         @param seed_money: 씨드머니 (초기 자본금)
-        @return: 거래 기록 리스트
+        @return: 거래 기록 (TradeLog, 거래 1건은 Strategy1Trade와 같은 필드의 TradeRow)
         """
-        trades: List[Strategy1Trade] = []
-        balance = seed_money
-        loss_amount = 0.0  # 누적 손해액
-        
         logger.info(
             f"execute_strategy1 | buy_time={buy_time} | sell_time={sell_time} | "
             f"seed_money={seed_money:,.0f} | records={len(ohlc_data)}"
         )
         
-        # 날짜별로 그룹핑
-        ohlc_data = ohlc_data.copy()
-        ohlc_data['Date'] = pd.to_datetime(ohlc_data['Date'])
-        ohlc_data['trade_date'] = ohlc_data['Date'].dt.date
-        ohlc_data['time_str'] = ohlc_data['Date'].dt.strftime('%H:%M')
-        
-        grouped = ohlc_data.groupby('trade_date')
-        total_days = len(grouped)
-        skipped_days = 0
+        # 일자/분 정수 인덱스 (날짜별 groupby 대신 CSR 일자 경계 사용, 캐시 레이아웃 재사용)
+        session = self.session_layout(ohlc_data)
+        total_days = session.num_days
         
         # 데이터에 존재하는 시간 범위 로깅 (첫 번째 날 기준)
-        first_day = list(grouped)[0][1] if total_days > 0 else pd.DataFrame()
-        if not first_day.empty:
-            avail_times = sorted(first_day['time_str'].unique())
+        if total_days > 0:
+            day1_minutes = np.unique(session.minutes[session.day_offsets[0]:session.day_offsets[1]])
+            avail_times = [format_minute(m) for m in day1_minutes]
             logger.info(
                 f"Available candle times (day1): {avail_times[0]}~{avail_times[-1]} "
                 f"({len(avail_times)} slots, interval={avail_times[1] if len(avail_times)>1 else 'N/A'}~) | "
@@ -506,106 +840,73 @@ class BacktestEngine:
                 f"sell_time={sell_time} in data: {sell_time in avail_times}"
             )
         
-        for date, day_data in grouped:
-            day_data_sorted = day_data.sort_values('Date')
-            
-            # 매수 시점 찾기 (정확 매칭 → 근접 매칭 fallback)
-            buy_candle = self._find_nearest_candle(day_data_sorted, buy_time, direction='forward')
-            if buy_candle is None:
-                skipped_days += 1
-                logger.debug(f"{date}: No candle near buy_time {buy_time}, skipping")
-                continue
-            
-            buy_price = float(buy_candle['Close'])
-            
-            if buy_price <= 0:
-                logger.warning(f"{date}: Invalid buy price {buy_price}, skipping")
-                continue
-            
-            # 투입 금액 = balance - lossAmount (LLD 명세)
-            buy_amount = balance - loss_amount
-            if buy_amount <= 0:
-                logger.warning(f"{date}: buyAmount <= 0 (balance={balance}, lossAmount={loss_amount}), skipping")
-                continue
-            
-            # 매도 시점 찾기 (정확 매칭 → 근접 매칭 fallback)
-            sell_candle = self._find_nearest_candle(day_data_sorted, sell_time, direction='backward')
-            if sell_candle is None:
-                skipped_days += 1
-                logger.debug(f"{date}: No candle near sell_time {sell_time}, skipping")
-                continue
-            sell_price = float(sell_candle['Close'])
-            
-            # 실제 매칭된 시간 로깅 (target vs actual)
-            actual_buy_time = buy_candle['time_str']
-            actual_sell_time = sell_candle['time_str']
-            if actual_buy_time != buy_time or actual_sell_time != sell_time:
-                logger.debug(
-                    f"{date}: Time adjusted | buy {buy_time}→{actual_buy_time} | sell {sell_time}→{actual_sell_time}"
-                )
-            
-            if sell_price <= 0:
-                logger.warning(f"{date}: Invalid sell price {sell_price}, skipping")
-                continue
-            
-            # 거래 결과 계산 (LLD 3.3.2)
-            # grossProfit = (sellPrice - buyPrice) * (buyAmount / buyPrice)
-            gross_profit = (sell_price - buy_price) * (buy_amount / buy_price)
-            
-            # 비용 = 세금(매도금액의 0.2%) + 수수료(매도금액의 0.011%)
-            # 매도금액 = sellPrice * (buyAmount / buyPrice) = 보유 주식의 매도 총액
-            sell_total = sell_price * (buy_amount / buy_price)
-            tax = sell_total * 0.2 / 100
-            commission = sell_total * 0.011 / 100
-            cost = tax + commission
-            
-            # 순수익
-            net_profit = gross_profit - cost
-            
-            # 잔고 업데이트
-            balance += net_profit
-            
-            # 손실 시 누적 손해액 증가
-            if net_profit < 0:
-                loss_amount += abs(net_profit)
-            
-            # 거래 기록
-            trade = Strategy1Trade(
-                buy_time=str(buy_candle['Date']),
-                buy_price=buy_price,
-                sell_time=str(sell_candle['Date']),
-                sell_price=sell_price,
-                buy_amount=buy_amount,
-                gross_profit=gross_profit,
-                cost=cost,
-                profit=net_profit,
-                balance_after=balance
+        # 매수/매도 시점 찾기 (정확 매칭 → 근접 매칭 fallback, 전체 거래일 일괄 검색)
+        keys = session_keys(session)
+        buy_idx = nearest_candle_indices(session, buy_time, direction='forward', keys=keys)
+        sell_idx = nearest_candle_indices(session, sell_time, direction='backward', keys=keys)
+        
+        # 잔고 / 누적 손해액 점화식 (LLD 3.3.2)
+        labels = day_labels(session)
+        fills = run_strategy1(session.close, buy_idx, sell_idx, seed_money, labels=labels)
+        reporter = self._progress_reporter(total_days, seed_money)
+        
+        # 체결 결과 → 컬럼형 거래 기록 (거래별 객체 생성 없음)
+        trades = TradeLog('strategy1', {
+            'buy_time': session.dates.iloc[fills.buy_idx],
+            'buy_price': fills.buy_price,
+            'sell_time': session.dates.iloc[fills.sell_idx],
+            'sell_price': fills.sell_price,
+            'buy_amount': fills.buy_amount,
+            'gross_profit': fills.gross_profit,
+            'cost': fills.cost,
+            'profit': fills.profit,
+            'balance_after': fills.balance_after
+        })
+        # 거래별 progress 프레임 / 상세 로그 (TRACE 레벨, TRADE_LOG_SAMPLE건마다 1건) - 둘 다 없으면 순회 생략
+        trace = logger.isEnabledFor(TRACE)
+        if reporter is not None or trace:
+            columns = zip(
+                fills.day.tolist(), fills.buy_idx.tolist(), fills.sell_idx.tolist(),
+                fills.buy_price.tolist(), fills.sell_price.tolist(),
+                fills.buy_amount.tolist(), fills.gross_profit.tolist(), fills.cost.tolist(),
+                fills.profit.tolist(), fills.balance_after.tolist(), fills.loss_amount.tolist()
             )
-            trades.append(trade)
             
-            logger.info(
-                f"[S1 Trade #{len(trades)}] {date} | "
-                f"BUY@{buy_price:,.0f}({buy_candle['time_str']}) → SELL@{sell_price:,.0f}({sell_candle['time_str']}) | "
-                f"qty={buy_amount/buy_price:.0f}주 buyAmt={buy_amount:,.0f} | "
-                f"gross={gross_profit:+,.0f} cost={cost:,.0f} net={net_profit:+,.0f} | "
-                f"bal={balance:,.0f} lossAmt={loss_amount:,.0f}"
-            )
+            for n, (day, bi, si, buy_price, sell_price, buy_amount,
+                    gross_profit, cost, net_profit, balance, loss_amount) in enumerate(columns):
+                if reporter is not None:
+                    reporter.add(trades, n, day + 1, labels[day])
+                
+                if trace and n % TRADE_LOG_SAMPLE == 0:
+                    logger.log(
+                        TRACE,
+                        f"[S1 Trade #{n + 1}] {labels[day]} | "
+                        f"BUY@{buy_price:,.0f}({format_minute(session.minutes[bi])}) → "
+                        f"SELL@{sell_price:,.0f}({format_minute(session.minutes[si])}) | "
+                        f"qty={buy_amount/buy_price:.0f}주 buyAmt={buy_amount:,.0f} | "
+                        f"gross={gross_profit:+,.0f} cost={cost:,.0f} net={net_profit:+,.0f} | "
+                        f"bal={balance:,.0f} lossAmt={loss_amount:,.0f}"
+                    )
         
+        final_balance = float(fills.balance_after[-1]) if len(trades) > 0 else seed_money
+        final_loss_amount = float(fills.loss_amount[-1]) if len(trades) > 0 else 0.0
+        if reporter is not None:
+            reporter.finish(labels[-1] if labels else None)
         logger.info(
             f"Strategy 1 finished | trades={len(trades)}/{total_days}days "
-            f"(skipped={skipped_days}) | "
-            f"final_balance={balance:,.0f} | total_loss_amount={loss_amount:,.0f}"
+            f"(skipped={total_days - len(trades)}) | {_fills_summary(fills.profit)} | "
+            f"final_balance={final_balance:,.0f} | total_loss_amount={final_loss_amount:,.0f}"
         )
         return trades
     
-    def _calculate_strategy1_performance(self, trades: List[Strategy1Trade]) -> Dict:
+    def _calculate_strategy1_performance(self, trades: TradeLog) -> Dict:
         """
         전략 1 성과 지표 계산
         
-        @param trades: Strategy1Trade 리스트
-        @return: 성과 요약 딕셔너리
+        @param trades: 거래 기록 (TradeLog)
+        @return: 성과 요약 딕셔너리 (trading_log: TradeLog, equity_curve: ndarray - JSON 출력 시 리스트로 변환)
         """
-        if not trades:
+        if not len(trades):
             return {
                 'stock_code': self.stock_code,
                 'strategy': 'strategy1_fixed_time',
@@ -622,67 +923,68 @@ class BacktestEngine:
                 'total_cost': 0.0,
                 'initial_capital': float(self.initial_capital),
                 'final_capital': float(self.initial_capital),
-                'trading_log': [],
-                'equity_curve': [float(self.initial_capital)]
+                'trading_log': trades,
+                'equity_curve': trades.equity_curve(self.initial_capital)
             }
         
-        # 승/패 분류
-        winning = [t for t in trades if t.profit > 0]
-        losing = [t for t in trades if t.profit <= 0]
-        
-        total_profit = sum(t.profit for t in trades)
-        total_cost = sum(t.cost for t in trades)
-        total_wins = sum(t.profit for t in winning)
-        total_losses = sum(abs(t.profit) for t in losing)
+        stats = self._trade_stats(trades)
         
-        final_balance = trades[-1].balance_after
-        return_rate = (total_profit / self.initial_capital) * 100
-        win_rate = (len(winning) / len(trades)) * 100 if trades else 0
-        avg_win = total_wins / len(winning) if winning else 0
-        avg_loss = total_losses / len(losing) if losing else 0
-        profit_factor = total_wins / total_losses if total_losses > 0 else 0
-        
-        # 자산 곡선 (equity curve)
-        equity_curve = [float(self.initial_capital)]
-        for t in trades:
-            equity_curve.append(float(t.balance_after))
-        
-        # MDD 계산
+        # 자산 곡선 (equity curve) / MDD
+        equity_curve = trades.equity_curve(self.initial_capital)
         mdd = self.calculate_mdd(equity_curve)
         
-        # 거래 로그 (직렬화 가능 형태)
-        trading_log = [asdict(t) for t in trades]
-        
         result = {
             'stock_code': self.stock_code,
             'strategy': 'strategy1_fixed_time',
-            'total_profit': float(total_profit),
-            'return_rate': float(return_rate),
-            'total_trades': len(trades),
-            'winning_trades': len(winning),
-            'losing_trades': len(losing),
-            'win_rate': float(win_rate),
-            'avg_win': float(avg_win),
-            'avg_loss': float(avg_loss),
-            'profit_factor': float(profit_factor),
+            **stats,
             'mdd': float(mdd),
-            'total_cost': float(total_cost),
             'initial_capital': float(self.initial_capital),
-            'final_capital': float(final_balance),
-            'trading_log': trading_log,
+            'final_capital': float(trades.column('balance_after')[-1]),
+            'trading_log': trades,
             'equity_curve': equity_curve
         }
         
         logger.info(
             f"Strategy 1 results: {self.stock_code} | "
-            f"Return={return_rate:+.2f}% | PnL={total_profit:+,.0f} | "
-            f"Trades={len(trades)} (W:{len(winning)} L:{len(losing)}) | "
-            f"WinRate={win_rate:.1f}% | AvgWin={avg_win:,.0f} AvgLoss={avg_loss:,.0f} | "
-            f"PF={profit_factor:.2f} | MDD={mdd:.2f}% | Cost={total_cost:,.0f} | "
-            f"Capital: {self.initial_capital:,.0f} → {final_balance:,.0f}"
+            f"Return={result['return_rate']:+.2f}% | PnL={result['total_profit']:+,.0f} | "
+            f"Trades={len(trades)} (W:{result['winning_trades']} L:{result['losing_trades']}) | "
+            f"WinRate={result['win_rate']:.1f}% | AvgWin={result['avg_win']:,.0f} AvgLoss={result['avg_loss']:,.0f} | "
+            f"PF={result['profit_factor']:.2f} | MDD={mdd:.2f}% | Cost={result['total_cost']:,.0f} | "
+            f"Capital: {self.initial_capital:,.0f} → {result['final_capital']:,.0f}"
         )
         return result
     
+    def _trade_stats(self, trades: TradeLog) -> Dict:
+        """
+        거래 기록 컬럼 → 손익 통계 (전략 1/2 공통)
+        
+        @param trades: 거래 기록 (1건 이상)
+        @return: total_profit, return_rate, total_trades, winning/losing_trades, win_rate,
+                 avg_win, avg_loss, profit_factor, total_cost
+        """
+        profit = trades.column('profit')
+        wins = profit > 0
+        num_wins = int(np.count_nonzero(wins))
+        num_losses = len(profit) - num_wins
+        
+        # 합계는 거래 순서대로 순차 합산 (np.sum의 pairwise 합산과 마지막 자리가 달라지지 않도록)
+        total_profit = sum(profit.tolist())
+        total_wins = sum(profit[wins].tolist())
+        total_losses = sum(np.abs(profit[~wins]).tolist())
+        
+        return {
+            'total_profit': float(total_profit),
+            'return_rate': (total_profit / self.initial_capital) * 100,
+            'total_trades': len(profit),
+            'winning_trades': num_wins,
+            'losing_trades': num_losses,
+            'win_rate': (num_wins / len(profit)) * 100,
+            'avg_win': total_wins / num_wins if num_wins else 0.0,
+            'avg_loss': total_losses / num_losses if num_losses else 0.0,
+            'profit_factor': total_wins / total_losses if total_losses > 0 else 0.0,
+            'total_cost': float(sum(trades.column('cost').tolist()))
+        }
+    
     def run_strategy2_backtest(self, strategy: Dict, prices_dict: Optional[Dict] = None, period: int = 60) -> Dict:
         """
         전략 2: Trailing Stop 백테스팅 (LLD 3.3.3 준수)
@@ -706,7 +1008,7 @@ class BacktestEngine:
         """
         try:
             # 1. 주가 데이터 로드
-            prices = self.load_price_data(prices_dict=prices_dict, period=period)
+            prices, _ = self.load_price_data(prices_dict=prices_dict, period=period, with_layout=True)
             
             # 2. 전략 2 실행
             buy_time = strategy.get('buy_time', '15:30')
@@ -746,7 +1048,7 @@ class BacktestEngine:
     
     def execute_strategy2(self, buy_time: str, min_profit_pct: float,
                            profit_cutoff_pct: float, loss_cutoff_time: str,
-                           ohlc_data: pd.DataFrame, seed_money: float) -> List[Strategy2Trade]:
+                           ohlc_data: pd.DataFrame, seed_money: float) -> TradeLog:
         """
         전략 2: Trailing Stop (LLD 3.3.3 준수)
         
@@ -766,26 +1068,17 @@ class BacktestEngine:
         @param loss_cutoff_time: 손절 시간 (다음날, 예: "14:00")
         @param ohlc_data: OHLCV 데이터프레임
         @param seed_money: 씨드머니
-        @return: 거래 기록 리스트
+        @return: 거래 기록 (TradeLog, 거래 1건은 Strategy2Trade와 같은 필드의 TradeRow)
         """
-        trades: List[Strategy2Trade] = []
-        balance = seed_money
-        loss_amount = 0.0
-        
         logger.info(
             f"execute_strategy2 | buy_time={buy_time} | min_profit={min_profit_pct}% | "
             f"cutoff={profit_cutoff_pct}% | loss_cutoff_time={loss_cutoff_time} | "
             f"seed_money={seed_money:,.0f} | records={len(ohlc_data)}"
         )
         
-        # 날짜별로 그룹핑
-        ohlc_data = ohlc_data.copy()
-        ohlc_data['Date'] = pd.to_datetime(ohlc_data['Date'])
-        ohlc_data['trade_date'] = ohlc_data['Date'].dt.date
-        ohlc_data['time_str'] = ohlc_data['Date'].dt.strftime('%H:%M')
-        
-        # 날짜 목록 (정렬)
-        dates_list = sorted(ohlc_data['trade_date'].unique())
+        # 일자/분 정수 인덱스 (캐시 레이아웃 재사용, 없으면 1회 계산)
+        session = self.session_layout(ohlc_data)
+        labels = day_labels(session)
         
         # Trailing stop 하락 임계치: 고점 대비 이만큼 하락하면 매도
         # LLD: (highestPrice - candlePrice) / highestPrice > (1 - profit_cutoff_pct / 100)
@@ -793,153 +1086,78 @@ class BacktestEngine:
         drop_threshold = 1.0 - profit_cutoff_pct / 100.0
         logger.info(f"Trailing stop drop_threshold={drop_threshold:.4f} (sell when drop > {drop_threshold*100:.1f}% from high)")
         
-        for day_idx in range(len(dates_list) - 1):  # 마지막 날은 다음날이 없으므로 제외
-            current_date = dates_list[day_idx]
-            next_date = dates_list[day_idx + 1]
-            
-            current_day_data = ohlc_data[ohlc_data['trade_date'] == current_date]
-            next_day_data = ohlc_data[ohlc_data['trade_date'] == next_date].sort_values('Date')
-            
-            if next_day_data.empty:
-                continue
-            
-            # Step 1: 매수 (당일 buy_time) - 정확 매칭 → 근접 매칭 fallback
-            current_day_sorted = current_day_data.sort_values('Date')
-            buy_candle = self._find_nearest_candle(current_day_sorted, buy_time, direction='backward')
-            if buy_candle is None:
-                logger.debug(f"{current_date}: No candle near buy_time {buy_time}, skipping")
-                continue
-            buy_price = float(buy_candle['Close'])
-            
-            if buy_price <= 0:
-                logger.warning(f"{current_date}: Invalid buy price {buy_price}, skipping")
-                continue
-            
-            # 투입 금액 = balance - lossAmount
-            buy_amount = balance - loss_amount
-            if buy_amount <= 0:
-                logger.warning(f"{current_date}: buyAmount <= 0 (balance={balance}, lossAmount={loss_amount}), skipping")
-                continue
-            
-            # Step 2: 다음날 손절/익절 탐색
-            sell_price = None
-            sell_time_str = None
-            sell_reason = ''
-            highest_price = buy_price
-            max_profit_pct_reached = 0.0
-            min_profit_reached = False
+        fills = run_strategy2(
+            session, buy_time, min_profit_pct, profit_cutoff_pct, loss_cutoff_time,
+            seed_money, labels=labels
+        )
+        reporter = self._progress_reporter(session.num_days, seed_money)
+        
+        # 체결 결과 → 컬럼형 거래 기록 (거래별 객체 생성 없음)
+        trades = TradeLog('strategy2', {
+            'buy_time': session.dates.iloc[fills.buy_idx],
+            'buy_price': fills.buy_price,
+            'sell_time': session.dates.iloc[fills.sell_idx],
+            'sell_price': fills.sell_price,
+            'buy_amount': fills.buy_amount,
+            'gross_profit': fills.gross_profit,
+            'cost': fills.cost,
+            'profit': fills.profit,
+            'balance_after': fills.balance_after,
+            'sell_reason': fills.sell_reason,
+            'highest_price': fills.highest_price,
+            'max_profit_pct': fills.max_profit_pct
+        })
+        # 거래별 progress 프레임 / 상세 로그 (TRACE 레벨, TRADE_LOG_SAMPLE건마다 1건) - 둘 다 없으면 순회 생략
+        trace = logger.isEnabledFor(TRACE)
+        if reporter is not None or trace:
+            columns = zip(
+                fills.day.tolist(), fills.buy_idx.tolist(),
+                fills.buy_price.tolist(), fills.sell_price.tolist(),
+                fills.buy_amount.tolist(), fills.gross_profit.tolist(), fills.cost.tolist(),
+                fills.profit.tolist(), fills.balance_after.tolist(), fills.loss_amount.tolist(),
+                fills.sell_reason.tolist(), fills.highest_price.tolist(), fills.max_profit_pct.tolist()
+            )
             
-            for _, candle in next_day_data.iterrows():
-                candle_price = float(candle['Close'])
-                candle_time = candle['time_str']
-                
-                if candle_price <= 0:
-                    continue
-                
-                # 수익률 계산
-                profit_rate = (candle_price - buy_price) / buy_price * 100
+            for n, (day, bi, buy_price, sell_price, buy_amount, gross_profit,
+                    cost, net_profit, balance, loss_amount, reason, highest_price, max_profit_pct) in enumerate(columns):
+                if reporter is not None:
+                    # 매도일(day + 1)까지 처리
+                    reporter.add(trades, n, day + 2, labels[day + 1])
                 
-                # 최소 수익률 도달 확인
-                if profit_rate >= min_profit_pct:
-                    min_profit_reached = True
-                    if candle_price > highest_price:
-                        highest_price = candle_price
-                    max_profit_pct_reached = max(max_profit_pct_reached, profit_rate)
-                
-                # 손절 시간 도달 && 최소 수익 미달 → 손절
-                if candle_time >= loss_cutoff_time and not min_profit_reached:
-                    # 손절 시간의 캔들 가격으로 매도 (근접 매칭)
-                    loss_cutoff_candle = self._find_nearest_candle(
-                        next_day_data, loss_cutoff_time, direction='backward'
+                if trace and n % TRADE_LOG_SAMPLE == 0:
+                    logger.log(
+                        TRACE,
+                        f"[S2 Trade #{n + 1}] {labels[day]}→{labels[day + 1]} | "
+                        f"BUY@{buy_price:,.0f}({format_minute(session.minutes[bi])}) → "
+                        f"SELL@{sell_price:,.0f} ({SELL_REASONS[reason]}) | "
+                        f"qty={buy_amount/buy_price:.0f}주 buyAmt={buy_amount:,.0f} | "
+                        f"gross={gross_profit:+,.0f} cost={cost:,.0f} net={net_profit:+,.0f} | "
+                        f"bal={balance:,.0f} lossAmt={loss_amount:,.0f} | "
+                        f"highest={highest_price:,.0f} maxPct={max_profit_pct:.2f}%"
                     )
-                    if loss_cutoff_candle is not None:
-                        sell_price = float(loss_cutoff_candle['Close'])
-                        sell_time_str = str(loss_cutoff_candle['Date'])
-                    else:
-                        sell_price = candle_price
-                        sell_time_str = str(candle['Date'])
-                    sell_reason = 'loss_cutoff'
-                    break
-                
-                # 이익보전(Trailing Stop) 로직
-                # (highestPrice - candlePrice) / highestPrice > (1 - profit_cutoff_pct / 100)
-                if min_profit_reached and highest_price > 0:
-                    drop_rate = (highest_price - candle_price) / highest_price
-                    if drop_rate > drop_threshold:
-                        sell_price = candle_price
-                        sell_time_str = str(candle['Date'])
-                        sell_reason = 'trailing_stop'
-                        break
-            
-            # End of day: 미청산 시 다음날 마지막 캔들 종가로 매도
-            if sell_price is None:
-                last_candle = next_day_data.iloc[-1]
-                sell_price = float(last_candle['Close'])
-                sell_time_str = str(last_candle['Date'])
-                sell_reason = 'end_of_day'
-            
-            if sell_price <= 0:
-                logger.warning(f"{current_date}: Invalid sell price {sell_price}, skipping")
-                continue
-            
-            # 거래 결과 계산 (전략 1과 동일한 비용 구조)
-            gross_profit = (sell_price - buy_price) * (buy_amount / buy_price)
-            sell_total = sell_price * (buy_amount / buy_price)
-            tax = sell_total * 0.2 / 100
-            commission = sell_total * 0.011 / 100
-            cost = tax + commission
-            net_profit = gross_profit - cost
-            
-            # 잔고 업데이트
-            balance += net_profit
-            if net_profit < 0:
-                loss_amount += abs(net_profit)
-            
-            trade = Strategy2Trade(
-                buy_time=str(buy_candle['Date']),
-                buy_price=buy_price,
-                sell_time=sell_time_str,
-                sell_price=sell_price,
-                buy_amount=buy_amount,
-                gross_profit=gross_profit,
-                cost=cost,
-                profit=net_profit,
-                balance_after=balance,
-                sell_reason=sell_reason,
-                highest_price=highest_price,
-                max_profit_pct=max_profit_pct_reached
-            )
-            trades.append(trade)
-            
-            logger.info(
-                f"[S2 Trade #{len(trades)}] {current_date}→{next_date} | "
-                f"BUY@{buy_price:,.0f}({buy_candle['time_str']}) → SELL@{sell_price:,.0f} ({sell_reason}) | "
-                f"qty={buy_amount/buy_price:.0f}주 buyAmt={buy_amount:,.0f} | "
-                f"gross={gross_profit:+,.0f} cost={cost:,.0f} net={net_profit:+,.0f} | "
-                f"bal={balance:,.0f} lossAmt={loss_amount:,.0f} | "
-                f"highest={highest_price:,.0f} maxPct={max_profit_pct_reached:.2f}%"
-            )
         
         # 매도 사유 통계
-        reason_counts = {}
-        for t in trades:
-            reason_counts[t.sell_reason] = reason_counts.get(t.sell_reason, 0) + 1
+        reason_counts = trades.sell_reason_counts()
         
+        final_balance = float(fills.balance_after[-1]) if len(trades) > 0 else seed_money
+        final_loss_amount = float(fills.loss_amount[-1]) if len(trades) > 0 else 0.0
+        if reporter is not None:
+            reporter.finish(labels[-1] if labels else None)
         logger.info(
-            f"Strategy 2 finished | trades={len(trades)}/{len(dates_list)-1}days | "
-            f"final_balance={balance:,.0f} | total_loss_amount={loss_amount:,.0f} | "
+            f"Strategy 2 finished | trades={len(trades)}/{session.num_days-1}days | "
+            f"{_fills_summary(fills.profit)} | final_balance={final_balance:,.0f} | total_loss_amount={final_loss_amount:,.0f} | "
             f"sell_reasons={reason_counts}"
         )
         return trades
     
-    def _calculate_strategy2_performance(self, trades: List[Strategy2Trade]) -> Dict:
+    def _calculate_strategy2_performance(self, trades: TradeLog) -> Dict:
         """
         전략 2 성과 지표 계산
         
-        @param trades: Strategy2Trade 리스트
-        @return: 성과 요약 딕셔너리
+        @param trades: 거래 기록 (TradeLog)
+        @return: 성과 요약 딕셔너리 (trading_log: TradeLog, equity_curve: ndarray - JSON 출력 시 리스트로 변환)
         """
-        if not trades:
+        if not len(trades):
             return {
                 'stock_code': self.stock_code,
                 'strategy': 'strategy2_trailing_stop',
@@ -956,66 +1174,38 @@ class BacktestEngine:
                 'total_cost': 0.0,
                 'initial_capital': float(self.initial_capital),
                 'final_capital': float(self.initial_capital),
-                'trading_log': [],
-                'equity_curve': [float(self.initial_capital)],
+                'trading_log': trades,
+                'equity_curve': trades.equity_curve(self.initial_capital),
                 'sell_reason_stats': {}
             }
         
-        winning = [t for t in trades if t.profit > 0]
-        losing = [t for t in trades if t.profit <= 0]
-        
-        total_profit = sum(t.profit for t in trades)
-        total_cost = sum(t.cost for t in trades)
-        total_wins = sum(t.profit for t in winning)
-        total_losses = sum(abs(t.profit) for t in losing)
-        
-        final_balance = trades[-1].balance_after
-        return_rate = (total_profit / self.initial_capital) * 100
-        win_rate = (len(winning) / len(trades)) * 100 if trades else 0
-        avg_win = total_wins / len(winning) if winning else 0
-        avg_loss = total_losses / len(losing) if losing else 0
-        profit_factor = total_wins / total_losses if total_losses > 0 else 0
+        stats = self._trade_stats(trades)
         
         # 매도 사유 통계
-        sell_reason_stats = {}
-        for t in trades:
-            sell_reason_stats[t.sell_reason] = sell_reason_stats.get(t.sell_reason, 0) + 1
-        
-        equity_curve = [float(self.initial_capital)]
-        for t in trades:
-            equity_curve.append(float(t.balance_after))
+        sell_reason_stats = trades.sell_reason_counts()
         
+        equity_curve = trades.equity_curve(self.initial_capital)
         mdd = self.calculate_mdd(equity_curve)
-        trading_log = [asdict(t) for t in trades]
         
         result = {
             'stock_code': self.stock_code,
             'strategy': 'strategy2_trailing_stop',
-            'total_profit': float(total_profit),
-            'return_rate': float(return_rate),
-            'total_trades': len(trades),
-            'winning_trades': len(winning),
-            'losing_trades': len(losing),
-            'win_rate': float(win_rate),
-            'avg_win': float(avg_win),
-            'avg_loss': float(avg_loss),
-            'profit_factor': float(profit_factor),
+            **stats,
             'mdd': float(mdd),
-            'total_cost': float(total_cost),
             'initial_capital': float(self.initial_capital),
-            'final_capital': float(final_balance),
-            'trading_log': trading_log,
+            'final_capital': float(trades.column('balance_after')[-1]),
+            'trading_log': trades,
             'equity_curve': equity_curve,
             'sell_reason_stats': sell_reason_stats
         }
         
         logger.info(
             f"Strategy 2 results: {self.stock_code} | "
-            f"Return={return_rate:+.2f}% | PnL={total_profit:+,.0f} | "
-            f"Trades={len(trades)} (W:{len(winning)} L:{len(losing)}) | "
-            f"WinRate={win_rate:.1f}% | AvgWin={avg_win:,.0f} AvgLoss={avg_loss:,.0f} | "
-            f"PF={profit_factor:.2f} | MDD={mdd:.2f}% | Cost={total_cost:,.0f} | "
-            f"Capital: {self.initial_capital:,.0f} → {final_balance:,.0f} | "
+            f"Return={result['return_rate']:+.2f}% | PnL={result['total_profit']:+,.0f} | "
+            f"Trades={len(trades)} (W:{result['winning_trades']} L:{result['losing_trades']}) | "
+            f"WinRate={result['win_rate']:.1f}% | AvgWin={result['avg_win']:,.0f} AvgLoss={result['avg_loss']:,.0f} | "
+            f"PF={result['profit_factor']:.2f} | MDD={mdd:.2f}% | Cost={result['total_cost']:,.0f} | "
+            f"Capital: {self.initial_capital:,.0f} → {result['final_capital']:,.0f} | "
             f"Reasons={sell_reason_stats}"
         )
         return result
@@ -1038,23 +1228,8 @@ class BacktestEngine:
             buy_signals, sell_signals = self.generate_signals(prices, strategy)
             logger.info(f"Buy signals: {len(buy_signals)}, Sell signals: {len(sell_signals)}")
             
-            # 3. 주문 실행
-            trades_executed = 0
-            for idx, row in prices.iterrows():
-                date = row['Date'].strftime('%Y-%m-%d %H:%M:%S') if hasattr(row['Date'], 'strftime') else str(row['Date'])
-                close_price = float(row['Close'])
-                
-                if idx in buy_signals:
-                    # 현재 잔고로 구매할 수 있는 최대 수량 계산
-                    max_quantity = int(self.current_cash / close_price)
-                    if max_quantity > 0:
-                        self.buy(date, close_price, quantity=max_quantity)
-                        trades_executed += 1
-                    else:
-                        logger.warning(f"Insufficient cash to buy at {date}: available {self.current_cash}, price {close_price}")
-                elif idx in sell_signals:
-                    self.sell(date, close_price)
-                    trades_executed += 1
+            # 3. 주문 실행 (신호 행만 순서대로 처리)
+            trades_executed = self._execute_signal_events(prices, buy_signals, sell_signals)
             
             logger.info(f"Total trades executed: {trades_executed}, Trading log size: {len(self.trading_log)}")
             
@@ -1064,6 +1239,77 @@ class BacktestEngine:
             logger.error(f"Backtest error: {str(e)}")
             raise
     
+    def _execute_signal_events(self, prices: pd.DataFrame, buy_signals, sell_signals) -> int:
+        """
+        레거시 신호 체결 (이벤트 기반)
+        
+        행 단위 순회 대신 정렬된 신호 행 번호 배열에서 다음 체결 시점만 찾아 buy()/sell()을 호출한다.
+          - 신호 판정: prices.index 라벨 기준 (매수 신호가 우선, 같은 행의 매도 신호는 무시)
+          - 다음 매수: 현재 현금으로 1주 이상 살 수 있는 첫 매수 신호 행 (현금은 체결 시에만 바뀜)
+          - 다음 매도: 보유 포지션이 있을 때 첫 매도 신호 행 (FIFO 청산은 sell()에서 처리)
+        종가가 0/NaN인 매수 신호 행에 도달하면 행 단위 처리와 같은 예외를 발생시킨다.
+        
+        @param prices: 주가 데이터프레임
+        @param buy_signals: 매수 신호 (인덱스 라벨 목록)
+        @param sell_signals: 매도 신호 (인덱스 라벨 목록)
+        @return: 체결 시도 수 (매수 + 매도)
+        """
+        close = prices['Close'].to_numpy(dtype=np.float64)
+        is_buy = prices.index.isin(list(buy_signals))
+        is_sell = ~is_buy & prices.index.isin(list(sell_signals))
+        buy_rows = np.flatnonzero(is_buy)
+        sell_rows = np.flatnonzero(is_sell)
+        
+        # 수량 계산(현금 / 종가)이 불가능한 첫 매수 신호 행 → 그 이전 신호까지만 체결
+        invalid = (close[buy_rows] == 0) | np.isnan(close[buy_rows])
+        invalid_row = int(buy_rows[np.argmax(invalid)]) if invalid.any() else None
+        if invalid_row is not None:
+            buy_rows = buy_rows[buy_rows < invalid_row]
+            sell_rows = sell_rows[sell_rows < invalid_row]
+        
+        dates = prices['Date']
+        
+        def date_at(row: int) -> str:
+            value = dates.iloc[row]
+            return value.strftime('%Y-%m-%d %H:%M:%S') if hasattr(value, 'strftime') else str(value)
+        
+        buys = sells = 0
+        cursor = 0
+        while True:
+            # 다음 체결 가능한 매수 행
+            pending = buy_rows[np.searchsorted(buy_rows, cursor):]
+            affordable = np.flatnonzero(self.current_cash / close[pending] >= 1.0)
+            next_buy = int(pending[affordable[0]]) if affordable.size else None
+            
+            # 다음 매도 행 (보유 포지션이 있을 때만 의미 있음)
+            next_sell = None
+            if self.positions:
+                pos = np.searchsorted(sell_rows, cursor)
+                next_sell = int(sell_rows[pos]) if pos < len(sell_rows) else None
+            
+            if next_buy is None and next_sell is None:
+                break
+            if next_sell is None or (next_buy is not None and next_buy < next_sell):
+                close_price = float(close[next_buy])
+                self.buy(date_at(next_buy), close_price, quantity=int(self.current_cash / close_price))
+                buys += 1
+                cursor = next_buy + 1
+            else:
+                self.sell(date_at(next_sell), float(close[next_sell]))
+                sells += 1
+                cursor = next_sell + 1
+        
+        logger.info(f"Signal events executed | buys={buys} | sells={sells} | cash remaining: {self.current_cash}")
+        skipped = len(buy_rows) - buys
+        if skipped:
+            logger.warning(f"Insufficient cash for {skipped} buy signals (cash remaining: {self.current_cash})")
+        
+        if invalid_row is not None:
+            # 종가 0 → ZeroDivisionError, NaN → ValueError (행 단위 처리와 동일)
+            int(self.current_cash / float(close[invalid_row]))
+        
+        return buys + sells
+    
     def generate_signals(self, prices: pd.DataFrame, strategy: Dict) -> Tuple[List[int], List[int]]:
         """
         매매 신호 생성 (구매/판매 시점)
@@ -1075,8 +1321,6 @@ class BacktestEngine:
         
         @return: (buy_signals_list, sell_signals_list) - 인덱스 리스트
         """
-        buy_signals = []
-        sell_signals = []
         buy_time = strategy.get('buy_time', '09:30')
         sell_time = strategy.get('sell_time', '15:50')
         
@@ -1085,25 +1329,12 @@ class BacktestEngine:
         if len(prices) > 0:
             logger.info(f"Sample date: {prices.iloc[0]['Date']}, dtype: {prices['Date'].dtype}")
         
-        # 간단한 규칙: 매일 매수 시간에 사고, 매도 시간에 팜
-        for idx, row in prices.iterrows():
-            try:
-                date = row['Date']
-                # Date가 string이면 변환, datetime이면 그대로 사용
-                if isinstance(date, str):
-                    date = pd.to_datetime(date)
-                
-                time_str = date.strftime('%H:%M') if hasattr(date, 'strftime') else str(date)[11:16]
-                
-                if time_str == buy_time:
-                    buy_signals.append(idx)
-                    logger.debug(f"Buy signal at idx {idx}, time {time_str}")
-                elif time_str == sell_time:
-                    sell_signals.append(idx)
-                    logger.debug(f"Sell signal at idx {idx}, time {time_str}")
-            except Exception as e:
-                logger.debug(f"Error parsing date at idx {idx}: {str(e)}")
-                continue
+        # 간단한 규칙: 매일 매수 시간에 사고, 매도 시간에 팜 (Date 컬럼 전체를 한 번에 비교)
+        # 문자열 Date는 pd.to_datetime으로 해석, 해석할 수 없는 행은 건너뜀
+        is_buy, is_sell = time_of_day_masks(prices['Date'], [buy_time, sell_time], parse_strings=True)
+        is_sell &= ~is_buy
+        buy_signals = prices.index[is_buy].tolist()
+        sell_signals = prices.index[is_sell].tolist()
         
         # 신호가 없으면 기본값 설정 (매일 매수/매도)
         # Fallback: 매 N개 바마다 매수/매도
@@ -1145,7 +1376,8 @@ class BacktestEngine:
                 cash_remaining=self.current_cash
             )
             self.trading_log.append(trade)
-            logger.info(f"BUY: {self.stock_code} {quantity}주 @ {price} on {date}, cost: {cost}, cash remaining: {self.current_cash}")
+            logger.log(TRACE, "BUY: %s %s주 @ %s on %s, cost: %s, cash remaining: %s",
+                       self.stock_code, quantity, price, date, cost, self.current_cash)
         else:
             logger.warning(f"Insufficient cash to buy: {cost} > {self.current_cash}")
     
@@ -1157,7 +1389,7 @@ class BacktestEngine:
         @param price: 거래 가격
         """
         if not self.positions:
-            logger.debug(f"No positions to sell on {date}")
+            logger.debug("No positions to sell on %s", date)
             return
         
         position = self.positions.pop(0)  # FIFO
@@ -1178,7 +1410,8 @@ class BacktestEngine:
             cash_remaining=self.current_cash
         )
         self.trading_log.append(trade)
-        logger.info(f"SELL: {self.stock_code} {position.quantity}주 @ {price} on {date}, profit: {profit} ({profit_rate:.2f}%), cash remaining: {self.current_cash}")
+        logger.log(TRACE, "SELL: %s %s주 @ %s on %s, profit: %s (%.2f%%), cash remaining: %s",
+                   self.stock_code, position.quantity, price, date, profit, profit_rate, self.current_cash)
     
     def calculate_performance(self) -> Dict:
         """
@@ -1236,23 +1469,19 @@ class BacktestEngine:
             equity.append(trade.cash_remaining)
         return equity
     
-    def calculate_mdd(self, equity_curve: List[float]) -> float:
-        """Maximum Drawdown 계산 (%)"""
-        if not equity_curve or len(equity_curve) < 2:
+    def calculate_mdd(self, equity_curve) -> float:
+        """Maximum Drawdown 계산 (%, equity_curve: 리스트 또는 ndarray)"""
+        if equity_curve is None or len(equity_curve) < 2:
             return 0.0
         
-        peak = equity_curve[0]
-        mdd = 0.0
-        for value in equity_curve:
-            if value > peak:
-                peak = value
-            dd = (peak - value) / peak * 100 if peak > 0 else 0
-            if dd > mdd:
-                mdd = dd
-        return mdd
+        curve = np.asarray(equity_curve, dtype=np.float64)
+        peak = np.maximum.accumulate(curve)
+        safe_peak = np.where(peak > 0, peak, 1.0)
+        dd = np.where(peak > 0, (peak - curve) / safe_peak * 100, 0.0)
+        return max(float(dd.max()), 0.0)
 
     @staticmethod
-    def export_trades_csv(trading_log: List[Dict], strategy_type: str = '') -> str:
+    def export_trades_csv(trading_log, strategy_type: str = '') -> str:
         """
         매매 내역을 CSV 문자열로 변환
         
@@ -1263,24 +1492,25 @@ class BacktestEngine:
         전략 2 (Strategy2Trade) 추가 필드:
           sell_reason, highest_price, max_profit_pct
         
-        @param trading_log: asdict()된 거래 기록 리스트
+        @param trading_log: 거래 기록 (TradeLog 또는 asdict()된 거래 기록 리스트)
         @param strategy_type: 전략 유형 ('strategy1_fixed_time' 또는 'strategy2_trailing_stop')
         @return: CSV 문자열 (UTF-8 BOM 포함)
         """
         import io
         import csv
         
-        if not trading_log:
+        if trading_log is None or len(trading_log) == 0:
             return '\ufeff거래 내역이 없습니다.\n'
         
         output = io.StringIO()
         output.write('\ufeff')  # UTF-8 BOM (Excel 한글 호환)
         
         # 전략 2 여부 판단: sell_reason 필드가 있으면 전략 2
-        is_strategy2 = (
-            strategy_type == 'strategy2_trailing_stop' or
-            any('sell_reason' in t for t in trading_log)
-        )
+        if isinstance(trading_log, TradeLog):
+            has_sell_reason = 'sell_reason' in trading_log.fields
+        else:
+            has_sell_reason = any('sell_reason' in t for t in trading_log)
+        is_strategy2 = strategy_type == 'strategy2_trailing_stop' or has_sell_reason
         
         # CSV 헤더 정의
         if is_strategy2:
@@ -1299,30 +1529,46 @@ class BacktestEngine:
         writer = csv.writer(output)
         writer.writerow(headers)
         
-        for idx, trade in enumerate(trading_log, 1):
+        # 필드별 컬럼 값 (TradeLog는 컬럼을 직접 읽고, 딕셔너리 리스트는 필드별로 모음)
+        defaults = {
+            'buy_time': '', 'buy_price': '', 'sell_time': '', 'sell_price': '',
+            'buy_amount': 0, 'gross_profit': 0, 'cost': 0, 'profit': 0, 'balance_after': 0,
+            'sell_reason': '', 'highest_price': '', 'max_profit_pct': 0
+        }
+        fields = list(defaults) if is_strategy2 else list(defaults)[:9]
+        if isinstance(trading_log, TradeLog):
+            columns = [
+                trading_log.values(name) if name in trading_log.fields else [defaults[name]] * len(trading_log)
+                for name in fields
+            ]
+        else:
+            columns = [[trade.get(name, defaults[name]) for trade in trading_log] for name in fields]
+        
+        sell_reason_map = {
+            'trailing_stop': '트레일링스탑',
+            'loss_cutoff': '손절',
+            'end_of_day': '장마감매도'
+        }
+        for idx, values in enumerate(zip(*columns), 1):
+            trade = dict(zip(fields, values))
             row = [
                 idx,
-                trade.get('buy_time', ''),
-                trade.get('buy_price', ''),
-                trade.get('sell_time', ''),
-                trade.get('sell_price', ''),
-                round(trade.get('buy_amount', 0), 0),
-                round(trade.get('gross_profit', 0), 0),
-                round(trade.get('cost', 0), 0),
-                round(trade.get('profit', 0), 0),
-                round(trade.get('balance_after', 0), 0),
+                trade['buy_time'],
+                trade['buy_price'],
+                trade['sell_time'],
+                trade['sell_price'],
+                round(trade['buy_amount'], 0),
+                round(trade['gross_profit'], 0),
+                round(trade['cost'], 0),
+                round(trade['profit'], 0),
+                round(trade['balance_after'], 0),
             ]
             if is_strategy2:
-                sell_reason_map = {
-                    'trailing_stop': '트레일링스탑',
-                    'loss_cutoff': '손절',
-                    'end_of_day': '장마감매도'
-                }
-                reason = trade.get('sell_reason', '')
+                reason = trade['sell_reason']
                 row.extend([
                     sell_reason_map.get(reason, reason),
-                    trade.get('highest_price', ''),
-                    round(trade.get('max_profit_pct', 0), 2),
+                    trade['highest_price'],
+                    round(trade['max_profit_pct'], 2),
                 ])
             writer.writerow(row)
         
@@ -1368,7 +1614,7 @@ if __name__ == '__main__':
         result = engine.run_backtest(strategy, period=period)
         
         # 4. 결과를 JSON으로 출력 (stdout으로 Backend에 전달)
-        print(json.dumps(result, indent=2, default=str))
+        print(json.dumps(result, indent=2, default=json_default))
         
     except Exception as e:
         # 오류 발생 시 구조화된 오류 메시지 반환
@@ -0,0 +1,435 @@
+"""
+Benchmark - py_backtest 주요 경로 성능 측정
+역할: 실제 KRX 장중 세션과 같은 형태의 합성 2분봉 데이터로 시세 로드/전략 실행/지표 계산/캐시 경로의
+      소요 시간을 측정하고, JSON 기준선(baseline)으로 저장하거나 기준선과 비교
+
+  - 데이터: generate_krx_sessions() - 시드 고정, 종목 × 거래일 단위 벡터 생성
+            09:00~15:30 2분봉 (늦은 개장일은 10:00~16:30), 휴장일/누락 봉/장 시작 갭 포함
+  - 측정 항목 (CASES):
+      load_price_data    Node.js prices 딕셔너리 → DataFrame + 세션 레이아웃
+      execute_strategy1  전략 1 실행 (세션 레이아웃 미리 계산)
+      execute_strategy2  전략 2 실행 (세션 레이아웃 미리 계산)
+      legacy_backtest    레거시 신호 기반 백테스트 (MA20_50)
+      signal_generator   SignalGenerator 3종 (simple_time / bollinger_band / moving_average)
+      performance        PerformanceCalculator.calculate_all_metrics (전략 1 / 레거시 결과)
+      cache_put          DataCache.put_many (디스크 기록)
+      cache_get_disk     DataCache.get (새 인스턴스, 디스크 → 메모리)
+      cache_get_memory   DataCache.get (메모리 캐시)
+  - 크기: 거래일 1/60/250 × 종목 1/50/200 (기본값, --days/--stocks로 변경)
+  - 결과: 항목/크기별 최소·중앙값 시간 (repeat회 측정)
+
+사용 예:
+  python benchmark.py --days 60 --stocks 1
+  python benchmark.py --output benchmarks/baseline.json
+  python benchmark.py --cases execute_strategy1 execute_strategy2 --baseline benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from backtest_engine import BacktestEngine
+    from data_cache import DataCache
+    from performance_calculator import PerformanceCalculator
+    from signal_generator import SignalGenerator
+    from strategy_kernels import build_session_index
+except ImportError:
+    from .backtest_engine import BacktestEngine
+    from .data_cache import DataCache
+    from .performance_calculator import PerformanceCalculator
+    from .signal_generator import SignalGenerator
+    from .strategy_kernels import build_session_index
+
+logger = logging.getLogger(__name__)
+
+# 기본 측정 크기 (거래일 × 종목 수)
+DEFAULT_DAYS = [1, 60, 250]
+DEFAULT_STOCKS = [1, 50, 200]
+DEFAULT_REPEAT = 3
+DEFAULT_SEED = 0
+
+# 기준선 대비 이 비율 이상 느려지면 회귀로 표시 (0.1 = 10%)
+DEFAULT_TOLERANCE = 0.1
+
+# KRX 정규장 세션 (2분봉: 09:00 ~ 15:30, 196개)
+SESSION_OPEN_MINUTE = 9 * 60
+SESSION_CLOSE_MINUTE = 15 * 60 + 30
+BAR_MINUTES = 2
+SESSION_BARS = (SESSION_CLOSE_MINUTE - SESSION_OPEN_MINUTE) // BAR_MINUTES + 1
+KRX_TIMEZONE = 'Asia/Seoul'
+
+INITIAL_CAPITAL = 10000000
+STRATEGY1 = {'buy_time': '09:30', 'sell_time': '15:00'}
+STRATEGY2 = {'buy_time': '15:20', 'min_profit_pct': 1.0, 'profit_cutoff_pct': 80.0, 'loss_cutoff_time': '14:00'}
+LEGACY_STRATEGY = {'type': 'MA20_50'}
+SIGNAL_STRATEGIES = [
+    {'signal_type': 'simple_time', 'buy_time': '09:30', 'sell_time': '15:20'},
+    {'signal_type': 'bollinger_band', 'bb_period': 20, 'bb_std': 2},
+    {'signal_type': 'moving_average', 'ma_short': 5, 'ma_long': 20}
+]
+
+
+# ──────────────────────────────────────────────
+# 합성 KRX 세션 데이터
+# ──────────────────────────────────────────────
+
+def krx_session_grid(days: int, seed: int = DEFAULT_SEED, start: str = '2025-01-02',
+                     holiday_rate: float = 0.03, late_open_rate: float = 0.01) -> pd.DatetimeIndex:
+    """
+    거래일 × 2분봉 시각 격자 (모든 종목 공통)
+
+    @param days: 거래일 수
+    @param seed: 난수 시드
+    @param start: 첫 영업일 후보
+    @param holiday_rate: 평일 중 휴장일 비율
+    @param late_open_rate: 1시간 늦게 개장하는 날 비율 (10:00~16:30)
+    @return: Asia/Seoul DatetimeIndex (거래일 순, 일자 내 시각 순)
+    """
+    rng = np.random.default_rng(seed)
+    candidates = pd.bdate_range(start, periods=int(days * (1 + holiday_rate) * 1.2) + 10)
+    sessions = candidates[rng.random(len(candidates)) >= holiday_rate][:days]
+    late = rng.random(len(sessions)) < late_open_rate
+
+    bar_offsets = (SESSION_OPEN_MINUTE + np.arange(SESSION_BARS) * BAR_MINUTES).astype('timedelta64[m]')
+    day_offsets = np.where(late, 60, 0).astype('timedelta64[m]')
+    grid = (sessions.values[:, None] + day_offsets[:, None] + bar_offsets[None, :]).ravel()
+    return pd.DatetimeIndex(grid).tz_localize(KRX_TIMEZONE)
+
+
+def generate_krx_sessions(stocks: int, days: int, seed: int = DEFAULT_SEED,
+                          gap_rate: float = 0.02, holiday_rate: float = 0.03,
+                          late_open_rate: float = 0.01) -> Dict[str, pd.DataFrame]:
+    """
+    종목별 합성 2분봉 데이터 (Ticker.history() 정규화 결과와 같은 Date/OHLCV 형식)
+
+    - 종목마다 시작가/변동성이 다른 로그 정규 가격 경로, 장 시작 봉에 전일 대비 갭
+    - gap_rate 비율의 봉은 누락 (거래 없는 봉), 같은 시드면 항상 같은 데이터
+
+    @param stocks: 종목 수
+    @param days: 거래일 수
+    @param seed: 난수 시드
+    @param gap_rate: 누락 봉 비율
+    @param holiday_rate: 평일 휴장일 비율
+    @param late_open_rate: 늦은 개장일 비율
+    @return: { 종목 코드: DataFrame }
+    """
+    grid = krx_session_grid(days, seed, holiday_rate=holiday_rate, late_open_rate=late_open_rate)
+    n = len(grid)
+    day_start = np.zeros(n, dtype=bool)
+    day_start[::SESSION_BARS] = True
+
+    frames = {}
+    for i in range(stocks):
+        rng = np.random.default_rng([seed, i])
+        base = float(rng.uniform(5000, 300000))
+        returns = rng.normal(0, rng.uniform(0.001, 0.003), n)
+        returns[day_start] += rng.normal(0, 0.01, int(day_start.sum()))
+        returns[0] = 0.0
+        close = np.round(base * np.exp(np.cumsum(returns)))
+        open_ = np.empty(n)
+        open_[0] = close[0]
+        open_[1:] = close[:-1]
+        spread = np.abs(rng.normal(0, 0.001, (2, n)))
+        high = np.round(np.maximum(open_, close) * (1 + spread[0]))
+        low = np.round(np.minimum(open_, close) * (1 - spread[1]))
+        volume = rng.lognormal(7, 1, n).astype(np.int64)
+
+        keep = rng.random(n) >= gap_rate
+        frames[f"{900000 + i:06d}"] = pd.DataFrame({
+            'Date': grid[keep],
+            'Open': open_[keep],
+            'High': high[keep],
+            'Low': low[keep],
+            'Close': close[keep],
+            'Volume': volume[keep]
+        })
+    return frames
+
+
+# ──────────────────────────────────────────────
+# 측정 항목 (준비 단계는 측정하지 않고, 반환된 함수만 측정)
+# ──────────────────────────────────────────────
+
+def _engine(code: str, df: pd.DataFrame, layout=None) -> BacktestEngine:
+    engine = BacktestEngine(code, INITIAL_CAPITAL)
+    engine.use_price_data(df, layout)
+    return engine
+
+
+def _case_load_price_data(frames: Dict[str, pd.DataFrame], workdir: str) -> Callable[[], None]:
+    payloads = {code: BacktestEngine.to_prices_dict(df) for code, df in frames.items()}
+
+    def run():
+        for code, prices in payloads.items():
+            BacktestEngine(code, INITIAL_CAPITAL).load_price_data(prices_dict=prices, with_layout=True)
+    return run
+
+
+def _case_execute_strategy1(frames: Dict[str, pd.DataFrame], workdir: str) -> Callable[[], None]:
+    layouts = {code: build_session_index(df) for code, df in frames.items()}
+
+    def run():
+        for code, df in frames.items():
+            _engine(code, df, layouts[code]).execute_strategy1(
+                STRATEGY1['buy_time'], STRATEGY1['sell_time'], ohlc_data=df, seed_money=INITIAL_CAPITAL
+            )
+    return run
+
+
+def _case_execute_strategy2(frames: Dict[str, pd.DataFrame], workdir: str) -> Callable[[], None]:
+    layouts = {code: build_session_index(df) for code, df in frames.items()}
+
+    def run():
+        for code, df in frames.items():
+            _engine(code, df, layouts[code]).execute_strategy2(
+                ohlc_data=df, seed_money=INITIAL_CAPITAL, **STRATEGY2
+            )
+    return run
+
+
+def _case_legacy_backtest(frames: Dict[str, pd.DataFrame], workdir: str) -> Callable[[], None]:
+    def run():
+        for code, df in frames.items():
+            _engine(code, df).run_backtest(dict(LEGACY_STRATEGY))
+    return run
+
+
+def _case_signal_generator(frames: Dict[str, pd.DataFrame], workdir: str) -> Callable[[], None]:
+    generator = SignalGenerator()
+
+    def run():
+        for df in frames.values():
+            for strategy in SIGNAL_STRATEGIES:
+                generator.generate_signals(df, strategy)
+    return run
+
+
+def _case_performance(frames: Dict[str, pd.DataFrame], workdir: str) -> Callable[[], None]:
+    inputs = []
+    for code, df in frames.items():
+        result = _engine(code, df).run_backtest(dict(STRATEGY1, type='daily_trading'))
+        inputs.append((result['equity_curve'], result['trading_log']))
+        result = _engine(code, df).run_backtest(dict(LEGACY_STRATEGY))
+        inputs.append((result['equity_curve'], result['trading_log']))
+    calculator = PerformanceCalculator()
+
+    def run():
+        for equity_curve, trading_log in inputs:
+            calculator.calculate_all_metrics(equity_curve, trading_log, INITIAL_CAPITAL)
+    return run
+
+
+def _cache_dir(workdir: str, name: str) -> str:
+    path = os.path.join(workdir, name)
+    shutil.rmtree(path, ignore_errors=True)
+    return os.path.join(path, 'price_cache.db')
+
+
+def _case_cache_put(frames: Dict[str, pd.DataFrame], workdir: str) -> Callable[[], None]:
+    def run():
+        cache = DataCache(_cache_dir(workdir, 'cache_put'))
+        cache.put_many(frames)
+        cache.close()
+    return run
+
+
+def _case_cache_get_disk(frames: Dict[str, pd.DataFrame], workdir: str) -> Callable[[], None]:
+    db_path = _cache_dir(workdir, 'cache_get')
+    cache = DataCache(db_path)
+    cache.put_many(frames)
+    cache.close()
+
+    def run():
+        reader = DataCache(db_path)
+        for code in frames:
+            reader.get(code)
+        reader.close()
+    return run
+
+
+def _case_cache_get_memory(frames: Dict[str, pd.DataFrame], workdir: str) -> Callable[[], None]:
+    cache = DataCache(_cache_dir(workdir, 'cache_memory'))
+    cache.put_many(frames)
+    for code in frames:
+        cache.get(code)
+
+    def run():
+        for code in frames:
+            cache.get(code)
+    return run
+
+
+CASES: Dict[str, Callable[[Dict[str, pd.DataFrame], str], Callable[[], None]]] = {
+    'load_price_data': _case_load_price_data,
+    'execute_strategy1': _case_execute_strategy1,
+    'execute_strategy2': _case_execute_strategy2,
+    'legacy_backtest': _case_legacy_backtest,
+    'signal_generator': _case_signal_generator,
+    'performance': _case_performance,
+    'cache_put': _case_cache_put,
+    'cache_get_disk': _case_cache_get_disk,
+    'cache_get_memory': _case_cache_get_memory
+}
+
+
+# ──────────────────────────────────────────────
+# 실행 / 기준선 비교
+# ──────────────────────────────────────────────
+
+def run_benchmarks(days_list: List[int] = None, stocks_list: List[int] = None,
+                   cases: Optional[List[str]] = None, repeat: int = DEFAULT_REPEAT,
+                   seed: int = DEFAULT_SEED) -> Dict[str, Any]:
+    """
+    측정 실행
+
+    @param days_list: 거래일 수 목록
+    @param stocks_list: 종목 수 목록
+    @param cases: 측정 항목 (기본값: 전체 CASES)
+    @param repeat: 항목별 반복 측정 횟수
+    @param seed: 데이터 생성 시드
+    @return: {"created_at", "environment", "seed", "repeat", "results": [{case, days, stocks, bars, best_sec, median_sec, ...}]}
+    """
+    days_list = days_list or DEFAULT_DAYS
+    stocks_list = stocks_list or DEFAULT_STOCKS
+    cases = cases or list(CASES)
+    unknown = [name for name in cases if name not in CASES]
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases: {unknown} (expected {list(CASES)})")
+
+    results = []
+    workdir = tempfile.mkdtemp(prefix='py_backtest_bench_')
+    try:
+        for days in days_list:
+            for stocks in stocks_list:
+                frames = generate_krx_sessions(stocks, days, seed)
+                bars = int(sum(len(df) for df in frames.values()))
+                for name in cases:
+                    run = CASES[name](frames, workdir)
+                    samples = []
+                    for _ in range(repeat):
+                        started = time.perf_counter()
+                        run()
+                        samples.append(time.perf_counter() - started)
+                    best = min(samples)
+                    results.append({
+                        'case': name,
+                        'days': days,
+                        'stocks': stocks,
+                        'bars': bars,
+                        'best_sec': round(best, 6),
+                        'median_sec': round(statistics.median(samples), 6),
+                        'per_stock_ms': round(best / stocks * 1000, 3)
+                    })
+                    print(
+                        f"{name:<18} days={days:<4} stocks={stocks:<4} bars={bars:<9} "
+                        f"best={best:.4f}s median={statistics.median(samples):.4f}s",
+                        file=sys.stderr
+                    )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count()
+        },
+        'seed': seed,
+        'repeat': repeat,
+        'results': results
+    }
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any],
+                    tolerance: float = DEFAULT_TOLERANCE) -> List[Dict[str, Any]]:
+    """
+    기준선 대비 비교 (best_sec 기준, 같은 항목/거래일/종목 수끼리)
+
+    @param current: run_benchmarks() 결과
+    @param baseline: 저장된 기준선
+    @param tolerance: 회귀 판정 비율
+    @return: [{case, days, stocks, baseline_sec, current_sec, ratio, status}] (status: faster | same | slower)
+    """
+    previous = {(r['case'], r['days'], r['stocks']): r for r in baseline.get('results', [])}
+    rows = []
+    for result in current['results']:
+        before = previous.get((result['case'], result['days'], result['stocks']))
+        if before is None:
+            continue
+        ratio = result['best_sec'] / before['best_sec'] if before['best_sec'] > 0 else float('inf')
+        if ratio > 1 + tolerance:
+            status = 'slower'
+        elif ratio < 1 - tolerance:
+            status = 'faster'
+        else:
+            status = 'same'
+        rows.append({
+            'case': result['case'],
+            'days': result['days'],
+            'stocks': result['stocks'],
+            'baseline_sec': before['best_sec'],
+            'current_sec': result['best_sec'],
+            'ratio': round(ratio, 3),
+            'status': status
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark py_backtest hot paths on synthetic KRX sessions')
+    parser.add_argument('--days', type=int, nargs='+', default=DEFAULT_DAYS, help='거래일 수 (예: 1 60 250)')
+    parser.add_argument('--stocks', type=int, nargs='+', default=DEFAULT_STOCKS, help='종목 수 (예: 1 50 200)')
+    parser.add_argument('--cases', nargs='+', choices=list(CASES), help='측정 항목 (기본값: 전체)')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--output', help='결과 JSON 저장 경로 (기준선으로 사용)')
+    parser.add_argument('--baseline', help='비교할 기준선 JSON')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help='회귀 판정 비율 (기본값: 0.1)')
+    parser.add_argument('--fail-on-regression', action='store_true', help='기준선보다 느린 항목이 있으면 종료 코드 1')
+    parser.add_argument('--log-level', default='WARNING', help='측정 중 로그 레벨 (기본값: WARNING)')
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=getattr(logging, args.log_level.upper(), logging.WARNING),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        force=True
+    )
+
+    report = run_benchmarks(args.days, args.stocks, args.cases, repeat=args.repeat, seed=args.seed)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Saved {len(report['results'])} results to {args.output}", file=sys.stderr)
+
+    if not args.baseline:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    rows = compare_results(report, baseline, args.tolerance)
+    print(json.dumps({'baseline': args.baseline, 'comparison': rows}, ensure_ascii=False, indent=2))
+    slower = [row for row in rows if row['status'] == 'slower']
+    return 1 if slower and args.fail_on_regression else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,28 +3,220 @@ DataCache - 주가 데이터 캐시 모듈 (SRS NFR-301 준수)
 
 역할: Yahoo Finance 데이터를 일일 1회만 수집하고, 이후 캐시에서 재사용
 캐시 전략:
-  1단계: 메모리 캐시 (가장 빠름)
-  2단계: 디스크 캐시 - SQLite (서버 재시작 시에도 당일 데이터 유지)
+  1단계: 메모리 캐시 (가장 빠름, 바이트 예산 LRU - 예산 초과/날짜 지난 항목은 제거)
+  2단계: 디스크 캐시 - 컬럼형 바이너리 파일 + SQLite 인덱스 (서버 재시작 시에도 당일 데이터 유지)
+         SQLite는 스레드별 상시 커넥션 + WAL 모드 (여러 스레드/프로세스 동시 읽기, 쓰기는 busy_timeout 대기)
   3단계: Yahoo Finance API 호출 (캐시 미스 시에만)
 
+디스크 저장 형식:
+  - 'feather': pyarrow 설치 시 Feather(Arrow IPC) 파일
+  - 'raw'    : 컬럼별 리틀엔디언 배열을 이어 붙인 파일 (Date는 int64 epoch ns, UTC)
+  SQLite(price_store)에는 파일 경로/행 수/컬럼 dtype/타임존 등 메타데이터만 저장한다.
+
+공유 메모리:
+  디스크 파일은 (stock_code, fetch_date)별로 한 번만 기록되고, 읽을 때는 memory-map으로 열어
+  DataFrame 컬럼이 파일 매핑 위의 zero-copy NumPy 뷰가 된다. 여러 Worker 프로세스가 같은 종목을
+  조회해도 OS 페이지 캐시 1벌만 공유하므로 프로세스 수를 늘려도 RSS가 배로 늘지 않는다.
+
+시장 인덱스: 종목 코드 → Yahoo 시장 접미사(KS/KQ) 영구 매핑 (날짜 만료 없음)
+  종목 목록 파일(market 필드)로 일괄 갱신하고, 목록에 없는 종목은 prefetch 일괄 조회 결과를 기록
+  (요청별 단건 판별 결과는 ticker 캐시에만 저장)
+
+세션 레이아웃:
+  메모리 캐시 항목마다 일자/분 정수 인덱스(SessionIndex: 거래일 서수, 분, CSR 일자 경계, 검색 키)를
+  처음 요청될 때 1회 계산해 시세와 함께 보관한다 (get_layout). 같은 종목의 이후 요청은
+  Date 변환/일자 경계 계산 없이 정수 배열을 그대로 사용한다.
+
+시세 해시:
+  메모리 캐시 항목의 내용 해시(frame_fingerprint)도 처음 요청될 때 1회 계산해 보관한다 (get_fingerprint).
+  백테스팅 결과 캐시(result_cache) 키에 사용하며, 시세가 갱신되면 항목이 교체되어 해시도 바뀐다.
+
+동시 미스 병합 (single-flight):
+  같은 키(종목 시세, ticker 판별)의 캐시 미스가 동시에 발생하면 첫 요청만 조회하고
+  나머지는 같은 Future를 기다려 결과를 공유한다 (프로세스 내 스레드 간).
+
 캐시 갱신 조건: fetchDate가 당일(00:00 이후)이면 캐시 사용, 아니면 재수집
+  - 증분 갱신: 이전 날짜의 캐시가 있으면 마지막 봉 이후 데이터만 수집해 append (append/get_latest)
+    종목별 보유 구간(첫 봉 ~ 마지막 봉)은 price_coverage 테이블에 기록
 """
 
 import os
 import json
+import hashlib
 import sqlite3
 import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
 from datetime import datetime, date
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple, Callable
 
+import numpy as np
 import pandas as pd
 
+try:
+    from strategy_kernels import SessionIndex, build_session_index, session_nbytes
+except ImportError:
+    from .strategy_kernels import SessionIndex, build_session_index, session_nbytes
+
+try:
+    import pyarrow  # noqa: F401
+    import pyarrow.feather as feather
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+    feather = None
+
 logger = logging.getLogger(__name__)
 
-# 디스크 캐시 DB 경로 (프로젝트 루트/data/cache.db)
-_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+# 디스크 캐시 DB 경로 (프로젝트 루트/data/cache.db, PRICE_CACHE_DIR로 디렉터리 변경 가능)
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_CACHE_DIR = os.environ.get('PRICE_CACHE_DIR') or os.path.join(_PROJECT_ROOT, 'data')
 _CACHE_DB_PATH = os.path.join(_CACHE_DIR, 'price_cache.db')
 
+# 시장 인덱스 초기 데이터 (종목 목록 JSON: [{"code", "market", ...}])
+_MARKET_LISTING_PATH = os.environ.get('MARKET_LISTING_PATH') or os.path.join(
+    _PROJECT_ROOT, 'test-data', 'mock-stocks.json'
+)
+
+# 종목 목록의 시장 표기 → Yahoo Finance 접미사
+MARKET_SUFFIXES = {'KOSPI': 'KS', 'KOSDAQ': 'KQ', 'KS': 'KS', 'KQ': 'KQ'}
+
+# 디스크 저장 형식 ('feather' | 'raw', 기본값: pyarrow 설치 시 feather)
+STORAGE_FORMATS = ('feather', 'raw')
+DEFAULT_STORAGE_FORMAT = os.environ.get('PRICE_CACHE_FORMAT') or ('feather' if HAS_PYARROW else 'raw')
+
+# SQLite 잠금 대기 시간 (초) / 다른 프로세스 기록분 반영을 위한 디스크 통계 재조회 주기 (초)
+SQLITE_BUSY_TIMEOUT_SEC = 30.0
+DISK_STATS_REFRESH_SEC = 60.0
+
+# 바이너리 저장소 메타데이터 / 보유 구간 등록 SQL
+_STORE_UPSERT_SQL = """INSERT OR REPLACE INTO price_store
+    (stock_code, fetch_date, format, file_name, num_rows, columns, tz)
+    VALUES (?, ?, ?, ?, ?, ?, ?)"""
+_COVERAGE_UPSERT_SQL = """INSERT OR REPLACE INTO price_coverage
+    (stock_code, fetch_date, first_bar, last_bar, num_rows, mode, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, datetime('now'))"""
+
+# 메모리 캐시 바이트 예산 (기본값: 512MB)
+DEFAULT_MEMORY_BUDGET_MB = float(os.environ.get('PRICE_CACHE_MEMORY_MB', '512'))
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """
+    OHLCV DataFrame 내용 해시 (Date 타임존 + Date(epoch ns) + OHLCV float64 배열)
+
+    @param df: Date/OHLCV DataFrame
+    @return: hex 문자열 (32자)
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    dates = pd.DatetimeIndex(df['Date'])
+    digest.update(str(dates.tz).encode('utf-8'))
+    digest.update(np.ascontiguousarray(dates.as_unit('ns').asi8))
+    for column in ('Open', 'High', 'Low', 'Close', 'Volume'):
+        digest.update(np.ascontiguousarray(df[column].to_numpy(dtype=np.float64)))
+    return digest.hexdigest()
+
+
+class SingleFlight:
+    """
+    키별 동시 호출 병합
+
+    같은 키로 진행 중인 호출이 있으면 새로 실행하지 않고 그 결과(또는 예외)를 함께 받는다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self.shared = 0  # 진행 중인 호출의 결과를 공유받은 횟수
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        @param key: 병합 키
+        @param fn: 실제 호출 (키별로 동시에 1개만 실행)
+        @return: fn 결과
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+            else:
+                self.shared += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+
+class SQLiteConnections:
+    """
+    스레드별 상시 SQLite 커넥션 (WAL 모드, DataCache / ResultCache 공통)
+
+    스레드마다 커넥션 1개를 만들어 재사용하고, 프로세스가 바뀌면(fork) 새로 연결한다.
+    """
+
+    def __init__(self, db_path: str, cached_statements: int = 128):
+        """
+        @param db_path: SQLite DB 경로
+        @param cached_statements: 커넥션별 준비된 statement 캐시 크기 (반복 쿼리 재사용)
+        """
+        self.db_path = db_path
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> sqlite3.Connection:
+        """현재 스레드의 상시 커넥션 반환 (없으면 생성)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        # 커넥션은 만든 스레드에서만 사용하지만, close()는 다른 스레드에서 호출되므로 스레드 검사 해제
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=SQLITE_BUSY_TIMEOUT_SEC,
+            check_same_thread=False,
+            cached_statements=self.cached_statements
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    @staticmethod
+    def release(conn: sqlite3.Connection):
+        """커넥션 반환 (닫지 않고, 예외 등으로 남은 트랜잭션만 정리)"""
+        if conn.in_transaction:
+            conn.rollback()
+
+    def close(self):
+        """모든 스레드의 커넥션 종료"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to close SQLite connection ({self.db_path}): {e}")
+        self._local = threading.local()
+
 
 class DataCache:
     """
@@ -34,19 +226,66 @@ class DataCache:
       메모리 캐시 확인 → 디스크 캐시 확인 → Yahoo Finance API 호출
     """
 
-    def __init__(self, cache_db_path: Optional[str] = None):
+    def __init__(self, cache_db_path: Optional[str] = None, storage_format: Optional[str] = None,
+                 memory_budget_mb: Optional[float] = None, market_listing_path: Optional[str] = None):
         """
         @param cache_db_path: 디스크 캐시 SQLite DB 경로 (기본값: data/price_cache.db)
+        @param storage_format: 디스크 저장 형식 'feather' | 'raw' (기본값: PRICE_CACHE_FORMAT 또는 자동)
+        @param memory_budget_mb: 메모리 캐시 바이트 예산 MB (기본값: PRICE_CACHE_MEMORY_MB 또는 512)
+        @param market_listing_path: 시장 인덱스 초기 데이터 파일 (기본값: MARKET_LISTING_PATH 또는 test-data/mock-stocks.json)
         """
         self.cache_db_path = cache_db_path or _CACHE_DB_PATH
+        self.market_listing_path = market_listing_path or _MARKET_LISTING_PATH
+        self.store_dir = os.path.join(os.path.dirname(self.cache_db_path), 'price_store')
+
+        storage_format = storage_format or DEFAULT_STORAGE_FORMAT
+        if storage_format not in STORAGE_FORMATS:
+            raise ValueError(f"Unknown storage format: {storage_format} (expected one of {STORAGE_FORMATS})")
+        if storage_format == 'feather' and not HAS_PYARROW:
+            logger.warning("pyarrow is not installed, falling back to raw storage format")
+            storage_format = 'raw'
+        self.storage_format = storage_format
+
+        # 1계층: 메모리 캐시 { stock_code: { fetchDate, data(DataFrame), bytes } } (LRU 순서)
+        self._memory_cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._memory_lock = threading.RLock()
+        if memory_budget_mb is None:
+            memory_budget_mb = DEFAULT_MEMORY_BUDGET_MB
+        self.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+        self._memory_bytes = 0
+
+        # 메모리 캐시 카운터
+        self._counters = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'stale_evictions': 0
+        }
 
-        # 1계층: 메모리 캐시 { stock_code: { fetchDate, data(DataFrame) } }
-        self._memory_cache: Dict[str, Dict[str, Any]] = {}
+        # 디스크 캐시 SQLite 커넥션 (스레드별 1개, 프로세스가 바뀌면 재연결)
+        self._db = SQLiteConnections(self.cache_db_path)
+
+        # 당일 디스크 캐시 종목 (get_stats가 요청마다 COUNT(*) 하지 않도록 메모리에서 유지)
+        self._disk_today: set = set()
+        self._disk_today_date: Optional[str] = None
+        self._disk_today_loaded_at = 0.0
+
+        # 캐시 미스 동시 조회 병합
+        self._flights = SingleFlight()
+
+        # 시장 인덱스 { stock_code: 'KS' | 'KQ' } (최초 조회 시 DB + 종목 목록에서 로드)
+        self._market_index: Optional[Dict[str, str]] = None
+        self._market_lock = threading.Lock()
 
         # 디스크 캐시 DB 초기화
         self._init_disk_cache()
 
-        logger.info(f"DataCache initialized (disk: {self.cache_db_path})")
+        logger.info(f"DataCache initialized (disk: {self.cache_db_path}, format: {self.storage_format})")
+
+    def close(self):
+        """모든 스레드의 SQLite 커넥션 종료"""
+        self._db.close()
 
     # ──────────────────────────────────────────────
     # 디스크 캐시 DB 초기화
@@ -55,9 +294,37 @@ class DataCache:
     def _init_disk_cache(self):
         """디스크 캐시용 SQLite 테이블 생성"""
         os.makedirs(os.path.dirname(self.cache_db_path), exist_ok=True)
+        os.makedirs(self.store_dir, exist_ok=True)
 
-        conn = sqlite3.connect(self.cache_db_path)
+        conn = self._db.acquire()
         try:
+            # 바이너리 파일 인덱스 (데이터 본문은 store_dir의 파일에 저장)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS price_store (
+                    stock_code  TEXT    NOT NULL,
+                    fetch_date  TEXT    NOT NULL,   -- 'YYYY-MM-DD'
+                    format      TEXT    NOT NULL,   -- 'feather' | 'raw'
+                    file_name   TEXT    NOT NULL,   -- store_dir 기준 파일명
+                    num_rows    INTEGER NOT NULL,
+                    columns     TEXT    NOT NULL,   -- [[컬럼명, dtype], ...] JSON
+                    tz          TEXT,               -- Date 타임존 (naive이면 NULL)
+                    created_at  TEXT    DEFAULT (datetime('now')),
+                    PRIMARY KEY (stock_code, fetch_date)
+                )
+            """)
+            # 종목별 보유 구간 (증분 갱신 기준점)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS price_coverage (
+                    stock_code  TEXT    PRIMARY KEY,
+                    fetch_date  TEXT    NOT NULL,   -- 마지막 갱신일 'YYYY-MM-DD'
+                    first_bar   TEXT    NOT NULL,   -- 첫 봉 시각 (ISO 8601)
+                    last_bar    TEXT    NOT NULL,   -- 마지막 봉 시각 (ISO 8601)
+                    num_rows    INTEGER NOT NULL,
+                    mode        TEXT    NOT NULL,   -- 'full' | 'incremental'
+                    updated_at  TEXT    DEFAULT (datetime('now'))
+                )
+            """)
+            # 구버전 JSON 캐시 (읽기 호환용, 새 데이터는 저장하지 않음)
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS price_cache (
                     stock_code  TEXT    NOT NULL,
@@ -67,6 +334,14 @@ class DataCache:
                     PRIMARY KEY (stock_code, fetch_date)
                 )
             """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS market_index (
+                    stock_code  TEXT    PRIMARY KEY,
+                    market      TEXT    NOT NULL,   -- 'KS' | 'KQ'
+                    source      TEXT    NOT NULL,   -- 'listing' | 'download'
+                    updated_at  TEXT    DEFAULT (datetime('now'))
+                )
+            """)
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS ticker_cache (
                     stock_code  TEXT    PRIMARY KEY,
@@ -78,7 +353,7 @@ class DataCache:
             conn.commit()
             logger.info("Disk cache DB initialized")
         finally:
-            conn.close()
+            self._db.release(conn)
 
     # ──────────────────────────────────────────────
     # 공개 API
@@ -90,29 +365,130 @@ class DataCache:
 
         @param stock_code: 종목 코드 (예: "005930")
         @return: OHLCV DataFrame 또는 None (캐시 미스)
+                 컬럼은 디스크 파일의 memory-map 뷰 (읽기 전용, 값을 수정하려면 copy() 후 사용)
+        """
+        return self.lookup(stock_code)[0]
+
+    def lookup(self, stock_code: str) -> Tuple[Optional[pd.DataFrame], str]:
+        """
+        get()과 같은 조회 + 적중 계층
+
+        @param stock_code: 종목 코드
+        @return: (OHLCV DataFrame 또는 None, 'memory' / 'disk' / 'miss')
         """
         today = self._today_str()
 
         # 1단계: 메모리 캐시
-        mem = self._memory_cache.get(stock_code)
-        if mem and mem.get('fetchDate') == today:
+        mem = self._memory_get(stock_code, today)
+        if mem is not None:
             logger.debug(f"[Cache HIT - memory] {stock_code}")
-            return mem['data']
+            self._count('memory_hits')
+            return mem, 'memory'
 
         # 2단계: 디스크 캐시
         disk_data = self._load_from_disk(stock_code, today)
         if disk_data is not None:
             # 메모리 캐시 복원
-            self._memory_cache[stock_code] = {
-                'fetchDate': today,
-                'data': disk_data
-            }
+            self._memory_put(stock_code, today, disk_data)
             logger.info(f"[Cache HIT - disk] {stock_code}")
-            return disk_data
+            self._count('disk_hits')
+            return disk_data, 'disk'
 
         # 캐시 미스
         logger.info(f"[Cache MISS] {stock_code}")
-        return None
+        self._count('misses')
+        return None, 'miss'
+
+    def peek(self, stock_code: str) -> Optional[pd.DataFrame]:
+        """
+        당일 주가 데이터 조회 (적중/미스 카운터와 LRU 순서를 바꾸지 않음, 요청 기록/진단용)
+
+        @param stock_code: 종목 코드
+        @return: OHLCV DataFrame 또는 None
+        """
+        today = self._today_str()
+        with self._memory_lock:
+            mem = self._memory_cache.get(stock_code)
+            if mem is not None and mem['fetchDate'] == today:
+                return mem['data']
+        return self._load_from_disk(stock_code, today)
+
+    def load_once(self, stock_code: str, loader: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """
+        캐시 미스 시 조회 (같은 종목의 동시 미스는 loader 1회 실행 후 결과 공유)
+
+        @param stock_code: 종목 코드
+        @param loader: 시세 조회 + 캐시 저장 함수 (예: Yahoo Finance 조회 후 put)
+        @return: OHLCV DataFrame
+        """
+        def load():
+            # 직전 조회가 막 끝나 캐시에 채워졌으면 다시 조회하지 않음
+            mem = self._memory_get(stock_code, self._today_str())
+            if mem is not None:
+                return mem
+            return loader()
+
+        return self._flights.do(f"price:{stock_code}", load)
+
+    def get_layout(self, stock_code: str, df: pd.DataFrame) -> Optional[SessionIndex]:
+        """
+        메모리 캐시 시세의 세션 레이아웃 조회 (없으면 1회 계산 후 항목에 보관)
+
+        @param stock_code: 종목 코드
+        @param df: get/load_once가 반환한 DataFrame (메모리 캐시 항목과 같은 객체일 때만 보관)
+        @return: SessionIndex 또는 None (메모리 캐시에 해당 DataFrame이 없음)
+        """
+        with self._memory_lock:
+            mem = self._memory_cache.get(stock_code)
+            if mem is None or mem['data'] is not df:
+                return None
+            if mem.get('layout') is not None:
+                return mem['layout']
+
+        layout = build_session_index(df)
+        nbytes = session_nbytes(layout)
+        with self._memory_lock:
+            mem = self._memory_cache.get(stock_code)
+            # 계산 중 다른 스레드가 먼저 보관했거나 항목이 교체/제거된 경우
+            if mem is None or mem['data'] is not df:
+                return layout
+            if mem.get('layout') is not None:
+                return mem['layout']
+            mem['layout'] = layout
+            mem['bytes'] += nbytes
+            self._memory_bytes += nbytes
+            self._evict_over_budget()
+        return layout
+
+    def get_fingerprint(self, stock_code: str, df: pd.DataFrame) -> str:
+        """
+        시세 내용 해시 (메모리 캐시 항목이면 1회 계산 후 항목에 보관)
+
+        @param stock_code: 종목 코드
+        @param df: get/load_once가 반환한 DataFrame (다른 DataFrame이면 매번 계산)
+        @return: frame_fingerprint(df)
+        """
+        with self._memory_lock:
+            mem = self._memory_cache.get(stock_code)
+            if mem is not None and mem['data'] is df and mem.get('fingerprint') is not None:
+                return mem['fingerprint']
+
+        fingerprint = frame_fingerprint(df)
+        with self._memory_lock:
+            mem = self._memory_cache.get(stock_code)
+            if mem is not None and mem['data'] is df:
+                mem['fingerprint'] = fingerprint
+        return fingerprint
+
+    def single_flight(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        키별 동시 호출 병합 (ticker 판별 등)
+
+        @param key: 병합 키 (예: "ticker:005930")
+        @param fn: 실제 호출
+        @return: fn 결과 (진행 중인 호출이 있으면 그 결과)
+        """
+        return self._flights.do(key, fn)
 
     def put(self, stock_code: str, df: pd.DataFrame):
         """
@@ -123,58 +499,315 @@ class DataCache:
         """
         today = self._today_str()
 
-        # 메모리 캐시 저장
-        self._memory_cache[stock_code] = {
-            'fetchDate': today,
-            'data': df
+        self._store(stock_code, today, df, mode='full')
+
+        logger.info(f"[Cache PUT] {stock_code} ({len(df)} records, date={today})")
+
+    def put_many(self, frames: Dict[str, pd.DataFrame]) -> List[str]:
+        """
+        여러 종목 일괄 저장 (장 시작 전 prefetch용)
+
+        바이너리 파일을 모두 기록한 뒤 메타데이터/보유 구간은 하나의 트랜잭션으로 등록한다.
+
+        @param frames: { stock_code: OHLCV DataFrame }
+        @return: 저장된 종목 코드 목록
+        """
+        today = self._today_str()
+        store_rows = []
+        coverage_rows = []
+        for stock_code, df in frames.items():
+            try:
+                file_name, columns, tz = self._write_columns(stock_code, today, df)
+            except Exception as e:
+                logger.error(f"Failed to save disk cache for {stock_code}: {e}")
+                continue
+            store_rows.append((stock_code, today, self.storage_format, file_name, len(df),
+                               json.dumps(columns), tz))
+            if len(df) > 0:
+                coverage_rows.append(self._coverage_row(stock_code, today, df, 'full'))
+
+        saved = [row[0] for row in store_rows]
+        conn = self._db.acquire()
+        try:
+            conn.executemany(_STORE_UPSERT_SQL, store_rows)
+            conn.executemany(
+                "DELETE FROM price_cache WHERE stock_code = ? AND fetch_date = ?",
+                [(stock_code, today) for stock_code in saved]
+            )
+            conn.executemany(_COVERAGE_UPSERT_SQL, coverage_rows)
+            conn.commit()
+        finally:
+            self._db.release(conn)
+        if today == self._disk_today_date:
+            self._disk_today.update(saved)
+
+        # 메모리 캐시는 memory-map 뷰로 채움 (예산 초과분은 LRU로 제거됨)
+        for stock_code in saved:
+            mapped = self._load_from_disk(stock_code, today)
+            self._memory_put(stock_code, today, mapped if mapped is not None else frames[stock_code])
+
+        logger.info(f"[Cache PUT MANY] {len(saved)}/{len(frames)} stocks (date={today})")
+        return saved
+
+    def get_latest(self, stock_code: str) -> Optional[Tuple[pd.DataFrame, str]]:
+        """
+        날짜와 무관하게 가장 최근 캐시 조회 (증분 갱신의 기준 데이터)
+
+        @param stock_code: 종목 코드
+        @return: (OHLCV DataFrame, fetchDate) 또는 None
+        """
+        with self._memory_lock:
+            mem = self._memory_cache.get(stock_code)
+            if mem:
+                return mem['data'], mem['fetchDate']
+
+        conn = self._db.acquire()
+        try:
+            row = conn.execute(
+                """SELECT fetch_date FROM price_store WHERE stock_code = ?
+                   ORDER BY fetch_date DESC LIMIT 1""",
+                (stock_code,)
+            ).fetchone()
+        finally:
+            self._db.release(conn)
+
+        if not row:
+            return None
+        df = self._load_from_disk(stock_code, row[0])
+        if df is None:
+            return None
+        return df, row[0]
+
+    def append(self, stock_code: str, new_df: pd.DataFrame,
+               period: Optional[int] = None) -> Optional[pd.DataFrame]:
+        """
+        증분 갱신: 가장 최근 캐시에 새 봉을 이어 붙여 당일 캐시로 저장 (메모리 + 디스크)
+
+        - 겹치는 시각의 봉은 새 데이터로 교체 (이전 수집 시 미완성이던 마지막 봉 보정)
+        - period가 주어지면 마지막 봉 기준 period일 이전 봉은 제거 (전체 수집과 같은 구간 유지)
+        - new_df가 비어 있으면 (장 휴일 등) 기존 데이터를 당일 캐시로 갱신만 함
+
+        @param stock_code: 종목 코드
+        @param new_df: 마지막 캐시 봉 이후(또는 그 날짜부터)의 OHLCV DataFrame
+        @param period: 보관 기간 (일)
+        @return: 병합된 DataFrame 또는 None (기준 캐시 없음)
+        """
+        latest = self.get_latest(stock_code)
+        if latest is None:
+            return None
+        base_df, base_date = latest
+
+        # 타임존 표기가 달라도 (예: Asia/Seoul vs UTC+09:00) 기존 캐시 기준으로 맞춤
+        base_tz = getattr(base_df['Date'].dt, 'tz', None)
+        if base_tz is not None and len(new_df) > 0 and new_df['Date'].dt.tz is not None:
+            new_df = new_df.assign(Date=new_df['Date'].dt.tz_convert(base_tz))
+
+        merged = pd.concat([base_df, new_df], ignore_index=True)
+        merged = merged.drop_duplicates(subset='Date', keep='last')
+        merged = merged.sort_values('Date', kind='stable').reset_index(drop=True)
+        if period and len(merged) > 0:
+            cutoff = merged['Date'].iloc[-1] - pd.Timedelta(days=period)
+            merged = merged[merged['Date'] >= cutoff].reset_index(drop=True)
+
+        today = self._today_str()
+        stored = self._store(stock_code, today, merged, mode='incremental')
+
+        logger.info(
+            f"[Cache APPEND] {stock_code} (+{len(new_df)} fetched, {len(base_df)} → {len(merged)} records, "
+            f"base={base_date}, date={today})"
+        )
+        return stored
+
+    def get_coverage(self, stock_code: str) -> Optional[Dict[str, Any]]:
+        """
+        종목별 보유 구간 조회
+
+        @return: {"fetch_date", "first_bar", "last_bar", "num_rows", "mode"} 또는 None
+        """
+        conn = self._db.acquire()
+        try:
+            row = conn.execute(
+                """SELECT fetch_date, first_bar, last_bar, num_rows, mode
+                   FROM price_coverage WHERE stock_code = ?""",
+                (stock_code,)
+            ).fetchone()
+        finally:
+            self._db.release(conn)
+
+        if not row:
+            return None
+        return {
+            'fetch_date': row[0],
+            'first_bar': row[1],
+            'last_bar': row[2],
+            'num_rows': row[3],
+            'mode': row[4]
         }
 
-        # 디스크 캐시 저장
-        self._save_to_disk(stock_code, today, df)
+    def _store(self, stock_code: str, fetch_date: str, df: pd.DataFrame, mode: str) -> pd.DataFrame:
+        """
+        메모리 + 디스크 저장 및 보유 구간 기록 (put/append 공통)
 
-        logger.info(f"[Cache PUT] {stock_code} ({len(df)} records, date={today})")
+        @return: 메모리 캐시에 보관한 DataFrame (memory-map 뷰 또는 원본)
+        """
+        # 디스크 캐시 저장 후 memory-map으로 다시 열어 메모리 캐시가 공유 매핑을 가리키도록 함
+        # (디스크 저장 실패 시 원본 DataFrame을 그대로 보관)
+        mapped = None
+        if self._save_to_disk(stock_code, fetch_date, df):
+            mapped = self._load_from_disk(stock_code, fetch_date)
+            self._save_coverage(stock_code, fetch_date, df, mode)
+
+        # 메모리 캐시 저장
+        stored = mapped if mapped is not None else df
+        self._memory_put(stock_code, fetch_date, stored)
+        return stored
 
     def invalidate(self, stock_code: str):
         """특정 종목 캐시 무효화"""
-        self._memory_cache.pop(stock_code, None)
+        self._memory_pop(stock_code)
         self._delete_from_disk(stock_code)
         logger.info(f"[Cache INVALIDATE] {stock_code}")
 
     def invalidate_all(self):
         """전체 캐시 무효화"""
-        self._memory_cache.clear()
-        conn = sqlite3.connect(self.cache_db_path)
+        with self._memory_lock:
+            self._memory_cache.clear()
+            self._memory_bytes = 0
+        conn = self._db.acquire()
         try:
+            rows = conn.execute("SELECT file_name FROM price_store").fetchall()
+            conn.execute("DELETE FROM price_store")
+            conn.execute("DELETE FROM price_coverage")
             conn.execute("DELETE FROM price_cache")
             conn.commit()
         finally:
-            conn.close()
+            self._db.release(conn)
+        self._remove_files(row[0] for row in rows)
+        self._disk_today_date = None
         logger.info("[Cache INVALIDATE ALL]")
 
     def get_stats(self) -> Dict:
         """캐시 통계 조회"""
         today = self._today_str()
-        memory_count = sum(
-            1 for v in self._memory_cache.values()
-            if v.get('fetchDate') == today
-        )
+        with self._memory_lock:
+            self._evict_stale(today)
+            memory_count = len(self._memory_cache)
+            memory_bytes = self._memory_bytes
+            counters = dict(self._counters)
 
-        conn = sqlite3.connect(self.cache_db_path)
-        try:
-            row = conn.execute(
-                "SELECT COUNT(*) FROM price_cache WHERE fetch_date = ?",
-                (today,)
-            ).fetchone()
-            disk_count = row[0] if row else 0
-        finally:
-            conn.close()
+        disk_count = len(self._disk_cached_today(today))
 
         return {
             'memory_cached': memory_count,
             'disk_cached_today': disk_count,
-            'cache_date': today
+            'cache_date': today,
+            'storage_format': self.storage_format,
+            'memory_bytes': memory_bytes,
+            'memory_budget_bytes': self.memory_budget_bytes,
+            'coalesced': self._flights.shared,
+            **counters
         }
 
+    def _disk_cached_today(self, today: str) -> set:
+        """
+        당일 디스크 캐시 종목 집합
+
+        저장/삭제 시 메모리에서 갱신하고, 날짜가 바뀌었거나 DISK_STATS_REFRESH_SEC가
+        지났을 때만 DB를 다시 조회한다 (다른 Worker 프로세스가 기록한 종목 반영).
+        """
+        now = time.monotonic()
+        if self._disk_today_date == today and now - self._disk_today_loaded_at < DISK_STATS_REFRESH_SEC:
+            return self._disk_today
+
+        conn = self._db.acquire()
+        try:
+            rows = conn.execute(
+                """SELECT stock_code FROM price_store WHERE fetch_date = ?
+                   UNION
+                   SELECT stock_code FROM price_cache WHERE fetch_date = ?""",
+                (today, today)
+            ).fetchall()
+        finally:
+            self._db.release(conn)
+
+        self._disk_today = {row[0] for row in rows}
+        self._disk_today_date = today
+        self._disk_today_loaded_at = now
+        return self._disk_today
+
+    # ──────────────────────────────────────────────
+    # 메모리 캐시 (바이트 예산 LRU)
+    # ──────────────────────────────────────────────
+
+    def _memory_get(self, stock_code: str, today: str) -> Optional[pd.DataFrame]:
+        """메모리 캐시 조회 (당일 항목만 유효, 조회 시 LRU 최신으로 이동)"""
+        with self._memory_lock:
+            mem = self._memory_cache.get(stock_code)
+            if mem is None:
+                return None
+            if mem['fetchDate'] != today:
+                self._memory_pop(stock_code)
+                self._counters['stale_evictions'] += 1
+                return None
+            self._memory_cache.move_to_end(stock_code)
+            return mem['data']
+
+    def _memory_put(self, stock_code: str, fetch_date: str, df: pd.DataFrame):
+        """메모리 캐시 저장 후 날짜 지난 항목 → 오래된 항목 순으로 예산 초과분 제거"""
+        nbytes = self._frame_bytes(df)
+        with self._memory_lock:
+            self._memory_pop(stock_code)
+            if nbytes > self.memory_budget_bytes:
+                logger.warning(
+                    f"[Cache] {stock_code} ({nbytes:,} bytes) exceeds memory budget "
+                    f"({self.memory_budget_bytes:,} bytes), not kept in memory"
+                )
+                return
+
+            self._memory_cache[stock_code] = {
+                'fetchDate': fetch_date,
+                'data': df,
+                'bytes': nbytes
+            }
+            self._memory_bytes += nbytes
+
+            self._evict_stale(fetch_date)
+            self._evict_over_budget()
+
+    def _evict_over_budget(self):
+        """예산 초과분을 오래된 항목(LRU) 순으로 제거"""
+        with self._memory_lock:
+            while self._memory_bytes > self.memory_budget_bytes and self._memory_cache:
+                evicted, _ = next(iter(self._memory_cache.items()))
+                self._memory_pop(evicted)
+                self._counters['evictions'] += 1
+                logger.debug(f"[Cache EVICT - memory] {evicted}")
+
+    def _memory_pop(self, stock_code: str):
+        """메모리 캐시 항목 제거 (바이트 합계 갱신)"""
+        with self._memory_lock:
+            mem = self._memory_cache.pop(stock_code, None)
+            if mem is not None:
+                self._memory_bytes -= mem['bytes']
+
+    def _evict_stale(self, today: str):
+        """날짜 지난 메모리 캐시 항목 제거"""
+        with self._memory_lock:
+            stale = [code for code, mem in self._memory_cache.items() if mem['fetchDate'] != today]
+            for code in stale:
+                self._memory_pop(code)
+            self._counters['stale_evictions'] += len(stale)
+
+    def _count(self, name: str):
+        """카운터 증가"""
+        with self._memory_lock:
+            self._counters[name] += 1
+
+    @staticmethod
+    def _frame_bytes(df: pd.DataFrame) -> int:
+        """DataFrame 메모리 사용량 (바이트, 인덱스 포함)"""
+        return int(df.memory_usage(index=True, deep=True).sum())
+
     # ──────────────────────────────────────────────
     # Ticker 캐시
     # ──────────────────────────────────────────────
@@ -182,7 +815,7 @@ class DataCache:
     def get_ticker(self, stock_code: str) -> Optional[str]:
         """캐시에서 ticker 결과 조회 (일일 1회)"""
         today = self._today_str()
-        conn = sqlite3.connect(self.cache_db_path)
+        conn = self._db.acquire()
         try:
             row = conn.execute(
                 "SELECT ticker FROM ticker_cache WHERE stock_code = ? AND fetch_date = ?",
@@ -192,13 +825,13 @@ class DataCache:
                 logger.debug(f"[Ticker Cache HIT] {stock_code} → {row[0]}")
                 return row[0]
         finally:
-            conn.close()
+            self._db.release(conn)
         return None
 
     def put_ticker(self, stock_code: str, ticker: str):
         """ticker 결과 캐시 저장"""
         today = self._today_str()
-        conn = sqlite3.connect(self.cache_db_path)
+        conn = self._db.acquire()
         try:
             conn.execute(
                 """INSERT OR REPLACE INTO ticker_cache (stock_code, ticker, fetch_date)
@@ -208,90 +841,351 @@ class DataCache:
             conn.commit()
             logger.debug(f"[Ticker Cache PUT] {stock_code} → {ticker}")
         finally:
-            conn.close()
+            self._db.release(conn)
+
+    # ──────────────────────────────────────────────
+    # 시장 인덱스
+    # ──────────────────────────────────────────────
+
+    def get_market(self, stock_code: str) -> Optional[str]:
+        """
+        종목 코드 → 시장 접미사 조회 (메모리 dict, 날짜 만료 없음)
+
+        @param stock_code: 종목 코드
+        @return: 'KS' | 'KQ' 또는 None (인덱스에 없음)
+        """
+        return self._markets().get(stock_code)
+
+    def put_markets(self, markets: Dict[str, str], source: str = 'listing') -> int:
+        """
+        시장 인덱스 일괄 갱신 (하나의 트랜잭션)
+
+        @param markets: { stock_code: 'KS' | 'KQ' | 'KOSPI' | 'KOSDAQ' }
+        @param source: 출처 ('listing' | 'download')
+        @return: 갱신된 종목 수
+        """
+        rows = []
+        for stock_code, market in markets.items():
+            suffix = MARKET_SUFFIXES.get(str(market).upper())
+            if suffix:
+                rows.append((stock_code, suffix, source))
+        if not rows:
+            return 0
+
+        conn = self._db.acquire()
+        try:
+            conn.executemany(
+                """INSERT OR REPLACE INTO market_index (stock_code, market, source, updated_at)
+                   VALUES (?, ?, ?, datetime('now'))""",
+                rows
+            )
+            conn.commit()
+        finally:
+            self._db.release(conn)
+
+        index = self._markets()
+        with self._market_lock:
+            index.update({stock_code: suffix for stock_code, suffix, _ in rows})
+        logger.debug(f"[Market Index PUT] {len(rows)} stocks (source={source})")
+        return len(rows)
+
+    def seed_market_index(self, path: Optional[str] = None) -> int:
+        """
+        종목 목록 파일로 시장 인덱스 일괄 갱신
+
+        @param path: JSON 파일 ([{"code": "005930", "market": "KOSPI", ...}], 기본값: market_listing_path)
+        @return: 갱신된 종목 수 (market 필드가 없는 항목은 제외)
+        """
+        path = path or self.market_listing_path
+        if not path or not os.path.exists(path):
+            return 0
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                listing = json.load(f)
+            markets = {
+                str(item['code']): item['market']
+                for item in listing
+                if isinstance(item, dict) and item.get('code') and item.get('market')
+            }
+        except Exception as e:
+            logger.error(f"Failed to load market listing {path}: {e}")
+            return 0
+
+        count = self.put_markets(markets, source='listing')
+        logger.info(f"[Market Index] Seeded {count} stocks from {path}")
+        return count
+
+    def _markets(self) -> Dict[str, str]:
+        """시장 인덱스 dict 반환 (최초 호출 시 DB 로드 + 종목 목록 반영)"""
+        if self._market_index is not None:
+            return self._market_index
+
+        with self._market_lock:
+            if self._market_index is None:
+                conn = self._db.acquire()
+                try:
+                    rows = conn.execute("SELECT stock_code, market FROM market_index").fetchall()
+                finally:
+                    self._db.release(conn)
+                self._market_index = dict(rows)
+        self.seed_market_index()
+        return self._market_index
 
     # ──────────────────────────────────────────────
     # 디스크 캐시 내부 메서드
     # ──────────────────────────────────────────────
 
     def _load_from_disk(self, stock_code: str, fetch_date: str) -> Optional[pd.DataFrame]:
-        """디스크 캐시에서 데이터 로드"""
-        conn = sqlite3.connect(self.cache_db_path)
+        """디스크 캐시에서 데이터 로드 (바이너리 저장소 → 구버전 JSON 순)"""
+        conn = self._db.acquire()
         try:
             row = conn.execute(
-                "SELECT data_json FROM price_cache WHERE stock_code = ? AND fetch_date = ?",
+                """SELECT format, file_name, num_rows, columns, tz FROM price_store
+                   WHERE stock_code = ? AND fetch_date = ?""",
                 (stock_code, fetch_date)
             ).fetchone()
-
+            legacy = None
             if not row:
+                legacy = conn.execute(
+                    "SELECT data_json FROM price_cache WHERE stock_code = ? AND fetch_date = ?",
+                    (stock_code, fetch_date)
+                ).fetchone()
+        except Exception as e:
+            logger.error(f"Failed to load disk cache for {stock_code}: {e}")
+            return None
+        finally:
+            self._db.release(conn)
+
+        try:
+            if row:
+                fmt, file_name, num_rows, columns_json, tz = row
+                return self._read_columns(fmt, file_name, num_rows, json.loads(columns_json), tz)
+
+            if not legacy:
                 return None
 
-            data = json.loads(row[0])
+            # 구버전 JSON 캐시 → 바이너리 저장소로 이전
+            data = json.loads(legacy[0])
             df = pd.DataFrame(data)
             df['Date'] = pd.to_datetime(df['Date'])
+            if self._save_to_disk(stock_code, fetch_date, df):
+                mapped = self._load_from_disk(stock_code, fetch_date)
+                if mapped is not None:
+                    return mapped
             return df
 
         except Exception as e:
             logger.error(f"Failed to load disk cache for {stock_code}: {e}")
             return None
-        finally:
-            conn.close()
 
-    def _save_to_disk(self, stock_code: str, fetch_date: str, df: pd.DataFrame):
-        """디스크 캐시에 데이터 저장"""
-        conn = sqlite3.connect(self.cache_db_path)
+    def _save_to_disk(self, stock_code: str, fetch_date: str, df: pd.DataFrame) -> bool:
+        """
+        디스크 캐시에 데이터 저장 (바이너리 파일 기록 후 SQLite에 메타데이터 등록)
+
+        @return: 저장 성공 여부
+        """
         try:
-            # DataFrame → JSON (Date를 문자열로 변환)
-            df_copy = df.copy()
-            df_copy['Date'] = df_copy['Date'].astype(str)
-            data_json = df_copy.to_dict(orient='list')
-            json_str = json.dumps(data_json, ensure_ascii=False)
+            file_name, columns, tz = self._write_columns(stock_code, fetch_date, df)
 
-            conn.execute(
-                """INSERT OR REPLACE INTO price_cache (stock_code, fetch_date, data_json)
-                   VALUES (?, ?, ?)""",
-                (stock_code, fetch_date, json_str)
-            )
-            conn.commit()
+            conn = self._db.acquire()
+            try:
+                conn.execute(
+                    _STORE_UPSERT_SQL,
+                    (stock_code, fetch_date, self.storage_format, file_name, len(df),
+                     json.dumps(columns), tz)
+                )
+                conn.execute(
+                    "DELETE FROM price_cache WHERE stock_code = ? AND fetch_date = ?",
+                    (stock_code, fetch_date)
+                )
+                conn.commit()
+            finally:
+                self._db.release(conn)
+            if fetch_date == self._disk_today_date:
+                self._disk_today.add(stock_code)
+            return True
 
         except Exception as e:
             logger.error(f"Failed to save disk cache for {stock_code}: {e}")
-        finally:
-            conn.close()
+            return False
 
     def _delete_from_disk(self, stock_code: str):
         """디스크 캐시에서 데이터 삭제"""
-        conn = sqlite3.connect(self.cache_db_path)
+        conn = self._db.acquire()
         try:
+            rows = conn.execute(
+                "SELECT file_name FROM price_store WHERE stock_code = ?",
+                (stock_code,)
+            ).fetchall()
+            conn.execute(
+                "DELETE FROM price_store WHERE stock_code = ?",
+                (stock_code,)
+            )
+            conn.execute(
+                "DELETE FROM price_coverage WHERE stock_code = ?",
+                (stock_code,)
+            )
             conn.execute(
                 "DELETE FROM price_cache WHERE stock_code = ?",
                 (stock_code,)
             )
             conn.commit()
         finally:
-            conn.close()
+            self._db.release(conn)
+        self._remove_files(row[0] for row in rows)
+        self._disk_today.discard(stock_code)
+
+    @staticmethod
+    def _coverage_row(stock_code: str, fetch_date: str, df: pd.DataFrame, mode: str) -> tuple:
+        """price_coverage 행 (첫 봉 ~ 마지막 봉)"""
+        return (stock_code, fetch_date, df['Date'].iloc[0].isoformat(),
+                df['Date'].iloc[-1].isoformat(), len(df), mode)
+
+    def _save_coverage(self, stock_code: str, fetch_date: str, df: pd.DataFrame, mode: str):
+        """종목별 보유 구간 기록"""
+        if len(df) == 0:
+            return
+        conn = self._db.acquire()
+        try:
+            conn.execute(_COVERAGE_UPSERT_SQL, self._coverage_row(stock_code, fetch_date, df, mode))
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to save coverage for {stock_code}: {e}")
+        finally:
+            self._db.release(conn)
+
+    # ──────────────────────────────────────────────
+    # 컬럼형 바이너리 저장소
+    # ──────────────────────────────────────────────
+
+    def _write_columns(self, stock_code: str, fetch_date: str,
+                       df: pd.DataFrame) -> Tuple[str, List[List[str]], Optional[str]]:
+        """
+        DataFrame을 컬럼형 바이너리 파일로 기록 (임시 파일 기록 후 rename)
+
+        @return: (파일명, [[컬럼명, dtype], ...], Date 타임존)
+        """
+        dates = pd.DatetimeIndex(df['Date'])
+        tz = None
+        if dates.tz is not None:
+            tz = str(dates.tz)
+            dates = dates.tz_convert('UTC').tz_localize(None)
+        date_ns = dates.values.astype('datetime64[ns]').view('<i8')
+
+        arrays = [('Date', date_ns)]
+        for col in df.columns:
+            if col == 'Date':
+                continue
+            values = np.asarray(df[col])
+            if values.dtype.kind not in 'biuf':
+                raise ValueError(f"Column {col} has unsupported dtype {values.dtype}")
+            arrays.append((col, values.astype(values.dtype.newbyteorder('<'), copy=False)))
+        columns = [[name, values.dtype.str] for name, values in arrays]
+
+        file_name = f"{stock_code}_{fetch_date}.{self.storage_format}"
+        path = os.path.join(self.store_dir, file_name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+
+        if self.storage_format == 'feather':
+            # 무압축 + NaN을 null로 바꾸지 않아야 memory-map 읽기가 zero-copy가 됨
+            table = pyarrow.table({name: pyarrow.array(values) for name, values in arrays})
+            feather.write_feather(table, tmp_path, compression='uncompressed')
+        else:
+            # 컬럼을 순서대로 이어 붙임 (각 컬럼은 8바이트 경계로 정렬)
+            with open(tmp_path, 'wb') as f:
+                for _, values in arrays:
+                    buf = np.ascontiguousarray(values).tobytes()
+                    f.write(buf)
+                    f.write(b'\0' * (-len(buf) % 8))
+        os.replace(tmp_path, path)
+
+        return file_name, columns, tz
+
+    def _read_columns(self, fmt: str, file_name: str, num_rows: int,
+                      columns: List[List[str]], tz: Optional[str]) -> pd.DataFrame:
+        """
+        컬럼형 바이너리 파일 → DataFrame (memory-map, zero-copy)
+
+        각 컬럼은 파일 매핑 위의 읽기 전용 뷰이며, Date는 int64 epoch ns에
+        저장 시 타임존 dtype을 입혀 복원한다 (값 복사 없음).
+        """
+        path = os.path.join(self.store_dir, file_name)
+
+        if fmt == 'feather':
+            if not HAS_PYARROW:
+                raise RuntimeError(f"pyarrow is required to read {file_name}")
+            table = feather.read_table(path, memory_map=True)
+            data = {name: table.column(name).to_numpy() for name, _ in columns}
+        elif num_rows == 0:
+            data = {name: np.empty(0, dtype=np.dtype(dtype_str)) for name, dtype_str in columns}
+        else:
+            # memmap 서브클래스가 pandas 연산 결과로 번지지 않도록 일반 ndarray 뷰로 변환
+            raw = np.asarray(np.memmap(path, dtype=np.uint8, mode='r'))
+            data = {}
+            offset = 0
+            for name, dtype_str in columns:
+                dtype = np.dtype(dtype_str)
+                nbytes = dtype.itemsize * num_rows
+                data[name] = raw[offset:offset + nbytes].view(dtype)
+                offset += nbytes + (-nbytes % 8)
+
+        date_ns = data['Date'].view('<i8')
+        if tz is not None:
+            # int64 입력 + tz dtype은 UTC epoch로 해석됨 (tz_localize와 달리 복사하지 않음)
+            data['Date'] = pd.DatetimeIndex(date_ns, dtype=pd.DatetimeTZDtype(unit='ns', tz=tz), copy=False)
+        else:
+            data['Date'] = pd.DatetimeIndex(date_ns.view('datetime64[ns]'), copy=False)
+        return pd.DataFrame(data, copy=False)
+
+    def _remove_files(self, file_names):
+        """바이너리 저장소 파일 삭제"""
+        for file_name in file_names:
+            try:
+                os.remove(os.path.join(self.store_dir, file_name))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Failed to remove cache file {file_name}: {e}")
 
     def cleanup_old_cache(self, keep_days: int = 3):
-        """오래된 캐시 정리 (기본: 3일 이전 데이터 삭제)"""
+        """
+        오래된 캐시 정리 (기본: 3일 이전 데이터 삭제)
+
+        종목별 가장 최근 바이너리 캐시는 증분 갱신 기준이므로 기간과 무관하게 남긴다.
+        """
         from datetime import timedelta
         cutoff = (date.today() - timedelta(days=keep_days)).isoformat()
+        stale = """fetch_date < ? AND fetch_date < (
+                       SELECT MAX(latest.fetch_date) FROM price_store AS latest
+                       WHERE latest.stock_code = price_store.stock_code
+                   )"""
 
-        conn = sqlite3.connect(self.cache_db_path)
+        conn = self._db.acquire()
         try:
+            old_files = conn.execute(
+                f"SELECT file_name FROM price_store WHERE {stale}",
+                (cutoff,)
+            ).fetchall()
             result = conn.execute(
-                "DELETE FROM price_cache WHERE fetch_date < ?",
+                f"DELETE FROM price_store WHERE {stale}",
                 (cutoff,)
             )
             deleted = result.rowcount
+            result = conn.execute(
+                "DELETE FROM price_cache WHERE fetch_date < ?",
+                (cutoff,)
+            )
+            deleted += result.rowcount
             conn.execute(
                 "DELETE FROM ticker_cache WHERE fetch_date < ?",
                 (cutoff,)
             )
             conn.commit()
+            self._remove_files(row[0] for row in old_files)
             if deleted > 0:
                 logger.info(f"[Cache CLEANUP] Removed {deleted} old entries (before {cutoff})")
         finally:
-            conn.close()
+            self._db.release(conn)
 
     # ──────────────────────────────────────────────
     # 유틸
@@ -0,0 +1,101 @@
+"""
+JsonCodec - Worker 응답 JSON 인코더
+역할: 응답(dict) → JSON 1줄(bytes) 변환
+
+  - orjson 설치 시: orjson (NumPy 배열 직접 직렬화, 결과는 UTF-8 bytes)
+  - 미설치 시: 표준 json 모듈
+  - NaN/Infinity는 두 인코더 모두 null로 출력 (Node.js JSON.parse가 읽을 수 있는 표준 JSON)
+  - 응답 형식:
+      'rows'    : trading_log = 거래별 딕셔너리 리스트 (기본값, 기존 형식)
+      'columnar': trading_log = {"format": "columnar", "length", "fields", "columns": {필드: 병렬 배열}}
+                  (반복되는 키가 없어 응답 크기/파싱 비용이 작음 - 다종목 요청 등)
+
+인코더는 환경변수 WORKER_JSON_ENCODER ('auto' | 'orjson' | 'json')로 선택한다.
+"""
+
+import json
+import logging
+import math
+import os
+from typing import Any, Callable
+
+import numpy as np
+
+try:
+    from trade_log import TradeLog
+except ImportError:
+    from .trade_log import TradeLog
+
+# orjson 임포트 (선택사항: 빠른 JSON 직렬화)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_FORMATS = ('rows', 'columnar')
+
+_ENCODER_SETTING = os.environ.get('WORKER_JSON_ENCODER', 'auto').lower()
+if _ENCODER_SETTING == 'orjson' and not HAS_ORJSON:
+    logger.warning("WORKER_JSON_ENCODER=orjson but orjson is not installed, using json")
+ENCODER = 'orjson' if HAS_ORJSON and _ENCODER_SETTING in ('auto', 'orjson') else 'json'
+
+
+def _default_for(columnar: bool, numpy_native: bool) -> Callable[[Any], Any]:
+    """JSON 기본 타입이 아닌 값 변환 함수 (TradeLog / NumPy)"""
+    def default(obj: Any) -> Any:
+        if isinstance(obj, TradeLog):
+            return obj.to_columns(numeric_arrays=numpy_native) if columnar else obj.to_dicts()
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        if isinstance(obj, np.generic):
+            return obj.item()
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return default
+
+
+def _finite(obj: Any) -> Any:
+    """비유한 float(NaN/Infinity) → None (딕셔너리/리스트는 재귀, 그 외 값은 그대로)"""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(value) for value in obj]
+    return obj
+
+
+_DEFAULTS = {
+    (columnar, numpy_native): _default_for(columnar, numpy_native)
+    for columnar in (False, True) for numpy_native in (False, True)
+}
+
+
+def encode(response: Any, response_format: str = 'rows') -> bytes:
+    """
+    응답 → JSON (UTF-8 bytes, 줄바꿈 없음)
+
+    @param response: 응답 딕셔너리 (TradeLog, ndarray 포함 가능)
+    @param response_format: 'rows' 또는 'columnar'
+    @return: JSON bytes
+    """
+    columnar = response_format == 'columnar'
+    if ENCODER == 'orjson':
+        return orjson.dumps(
+            response,
+            default=_DEFAULTS[(columnar, True)],
+            option=orjson.OPT_SERIALIZE_NUMPY
+        )
+    default = _DEFAULTS[(columnar, False)]
+    try:
+        return json.dumps(response, default=default, allow_nan=False).encode('utf-8')
+    except ValueError:
+        # 비유한 값이 있으면 null로 바꿔 다시 직렬화 (orjson과 같은 출력, 일반 응답은 1회 직렬화로 끝남)
+        return json.dumps(
+            _finite(response),
+            default=lambda obj: _finite(default(obj)),
+            allow_nan=False
+        ).encode('utf-8')
@@ -0,0 +1,140 @@
+"""
+LogConfig - Worker 로깅 설정
+역할: 로그 핸들러를 백그라운드 스레드(QueueListener)에서 실행하고, 거래별 상세 로그는 TRACE 레벨로 분리
+
+  - 큐 모드: 호출 스레드는 LogRecord를 큐에 넣기만 하고, 메시지 포맷/stderr 출력은 리스너 스레드가 처리
+             (Node.js가 stderr를 줄 단위로 읽는 동안 전략 실행 스레드가 출력에 묶이지 않음)
+  - TRACE(5): 거래별 체결 로그 레벨 (기본 INFO에서는 실행 요약 1줄만 출력)
+  - 거래 로그 샘플링: TRACE 레벨에서 N건마다 1건만 출력
+
+환경변수:
+  WORKER_LOG_LEVEL   로그 레벨 (TRACE / DEBUG / INFO / WARNING / ERROR, 기본값: INFO)
+  WORKER_LOG_QUEUE   1이면 큐 모드 (기본값: 1, 0이면 호출 스레드에서 바로 출력)
+  TRADE_LOG_SAMPLE   TRACE 레벨 거래별 로그 샘플링 간격 (기본값: 1 = 전체)
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Optional, TextIO
+
+TRACE = 5
+logging.addLevelName(TRACE, 'TRACE')
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+TRADE_LOG_SAMPLE = max(1, int(os.environ.get('TRADE_LOG_SAMPLE', '1')))
+
+# 리스너 스레드에서 포맷해도 값이 바뀌지 않는 인자 타입 (그 외 인자는 큐에 넣기 전에 메시지 확정)
+_IMMUTABLE_ARGS = (str, int, float, bool, type(None))
+
+_listener: Optional[QueueListener] = None
+
+
+class Lazy:
+    """
+    로그 인자 지연 평가 (레벨이 꺼져 있으면 func를 호출하지 않음)
+
+    예: logger.info("strategy=%s", Lazy(json.dumps, strategy, ensure_ascii=False))
+    """
+    __slots__ = ('func', 'args', 'kwargs')
+
+    def __init__(self, func: Callable[..., Any], *args: Any, **kwargs: Any):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self) -> str:
+        return str(self.func(*self.args, **self.kwargs))
+
+
+def lazy_json(obj: Any) -> Lazy:
+    """json.dumps(obj, ensure_ascii=False) 지연 평가"""
+    return Lazy(json.dumps, obj, ensure_ascii=False, default=str)
+
+
+class _DeferredFormatQueueHandler(QueueHandler):
+    """
+    메시지 포맷을 리스너 스레드로 미루는 QueueHandler
+
+    기본 QueueHandler.prepare()는 호출 스레드에서 메시지를 포맷하므로,
+    같은 프로세스의 리스너가 처리하는 경우 불변 값 인자는 LogRecord 그대로 넘긴다.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        if args:
+            values = args.values() if isinstance(args, dict) else args
+            if not all(isinstance(value, _IMMUTABLE_ARGS) for value in values):
+                record.msg = record.getMessage()
+                record.args = None
+        return record
+
+
+def parse_level(name: Optional[str], default: int = logging.INFO) -> int:
+    """
+    로그 레벨 이름 → 숫자 (TRACE 포함, 알 수 없는 이름은 default)
+
+    @param name: 'TRACE' / 'DEBUG' / 'INFO' ... 또는 숫자 문자열
+    """
+    if not name:
+        return default
+    name = name.strip().upper()
+    if name.isdigit():
+        return int(name)
+    level = logging.getLevelName(name)
+    return level if isinstance(level, int) else default
+
+
+def configure_logging(level: Optional[int] = None, use_queue: Optional[bool] = None,
+                      fmt: str = LOG_FORMAT, stream: Optional[TextIO] = None) -> Optional[QueueListener]:
+    """
+    root 로거 설정 (기존 핸들러 교체, 여러 번 호출 가능)
+
+    @param level: 로그 레벨 (기본값: WORKER_LOG_LEVEL)
+    @param use_queue: 큐 모드 여부 (기본값: WORKER_LOG_QUEUE)
+    @param fmt: 로그 포맷
+    @param stream: 출력 스트림 (기본값: stderr)
+    @return: 큐 모드면 QueueListener, 아니면 None
+    """
+    global _listener
+
+    if level is None:
+        level = parse_level(os.environ.get('WORKER_LOG_LEVEL'))
+    if use_queue is None:
+        use_queue = os.environ.get('WORKER_LOG_QUEUE', '1') != '0'
+
+    stop_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(logging.Formatter(fmt))
+    root.setLevel(level)
+
+    if not use_queue:
+        root.addHandler(handler)
+        return None
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    root.addHandler(_DeferredFormatQueueHandler(log_queue))
+    return _listener
+
+
+def stop_logging():
+    """큐 리스너 종료 (남은 로그 출력 후 반환)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
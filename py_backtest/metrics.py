@@ -0,0 +1,274 @@
+"""
+Metrics - Worker 요청 단계별 소요 시간 계측 / 지연 히스토그램
+역할: 요청 1건의 단계별 시간(PhaseTimings)을 기록해 응답의 timings로 돌려주고,
+      프로세스 내 히스토그램(WorkerMetrics)에 누적하여 Prometheus 텍스트 형식으로 노출
+
+단계 (PHASES):
+  ticker_resolve  종목 코드 → Yahoo Finance 티커 판별
+  cache_lookup    DataCache 조회 (cache_tier: memory / disk / miss, 시세 직접 전달은 inline)
+  yahoo_fetch     Yahoo Finance 조회 (캐시 미스)
+  cache_store     조회 결과 캐시 저장
+  result_cache    백테스팅 결과 캐시 조회 (시세 해시 + 키 계산, result_cache: memory / disk / miss)
+  frame_build     prices 딕셔너리/조회 결과 → DataFrame 변환, 세션 레이아웃 계산
+  strategy        전략 실행 (위 단계 시간 제외)
+  performance     PerformanceCalculator 추가 지표
+  json_encode     응답 JSON 직렬화
+  total           요청 수신 → 응답 출력 직전
+
+단계는 중첩될 수 있으며, 바깥 단계 시간에서 안쪽 단계 시간을 뺀 값(자기 시간)만 기록한다.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+PHASES = (
+    'ticker_resolve', 'cache_lookup', 'yahoo_fetch', 'cache_store', 'frame_build',
+    'result_cache', 'strategy', 'performance', 'json_encode', 'total'
+)
+
+# 히스토그램 버킷 상한 (초, Node.js 요청 타임아웃 30초 전후까지)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_MS_SUFFIX = '_ms'
+
+
+class PhaseTimings:
+    """요청 1건의 단계별 소요 시간 (초 누적, 같은 단계는 합산)"""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.cache_tier: Optional[str] = None
+        self.result_cache: Optional[str] = None
+        self._children: List[float] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        단계 시간 측정 (with 블록)
+
+        @param name: 단계 이름 (PHASES)
+        """
+        started = time.perf_counter()
+        self._children.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            inner = self._children.pop()
+            self.add(name, elapsed - inner)
+            if self._children:
+                self._children[-1] += elapsed
+
+    def add(self, name: str, seconds: float):
+        """단계 시간 추가 (초)"""
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def merge(self, timings: Optional[Dict[str, Any]]):
+        """
+        to_dict() 결과 합산 (프로세스 풀 작업/종목별 결과)
+
+        @param timings: {"<phase>_ms": float, "cache_tier": str, "result_cache": str}
+        """
+        if not timings:
+            return
+        for key, value in timings.items():
+            if key.endswith(_MS_SUFFIX) and isinstance(value, (int, float)):
+                self.add(key[:-len(_MS_SUFFIX)], value / 1000)
+        if self.cache_tier is None and timings.get('cache_tier'):
+            self.cache_tier = timings['cache_tier']
+        if self.result_cache is None and timings.get('result_cache'):
+            self.result_cache = timings['result_cache']
+
+    def to_dict(self) -> Dict[str, Any]:
+        """응답 timings 형식 {"<phase>_ms": 밀리초, "cache_tier": 시세 조회 계층, "result_cache": 결과 캐시 계층}"""
+        result: Dict[str, Any] = {
+            f"{name}{_MS_SUFFIX}": round(seconds * 1000, 3) for name, seconds in self.phases.items()
+        }
+        if self.cache_tier is not None:
+            result['cache_tier'] = self.cache_tier
+        if self.result_cache is not None:
+            result['result_cache'] = self.result_cache
+        return result
+
+
+class Histogram:
+    """누적 버킷 히스토그램 (Prometheus histogram 형식)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+
+
+class WorkerMetrics:
+    """
+    Worker 프로세스 지표 (스레드 안전)
+
+    - backtest_phase_seconds{phase}        단계별 지연 히스토그램
+    - backtest_request_seconds{type}       요청 유형별 전체 지연 히스토그램
+    - backtest_requests_total{type,status} 요청 수
+    - backtest_price_source_total{source}  시세 조회 계층별 횟수 (프로세스 풀 작업 포함)
+    - backtest_result_cache_total{tier}    결과 캐시 조회 계층별 횟수
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._phases: Dict[str, Histogram] = {}
+        self._requests: Dict[str, Histogram] = {}
+        self._request_counts: Dict[Tuple[str, str], int] = {}
+        self._price_sources: Dict[str, int] = {}
+        self._result_tiers: Dict[str, int] = {}
+        self._started = time.time()
+
+    def observe(self, request_type: str, status: str, timings: Optional[Dict[str, Any]]):
+        """
+        요청 1건 누적
+
+        @param request_type: single / sweep / multi_stock / prefetch / metrics
+        @param status: success / error
+        @param timings: 응답 timings ({"<phase>_ms", "cache_tier", "result_cache"},
+                        다종목은 종목별 계층 수 {"cache_tiers": {...}, "result_cache_tiers": {...}})
+        """
+        timings = timings or {}
+        price_sources = self._tier_counts(timings, 'cache_tier', 'cache_tiers')
+        result_tiers = self._tier_counts(timings, 'result_cache', 'result_cache_tiers')
+        with self._lock:
+            self._request_counts[(request_type, status)] = self._request_counts.get((request_type, status), 0) + 1
+            for key, value in timings.items():
+                if not key.endswith(_MS_SUFFIX) or not isinstance(value, (int, float)):
+                    continue
+                name = key[:-len(_MS_SUFFIX)]
+                if name == 'total':
+                    self._requests.setdefault(request_type, Histogram()).observe(value / 1000)
+                else:
+                    self._phases.setdefault(name, Histogram()).observe(value / 1000)
+            for source, count in price_sources.items():
+                self._price_sources[source] = self._price_sources.get(source, 0) + count
+            for tier, count in result_tiers.items():
+                self._result_tiers[tier] = self._result_tiers.get(tier, 0) + count
+
+    def render_prometheus(self, cache_stats: Optional[Dict[str, Any]] = None,
+                          result_cache_stats: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Prometheus 텍스트 형식 (exposition format 0.0.4)
+
+        @param cache_stats: DataCache.get_stats() (이 프로세스의 캐시 적중 카운터/메모리 사용량)
+        @param result_cache_stats: ResultCache.get_stats() (결과 캐시 사용 시)
+        """
+        with self._lock:
+            phases = {name: self._snapshot(h) for name, h in self._phases.items()}
+            requests = {name: self._snapshot(h) for name, h in self._requests.items()}
+            request_counts = dict(self._request_counts)
+            price_sources = dict(self._price_sources)
+            result_tiers = dict(self._result_tiers)
+
+        lines: List[str] = []
+        self._render_histogram(lines, 'backtest_phase_seconds', 'Worker request phase latency (self time)',
+                               'phase', phases)
+        self._render_histogram(lines, 'backtest_request_seconds', 'Worker request latency (receive to response)',
+                               'type', requests)
+
+        lines.append('# HELP backtest_requests_total Worker requests handled')
+        lines.append('# TYPE backtest_requests_total counter')
+        for (request_type, status), count in sorted(request_counts.items()):
+            lines.append(f'backtest_requests_total{{type="{request_type}",status="{status}"}} {count}')
+
+        lines.append('# HELP backtest_price_source_total Price data source per backtest (including pool workers)')
+        lines.append('# TYPE backtest_price_source_total counter')
+        for source, count in sorted(price_sources.items()):
+            lines.append(f'backtest_price_source_total{{source="{source}"}} {count}')
+        lookups = sum(price_sources.get(tier, 0) for tier in ('memory', 'disk', 'miss'))
+        hits = price_sources.get('memory', 0) + price_sources.get('disk', 0)
+        lines.append('# HELP backtest_price_source_hit_ratio Cache hit ratio of price lookups (memory + disk)')
+        lines.append('# TYPE backtest_price_source_hit_ratio gauge')
+        lines.append(f'backtest_price_source_hit_ratio {self._ratio(hits, lookups)}')
+
+        lines.append('# HELP backtest_result_cache_total Backtest result cache lookups by tier')
+        lines.append('# TYPE backtest_result_cache_total counter')
+        for tier, count in sorted(result_tiers.items()):
+            lines.append(f'backtest_result_cache_total{{tier="{tier}"}} {count}')
+        result_hits = result_tiers.get('memory', 0) + result_tiers.get('disk', 0)
+        lines.append('# HELP backtest_result_cache_hit_ratio Backtest result cache hit ratio (memory + disk)')
+        lines.append('# TYPE backtest_result_cache_hit_ratio gauge')
+        lines.append(
+            f'backtest_result_cache_hit_ratio {self._ratio(result_hits, result_hits + result_tiers.get("miss", 0))}'
+        )
+        if result_cache_stats and 'memory_entries' in result_cache_stats:
+            lines.append('# HELP backtest_result_cache_memory_entries Backtest results held in memory')
+            lines.append('# TYPE backtest_result_cache_memory_entries gauge')
+            lines.append(f'backtest_result_cache_memory_entries {result_cache_stats["memory_entries"]}')
+
+        if cache_stats:
+            memory_hits = int(cache_stats.get('memory_hits', 0))
+            disk_hits = int(cache_stats.get('disk_hits', 0))
+            misses = int(cache_stats.get('misses', 0))
+            lines.append('# HELP backtest_cache_lookups_total DataCache lookups in the worker process by tier')
+            lines.append('# TYPE backtest_cache_lookups_total counter')
+            lines.append(f'backtest_cache_lookups_total{{tier="memory"}} {memory_hits}')
+            lines.append(f'backtest_cache_lookups_total{{tier="disk"}} {disk_hits}')
+            lines.append(f'backtest_cache_lookups_total{{tier="miss"}} {misses}')
+            lines.append('# HELP backtest_cache_hit_ratio DataCache hit ratio in the worker process')
+            lines.append('# TYPE backtest_cache_hit_ratio gauge')
+            lines.append(
+                f'backtest_cache_hit_ratio {self._ratio(memory_hits + disk_hits, memory_hits + disk_hits + misses)}'
+            )
+            for key, metric, help_text in (
+                ('memory_cached', 'backtest_cache_memory_entries', 'Price frames held in memory cache'),
+                ('memory_bytes', 'backtest_cache_memory_bytes', 'Memory cache size in bytes'),
+                ('memory_budget_bytes', 'backtest_cache_memory_budget_bytes', 'Memory cache budget in bytes'),
+                ('disk_cached_today', 'backtest_cache_disk_entries', "Today's price frames on disk")
+            ):
+                if key in cache_stats:
+                    lines.append(f'# HELP {metric} {help_text}')
+                    lines.append(f'# TYPE {metric} gauge')
+                    lines.append(f'{metric} {cache_stats[key]}')
+            for key in ('evictions', 'stale_evictions', 'coalesced'):
+                if key in cache_stats:
+                    lines.append(f'# TYPE backtest_cache_{key}_total counter')
+                    lines.append(f'backtest_cache_{key}_total {cache_stats[key]}')
+
+        lines.append('# HELP backtest_worker_uptime_seconds Seconds since the worker metrics registry started')
+        lines.append('# TYPE backtest_worker_uptime_seconds gauge')
+        lines.append(f'backtest_worker_uptime_seconds {round(time.time() - self._started, 3)}')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _tier_counts(timings: Dict[str, Any], single_key: str, counts_key: str) -> Dict[str, int]:
+        """timings의 계층 값 (단일 요청: 문자열, 다종목: 계층별 종목 수) → {계층: 횟수}"""
+        counts = timings.get(counts_key)
+        if isinstance(counts, dict):
+            return {str(tier): int(count) for tier, count in counts.items()}
+        return {timings[single_key]: 1} if timings.get(single_key) else {}
+
+    @staticmethod
+    def _snapshot(histogram: Histogram) -> Tuple[Tuple[float, ...], List[int], int, float]:
+        return histogram.buckets, list(histogram.counts), histogram.count, histogram.sum
+
+    @staticmethod
+    def _render_histogram(lines: List[str], metric: str, help_text: str, label: str,
+                          histograms: Dict[str, Tuple[Tuple[float, ...], List[int], int, float]]):
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} histogram')
+        for name in sorted(histograms):
+            buckets, counts, count, total = histograms[name]
+            for bound, bucket_count in zip(buckets, counts):
+                lines.append(f'{metric}_bucket{{{label}="{name}",le="{bound:g}"}} {bucket_count}')
+            lines.append(f'{metric}_bucket{{{label}="{name}",le="+Inf"}} {count}')
+            lines.append(f'{metric}_sum{{{label}="{name}"}} {round(total, 6)}')
+            lines.append(f'{metric}_count{{{label}="{name}"}} {count}')
+
+    @staticmethod
+    def _ratio(numerator: int, denominator: int) -> float:
+        return round(numerator / denominator, 6) if denominator else 0.0
@@ -0,0 +1,343 @@
+"""
+ParameterSweep - 전략 파라미터 그리드 일괄 평가
+역할: 한 번 로드한 주가 데이터로 여러 전략 파라미터 조합을 평가하고 성과 순위표 생성
+
+  - 전략 1: 매수 시간 × 매도 시간 조합을 (거래일 × 조합) 행렬로 묶어
+            잔고/누적 손해액 점화식을 조합 전체에 대해 동시에 계산
+  - 전략 2: 세션 인덱스(일자 경계, 분 배열)를 공유하여 조합별 트레일링 스탑 커널 실행
+
+각 조합의 return_rate / mdd / win_rate / profit_factor 는
+BacktestEngine.run_backtest() 단일 실행 결과와 동일한 계산식을 사용한다.
+"""
+
+import itertools
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+try:
+    from strategy_kernels import (
+        SessionIndex, session_keys, nearest_candle_indices, run_strategy2, TIME_SLOTS
+    )
+except ImportError:
+    from .strategy_kernels import (
+        SessionIndex, session_keys, nearest_candle_indices, run_strategy2, TIME_SLOTS
+    )
+
+logger = logging.getLogger(__name__)
+
+# 전략별 스윕 파라미터 (기본값은 BacktestEngine.run_strategyN_backtest와 동일)
+STRATEGY1_PARAMS = {'buy_time': '10:00', 'sell_time': '15:00'}
+STRATEGY2_PARAMS = {
+    'buy_time': '15:30',
+    'min_profit_pct': 1.0,
+    'profit_cutoff_pct': 80.0,
+    'loss_cutoff_time': '14:00',
+}
+
+RANK_KEYS = ('return_rate', 'mdd', 'win_rate', 'profit_factor', 'total_profit', 'final_capital')
+
+# 순위표 조합 수 상한 (과도한 요청 방지)
+MAX_COMBINATIONS = 20000
+
+
+def expand_range(value: Any) -> List[Any]:
+    """
+    파라미터 범위 → 값 리스트
+
+    지원 형식:
+      - 리스트: 그대로 사용 (["10:00", "10:30"], [0.5, 1.0])
+      - 스칼라: 단일 값 ("10:00", 1.0)
+      - 시간 범위: {"start": "09:00", "end": "10:00", "step": 10}  (step: 분, end 포함)
+      - 숫자 범위: {"start": 0.5, "end": 2.0, "step": 0.5}         (end 포함)
+
+    @param value: 파라미터 범위 정의
+    @return: 값 리스트
+    """
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    if not isinstance(value, dict):
+        return [value]
+
+    start = value.get('start')
+    end = value.get('end', value.get('stop', start))
+    step = value.get('step')
+
+    if isinstance(start, str):
+        step = int(step or 1)
+        if step <= 0:
+            raise ValueError(f"Invalid time step: {step}")
+        lo = TIME_SLOTS.index(start)
+        hi = TIME_SLOTS.index(end)
+        return TIME_SLOTS[lo:hi + 1:step]
+
+    step = float(step or 1.0)
+    if step <= 0:
+        raise ValueError(f"Invalid numeric step: {step}")
+    count = int(np.floor((float(end) - float(start)) / step + 1e-9)) + 1
+    return [round(float(start) + i * step, 10) for i in range(max(count, 0))]
+
+
+def build_grid(strategy: Dict, defaults: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """
+    전략 설정에서 스윕 그리드 추출
+
+    @param strategy: 전략 설정 (파라미터 값이 범위 정의일 수 있음)
+    @param defaults: 전략별 파라미터 기본값
+    @return: {파라미터명: 값 리스트}
+    """
+    grid = {}
+    for name, default in defaults.items():
+        values = expand_range(strategy.get(name, default))
+        if not values:
+            raise ValueError(f"Empty sweep range for {name}")
+        grid[name] = values
+    return grid
+
+
+def sweep_strategy1(session: SessionIndex, buy_times: List[str], sell_times: List[str],
+                    seed_money: float) -> Dict[str, np.ndarray]:
+    """
+    전략 1 매수/매도 시간 조합 일괄 평가
+
+    매수 캔들(거래일 × 매수시간), 매도 캔들(거래일 × 매도시간) 행렬을 searchsorted로 구한 뒤
+    조합 축(매수시간 × 매도시간)으로 펼쳐 거래일 순서대로 점화식을 벡터 연산한다.
+    (조합별 연산 순서는 strategy_kernels.run_strategy1과 동일)
+
+    @param session: SessionIndex
+    @param buy_times: 매수 시간 리스트
+    @param sell_times: 매도 시간 리스트
+    @param seed_money: 씨드머니
+    @return: 조합별 지표 배열 (조합 순서: buy_times 우선, sell_times 내부)
+    """
+    keys = session_keys(session)
+    close = session.close
+    num_days = session.num_days
+    num_sell = len(sell_times)
+
+    buy_mat = np.column_stack([
+        nearest_candle_indices(session, t, direction='forward', keys=keys) for t in buy_times
+    ]) if num_days > 0 else np.zeros((0, len(buy_times)), dtype=np.int64)
+    sell_mat = np.column_stack([
+        nearest_candle_indices(session, t, direction='backward', keys=keys) for t in sell_times
+    ]) if num_days > 0 else np.zeros((0, num_sell), dtype=np.int64)
+
+    # (거래일 × 조합) 가격 행렬
+    buy_prices = np.repeat(close[buy_mat], num_sell, axis=1)
+    sell_prices = np.tile(close[sell_mat], (1, len(buy_times)))
+    num_combos = len(buy_times) * num_sell
+
+    balance = np.full(num_combos, float(seed_money))
+    loss_amount = np.zeros(num_combos)
+    total_profit = np.zeros(num_combos)
+    total_cost = np.zeros(num_combos)
+    total_wins = np.zeros(num_combos)
+    total_losses = np.zeros(num_combos)
+    trades = np.zeros(num_combos, dtype=np.int64)
+    wins = np.zeros(num_combos, dtype=np.int64)
+    losses = np.zeros(num_combos, dtype=np.int64)
+    peak = np.full(num_combos, float(seed_money))
+    mdd = np.zeros(num_combos)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for day in range(num_days):
+            buy_price = buy_prices[day]
+            sell_price = sell_prices[day]
+            buy_amount = balance - loss_amount
+            ok = ~(buy_price <= 0) & ~(buy_amount <= 0) & ~(sell_price <= 0)
+            if not ok.any():
+                continue
+
+            bp = buy_price[ok]
+            sp = sell_price[ok]
+            amount = buy_amount[ok]
+            gross_profit = (sp - bp) * (amount / bp)
+            sell_total = sp * (amount / bp)
+            tax = sell_total * 0.2 / 100
+            commission = sell_total * 0.011 / 100
+            cost = tax + commission
+            net_profit = gross_profit - cost
+
+            new_balance = balance[ok] + net_profit
+            balance[ok] = new_balance
+            losing = net_profit < 0
+            loss_amount[ok] = np.where(losing, loss_amount[ok] + np.abs(net_profit), loss_amount[ok])
+
+            trades[ok] += 1
+            winning = net_profit > 0
+            wins[ok] += winning
+            total_profit[ok] = total_profit[ok] + net_profit
+            total_cost[ok] = total_cost[ok] + cost
+            total_wins[ok] = np.where(winning, total_wins[ok] + net_profit, total_wins[ok])
+            non_winning = net_profit <= 0
+            losses[ok] += non_winning
+            total_losses[ok] = np.where(non_winning, total_losses[ok] + np.abs(net_profit), total_losses[ok])
+
+            # MDD (BacktestEngine.calculate_mdd와 동일한 순차 갱신)
+            new_peak = np.fmax(peak[ok], new_balance)
+            peak[ok] = new_peak
+            drawdown = np.where(new_peak > 0, (new_peak - new_balance) / new_peak * 100, 0)
+            mdd[ok] = np.fmax(mdd[ok], drawdown)
+
+    return _summarize(seed_money, trades, wins, losses, total_profit, total_cost, total_wins,
+                      total_losses, mdd, balance)
+
+
+def sweep_strategy2(session: SessionIndex, grid: Dict[str, List[Any]],
+                    seed_money: float) -> Dict[str, np.ndarray]:
+    """
+    전략 2 파라미터 조합 일괄 평가 (세션 인덱스/검색 키 공유)
+
+    @param session: SessionIndex
+    @param grid: STRATEGY2_PARAMS 키별 값 리스트
+    @param seed_money: 씨드머니
+    @return: 조합별 지표 배열 (조합 순서: itertools.product(grid 값들))
+    """
+    keys = session_keys(session)
+    combos = list(itertools.product(*(grid[name] for name in STRATEGY2_PARAMS)))
+    num_combos = len(combos)
+
+    trades = np.zeros(num_combos, dtype=np.int64)
+    wins = np.zeros(num_combos, dtype=np.int64)
+    losses = np.zeros(num_combos, dtype=np.int64)
+    total_profit = np.zeros(num_combos)
+    total_cost = np.zeros(num_combos)
+    total_wins = np.zeros(num_combos)
+    total_losses = np.zeros(num_combos)
+    mdd = np.zeros(num_combos)
+    balance = np.full(num_combos, float(seed_money))
+
+    for c, (buy_time, min_profit_pct, profit_cutoff_pct, loss_cutoff_time) in enumerate(combos):
+        fills = run_strategy2(
+            session, buy_time, float(min_profit_pct), float(profit_cutoff_pct),
+            loss_cutoff_time, seed_money, keys=keys
+        )
+        profits = fills.profit.tolist()
+        trades[c] = len(profits)
+        if not profits:
+            continue
+        winning = [p for p in profits if p > 0]
+        losing = [p for p in profits if p <= 0]
+        wins[c] = len(winning)
+        losses[c] = len(losing)
+        total_profit[c] = sum(profits)
+        total_cost[c] = sum(fills.cost.tolist())
+        total_wins[c] = sum(winning)
+        total_losses[c] = sum(abs(p) for p in losing)
+        balance[c] = fills.balance_after[-1]
+
+        equity = np.concatenate(([float(seed_money)], fills.balance_after))
+        running_peak = np.fmax.accumulate(equity)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            drawdown = np.where(running_peak > 0, (running_peak - equity) / running_peak * 100, 0)
+        mdd[c] = np.fmax.reduce(drawdown)
+
+    return _summarize(seed_money, trades, wins, losses, total_profit, total_cost, total_wins,
+                      total_losses, mdd, balance)
+
+
+def _summarize(seed_money, trades, wins, losses, total_profit, total_cost, total_wins,
+               total_losses, mdd, balance) -> Dict[str, np.ndarray]:
+    """조합별 누적값 → 성과 지표 (_calculate_strategyN_performance와 동일한 정의)"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        win_rate = np.where(trades > 0, wins / np.maximum(trades, 1) * 100, 0.0)
+        profit_factor = np.where(total_losses > 0, total_wins / np.where(total_losses > 0, total_losses, 1), 0.0)
+    return {
+        'total_trades': trades,
+        'winning_trades': wins,
+        'losing_trades': losses,
+        'total_profit': total_profit,
+        'return_rate': total_profit / seed_money * 100,
+        'win_rate': win_rate,
+        'profit_factor': profit_factor,
+        'mdd': mdd,
+        'total_cost': total_cost,
+        'final_capital': balance,
+    }
+
+
+def rank_results(params: List[Dict[str, Any]], metrics: Dict[str, np.ndarray],
+                 sort_by: str = 'return_rate', ascending: Optional[bool] = None,
+                 top_n: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    조합별 지표 → 순위표
+
+    @param params: 조합별 파라미터 (metrics 배열과 같은 순서)
+    @param metrics: 조합별 지표 배열
+    @param sort_by: 정렬 기준 (RANK_KEYS 중 하나, 기본값: return_rate)
+    @param ascending: 오름차순 여부 (기본값: mdd만 오름차순)
+    @param top_n: 상위 N개만 반환 (None이면 전체)
+    @return: [{rank, params..., return_rate, mdd, win_rate, profit_factor, ...}]
+    """
+    if sort_by not in RANK_KEYS:
+        raise ValueError(f"Invalid sort_by: {sort_by!r} (choose from {', '.join(RANK_KEYS)})")
+    if ascending is None:
+        ascending = sort_by == 'mdd'
+
+    values = np.nan_to_num(metrics[sort_by].astype(np.float64), nan=np.inf if ascending else -np.inf)
+    order = np.argsort(values if ascending else -values, kind='stable')
+    if top_n is not None:
+        order = order[:int(top_n)]
+
+    columns = {name: arr.tolist() for name, arr in metrics.items()}
+    table = []
+    for rank, c in enumerate(order.tolist(), 1):
+        row = {'rank': rank}
+        row.update(params[c])
+        for name, values_list in columns.items():
+            row[name] = values_list[c]
+        table.append(row)
+    return table
+
+
+def run_sweep(session: SessionIndex, strategy: Dict, seed_money: float,
+              sort_by: str = 'return_rate', top_n: Optional[int] = None) -> Dict:
+    """
+    전략 파라미터 스윕 실행
+
+    @param session: SessionIndex (로드된 주가 데이터)
+    @param strategy: {"type": "daily_trading", "buy_time": [...], "sell_time": {...}} 등
+    @param seed_money: 씨드머니
+    @param sort_by: 정렬 기준
+    @param top_n: 상위 N개만 반환
+    @return: {'strategy', 'combinations', 'grid', 'results'}
+    """
+    strategy_type = strategy.get('type', strategy.get('signal_type', ''))
+
+    if strategy_type in ('daily_trading', 'strategy1', 'fixed_time'):
+        grid = build_grid(strategy, STRATEGY1_PARAMS)
+        _check_size(grid)
+        metrics = sweep_strategy1(session, grid['buy_time'], grid['sell_time'], seed_money)
+        params = [{'buy_time': b, 'sell_time': s}
+                  for b, s in itertools.product(grid['buy_time'], grid['sell_time'])]
+        strategy_name = 'strategy1_fixed_time'
+    elif strategy_type in ('trailing_stop', 'strategy2'):
+        grid = build_grid(strategy, STRATEGY2_PARAMS)
+        _check_size(grid)
+        metrics = sweep_strategy2(session, grid, seed_money)
+        params = [dict(zip(STRATEGY2_PARAMS, combo))
+                  for combo in itertools.product(*(grid[name] for name in STRATEGY2_PARAMS))]
+        strategy_name = 'strategy2_trailing_stop'
+    else:
+        raise ValueError(f"Sweep is not supported for strategy type {strategy_type!r}")
+
+    logger.info(
+        f"Parameter sweep finished | strategy={strategy_name} | combinations={len(params)} | "
+        f"days={session.num_days} | sort_by={sort_by}"
+    )
+
+    return {
+        'strategy': strategy_name,
+        'combinations': len(params),
+        'grid': grid,
+        'sort_by': sort_by,
+        'results': rank_results(params, metrics, sort_by=sort_by, top_n=top_n),
+    }
+
+
+def _check_size(grid: Dict[str, List[Any]]):
+    """조합 수 상한 검사"""
+    size = int(np.prod([len(v) for v in grid.values()]))
+    if size > MAX_COMBINATIONS:
+        raise ValueError(f"Too many sweep combinations: {size} (max {MAX_COMBINATIONS})")
@@ -1,14 +1,101 @@
 """
 PerformanceCalculator - 성과 지표 계산기
 역할: 백테스팅 결과의 다양한 성과 지표 계산 및 분석
+
+지표 계산은 두 개의 중간 결과를 한 번씩만 만든 뒤 모든 지표를 여기서 도출한다.
+  - EquitySeries: 자산 곡선 → 구간 수익률, 누적 최고점(np.maximum.accumulate), 낙폭(%), MDD
+  - TradeProfits: 청산 거래 순수익 배열 → 수익/손실 거래 분할, 건수/합계
+자산 곡선은 리스트/ndarray, 거래는 레거시 SELL 딕셔너리 리스트 또는 순수익 배열을 그대로 받는다.
 """
 
 import numpy as np
-from typing import Dict, List
+from typing import Dict, List, NamedTuple, Sequence, Union
 import logging
 
+try:
+    from trade_log import TradeLog
+except ImportError:
+    from .trade_log import TradeLog
+
 logger = logging.getLogger(__name__)
 
+# 연환산 기준 거래일 수
+ANNUAL_DAYS = 252
+
+
+class EquitySeries(NamedTuple):
+    """자산 곡선 중간 결과"""
+    curve: np.ndarray      # 자산 추이 (float64)
+    returns: np.ndarray    # 구간 수익률 (diff / 직전 값)
+    peak: np.ndarray       # 누적 최고점
+    drawdown: np.ndarray   # 최고점 대비 낙폭 (%, 최고점 <= 0 구간은 0)
+    mdd: float             # 최대 낙폭 (%)
+
+
+class TradeProfits(NamedTuple):
+    """청산 거래 순수익 분할 결과"""
+    profits: np.ndarray    # 거래별 순수익 (None → 0)
+    wins: np.ndarray       # 수익 거래 여부 (profit > 0)
+    win_count: int
+    loss_count: int
+    win_total: float       # 수익 거래 순수익 합계
+    loss_total: float      # 손실 거래 손실액 합계 (양수)
+
+
+def equity_series(equity_curve: Union[Sequence[float], np.ndarray]) -> EquitySeries:
+    """
+    자산 곡선 중간 결과 계산 (수익률/최고점/낙폭을 한 번에)
+    
+    MDD는 순차 갱신과 같은 결과: NaN 값은 최고점 갱신/낙폭 계산에서 제외
+    
+    @param equity_curve: 자산 추이 (리스트 또는 ndarray)
+    @return: EquitySeries
+    """
+    curve = np.asarray(equity_curve if equity_curve is not None else [], dtype=np.float64)
+    if len(curve) < 2:
+        empty = np.empty(0, dtype=np.float64)
+        return EquitySeries(curve, empty, curve.copy(), np.zeros(len(curve)), 0.0)
+    
+    returns = np.diff(curve) / curve[:-1]
+    
+    if np.isnan(curve[0]):
+        # 시작값이 NaN이면 최고점이 갱신되지 않음 → 낙폭 없음
+        peak = np.full(len(curve), np.nan)
+        return EquitySeries(curve, returns, peak, np.zeros(len(curve)), 0.0)
+    
+    peak = np.fmax.accumulate(curve)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        drawdown = np.where(peak > 0, (peak - curve) / peak * 100, 0.0)
+    valid = drawdown[~np.isnan(drawdown)]
+    mdd = max(float(valid.max()), 0.0) if len(valid) else 0.0
+    return EquitySeries(curve, returns, peak, drawdown, mdd)
+
+
+def trade_profits(closing_trades: Union[List[Dict], np.ndarray]) -> TradeProfits:
+    """
+    청산 거래 순수익 분할 (수익: profit > 0, 손실: 그 외)
+    
+    합계는 거래 순서대로 더해 리스트 합산과 같은 값을 유지
+    
+    @param closing_trades: SELL 거래 딕셔너리 리스트 또는 순수익 배열
+    @return: TradeProfits
+    """
+    if isinstance(closing_trades, np.ndarray):
+        profits = closing_trades.astype(np.float64, copy=False)
+    else:
+        profits = np.array([t.get('profit', 0) or 0 for t in closing_trades], dtype=np.float64)
+    wins = profits > 0
+    win_profits = profits[wins]
+    loss_profits = profits[~wins]
+    return TradeProfits(
+        profits=profits,
+        wins=wins,
+        win_count=int(len(win_profits)),
+        loss_count=int(len(loss_profits)),
+        win_total=sum(win_profits.tolist()),
+        loss_total=sum(np.abs(loss_profits).tolist())
+    )
+
 
 class PerformanceCalculator:
     """
@@ -23,47 +110,51 @@ class PerformanceCalculator:
         self.risk_free_rate = risk_free_rate
     
     def calculate_all_metrics(self, 
-                              equity_curve: List[float],
-                              trades: List[Dict],
+                              equity_curve: Union[List[float], np.ndarray],
+                              trades: Union[List[Dict], TradeLog, np.ndarray],
                               initial_capital: float,
-                              trading_days: int = 252) -> Dict:
+                              trading_days: int = ANNUAL_DAYS) -> Dict:
         """
-        모든 성과 지표 계산
+        모든 성과 지표 계산 (자산 곡선/거래 중간 결과를 한 번씩만 계산)
         
-        @param equity_curve: 자산 추이
-        @param trades: 거래 로그
+        @param equity_curve: 자산 추이 (리스트 또는 ndarray)
+        @param trades: 거래 로그 (레거시 BUY/SELL 딕셔너리 리스트, TradeLog 또는 청산 거래 순수익 배열)
         @param initial_capital: 초기 자본금
         @param trading_days: 연간 거래일
         @return: 전체 성과 지표
         """
+        series = equity_series(equity_curve)
+        periods = len(series.curve)
+        final_value = series.curve[-1]
         metrics = {}
         
         # 기본 지표
-        metrics['total_return'] = self.calculate_total_return(equity_curve[-1], initial_capital)
-        metrics['annual_return'] = self.calculate_annual_return(
-            equity_curve[-1], 
-            initial_capital, 
-            len(equity_curve)
-        )
+        metrics['total_return'] = self.calculate_total_return(final_value, initial_capital)
+        metrics['annual_return'] = self.calculate_annual_return(final_value, initial_capital, periods)
         
         # 리스크 지표
-        metrics['volatility'] = self.calculate_volatility(equity_curve)
+        metrics['volatility'] = self._volatility(series)
         metrics['annual_volatility'] = metrics['volatility'] * np.sqrt(trading_days)
-        metrics['mdd'] = self.calculate_mdd(equity_curve)
+        metrics['mdd'] = series.mdd
         
         # 수익성 지표
-        metrics['sharpe_ratio'] = self.calculate_sharpe_ratio(equity_curve, self.risk_free_rate)
-        metrics['sortino_ratio'] = self.calculate_sortino_ratio(equity_curve, self.risk_free_rate)
-        metrics['calmar_ratio'] = self.calculate_calmar_ratio(equity_curve, len(equity_curve))
-        
-        # 거래 지표
-        closing_trades = [t for t in trades if t.get('type') == 'SELL']
-        if closing_trades:
-            metrics['win_rate'] = self.calculate_win_rate(closing_trades)
-            metrics['profit_factor'] = self.calculate_profit_factor(closing_trades)
-            metrics['avg_win'] = self.calculate_average_win(closing_trades)
-            metrics['avg_loss'] = self.calculate_average_loss(closing_trades)
-            metrics['expectancy'] = self.calculate_expectancy(closing_trades)
+        metrics['sharpe_ratio'] = self._sharpe_ratio(series, self.risk_free_rate)
+        metrics['sortino_ratio'] = self._sortino_ratio(series, self.risk_free_rate)
+        metrics['calmar_ratio'] = self._calmar_ratio(series, periods)
+        
+        # 거래 지표 (레거시 SELL 기록/순수익 배열 기준, 전략 1/2 TradeLog는 엔진 결과에 이미 포함)
+        if isinstance(trades, TradeLog):
+            closing = None
+        elif isinstance(trades, np.ndarray):
+            closing = trade_profits(trades)
+        else:
+            closing = trade_profits([t for t in trades if t.get('type') == 'SELL'])
+        if closing is not None and len(closing.profits):
+            metrics['win_rate'] = self._win_rate(closing)
+            metrics['profit_factor'] = self._profit_factor(closing)
+            metrics['avg_win'] = self._average_win(closing)
+            metrics['avg_loss'] = self._average_loss(closing)
+            metrics['expectancy'] = self._expectancy(closing)
         
         logger.info(f"Calculated metrics: Return={metrics.get('total_return', 0):.2f}%, "
                    f"Sharpe={metrics.get('sharpe_ratio', 0):.2f}, MDD={metrics.get('mdd', 0):.2f}%")
@@ -91,45 +182,28 @@ class PerformanceCalculator:
             return 0.0
         
         total_return = final_value / initial_value
-        years = trading_days / 252  # 년 단위
+        years = trading_days / ANNUAL_DAYS  # 년 단위
         annual_return = (total_return ** (1 / years) - 1) * 100 if years > 0 else 0
         return annual_return
     
-    def calculate_volatility(self, equity_curve: List[float]) -> float:
+    def calculate_volatility(self, equity_curve: Union[List[float], np.ndarray]) -> float:
         """
         일일 변동성 계산
         
         @return: 표준편차 (일일)
         """
-        if len(equity_curve) < 2:
-            return 0.0
-        
-        returns = np.diff(equity_curve) / np.array(equity_curve[:-1])
-        volatility = np.std(returns)
-        return volatility
+        return self._volatility(equity_series(equity_curve))
     
-    def calculate_mdd(self, equity_curve: List[float]) -> float:
+    def calculate_mdd(self, equity_curve: Union[List[float], np.ndarray]) -> float:
         """
         Maximum Drawdown 계산 (%)
         
         @return: MDD 비율
         """
-        if not equity_curve or len(equity_curve) < 2:
-            return 0.0
-        
-        peak = equity_curve[0]
-        mdd = 0.0
-        
-        for value in equity_curve:
-            if value > peak:
-                peak = value
-            dd = (peak - value) / peak * 100 if peak > 0 else 0
-            if dd > mdd:
-                mdd = dd
-        
-        return mdd
+        return equity_series(equity_curve).mdd
     
-    def calculate_sharpe_ratio(self, equity_curve: List[float], risk_free_rate: float = 0.02) -> float:
+    def calculate_sharpe_ratio(self, equity_curve: Union[List[float], np.ndarray],
+                               risk_free_rate: float = 0.02) -> float:
         """
         Sharpe Ratio 계산
         
@@ -138,42 +212,18 @@ class PerformanceCalculator:
         @param risk_free_rate: 연간 무위험 이자율
         @return: Sharpe Ratio
         """
-        if len(equity_curve) < 2:
-            return 0.0
-        
-        returns = np.diff(equity_curve) / np.array(equity_curve[:-1])
-        avg_return = np.mean(returns) * 252  # 연환산
-        volatility = np.std(returns) * np.sqrt(252)
-        
-        if volatility == 0:
-            return 0.0
-        
-        sharpe = (avg_return - risk_free_rate) / volatility
-        return sharpe
+        return self._sharpe_ratio(equity_series(equity_curve), risk_free_rate)
     
-    def calculate_sortino_ratio(self, equity_curve: List[float], risk_free_rate: float = 0.02) -> float:
+    def calculate_sortino_ratio(self, equity_curve: Union[List[float], np.ndarray],
+                                risk_free_rate: float = 0.02) -> float:
         """
         Sortino Ratio 계산 (하방 위험도만 고려)
         
         @return: Sortino Ratio
         """
-        if len(equity_curve) < 2:
-            return 0.0
-        
-        returns = np.diff(equity_curve) / np.array(equity_curve[:-1])
-        avg_return = np.mean(returns) * 252
-        
-        # 음수 수익만 고려
-        downside_returns = returns[returns < 0]
-        downside_volatility = np.std(downside_returns) * np.sqrt(252) if len(downside_returns) > 0 else 0
-        
-        if downside_volatility == 0:
-            return 0.0
-        
-        sortino = (avg_return - risk_free_rate) / downside_volatility
-        return sortino
+        return self._sortino_ratio(equity_series(equity_curve), risk_free_rate)
     
-    def calculate_calmar_ratio(self, equity_curve: List[float], trading_days: int) -> float:
+    def calculate_calmar_ratio(self, equity_curve: Union[List[float], np.ndarray], trading_days: int) -> float:
         """
         Calmar Ratio 계산
         
@@ -181,32 +231,18 @@ class PerformanceCalculator:
         
         @return: Calmar Ratio
         """
-        if len(equity_curve) < 2:
-            return 0.0
-        
-        annual_return = self.calculate_annual_return(equity_curve[-1], equity_curve[0], trading_days)
-        mdd = self.calculate_mdd(equity_curve)
-        
-        if mdd == 0 or mdd < 0.01:
-            return 0.0
-        
-        calmar = annual_return / mdd
-        return calmar
+        return self._calmar_ratio(equity_series(equity_curve), trading_days)
     
-    def calculate_win_rate(self, closing_trades: List[Dict]) -> float:
+    def calculate_win_rate(self, closing_trades: Union[List[Dict], np.ndarray]) -> float:
         """
         승률 계산 (%)
         
-        @param closing_trades: SELL 거래 로그
+        @param closing_trades: SELL 거래 로그 또는 순수익 배열
         @return: 승률 비율
         """
-        if not closing_trades:
-            return 0.0
-        
-        winning = len([t for t in closing_trades if (t.get('profit', 0) or 0) > 0])
-        return (winning / len(closing_trades)) * 100
+        return self._win_rate(trade_profits(closing_trades))
     
-    def calculate_profit_factor(self, closing_trades: List[Dict]) -> float:
+    def calculate_profit_factor(self, closing_trades: Union[List[Dict], np.ndarray]) -> float:
         """
         이익 지수 계산
         
@@ -214,32 +250,17 @@ class PerformanceCalculator:
         
         @return: Profit Factor
         """
-        winning_trades = [t for t in closing_trades if (t.get('profit', 0) or 0) > 0]
-        losing_trades = [t for t in closing_trades if (t.get('profit', 0) or 0) <= 0]
-        
-        total_profit = sum([t.get('profit', 0) or 0 for t in winning_trades])
-        total_loss = abs(sum([t.get('profit', 0) or 0 for t in losing_trades]))
-        
-        if total_loss == 0:
-            return 0.0
-        
-        return total_profit / total_loss if total_profit > 0 else 0.0
+        return self._profit_factor(trade_profits(closing_trades))
     
-    def calculate_average_win(self, closing_trades: List[Dict]) -> float:
+    def calculate_average_win(self, closing_trades: Union[List[Dict], np.ndarray]) -> float:
         """평균 수익 계산"""
-        winning_trades = [t for t in closing_trades if (t.get('profit', 0) or 0) > 0]
-        if not winning_trades:
-            return 0.0
-        return sum([t.get('profit', 0) or 0 for t in winning_trades]) / len(winning_trades)
+        return self._average_win(trade_profits(closing_trades))
     
-    def calculate_average_loss(self, closing_trades: List[Dict]) -> float:
+    def calculate_average_loss(self, closing_trades: Union[List[Dict], np.ndarray]) -> float:
         """평균 손실 계산"""
-        losing_trades = [t for t in closing_trades if (t.get('profit', 0) or 0) <= 0]
-        if not losing_trades:
-            return 0.0
-        return sum([abs(t.get('profit', 0) or 0) for t in losing_trades]) / len(losing_trades)
+        return self._average_loss(trade_profits(closing_trades))
     
-    def calculate_expectancy(self, closing_trades: List[Dict]) -> float:
+    def calculate_expectancy(self, closing_trades: Union[List[Dict], np.ndarray]) -> float:
         """
         기댓값 계산 (거래당 평균 수익)
         
@@ -247,13 +268,82 @@ class PerformanceCalculator:
         
         @return: 거래당 기댓값
         """
-        if not closing_trades:
+        return self._expectancy(trade_profits(closing_trades))
+    
+    # ===== 중간 결과 기반 지표 =====
+    
+    @staticmethod
+    def _volatility(series: EquitySeries) -> float:
+        if len(series.returns) == 0:
+            return 0.0
+        return np.std(series.returns)
+    
+    @staticmethod
+    def _sharpe_ratio(series: EquitySeries, risk_free_rate: float) -> float:
+        if len(series.returns) == 0:
             return 0.0
         
-        win_rate = self.calculate_win_rate(closing_trades) / 100
-        loss_rate = 1 - win_rate
-        avg_win = self.calculate_average_win(closing_trades)
-        avg_loss = self.calculate_average_loss(closing_trades)
+        avg_return = np.mean(series.returns) * ANNUAL_DAYS  # 연환산
+        volatility = np.std(series.returns) * np.sqrt(ANNUAL_DAYS)
+        
+        if volatility == 0:
+            return 0.0
+        return (avg_return - risk_free_rate) / volatility
+    
+    @staticmethod
+    def _sortino_ratio(series: EquitySeries, risk_free_rate: float) -> float:
+        if len(series.returns) == 0:
+            return 0.0
         
-        expectancy = (win_rate * avg_win) - (loss_rate * avg_loss)
-        return expectancy
+        avg_return = np.mean(series.returns) * ANNUAL_DAYS
+        
+        # 음수 수익만 고려
+        downside_returns = series.returns[series.returns < 0]
+        downside_volatility = np.std(downside_returns) * np.sqrt(ANNUAL_DAYS) if len(downside_returns) > 0 else 0
+        
+        if downside_volatility == 0:
+            return 0.0
+        return (avg_return - risk_free_rate) / downside_volatility
+    
+    def _calmar_ratio(self, series: EquitySeries, trading_days: int) -> float:
+        if len(series.curve) < 2:
+            return 0.0
+        
+        annual_return = self.calculate_annual_return(series.curve[-1], series.curve[0], trading_days)
+        if series.mdd == 0 or series.mdd < 0.01:
+            return 0.0
+        return annual_return / series.mdd
+    
+    @staticmethod
+    def _win_rate(closing: TradeProfits) -> float:
+        total = closing.win_count + closing.loss_count
+        if total == 0:
+            return 0.0
+        return (closing.win_count / total) * 100
+    
+    @staticmethod
+    def _profit_factor(closing: TradeProfits) -> float:
+        total_loss = abs(closing.loss_total)
+        if total_loss == 0:
+            return 0.0
+        return closing.win_total / total_loss if closing.win_total > 0 else 0.0
+    
+    @staticmethod
+    def _average_win(closing: TradeProfits) -> float:
+        if closing.win_count == 0:
+            return 0.0
+        return closing.win_total / closing.win_count
+    
+    @staticmethod
+    def _average_loss(closing: TradeProfits) -> float:
+        if closing.loss_count == 0:
+            return 0.0
+        return closing.loss_total / closing.loss_count
+    
+    def _expectancy(self, closing: TradeProfits) -> float:
+        if closing.win_count + closing.loss_count == 0:
+            return 0.0
+        
+        win_rate = self._win_rate(closing) / 100
+        loss_rate = 1 - win_rate
+        return (win_rate * self._average_win(closing)) - (loss_rate * self._average_loss(closing))
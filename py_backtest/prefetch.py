@@ -0,0 +1,277 @@
+"""
+PricePrefetch - 장 시작 전 주가 데이터 일괄 수집 (DataCache 예열)
+역할: 종목 코드 목록(예: KOSPI 200)을 배치로 묶어 yf.download 다중 티커 조회로 한 번에 수집하고,
+      결과를 DataCache에 하나의 트랜잭션으로 저장하여 사용자 요청이 콜드 조회를 하지 않도록 함
+
+  - 티커 판별: 시장 인덱스/ticker 캐시 → 미확정 종목은 .KS 배치 조회, 데이터가 없는 종목만 .KQ로 재조회
+              (종목별 history(period='1d') 탐색 호출 없음)
+  - 배치 동시 실행 수 제한 (max_workers), 배치 실패 시 지수 백오프 재시도
+
+사용 예:
+  python prefetch.py 005930 000660 035720
+  python prefetch.py --file ../test-data/mock-stocks.json --period 60
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+try:
+    from backtest_engine import BacktestEngine
+    from data_cache import get_cache
+except ImportError:
+    from .backtest_engine import BacktestEngine
+    from .data_cache import get_cache
+
+try:
+    import yfinance as yf
+    HAS_YFINANCE = True
+except ImportError:
+    HAS_YFINANCE = False
+    yf = None
+
+logger = logging.getLogger(__name__)
+
+# 배치 크기 / 동시 배치 수 / 재시도 (기본값)
+DEFAULT_BATCH_SIZE = 20
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_SEC = 2.0
+
+MARKET_SUFFIXES = ('KS', 'KQ')
+
+
+def download_batch(tickers: List[str], period: int, retries: int = DEFAULT_RETRIES,
+                   backoff_sec: float = DEFAULT_BACKOFF_SEC) -> Dict[str, pd.DataFrame]:
+    """
+    다중 티커 2분봉 일괄 조회 (실패 시 지수 백오프 재시도)
+
+    @param tickers: Yahoo Finance 티커 목록 (예: ["005930.KS", "000660.KS"])
+    @param period: 조회 기간 (일)
+    @param retries: 재시도 횟수
+    @param backoff_sec: 첫 재시도 대기 시간 (초, 이후 2배씩 증가)
+    @return: { ticker: Date/OHLCV DataFrame } (데이터가 없는 티커는 제외)
+    """
+    for attempt in range(retries + 1):
+        try:
+            raw = yf.download(
+                tickers=tickers,
+                period=f"{period}d",
+                interval="2m",
+                group_by='ticker',
+                auto_adjust=True,  # Ticker.history() 기본값과 동일
+                threads=False,     # 동시성은 배치 단위로 제한
+                progress=False
+            )
+            # 응답이 없으면(None) 일시적 오류(요청 제한 등)로 보고 재시도
+            # (행이 0개인 DataFrame은 배치 전체가 해당 시장에 없는 종목 → 재시도하지 않고 "데이터 없음")
+            if raw is not None or attempt == retries:
+                return _split_download(raw, tickers)
+            error = "no response"
+        except Exception as e:
+            if attempt == retries:
+                raise
+            error = str(e)
+
+        wait_sec = backoff_sec * (2 ** attempt)
+        logger.warning(
+            f"Batch download failed ({error}), retry {attempt + 1}/{retries} in {wait_sec:.1f}s "
+            f"| tickers={len(tickers)}"
+        )
+        time.sleep(wait_sec)
+    return {}
+
+
+def _split_download(raw: Optional[pd.DataFrame], tickers: List[str]) -> Dict[str, pd.DataFrame]:
+    """yf.download 결과(티커별 MultiIndex 컬럼) → 티커별 Date/OHLCV DataFrame"""
+    if raw is None or raw.empty:
+        return {}
+
+    frames = {}
+    for ticker in tickers:
+        if isinstance(raw.columns, pd.MultiIndex):
+            if ticker not in raw.columns.get_level_values(0):
+                continue
+            df = raw[ticker]
+        elif len(tickers) == 1:
+            df = raw
+        else:
+            continue
+
+        # 다른 티커와 합쳐진 인덱스에서 이 티커의 봉이 없는 행 제거
+        df = df.dropna(how='all')
+        if df.empty:
+            continue
+        frames[ticker] = BacktestEngine._normalize_history(df)
+    return frames
+
+
+def prefetch_prices(stock_codes: List[str], period: int = 60,
+                    batch_size: int = DEFAULT_BATCH_SIZE,
+                    max_workers: int = DEFAULT_MAX_WORKERS,
+                    retries: int = DEFAULT_RETRIES,
+                    backoff_sec: float = DEFAULT_BACKOFF_SEC,
+                    force: bool = False,
+                    cache=None) -> Dict[str, Any]:
+    """
+    종목 목록 일괄 수집 → DataCache 저장
+
+    @param stock_codes: 종목 코드 목록
+    @param period: 조회 기간 (일)
+    @param batch_size: yf.download 1회당 티커 수
+    @param max_workers: 동시에 조회하는 배치 수
+    @param retries: 배치별 재시도 횟수
+    @param backoff_sec: 첫 재시도 대기 시간 (초)
+    @param force: True면 당일 캐시가 있는 종목도 다시 수집
+    @param cache: DataCache (기본값: 글로벌 캐시)
+    @return: {"requested", "already_cached", "fetched", "failed", "tickers", "elapsed_sec"}
+    """
+    if not HAS_YFINANCE or yf is None:
+        raise ImportError("yfinance is not installed. Install with: pip install yfinance")
+
+    started = time.perf_counter()
+    cache = cache or get_cache()
+    stock_codes = list(dict.fromkeys(stock_codes))
+
+    # 1. 당일 캐시가 있는 종목 제외 (peek: 적중/미스 통계와 메모리 LRU에 영향 없이 확인)
+    pending = [code for code in stock_codes if force or cache.peek(code) is None]
+    already_cached = len(stock_codes) - len(pending)
+
+    logger.info(
+        f"Prefetch started | stocks={len(stock_codes)} | pending={len(pending)} | period={period}d | "
+        f"batch={batch_size} | workers={max_workers}"
+    )
+
+    # 2. 티커 판별: 캐시에 있으면 그대로, 없으면 .KS → .KQ 순으로 배치 조회
+    frames: Dict[str, pd.DataFrame] = {}
+    tickers: Dict[str, str] = {}
+    failed: List[Dict[str, str]] = []
+
+    known = {}
+    unresolved = []
+    for code in pending:
+        market = cache.get_market(code)
+        ticker = f"{code}.{market}" if market else cache.get_ticker(code)
+        if ticker:
+            known[code] = ticker
+        else:
+            unresolved.append(code)
+
+    def fetch(code_to_ticker: Dict[str, str]) -> Dict[str, pd.DataFrame]:
+        """종목→티커 매핑을 배치로 나눠 동시 조회 → { 종목: DataFrame }"""
+        items = list(code_to_ticker.items())
+        batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+        fetched = {}
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='prefetch') as pool:
+            futures = {
+                pool.submit(download_batch, [ticker for _, ticker in batch], period, retries, backoff_sec): batch
+                for batch in batches
+            }
+            for future, batch in futures.items():
+                try:
+                    by_ticker = future.result()
+                except Exception as e:
+                    logger.error(f"Batch download failed after {retries} retries: {str(e)}")
+                    by_ticker = {}
+                for code, ticker in batch:
+                    if ticker in by_ticker:
+                        fetched[code] = by_ticker[ticker]
+        return fetched
+
+    remaining = dict(known)
+    remaining.update({code: f"{code}.{MARKET_SUFFIXES[0]}" for code in unresolved})
+    for index, suffix in enumerate(MARKET_SUFFIXES):
+        if not remaining:
+            break
+        fetched = fetch(remaining)
+        for code, df in fetched.items():
+            frames[code] = df
+            tickers[code] = remaining[code]
+        # 데이터가 없는 미확정 종목만 다음 시장 접미사로 재시도
+        next_suffix = MARKET_SUFFIXES[index + 1] if index + 1 < len(MARKET_SUFFIXES) else None
+        remaining = {
+            code: f"{code}.{next_suffix}"
+            for code in remaining
+            if code not in fetched and code in unresolved and next_suffix
+        }
+
+    for code in pending:
+        if code not in frames:
+            failed.append({'stock_code': code, 'error': 'No data available'})
+
+    # 3. 캐시 저장 (파일 기록 후 메타데이터 일괄 등록)
+    detected = {code: tickers[code].rsplit('.', 1)[1] for code in unresolved if code in tickers}
+    for code, market in detected.items():
+        cache.put_ticker(code, f"{code}.{market}")
+    cache.put_markets(detected, source='download')
+    saved = cache.put_many(frames) if frames else []
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"Prefetch finished | fetched={len(saved)} | cached={already_cached} | failed={len(failed)} | "
+        f"elapsed={elapsed:.1f}s"
+    )
+    return {
+        'requested': len(stock_codes),
+        'already_cached': already_cached,
+        'fetched': len(saved),
+        'failed': failed,
+        'tickers': tickers,
+        'elapsed_sec': round(elapsed, 3)
+    }
+
+
+def load_stock_codes(path: str) -> List[str]:
+    """
+    종목 목록 파일 로드
+
+    @param path: JSON 파일 (["005930", ...] 또는 [{"code": "005930", ...}, ...])
+    @return: 종목 코드 목록
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        items = json.load(f)
+    return [item['code'] if isinstance(item, dict) else str(item) for item in items]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prefetch intraday prices into DataCache')
+    parser.add_argument('stock_codes', nargs='*', help='종목 코드 (예: 005930 000660)')
+    parser.add_argument('--file', help='종목 목록 JSON 파일')
+    parser.add_argument('--period', type=int, default=60, help='조회 기간 (일)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS)
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES)
+    parser.add_argument('--force', action='store_true', help='당일 캐시가 있어도 다시 수집')
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    stock_codes = list(args.stock_codes)
+    if args.file:
+        stock_codes.extend(load_stock_codes(args.file))
+    if not stock_codes:
+        parser.error('stock_codes or --file is required')
+
+    summary = prefetch_prices(
+        stock_codes,
+        period=args.period,
+        batch_size=args.batch_size,
+        max_workers=args.workers,
+        retries=args.retries,
+        force=args.force
+    )
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return 0 if not summary['failed'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,587 @@
+"""
+Replay - Worker stdin/stdout 프로토콜 요청 기록/재생 부하 테스트
+역할: 운영 중인 worker.py가 받은 요청과 그 요청이 사용한 시세 스냅샷을 JSONL 코퍼스로 기록하고,
+      코퍼스를 하나 이상의 worker.py 프로세스에 목표 속도/동시성으로 재생하여 지연 시간/처리량/RSS를 측정
+
+기록 (capture):
+  WORKER_CAPTURE_PATH=/path/corpus.jsonl python worker.py
+  - {"kind": "snapshot"}: 종목별 시세 (prices 딕셔너리 형식, 같은 데이터는 1회만 기록)
+  - {"kind": "request"} : 수신 요청 원문 + 수신 시각 오프셋 + 처리 시간/상태
+  요청에 prices/prices_by_code가 포함된 종목은 스냅샷을 따로 남기지 않는다.
+
+재생 (replay, 오프라인):
+  python replay.py corpus.jsonl --workers 2 --concurrency 8
+  python replay.py corpus.jsonl --rate 20 --loops 3 --output report.json
+  python replay.py corpus.jsonl --speed 1.0          # 기록된 수신 간격 그대로
+  - 시세 공급 (--price-source):
+      cache : 스냅샷을 임시 DataCache에 저장하고 PRICE_CACHE_DIR로 worker에 연결 (캐시 적중 경로, 기본값)
+      inline: 스냅샷을 요청의 prices/prices_by_code로 전달 (Node.js가 시세를 넘기는 경로)
+  - Yahoo Finance 조회가 필요한 요청(prefetch, 스냅샷 없는 종목)은 재생하지 않는다.
+  - 결과: p50/p95/p99 지연(ms), 처리량(req/s), 오류 수, 요청 유형별 지연, worker 프로세스 트리 최대 RSS
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from backtest_engine import BacktestEngine
+    from data_cache import DataCache
+except ImportError:
+    from .backtest_engine import BacktestEngine
+    from .data_cache import DataCache
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'worker.py')
+
+# 재생 기본값
+DEFAULT_WORKERS = 1
+DEFAULT_CONCURRENCY = 4
+PRICE_SOURCES = ('cache', 'inline')
+
+# 오프라인 재생이 불가능한 요청 유형 (Yahoo Finance 직접 조회 / 지표 조회)
+UNREPLAYABLE_TYPES = ('prefetch', 'metrics')
+
+# RSS 샘플링 주기 (초)
+RSS_SAMPLE_SEC = 0.2
+
+# 응답 대기 중 worker 종료/응답 시간 초과 확인 주기 (초) / 요청별 응답 대기 상한 (초, 기본값)
+LIVENESS_POLL_SEC = 1.0
+DEFAULT_RESPONSE_TIMEOUT_SEC = 600.0
+
+
+def request_kind(request: Dict[str, Any]) -> str:
+    """요청 유형 (single / sweep / multi_stock / prefetch / metrics)"""
+    return request.get('type') if request.get('type') in ('sweep', 'multi_stock', 'prefetch', 'metrics') else 'single'
+
+
+def request_stock_codes(request: Dict[str, Any]) -> List[str]:
+    """요청이 시세를 사용하는 종목 코드 목록"""
+    if request_kind(request) in ('multi_stock', 'prefetch'):
+        return list(dict.fromkeys(request.get('stock_codes') or []))
+    return [request['stock_code']] if request.get('stock_code') else []
+
+
+def inline_price_codes(request: Dict[str, Any]) -> set:
+    """요청에 시세가 포함된 종목 코드 (prices / prices_by_code)"""
+    if request_kind(request) == 'multi_stock':
+        return {code for code, prices in (request.get('prices_by_code') or {}).items() if prices}
+    prices = request.get('prices')
+    if prices and prices.get('dates') and request.get('stock_code'):
+        return {request['stock_code']}
+    return set()
+
+
+# ──────────────────────────────────────────────
+# 기록
+# ──────────────────────────────────────────────
+
+class RequestRecorder:
+    """
+    Worker 요청 기록기 (JSONL 코퍼스, 스레드 안전)
+
+    @param path: 코퍼스 파일 경로 (이어 쓰기)
+    @param cache: 스냅샷을 읽을 DataCache (peek: 적중 카운터/LRU 순서 변경 없음)
+    """
+
+    def __init__(self, path: str, cache: DataCache):
+        self.path = path
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        # 종목별 마지막으로 기록한 스냅샷 (행 수, 마지막 봉) - 바뀐 경우에만 다시 기록
+        self._snapshots: Dict[str, Tuple[int, str]] = {}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+        logger.info(f"Request capture enabled: {path}")
+
+    def record(self, request: Dict[str, Any], received_at: float, elapsed_sec: float, status: str):
+        """
+        요청 1건 기록 (필요한 종목 스냅샷 먼저 기록)
+
+        @param request: 수신 요청 원문
+        @param received_at: 수신 시각 (time.monotonic)
+        @param elapsed_sec: 처리 시간 (초)
+        @param status: 응답 상태 (success / error)
+        """
+        inline = inline_price_codes(request)
+        # 스냅샷 확인/기록을 한 번에 처리 (코퍼스에서 스냅샷이 항상 그 스냅샷을 쓰는 요청보다 앞에 오도록)
+        with self._lock:
+            records = []
+            for code in request_stock_codes(request):
+                if code in inline:
+                    continue
+                df = self.cache.peek(code)
+                if df is None or df.empty:
+                    continue
+                fingerprint = (len(df), str(df['Date'].iloc[-1]))
+                if self._snapshots.get(code) == fingerprint:
+                    continue
+                self._snapshots[code] = fingerprint
+                records.append({
+                    'kind': 'snapshot',
+                    'stock_code': code,
+                    'rows': len(df),
+                    'prices': BacktestEngine.to_prices_dict(df)
+                })
+
+            records.append({
+                'kind': 'request',
+                'offset_sec': round(received_at - self._started, 6),
+                'captured_at': datetime.now().isoformat(timespec='milliseconds'),
+                'elapsed_ms': round(elapsed_sec * 1000, 3),
+                'status': status,
+                'request': request
+            })
+            self._file.write(''.join(json.dumps(record, ensure_ascii=False, default=str) + '\n' for record in records))
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+# ──────────────────────────────────────────────
+# 코퍼스 로드
+# ──────────────────────────────────────────────
+
+def load_corpus(path: str) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """
+    코퍼스 파일 로드
+
+    @param path: JSONL 코퍼스
+    @return: (request 레코드 목록, { 종목 코드: 스냅샷 prices 딕셔너리 (마지막 기록) })
+    """
+    requests = []
+    snapshots = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get('kind') == 'snapshot':
+                snapshots[record['stock_code']] = record['prices']
+            elif record.get('kind') == 'request':
+                requests.append(record)
+    return requests, snapshots
+
+
+def prepare_requests(records: List[Dict[str, Any]], snapshots: Dict[str, Dict[str, Any]],
+                     price_source: str) -> Tuple[List[Dict[str, Any]], List[float], Dict[str, int]]:
+    """
+    재생할 요청 목록 (오프라인 재생 가능한 요청만)
+
+    @param records: request 레코드
+    @param snapshots: 종목별 스냅샷
+    @param price_source: 'cache' | 'inline'
+    @return: (요청 목록, 기록된 수신 오프셋(초), 건너뛴 사유별 건수)
+    """
+    prepared, offsets = [], []
+    skipped = {'unreplayable': 0, 'missing_snapshot': 0}
+    for record in records:
+        request = dict(record['request'])
+        kind = request_kind(request)
+        if kind in UNREPLAYABLE_TYPES:
+            skipped['unreplayable'] += 1
+            continue
+
+        inline = inline_price_codes(request)
+        missing = [code for code in request_stock_codes(request) if code not in inline and code not in snapshots]
+        if missing or not request_stock_codes(request):
+            skipped['missing_snapshot'] += 1
+            continue
+
+        if price_source == 'inline':
+            if kind == 'multi_stock':
+                by_code = dict(request.get('prices_by_code') or {})
+                for code in request_stock_codes(request):
+                    if not by_code.get(code):
+                        by_code[code] = snapshots[code]
+                request['prices_by_code'] = by_code
+            elif not inline:
+                request['prices'] = snapshots[request['stock_code']]
+
+        prepared.append(request)
+        offsets.append(float(record.get('offset_sec') or 0.0))
+    return prepared, offsets, skipped
+
+
+def seed_cache(cache_dir: str, snapshots: Dict[str, Dict[str, Any]]) -> int:
+    """스냅샷 → 임시 DataCache (당일 데이터로 저장)"""
+    cache = DataCache(os.path.join(cache_dir, 'price_cache.db'))
+    frames = {}
+    for code, prices in snapshots.items():
+        engine = BacktestEngine(code)
+        frames[code] = engine.load_price_data(prices_dict=prices)
+    saved = cache.put_many(frames) if frames else []
+    cache.close()
+    return len(saved)
+
+
+# ──────────────────────────────────────────────
+# 재생
+# ──────────────────────────────────────────────
+
+class WorkerProcess:
+    """재생 대상 worker.py 프로세스 1개 (stdin 쓰기 / stdout 응답 수신 스레드)"""
+
+    def __init__(self, index: int, env: Dict[str, str], on_response, stderr_path: Optional[str] = None):
+        self.index = index
+        self._stderr = open(stderr_path, 'ab') if stderr_path else subprocess.DEVNULL
+        self.process = subprocess.Popen(
+            [sys.executable, WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self._stderr,
+            env=env
+        )
+        self.in_flight = 0
+        self._write_lock = threading.Lock()
+        self._on_response = on_response
+        self._reader = threading.Thread(target=self._read, name=f'replay-reader-{index}', daemon=True)
+        self._reader.start()
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def send(self, payload: bytes):
+        with self._write_lock:
+            self.in_flight += 1
+            self.process.stdin.write(payload)
+            self.process.stdin.flush()
+
+    def _read(self):
+        for line in self.process.stdout:
+            if not line.strip():
+                continue
+            try:
+                response = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if response.get('status') == 'partial':
+                continue
+            with self._write_lock:
+                self.in_flight -= 1
+            self._on_response(response)
+
+    def close(self, timeout: float = 30.0):
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        if self._stderr is not subprocess.DEVNULL:
+            self._stderr.close()
+
+
+class RssSampler:
+    """worker 프로세스 트리(풀 하위 프로세스 포함) RSS 합계 최대값 샘플링 (Linux /proc)"""
+
+    def __init__(self, pids: List[int]):
+        self.pids = pids
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='replay-rss', daemon=True)
+
+    @staticmethod
+    def available() -> bool:
+        return os.path.exists('/proc/self/status')
+
+    def start(self):
+        if self.available():
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(RSS_SAMPLE_SEC):
+            self.peak_bytes = max(self.peak_bytes, sum(self._rss(pid) for pid in self._tree()))
+
+    def _tree(self) -> List[int]:
+        parents = {}
+        for name in os.listdir('/proc'):
+            if not name.isdigit():
+                continue
+            try:
+                with open(f'/proc/{name}/stat', 'r') as f:
+                    parents[int(name)] = int(f.read().rsplit(')', 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+        tree, frontier = set(self.pids), list(self.pids)
+        while frontier:
+            parent = frontier.pop()
+            for pid, ppid in parents.items():
+                if ppid == parent and pid not in tree:
+                    tree.add(pid)
+                    frontier.append(pid)
+        return list(tree)
+
+    @staticmethod
+    def _rss(pid: int) -> int:
+        try:
+            with open(f'/proc/{pid}/status', 'r') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            pass
+        return 0
+
+
+def replay(requests: List[Dict[str, Any]], offsets: List[float], workers: int = DEFAULT_WORKERS,
+           concurrency: int = DEFAULT_CONCURRENCY, rate: Optional[float] = None,
+           speed: Optional[float] = None, loops: int = 1, env: Optional[Dict[str, str]] = None,
+           stderr_path: Optional[str] = None,
+           response_timeout: Optional[float] = DEFAULT_RESPONSE_TIMEOUT_SEC) -> Dict[str, Any]:
+    """
+    요청 재생 + 측정
+
+    전송 방식: rate 지정 시 초당 rate건 (open-loop), speed 지정 시 기록된 수신 간격 / speed,
+    둘 다 없으면 동시 처리 중 요청을 concurrency건으로 유지 (closed-loop)
+
+    @param requests: 요청 목록
+    @param offsets: 요청별 기록된 수신 오프셋 (초)
+    @param workers: worker 프로세스 수 (요청은 처리 중 요청이 가장 적은 프로세스로 전송)
+    @param concurrency: closed-loop 동시 요청 수
+    @param rate: 초당 전송 건수
+    @param speed: 기록 시간 배속
+    @param loops: 코퍼스 반복 횟수
+    @param env: worker 환경 변수
+    @param stderr_path: worker 로그 파일 (None이면 버림)
+    @param response_timeout: 요청별 응답 대기 상한 (초, 초과하거나 worker가 종료되면 오류로 집계, None이면 무제한)
+    @return: 측정 결과 (worker가 모두 종료되면 남은 요청은 보내지 않고 집계)
+    """
+    total = len(requests) * loops
+    sent_at: Dict[str, float] = {}
+    kinds: Dict[str, str] = {}
+    latencies: Dict[str, float] = {}
+    errors: List[Dict[str, Any]] = []
+    # 응답 대기 중 요청 → 전송한 worker (응답 수신/유실 처리 시 제거)
+    pending: Dict[str, WorkerProcess] = {}
+    finished_count = 0
+    done = threading.Event()
+    slots = threading.Semaphore(concurrency)
+    lock = threading.Lock()
+    closed_loop = rate is None and speed is None
+
+    def finish(request_id: str, error: Optional[str] = None):
+        """요청 1건 종료 처리 (lock 보유 상태에서 호출)"""
+        nonlocal finished_count
+        del pending[request_id]
+        if error is not None:
+            errors.append({'request_id': request_id, 'error': error})
+        finished_count += 1
+        if finished_count == total:
+            done.set()
+        if closed_loop:
+            slots.release()
+
+    def on_response(response: Dict[str, Any]):
+        request_id = response.get('request_id')
+        finished = time.perf_counter()
+        with lock:
+            if request_id not in pending:
+                return  # 이미 유실 처리된 요청의 늦은 응답
+            latencies[request_id] = finished - sent_at[request_id]
+            finish(request_id, None if response.get('status') == 'success' else response.get('error'))
+
+    def reap() -> bool:
+        """
+        응답이 오지 않을 요청을 오류로 종료 (worker 종료 / 응답 시간 초과)
+
+        @return: 살아 있는 worker가 있으면 True
+        """
+        now = time.perf_counter()
+        with lock:
+            for request_id, process in list(pending.items()):
+                if not process.alive():
+                    finish(request_id, 'no response (worker exited)')
+                elif response_timeout is not None and now - sent_at[request_id] > response_timeout:
+                    finish(request_id, f'no response within {response_timeout:.0f}s')
+        return any(p.alive() for p in processes)
+
+    processes = [WorkerProcess(i, env or dict(os.environ), on_response, stderr_path) for i in range(workers)]
+    sampler = RssSampler([p.process.pid for p in processes])
+    sampler.start()
+
+    started = time.perf_counter()
+    try:
+        if total == 0:
+            done.set()
+        loop_span = (max(offsets) - min(offsets)) if offsets else 0.0
+        for seq, (loop_index, (index, request)) in enumerate(
+                itertools.product(range(loops), enumerate(requests))):
+            if closed_loop:
+                # 슬롯 대기 중에도 worker 종료/응답 시간 초과 확인 (응답이 오지 않으면 슬롯이 반환되지 않음)
+                acquired = slots.acquire(timeout=LIVENESS_POLL_SEC)
+                while not acquired and reap():
+                    acquired = slots.acquire(timeout=LIVENESS_POLL_SEC)
+                if not acquired:
+                    logger.error("All workers exited, stopping replay")
+                    break
+            else:
+                if rate is not None:
+                    due = seq / rate
+                else:
+                    due = (offsets[index] - offsets[0] + loop_index * loop_span) / speed
+                delay = started + due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+            alive = [p for p in processes if p.alive()]
+            if not alive:
+                if closed_loop:
+                    slots.release()
+                logger.error("All workers exited, stopping replay")
+                break
+
+            request_id = f'replay-{seq}'
+            payload = (json.dumps(dict(request, request_id=request_id), ensure_ascii=False) + '\n').encode('utf-8')
+            target = min(alive, key=lambda p: p.in_flight)
+            with lock:
+                sent_at[request_id] = time.perf_counter()
+                kinds[request_id] = request_kind(request)
+                pending[request_id] = target
+            try:
+                target.send(payload)
+            except OSError as e:
+                with lock:
+                    if request_id in pending:
+                        finish(request_id, f'send failed: {e}')
+
+        # 보낸 요청의 응답 수신 대기 (worker가 모두 종료되면 남은 요청은 응답 없음으로 처리)
+        while not done.wait(LIVENESS_POLL_SEC):
+            reap()
+            with lock:
+                if not pending:
+                    break  # 전송이 중단된 경우 (worker 모두 종료)
+        elapsed = time.perf_counter() - started
+    finally:
+        sampler.stop()
+        for process in processes:
+            process.close()
+
+    report = summarize(latencies, kinds, errors, elapsed, sampler.peak_bytes, workers)
+    report['unsent'] = total - len(sent_at)
+    return report
+
+
+def _percentiles(values_ms: List[float]) -> Dict[str, float]:
+    if not values_ms:
+        return {'count': 0}
+    arr = np.asarray(values_ms)
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+    return {
+        'count': int(len(arr)),
+        'p50_ms': round(float(p50), 3),
+        'p95_ms': round(float(p95), 3),
+        'p99_ms': round(float(p99), 3),
+        'max_ms': round(float(arr.max()), 3),
+        'mean_ms': round(float(arr.mean()), 3)
+    }
+
+
+def summarize(latencies: Dict[str, float], kinds: Dict[str, str], errors: List[Dict[str, Any]],
+              elapsed: float, peak_rss_bytes: int, workers: int) -> Dict[str, Any]:
+    """측정 결과 집계 (전체 / 요청 유형별 지연 백분위)"""
+    by_kind: Dict[str, List[float]] = {}
+    for request_id, seconds in latencies.items():
+        by_kind.setdefault(kinds[request_id], []).append(seconds * 1000)
+    all_ms = [ms for values in by_kind.values() for ms in values]
+    return {
+        'workers': workers,
+        'completed': len(latencies),
+        'errors': len(errors),
+        'error_samples': errors[:10],
+        'elapsed_sec': round(elapsed, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 3) if elapsed > 0 else 0.0,
+        'latency': _percentiles(all_ms),
+        'latency_by_type': {kind: _percentiles(values) for kind, values in sorted(by_kind.items())},
+        'peak_rss_mb': round(peak_rss_bytes / (1024 * 1024), 1) if peak_rss_bytes else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a captured worker request corpus offline')
+    parser.add_argument('corpus', help='WORKER_CAPTURE_PATH로 기록한 JSONL 코퍼스')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='worker.py 프로세스 수')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='closed-loop 동시 요청 수')
+    parser.add_argument('--rate', type=float, help='초당 전송 건수 (open-loop)')
+    parser.add_argument('--speed', type=float, help='기록된 수신 간격 배속 (예: 1.0 = 실제 속도)')
+    parser.add_argument('--loops', type=int, default=1, help='코퍼스 반복 횟수')
+    parser.add_argument('--price-source', choices=PRICE_SOURCES, default='cache')
+    parser.add_argument('--pool-workers', type=int, help='worker별 BACKTEST_POOL_WORKERS')
+    parser.add_argument('--worker-log', help='worker stderr 로그 파일 (기본값: 버림)')
+    parser.add_argument('--output', help='결과 JSON 저장 경로')
+    parser.add_argument('--response-timeout', type=float, default=DEFAULT_RESPONSE_TIMEOUT_SEC,
+                        help='요청별 응답 대기 상한 (초, 0이면 무제한)')
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.WARNING,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        force=True
+    )
+    if args.rate is not None and args.speed is not None:
+        parser.error('--rate and --speed are mutually exclusive')
+
+    records, snapshots = load_corpus(args.corpus)
+    requests, offsets, skipped = prepare_requests(records, snapshots, args.price_source)
+    print(
+        f"Corpus: {len(records)} requests, {len(snapshots)} snapshots | replaying {len(requests)} x {args.loops} | "
+        f"skipped={skipped}",
+        file=sys.stderr
+    )
+
+    env = dict(os.environ)
+    if args.pool_workers:
+        env['BACKTEST_POOL_WORKERS'] = str(args.pool_workers)
+    # worker 캐시는 항상 임시 디렉터리 사용 (운영 캐시를 건드리지 않음, inline 모드는 빈 캐시)
+    cache_dir = tempfile.mkdtemp(prefix='py_backtest_replay_')
+    env['PRICE_CACHE_DIR'] = cache_dir
+    try:
+        if args.price_source == 'cache':
+            seeded = seed_cache(cache_dir, snapshots)
+            print(f"Seeded {seeded} snapshots into {cache_dir}", file=sys.stderr)
+
+        report = replay(
+            requests, offsets,
+            workers=args.workers, concurrency=args.concurrency,
+            rate=args.rate, speed=args.speed, loops=args.loops,
+            env=env, stderr_path=args.worker_log,
+            response_timeout=args.response_timeout or None
+        )
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    report.update({
+        'corpus': args.corpus,
+        'price_source': args.price_source,
+        'mode': 'rate' if args.rate is not None else 'speed' if args.speed is not None else 'concurrency',
+        'skipped': skipped
+    })
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0 if report['errors'] == 0 and report['unsent'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
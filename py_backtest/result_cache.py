@@ -0,0 +1,320 @@
+"""
+ResultCache - 백테스팅 결과 캐시 (같은 시세 + 같은 파라미터 재계산 방지)
+
+역할: 단일 종목 백테스팅 결과(run_backtest + 성과 지표)를 키별로 보관하고, 같은 요청이 다시 오면 재사용
+캐시 키: 시세 내용 해시(frame_fingerprint) + 종목 코드 + 정규화한 전략 파라미터 + 초기 자본금 + 조회 기간(일)
+캐시 계층:
+  1단계: 메모리 캐시 (항목 수 LRU, 프로세스 내)
+  2단계: 디스크 캐시 - SQLite(result_cache.db)에 pickle로 저장 (서버 재시작/다른 Worker 프로세스와 공유)
+
+무효화:
+  - 시세가 갱신(당일 재수집/증분 append)되면 해시가 바뀌므로 이전 결과는 더 이상 조회되지 않는다.
+  - DataCache 시세로 계산한 결과를 저장할 때 같은 종목의 다른 해시 결과를 함께 삭제한다.
+    (Node.js가 전달한 시세(inline)는 요청마다 구간이 다를 수 있어 LRU/보관 기간으로만 정리)
+  - RESULT_CACHE_VERSION: 결과 형식/계산 로직이 바뀌면 올려서 기존 결과를 모두 무효화
+
+환경변수:
+  BACKTEST_RESULT_CACHE          0이면 사용 안 함 (기본값: 1)
+  BACKTEST_RESULT_CACHE_ENTRIES  메모리 캐시 항목 수 (기본값: 256)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    from data_cache import SQLiteConnections
+except ImportError:
+    from .data_cache import SQLiteConnections
+
+logger = logging.getLogger(__name__)
+
+RESULT_CACHE_ENABLED = os.environ.get('BACKTEST_RESULT_CACHE', '1') != '0'
+RESULT_CACHE_MEMORY_ENTRIES = int(os.environ.get('BACKTEST_RESULT_CACHE_ENTRIES', '256'))
+
+# 결과 형식/계산 로직 버전 (바뀌면 올림 → 이전 키는 조회되지 않음)
+RESULT_CACHE_VERSION = 1
+
+# 결과 저장 시 제외하는 키 (요청 시점 값)
+_TRANSIENT_KEYS = ('cache_stats', 'timings')
+
+
+def canonical_params(value: Any) -> Any:
+    """
+    키 계산용 파라미터 정규화 (딕셔너리 키 정렬, 정수 값 float → int, tuple → list)
+
+    예: {"min_profit_pct": 1.0, "buy_time": "15:20"} == {"buy_time": "15:20", "min_profit_pct": 1}
+    """
+    if isinstance(value, dict):
+        return {str(k): canonical_params(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))}
+    if isinstance(value, (list, tuple)):
+        return [canonical_params(v) for v in value]
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def result_key(stock_code: str, fingerprint: str, strategy: Dict[str, Any],
+               initial_capital: Any, period: int) -> str:
+    """
+    결과 캐시 키
+
+    @param stock_code: 종목 코드
+    @param fingerprint: 시세 내용 해시 (frame_fingerprint)
+    @param strategy: 전략 파라미터 (type 자동 설정 이후)
+    @param initial_capital: 초기 자본금
+    @param period: 조회 기간 (일, start_date/end_date에서 계산)
+    @return: 키 (hex)
+    """
+    payload = json.dumps({
+        'version': RESULT_CACHE_VERSION,
+        'stock_code': stock_code,
+        'prices': fingerprint,
+        'strategy': canonical_params(strategy),
+        'initial_capital': canonical_params(initial_capital),
+        'period': period
+    }, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=20).hexdigest()
+
+
+class ResultCache:
+    """
+    백테스팅 결과 캐시 (메모리 LRU + SQLite 2계층)
+
+    lookup()이 반환하는 결과는 저장된 결과의 얕은 복사본이다 (최상위 키 추가/교체는 캐시에 영향 없음,
+    거래 기록/지표 등 내부 값은 수정하지 않는다).
+    """
+
+    def __init__(self, db_path: str, memory_entries: Optional[int] = None):
+        """
+        @param db_path: SQLite DB 경로 (예: data/result_cache.db)
+        @param memory_entries: 메모리 캐시 항목 수 (기본값: BACKTEST_RESULT_CACHE_ENTRIES 또는 256)
+        """
+        self.db_path = db_path
+        self.memory_entries = RESULT_CACHE_MEMORY_ENTRIES if memory_entries is None else memory_entries
+
+        # 1계층: { key: {stock_code, fingerprint, source, result} } (LRU 순서)
+        self._memory: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'purged': 0
+        }
+
+        # SQLite 커넥션 (스레드별 1개, 프로세스가 바뀌면 재연결)
+        self._db = SQLiteConnections(self.db_path)
+
+        self._init_db()
+        logger.info(f"ResultCache initialized (disk: {self.db_path}, memory entries: {self.memory_entries})")
+
+    # ──────────────────────────────────────────────
+    # SQLite
+    # ──────────────────────────────────────────────
+
+    def close(self):
+        """모든 스레드의 SQLite 커넥션 종료"""
+        self._db.close()
+
+    def _init_db(self):
+        """결과 캐시 테이블 생성"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        conn = self._db.acquire()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS backtest_results (
+                    result_key   TEXT    PRIMARY KEY,
+                    stock_code   TEXT    NOT NULL,
+                    fingerprint  TEXT    NOT NULL,   -- 시세 내용 해시
+                    source       TEXT    NOT NULL,   -- 'cache' (DataCache 시세) | 'inline' (요청 시세)
+                    payload      BLOB    NOT NULL,   -- pickle(결과 딕셔너리)
+                    created_at   TEXT    DEFAULT (datetime('now'))
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_backtest_results_stock ON backtest_results (stock_code)")
+            conn.commit()
+        finally:
+            self._db.release(conn)
+
+    # ──────────────────────────────────────────────
+    # 공개 API
+    # ──────────────────────────────────────────────
+
+    def lookup(self, key: str) -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        결과 조회 (메모리 → 디스크 순)
+
+        @param key: result_key()
+        @return: (결과 딕셔너리 복사본 또는 None, 'memory' / 'disk' / 'miss')
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._counters['memory_hits'] += 1
+                return dict(entry['result']), 'memory'
+
+        conn = self._db.acquire()
+        try:
+            row = conn.execute(
+                "SELECT stock_code, fingerprint, source, payload FROM backtest_results WHERE result_key = ?",
+                (key,)
+            ).fetchone()
+        finally:
+            self._db.release(conn)
+
+        if row is not None:
+            try:
+                result = pickle.loads(row[3])
+            except Exception as e:
+                logger.warning(f"[ResultCache] Failed to load {key[:12]} ({row[0]}): {str(e)}")
+                row = None
+            else:
+                self._memory_put(key, row[0], row[1], row[2], result)
+                with self._lock:
+                    self._counters['disk_hits'] += 1
+                logger.info(f"[ResultCache HIT - disk] {row[0]}")
+                return dict(result), 'disk'
+
+        with self._lock:
+            self._counters['misses'] += 1
+        return None, 'miss'
+
+    def put(self, key: str, stock_code: str, fingerprint: str, result: Dict[str, Any], source: str = 'cache'):
+        """
+        결과 저장 (메모리 + 디스크)
+
+        source='cache'이면 같은 종목의 다른 시세 해시 결과(갱신 전 시세로 계산한 결과)를 함께 삭제한다.
+
+        @param key: result_key()
+        @param stock_code: 종목 코드
+        @param fingerprint: 시세 내용 해시
+        @param result: 백테스팅 결과 (cache_stats/timings는 저장하지 않음)
+        @param source: 'cache' | 'inline'
+        """
+        stored = {k: v for k, v in result.items() if k not in _TRANSIENT_KEYS}
+        payload = pickle.dumps(stored, protocol=pickle.HIGHEST_PROTOCOL)
+
+        self._memory_put(key, stock_code, fingerprint, source, stored)
+        purged = self._purge_memory(stock_code, fingerprint) if source == 'cache' else 0
+
+        conn = self._db.acquire()
+        try:
+            conn.execute(
+                """INSERT OR REPLACE INTO backtest_results
+                   (result_key, stock_code, fingerprint, source, payload) VALUES (?, ?, ?, ?, ?)""",
+                (key, stock_code, fingerprint, source, sqlite3.Binary(payload))
+            )
+            if source == 'cache':
+                purged += conn.execute(
+                    """DELETE FROM backtest_results
+                       WHERE stock_code = ? AND source = 'cache' AND fingerprint != ?""",
+                    (stock_code, fingerprint)
+                ).rowcount
+            conn.commit()
+        finally:
+            self._db.release(conn)
+
+        with self._lock:
+            self._counters['stores'] += 1
+            self._counters['purged'] += purged
+        if purged:
+            logger.info(f"[ResultCache] {stock_code}: removed {purged} results of refreshed price data")
+
+    def invalidate(self, stock_code: Optional[str] = None):
+        """종목(None이면 전체) 결과 삭제"""
+        with self._lock:
+            keys = [k for k, entry in self._memory.items() if stock_code is None or entry['stock_code'] == stock_code]
+            for k in keys:
+                del self._memory[k]
+        conn = self._db.acquire()
+        try:
+            if stock_code is None:
+                conn.execute("DELETE FROM backtest_results")
+            else:
+                conn.execute("DELETE FROM backtest_results WHERE stock_code = ?", (stock_code,))
+            conn.commit()
+        finally:
+            self._db.release(conn)
+        logger.info(f"[ResultCache INVALIDATE] {stock_code or 'all'}")
+
+    def cleanup(self, keep_days: int = 3):
+        """오래된 디스크 결과 정리 (기본: 3일 이전 저장분 삭제)"""
+        cutoff = (date.today() - timedelta(days=keep_days)).isoformat()
+        conn = self._db.acquire()
+        try:
+            deleted = conn.execute(
+                "DELETE FROM backtest_results WHERE created_at < ?", (cutoff,)
+            ).rowcount
+            conn.commit()
+        finally:
+            self._db.release(conn)
+        if deleted > 0:
+            logger.info(f"[ResultCache CLEANUP] Removed {deleted} old results (before {cutoff})")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """결과 캐시 통계"""
+        with self._lock:
+            return {
+                'memory_entries': len(self._memory),
+                'memory_capacity': self.memory_entries,
+                **self._counters
+            }
+
+    # ──────────────────────────────────────────────
+    # 메모리 캐시 (항목 수 LRU)
+    # ──────────────────────────────────────────────
+
+    def _memory_put(self, key: str, stock_code: str, fingerprint: str, source: str, result: Dict[str, Any]):
+        """메모리 캐시 저장 후 오래된 항목부터 용량 초과분 제거"""
+        if self.memory_entries <= 0:
+            return
+        with self._lock:
+            self._memory[key] = {
+                'stock_code': stock_code,
+                'fingerprint': fingerprint,
+                'source': source,
+                'result': result
+            }
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _purge_memory(self, stock_code: str, fingerprint: str) -> int:
+        """같은 종목의 다른 시세 해시(DataCache 시세) 결과 제거"""
+        with self._lock:
+            stale = [
+                k for k, entry in self._memory.items()
+                if entry['stock_code'] == stock_code and entry['source'] == 'cache'
+                and entry['fingerprint'] != fingerprint
+            ]
+            for k in stale:
+                del self._memory[k]
+        return len(stale)
+
+
+# 모듈 레벨 싱글턴 (worker 프로세스 내에서 공유)
+_global_result_cache: Optional[ResultCache] = None
+_global_lock = threading.Lock()
+
+
+def get_result_cache(cache_dir: str) -> ResultCache:
+    """
+    글로벌 ResultCache 인스턴스 반환 (싱글턴)
+
+    @param cache_dir: DB 디렉터리 (DataCache DB와 같은 디렉터리)
+    """
+    global _global_result_cache
+    with _global_lock:
+        if _global_result_cache is None:
+            _global_result_cache = ResultCache(os.path.join(cache_dir, 'result_cache.db'))
+        return _global_result_cache
@@ -5,30 +5,75 @@ SignalGenerator - 매매 신호 생성기
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Sequence
 import logging
 
+try:
+    from strategy_kernels import TIME_SLOTS
+except ImportError:
+    from .strategy_kernels import TIME_SLOTS
+
 logger = logging.getLogger(__name__)
 
+# 'HH:MM' → 분 단위 정수 (정규 형식 시간 문자열만)
+_SLOT_MINUTES: Dict[str, int] = {slot: minute for minute, slot in enumerate(TIME_SLOTS)}
+
+
+def _time_label(value, parse_strings: bool):
+    """캔들 시각 → 'HH:MM' (strftime 가능하면 strftime, 아니면 문자열 11~16번째 글자, 실패 시 None)"""
+    try:
+        if parse_strings and isinstance(value, str):
+            value = pd.to_datetime(value)
+        return value.strftime('%H:%M') if hasattr(value, 'strftime') else str(value)[11:16]
+    except Exception:
+        return None
+
+
+def time_of_day_masks(dates: pd.Series, target_times: Sequence[str],
+                      parse_strings: bool = False) -> List[np.ndarray]:
+    """
+    목표 시간별 캔들 일치 마스크 (행별 strftime('%H:%M') == 목표 시간과 동일한 결과)
+
+    - datetime 컬럼: 시/분 정수 배열 1회 계산 후 비교 (tz-aware는 현지 시각 기준, NaT는 불일치)
+    - 그 외(object/문자열) 컬럼: 행별 'HH:MM' 문자열 1회 생성 후 비교
+
+    @param dates: Date 컬럼
+    @param target_times: 목표 시간 목록 (예: ["09:30", "15:50"])
+    @param parse_strings: True면 문자열 시각을 pd.to_datetime으로 해석한 뒤 비교
+    @return: 목표 시간 순서대로 bool 배열
+    """
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        valid = dates.notna().to_numpy()
+        minutes = np.where(valid, (dates.dt.hour * 60 + dates.dt.minute).fillna(-1).to_numpy(), -1)
+        masks = []
+        for target in target_times:
+            slot = _SLOT_MINUTES.get(target)
+            masks.append(valid & (minutes == slot) if slot is not None else np.zeros(len(dates), dtype=bool))
+        return masks
+
+    labels = np.array([_time_label(value, parse_strings) for value in dates], dtype=object)
+    return [labels == target for target in target_times]
+
 
 class SignalGenerator:
     """
     매매 신호 생성 클래스
     - 기술적 분석 지표 기반 매매 신호
     - 볼린저밴드, 이동평균, RSI 등 지원
+    - 신호는 행 번호 배열(int64)로 반환하며 입력 DataFrame은 수정하지 않음
     """
     
     def __init__(self):
         """SignalGenerator 초기화"""
         pass
     
-    def generate_signals(self, prices: pd.DataFrame, strategy: Dict) -> Tuple[List[int], List[int]]:
+    def generate_signals(self, prices: pd.DataFrame, strategy: Dict) -> Tuple[np.ndarray, np.ndarray]:
         """
         매매 신호 생성
         
         @param prices: OHLCV 데이터프레임
         @param strategy: 전략 설정
-        @return: (buy_signals, sell_signals)
+        @return: (buy_signals, sell_signals) 인덱스 배열
         """
         signal_type = strategy.get('signal_type', 'simple_time')
         
@@ -42,103 +87,82 @@ class SignalGenerator:
             logger.warning(f"Unknown signal type: {signal_type}, using default")
             return self._simple_time_based_signals(prices, strategy)
     
-    def _simple_time_based_signals(self, prices: pd.DataFrame, strategy: Dict) -> Tuple[List[int], List[int]]:
+    def _simple_time_based_signals(self, prices: pd.DataFrame, strategy: Dict) -> Tuple[np.ndarray, np.ndarray]:
         """
         시간 기반 단순 신호
         - 지정된 시간에 매수, 지정된 시간에 매도
+        - 신호 값은 prices의 인덱스 라벨 (신호가 없을 때의 기본 신호는 행 번호)
         """
-        buy_signals = []
-        sell_signals = []
-        
         buy_time = strategy.get('buy_time', '09:30')
         sell_time = strategy.get('sell_time', '15:50')
         
-        for idx, row in prices.iterrows():
-            date = row['Date']
-            time_str = date.strftime('%H:%M') if hasattr(date, 'strftime') else str(date)[11:16]
-            
-            if time_str == buy_time:
-                buy_signals.append(idx)
-            elif time_str == sell_time:
-                sell_signals.append(idx)
+        is_buy, is_sell = time_of_day_masks(prices['Date'], [buy_time, sell_time])
+        is_sell &= ~is_buy  # 매수 시간과 같으면 매수 우선
+        buy_signals = np.asarray(prices.index[is_buy])
+        sell_signals = np.asarray(prices.index[is_sell])
         
         # 신호 없으면 기본 설정
-        if not buy_signals:
-            buy_signals = [i for i in range(0, len(prices), max(1, len(prices) // 20))]
-        if not sell_signals:
-            sell_signals = [i for i in range(1, len(prices), max(1, len(prices) // 20))]
+        step = max(1, len(prices) // 20)
+        if len(buy_signals) == 0:
+            buy_signals = np.arange(0, len(prices), step, dtype=np.int64)
+        if len(sell_signals) == 0:
+            sell_signals = np.arange(1, len(prices), step, dtype=np.int64)
         
         logger.info(f"Simple time signals: {len(buy_signals)} buys, {len(sell_signals)} sells")
         return buy_signals, sell_signals
     
-    def _bollinger_band_signals(self, prices: pd.DataFrame, strategy: Dict) -> Tuple[List[int], List[int]]:
+    def _bollinger_band_signals(self, prices: pd.DataFrame, strategy: Dict) -> Tuple[np.ndarray, np.ndarray]:
         """
         볼린저밴드 기반 신호
         - 가격이 하단 밴드 터치 → 매수
         - 가격이 상단 밴드 터치 → 매도
         """
-        buy_signals = []
-        sell_signals = []
-        
         period = strategy.get('bb_period', 20)
         std_dev = strategy.get('bb_std', 2)
         
-        # 이동평균과 표준편차 계산
-        prices['MA'] = prices['Close'].rolling(window=period).mean()
-        prices['STD'] = prices['Close'].rolling(window=period).std()
-        prices['Upper'] = prices['MA'] + (std_dev * prices['STD'])
-        prices['Lower'] = prices['MA'] - (std_dev * prices['STD'])
-        
-        for idx in range(period, len(prices)):
-            close = prices.iloc[idx]['Close']
-            lower = prices.iloc[idx]['Lower']
-            upper = prices.iloc[idx]['Upper']
-            
-            # 하단 밴드 터치 → 매수
-            if close <= lower and not np.isnan(lower):
-                buy_signals.append(idx)
-            # 상단 밴드 터치 → 매도
-            elif close >= upper and not np.isnan(upper):
-                sell_signals.append(idx)
+        # 이동평균과 표준편차 계산 (입력 DataFrame에 컬럼 추가하지 않음)
+        close_series = prices['Close']
+        ma = close_series.rolling(window=period).mean()
+        std = close_series.rolling(window=period).std()
+        upper = (ma + (std_dev * std)).to_numpy(dtype=np.float64)
+        lower = (ma - (std_dev * std)).to_numpy(dtype=np.float64)
+        close = close_series.to_numpy(dtype=np.float64)
+        
+        # 밴드가 계산되는 period번째 행부터 판정, 하단 터치가 우선
+        in_range = np.arange(len(prices)) >= period
+        is_buy = in_range & (close <= lower) & ~np.isnan(lower)
+        is_sell = in_range & ~is_buy & (close >= upper) & ~np.isnan(upper)
+        buy_signals = np.flatnonzero(is_buy)
+        sell_signals = np.flatnonzero(is_sell)
         
         logger.info(f"Bollinger band signals: {len(buy_signals)} buys, {len(sell_signals)} sells")
         return buy_signals, sell_signals
     
-    def _moving_average_signals(self, prices: pd.DataFrame, strategy: Dict) -> Tuple[List[int], List[int]]:
+    def _moving_average_signals(self, prices: pd.DataFrame, strategy: Dict) -> Tuple[np.ndarray, np.ndarray]:
         """
         이동평균 크로스 신호
         - 단기 MA > 장기 MA → 매수
         - 단기 MA < 장기 MA → 매도
         """
-        buy_signals = []
-        sell_signals = []
-        
         short_period = strategy.get('ma_short', 5)
         long_period = strategy.get('ma_long', 20)
         
-        prices['MA_Short'] = prices['Close'].rolling(window=short_period).mean()
-        prices['MA_Long'] = prices['Close'].rolling(window=long_period).mean()
-        
-        prev_short = None
-        prev_long = None
-        
-        for idx in range(long_period, len(prices)):
-            short_ma = prices.iloc[idx]['MA_Short']
-            long_ma = prices.iloc[idx]['MA_Long']
-            
-            if np.isnan(short_ma) or np.isnan(long_ma):
-                continue
-            
-            # Golden Cross (단기 > 장기) → 매수
-            if prev_short is not None and prev_long is not None:
-                if prev_short <= prev_long and short_ma > long_ma:
-                    buy_signals.append(idx)
-                # Death Cross (단기 < 장기) → 매도
-                elif prev_short >= prev_long and short_ma < long_ma:
-                    sell_signals.append(idx)
-            
-            prev_short = short_ma
-            prev_long = long_ma
+        short_ma = prices['Close'].rolling(window=short_period).mean().to_numpy(dtype=np.float64)
+        long_ma = prices['Close'].rolling(window=long_period).mean().to_numpy(dtype=np.float64)
+        
+        # long_period번째 행부터 두 이동평균이 모두 있는 행만 비교 (직전 유효 행과 크로스 판정)
+        rows = np.flatnonzero(~np.isnan(short_ma) & ~np.isnan(long_ma))
+        rows = rows[rows >= long_period]
+        short_v = short_ma[rows]
+        long_v = long_ma[rows]
+        prev_short, prev_long = short_v[:-1], long_v[:-1]
+        cur_short, cur_long = short_v[1:], long_v[1:]
+        
+        # Golden Cross (단기 > 장기) → 매수 / Death Cross (단기 < 장기) → 매도
+        golden = (prev_short <= prev_long) & (cur_short > cur_long)
+        death = ~golden & (prev_short >= prev_long) & (cur_short < cur_long)
+        buy_signals = rows[1:][golden]
+        sell_signals = rows[1:][death]
         
         logger.info(f"Moving average signals: {len(buy_signals)} buys, {len(sell_signals)} sells")
         return buy_signals, sell_signals
@@ -0,0 +1,469 @@
+"""
+StrategyKernels - 전략 실행용 NumPy 커널
+역할: 분봉 데이터를 정수 배열(일자 경계/분)로 변환하고, 전략의 매매 시점과 잔고 점화식을 배열 기반으로 계산
+
+pandas 일자별 슬라이싱(groupby, boolean mask) 대신
+  - 일자 경계: CSR 방식 오프셋 배열 (day_offsets[d] ~ day_offsets[d+1])
+  - 캔들 시간: 분 단위 정수 (minute-of-day, 0 ~ 1439)
+를 사용하여 searchsorted 한 번으로 모든 날짜의 매수/매도 캔들을 찾는다.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from typing import List, NamedTuple, Tuple
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# numba 임포트 (선택사항: 전략 2 트레일링 스탑 루프 JIT 컴파일)
+try:
+    import numba
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    numba = None
+
+# 'HH:MM' 전체 슬롯 (00:00 ~ 23:59) - 분 단위 정수와 문자열 비교 결과를 맞추기 위한 기준표
+TIME_SLOTS: List[str] = [f"{h:02d}:{m:02d}" for h in range(24) for m in range(60)]
+MINUTES_PER_DAY = 1440
+_EPOCH_DATE = date(1970, 1, 1)
+
+
+class SessionIndex(NamedTuple):
+    """정렬된 분봉 데이터의 일자/분 인덱스"""
+    dates: pd.Series          # 정렬된 Date (Timestamp, 거래 기록 문자열 생성용)
+    close: np.ndarray         # float64 종가
+    minutes: np.ndarray       # int16 분 단위 시간 (HH*60 + MM)
+    day_offsets: np.ndarray   # int64 일자 경계 (길이 = 거래일수 + 1)
+    days: np.ndarray = None   # int32 거래일 서수 (1970-01-01 기준 일수, 길이 = 거래일수)
+    keys: np.ndarray = None   # int64 검색 키 (session_keys, 구성 시 1회 계산)
+
+    @property
+    def num_days(self) -> int:
+        return len(self.day_offsets) - 1
+
+
+class Strategy1Fills(NamedTuple):
+    """전략 1 체결 결과 (거래가 발생한 날짜만, 순서대로)"""
+    day: np.ndarray            # 거래일 번호 (SessionIndex 기준)
+    buy_idx: np.ndarray        # 매수 캔들 행 번호
+    sell_idx: np.ndarray       # 매도 캔들 행 번호
+    buy_price: np.ndarray
+    sell_price: np.ndarray
+    buy_amount: np.ndarray
+    gross_profit: np.ndarray
+    cost: np.ndarray
+    profit: np.ndarray
+    balance_after: np.ndarray
+    loss_amount: np.ndarray    # 거래 후 누적 손해액
+
+
+class Strategy2Fills(NamedTuple):
+    """전략 2 체결 결과 (거래가 발생한 날짜만, 순서대로)"""
+    day: np.ndarray            # 매수일 번호 (매도는 day + 1)
+    buy_idx: np.ndarray
+    sell_idx: np.ndarray
+    buy_price: np.ndarray
+    sell_price: np.ndarray
+    buy_amount: np.ndarray
+    gross_profit: np.ndarray
+    cost: np.ndarray
+    profit: np.ndarray
+    balance_after: np.ndarray
+    loss_amount: np.ndarray
+    sell_reason: np.ndarray    # int8 (SELL_REASONS 인덱스)
+    highest_price: np.ndarray
+    max_profit_pct: np.ndarray
+
+
+# 전략 2 매도 사유 코드 (커널 반환값 → 문자열)
+SELL_REASON_TRAILING_STOP = 0
+SELL_REASON_LOSS_CUTOFF = 1
+SELL_REASON_END_OF_DAY = 2
+SELL_REASONS = ('trailing_stop', 'loss_cutoff', 'end_of_day')
+
+
+def time_bounds(target_time: str) -> Tuple[int, int]:
+    """
+    목표 시간 문자열을 분 단위 경계로 변환
+
+    기존 구현은 'HH:MM' 문자열을 사전식으로 비교했으므로 ('9:30' 같은 비정규 입력 포함)
+    동일한 결과를 얻기 위해 전체 슬롯 목록에서의 bisect 위치를 경계로 사용한다.
+
+    @param target_time: 목표 시간 (예: "15:00")
+    @return: (lo, hi)
+             minute >= lo ⇔ time_str >= target_time
+             minute <  hi ⇔ time_str <= target_time
+             hi > lo 이면 정확히 일치하는 슬롯이 존재 (minute == lo)
+    """
+    return bisect_left(TIME_SLOTS, target_time), bisect_right(TIME_SLOTS, target_time)
+
+
+def build_session_index(ohlc_data: pd.DataFrame) -> SessionIndex:
+    """
+    OHLCV 데이터프레임을 일자/분 정수 배열로 변환
+
+    - Date 기준 정렬 (이미 정렬된 경우 복사 없음)
+    - Date가 NaT인 행은 제외 (groupby와 동일)
+    - tz-aware Date는 현지 시각(벽시계) 기준으로 일자/분 계산
+
+    @param ohlc_data: OHLCV 데이터프레임 (Date, Close 필수)
+    @return: SessionIndex
+    """
+    dates = pd.to_datetime(ohlc_data['Date'])
+    close = ohlc_data['Close'].to_numpy(dtype=np.float64)
+
+    if dates.isna().any():
+        valid = dates.notna().to_numpy()
+        dates = dates[valid]
+        close = close[valid]
+
+    if not dates.is_monotonic_increasing:
+        order = np.argsort(dates.to_numpy(), kind='stable')
+        dates = dates.iloc[order]
+        close = close[order]
+
+    dates = dates.reset_index(drop=True)
+
+    wall = dates.dt.tz_localize(None) if dates.dt.tz is not None else dates
+    stamp_min = wall.to_numpy().astype('datetime64[m]').astype(np.int64)
+    day_num = np.floor_divide(stamp_min, MINUTES_PER_DAY)
+    minutes = (stamp_min - day_num * MINUTES_PER_DAY).astype(np.int16)
+
+    if len(day_num) == 0:
+        day_offsets = np.zeros(1, dtype=np.int64)
+    else:
+        boundaries = np.flatnonzero(np.diff(day_num)) + 1
+        day_offsets = np.concatenate(([0], boundaries, [len(day_num)])).astype(np.int64)
+    days = day_num[day_offsets[:-1]].astype(np.int32)
+
+    session = SessionIndex(dates=dates, close=np.ascontiguousarray(close), minutes=minutes,
+                           day_offsets=day_offsets, days=days)
+    return session._replace(keys=session_keys(session))
+
+
+def session_nbytes(session: SessionIndex) -> int:
+    """SessionIndex 정수 배열 메모리 크기 (bytes, dates/close는 원본 프레임과 공유하므로 제외)"""
+    return sum(arr.nbytes for arr in (session.minutes, session.day_offsets, session.days, session.keys)
+               if arr is not None)
+
+
+def session_keys(session: SessionIndex) -> np.ndarray:
+    """일자 번호 * 1440 + 분 (전체 구간에서 단조 증가하는 검색 키)"""
+    if session.keys is not None:
+        return session.keys
+    counts = np.diff(session.day_offsets)
+    day_pos = np.repeat(np.arange(session.num_days, dtype=np.int64), counts)
+    return day_pos * MINUTES_PER_DAY + session.minutes.astype(np.int64)
+
+
+def nearest_candle_indices(session: SessionIndex, target_time: str, direction: str = 'backward',
+                           keys: np.ndarray = None) -> np.ndarray:
+    """
+    모든 거래일에 대해 목표 시간에 가장 가까운 캔들의 행 번호 계산
+
+    BacktestEngine._find_nearest_candle과 동일한 규칙:
+      - 정확히 일치하는 캔들이 있으면 그 중 첫 번째
+      - 'backward': 목표 시간 이하 중 가장 늦은 캔들, 없으면 당일 첫 캔들
+      - 'forward' : 목표 시간 이상 중 가장 빠른 캔들, 없으면 당일 마지막 캔들
+
+    @param session: SessionIndex
+    @param target_time: 목표 시간 (예: "15:00")
+    @param direction: 'backward' 또는 'forward'
+    @param keys: session_keys() 결과 (재사용 시 전달)
+    @return: 거래일별 행 번호 (int64, 길이 = 거래일수)
+    """
+    num_days = session.num_days
+    if num_days == 0:
+        return np.zeros(0, dtype=np.int64)
+    if keys is None:
+        keys = session_keys(session)
+
+    starts = session.day_offsets[:-1]
+    ends = session.day_offsets[1:]
+    base = np.arange(num_days, dtype=np.int64) * MINUTES_PER_DAY
+    lo, hi = time_bounds(target_time)
+
+    # 당일 첫 번째 minute >= lo 캔들 (정확 일치 시 첫 일치 캔들)
+    first_ge = np.searchsorted(keys, base + lo, side='left')
+
+    if direction == 'forward':
+        return np.where(first_ge < ends, first_ge, ends - 1)
+
+    last_le = np.searchsorted(keys, base + hi, side='left') - 1
+    indices = np.where(last_le >= starts, last_le, starts)
+    if hi > lo:
+        probe = np.minimum(first_ge, len(keys) - 1)
+        exact = (first_ge < ends) & (session.minutes[probe] == lo)
+        indices = np.where(exact, first_ge, indices)
+    return indices
+
+
+def format_minute(minute: int) -> str:
+    """분 단위 정수 → 'HH:MM'"""
+    return TIME_SLOTS[int(minute)]
+
+
+def day_labels(session: SessionIndex) -> list:
+    """거래일별 날짜 (datetime.date 리스트, 로그용)"""
+    if session.days is not None:
+        return [_EPOCH_DATE + timedelta(days=int(d)) for d in session.days]
+    return session.dates.iloc[session.day_offsets[:-1]].dt.date.tolist()
+
+
+def run_strategy1(close: np.ndarray, buy_idx: np.ndarray, sell_idx: np.ndarray,
+                  seed_money: float, labels: list = None) -> Strategy1Fills:
+    """
+    전략 1 잔고/누적 손해액 점화식 계산 (LLD 3.3.2)
+
+    날짜별 매수/매도 가격은 배열로 미리 추출하고, 순차 의존성이 있는
+    balance / lossAmount 점화식만 스칼라 루프로 계산한다.
+    (부동소수점 연산 순서를 기존 구현과 동일하게 유지하여 결과가 비트 단위로 일치)
+
+    @param close: 종가 배열
+    @param buy_idx: 거래일별 매수 캔들 행 번호
+    @param sell_idx: 거래일별 매도 캔들 행 번호
+    @param seed_money: 씨드머니
+    @param labels: 거래일별 날짜 (로그용, 선택사항)
+    @return: Strategy1Fills
+    """
+    buy_prices = close[buy_idx].tolist()
+    sell_prices = close[sell_idx].tolist()
+
+    balance = seed_money
+    loss_amount = 0.0
+    rows = []
+
+    for day in range(len(buy_prices)):
+        date = labels[day] if labels is not None else f"day#{day}"
+        buy_price = buy_prices[day]
+        if buy_price <= 0:
+            logger.warning(f"{date}: Invalid buy price {buy_price}, skipping")
+            continue
+
+        # 투입 금액 = balance - lossAmount (LLD 명세)
+        buy_amount = balance - loss_amount
+        if buy_amount <= 0:
+            logger.warning(f"{date}: buyAmount <= 0 (balance={balance}, lossAmount={loss_amount}), skipping")
+            continue
+
+        sell_price = sell_prices[day]
+        if sell_price <= 0:
+            logger.warning(f"{date}: Invalid sell price {sell_price}, skipping")
+            continue
+
+        gross_profit = (sell_price - buy_price) * (buy_amount / buy_price)
+        sell_total = sell_price * (buy_amount / buy_price)
+        tax = sell_total * 0.2 / 100
+        commission = sell_total * 0.011 / 100
+        cost = tax + commission
+        net_profit = gross_profit - cost
+
+        balance += net_profit
+        if net_profit < 0:
+            loss_amount += abs(net_profit)
+
+        rows.append((day, buy_price, sell_price, buy_amount, gross_profit, cost, net_profit, balance, loss_amount))
+
+    if rows:
+        columns = list(zip(*rows))
+    else:
+        columns = [()] * 9
+    day_arr = np.array(columns[0], dtype=np.int64)
+
+    return Strategy1Fills(
+        day=day_arr,
+        buy_idx=np.asarray(buy_idx)[day_arr],
+        sell_idx=np.asarray(sell_idx)[day_arr],
+        buy_price=np.array(columns[1], dtype=np.float64),
+        sell_price=np.array(columns[2], dtype=np.float64),
+        buy_amount=np.array(columns[3], dtype=np.float64),
+        gross_profit=np.array(columns[4], dtype=np.float64),
+        cost=np.array(columns[5], dtype=np.float64),
+        profit=np.array(columns[6], dtype=np.float64),
+        balance_after=np.array(columns[7], dtype=np.float64),
+        loss_amount=np.array(columns[8], dtype=np.float64),
+    )
+
+
+def _strategy2_exit_loop(close, minutes, start, end, buy_price, min_profit_pct,
+                         drop_threshold, loss_lo, loss_idx):
+    """
+    전략 2 다음날 매도 시점 탐색 (캔들 단위 상태 머신, numba 호환)
+
+    @return: (sell_idx, reason_code, highest_price, max_profit_pct)
+    """
+    highest_price = buy_price
+    max_profit_pct = 0.0
+    min_profit_reached = False
+
+    for i in range(start, end):
+        candle_price = close[i]
+        if candle_price <= 0:
+            continue
+
+        profit_rate = (candle_price - buy_price) / buy_price * 100
+
+        # 최소 수익률 도달 확인
+        if profit_rate >= min_profit_pct:
+            min_profit_reached = True
+            if candle_price > highest_price:
+                highest_price = candle_price
+            if profit_rate > max_profit_pct:
+                max_profit_pct = profit_rate
+
+        # 손절 시간 도달 && 최소 수익 미달 → 손절 (손절 시간 근접 캔들로 매도)
+        if minutes[i] >= loss_lo and not min_profit_reached:
+            return loss_idx, 1, highest_price, max_profit_pct
+
+        # 이익보전(Trailing Stop): 고점 대비 하락률 > drop_threshold
+        if min_profit_reached and highest_price > 0:
+            drop_rate = (highest_price - candle_price) / highest_price
+            if drop_rate > drop_threshold:
+                return i, 0, highest_price, max_profit_pct
+
+    # 미청산 → 다음날 마지막 캔들 종가
+    return end - 1, 2, highest_price, max_profit_pct
+
+
+def _strategy2_exit_vectorized(close, minutes, start, end, buy_price, min_profit_pct,
+                               drop_threshold, loss_lo, loss_idx):
+    """
+    전략 2 다음날 매도 시점 탐색 (누적 최대값 기반 벡터화 버전, numba 미설치 시 사용)
+
+    상태 머신과 동일한 결과:
+      reached      = 유효 캔들 & 수익률 >= 최소 수익률
+      highest[i]   = max(buy_price, 도달 캔들 가격의 누적 최대값)
+      손절 조건     = 유효 & 손절 시간 이후 & 누적 도달 없음
+      익절 조건     = 유효 & 누적 도달 & (highest - price) / highest > drop_threshold
+    첫 번째로 조건을 만족하는 캔들에서 매도한다.
+
+    @return: (sell_idx, reason_code, highest_price, max_profit_pct)
+    """
+    prices = close[start:end]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        valid = ~(prices <= 0)
+        profit_rate = (prices - buy_price) / buy_price * 100
+        reached = valid & (profit_rate >= min_profit_pct)
+        reached_cum = np.logical_or.accumulate(reached)
+        highest = np.maximum(np.maximum.accumulate(np.where(reached, prices, -np.inf)), buy_price)
+
+        loss_hit = valid & (minutes[start:end] >= loss_lo) & ~reached_cum
+        trail_hit = valid & reached_cum & (highest > 0)
+        trail_hit[trail_hit] = (highest[trail_hit] - prices[trail_hit]) / highest[trail_hit] > drop_threshold
+
+    hits = np.flatnonzero(loss_hit | trail_hit)
+    if len(hits) == 0:
+        pos = len(prices) - 1
+        sell_idx, reason = end - 1, SELL_REASON_END_OF_DAY
+    else:
+        pos = int(hits[0])
+        if loss_hit[pos]:
+            return loss_idx, SELL_REASON_LOSS_CUTOFF, buy_price, 0.0
+        sell_idx, reason = start + pos, SELL_REASON_TRAILING_STOP
+
+    reached_rates = profit_rate[:pos + 1][reached[:pos + 1]]
+    max_profit_pct = max(0.0, float(reached_rates.max())) if len(reached_rates) > 0 else 0.0
+    highest_price = float(highest[pos]) if pos >= 0 else buy_price
+    return sell_idx, reason, highest_price, max_profit_pct
+
+
+if HAS_NUMBA:
+    strategy2_exit = numba.njit(cache=True)(_strategy2_exit_loop)
+else:
+    strategy2_exit = _strategy2_exit_vectorized
+
+
+def run_strategy2(session: SessionIndex, buy_time: str, min_profit_pct: float,
+                  profit_cutoff_pct: float, loss_cutoff_time: str, seed_money: float,
+                  labels: list = None, keys: np.ndarray = None) -> Strategy2Fills:
+    """
+    전략 2 (Trailing Stop) 실행 (LLD 3.3.3)
+
+    - 일자 경계(day_offsets)를 한 번만 계산하여 날짜별 필터링 제거
+    - 매수 캔들 / 손절 시간 캔들은 전체 거래일 일괄 검색
+    - 다음날 매도 탐색은 float64 종가 + int16 분 배열 위에서 strategy2_exit 커널로 수행
+
+    @param session: SessionIndex
+    @param buy_time: 매수 시간 (예: "15:30")
+    @param min_profit_pct: 최소 수익률 %
+    @param profit_cutoff_pct: 이익보전 비율 %
+    @param loss_cutoff_time: 손절 시간 (다음날)
+    @param seed_money: 씨드머니
+    @param labels: 거래일별 날짜 (로그용, 선택사항)
+    @param keys: session_keys() 결과 (재사용 시 전달)
+    @return: Strategy2Fills
+    """
+    if keys is None:
+        keys = session_keys(session)
+    close = session.close
+    minutes = session.minutes
+    offsets = session.day_offsets
+
+    drop_threshold = 1.0 - profit_cutoff_pct / 100.0
+    loss_lo, _ = time_bounds(loss_cutoff_time)
+    buy_indices = nearest_candle_indices(session, buy_time, direction='backward', keys=keys).tolist()
+    loss_indices = nearest_candle_indices(session, loss_cutoff_time, direction='backward', keys=keys).tolist()
+    offset_list = offsets.tolist()
+
+    balance = seed_money
+    loss_amount = 0.0
+    rows = []
+
+    for day in range(session.num_days - 1):  # 마지막 날은 다음날이 없으므로 제외
+        date = labels[day] if labels is not None else f"day#{day}"
+        buy_idx = buy_indices[day]
+        buy_price = float(close[buy_idx])
+        if buy_price <= 0:
+            logger.warning(f"{date}: Invalid buy price {buy_price}, skipping")
+            continue
+
+        buy_amount = balance - loss_amount
+        if buy_amount <= 0:
+            logger.warning(f"{date}: buyAmount <= 0 (balance={balance}, lossAmount={loss_amount}), skipping")
+            continue
+
+        sell_idx, reason, highest_price, max_profit_pct = strategy2_exit(
+            close, minutes, offset_list[day + 1], offset_list[day + 2], buy_price,
+            min_profit_pct, drop_threshold, loss_lo, loss_indices[day + 1]
+        )
+        sell_price = float(close[sell_idx])
+        if sell_price <= 0:
+            logger.warning(f"{date}: Invalid sell price {sell_price}, skipping")
+            continue
+
+        # 거래 결과 계산 (전략 1과 동일한 비용 구조)
+        gross_profit = (sell_price - buy_price) * (buy_amount / buy_price)
+        sell_total = sell_price * (buy_amount / buy_price)
+        tax = sell_total * 0.2 / 100
+        commission = sell_total * 0.011 / 100
+        cost = tax + commission
+        net_profit = gross_profit - cost
+
+        balance += net_profit
+        if net_profit < 0:
+            loss_amount += abs(net_profit)
+
+        rows.append((day, buy_idx, int(sell_idx), buy_price, sell_price, buy_amount, gross_profit, cost,
+                     net_profit, balance, loss_amount, int(reason), float(highest_price), float(max_profit_pct)))
+
+    columns = list(zip(*rows)) if rows else [()] * 14
+    return Strategy2Fills(
+        day=np.array(columns[0], dtype=np.int64),
+        buy_idx=np.array(columns[1], dtype=np.int64),
+        sell_idx=np.array(columns[2], dtype=np.int64),
+        buy_price=np.array(columns[3], dtype=np.float64),
+        sell_price=np.array(columns[4], dtype=np.float64),
+        buy_amount=np.array(columns[5], dtype=np.float64),
+        gross_profit=np.array(columns[6], dtype=np.float64),
+        cost=np.array(columns[7], dtype=np.float64),
+        profit=np.array(columns[8], dtype=np.float64),
+        balance_after=np.array(columns[9], dtype=np.float64),
+        loss_amount=np.array(columns[10], dtype=np.float64),
+        sell_reason=np.array(columns[11], dtype=np.int8),
+        highest_price=np.array(columns[12], dtype=np.float64),
+        max_profit_pct=np.array(columns[13], dtype=np.float64),
+    )
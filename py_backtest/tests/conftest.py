@@ -0,0 +1,29 @@
+"""
+py_backtest 테스트 공통 설정
+
+Worker와 같은 방식(py_backtest 디렉터리 기준 모듈 임포트)으로 실행되도록 경로를 추가한다.
+"""
+
+import os
+import sys
+
+import pytest
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PACKAGE_DIR not in sys.path:
+    sys.path.insert(0, PACKAGE_DIR)
+
+
+@pytest.fixture
+def open_cache(tmp_path):
+    """tmp_path 아래 같은 DB를 여는 DataCache 생성 함수 (테스트 종료 시 모두 close)"""
+    from data_cache import DataCache
+    caches = []
+
+    def open_(storage_format: str = 'raw', **kwargs):
+        cache = DataCache(str(tmp_path / 'price_cache.db'), storage_format=storage_format, **kwargs)
+        caches.append(cache)
+        return cache
+    yield open_
+    for cache in caches:
+        cache.close()
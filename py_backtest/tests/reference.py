@@ -0,0 +1,397 @@
+"""
+테스트용 참조 구현 + 시드 데이터
+
+배열/커널 기반으로 바뀌기 전의 행(캔들)/일자 단위 구현을 그대로 옮겨 둔 것으로,
+새 구현이 같은 입력에서 같은 결과를 내는지 비교하는 기준(oracle)으로만 사용한다.
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def make_prices(seed: int, days: int = 12, start: str = '2024-03-04', interval: int = 2,
+                open_time: str = '09:00', close_time: str = '15:30', tz: Optional[str] = None,
+                volatility: float = 0.004, drop_ratio: float = 0.0, zero_ratio: float = 0.0) -> pd.DataFrame:
+    """
+    시드 고정 분봉 데이터 (영업일 기준, 랜덤 워크 종가)
+
+    @param seed: 난수 시드
+    @param days: 거래일 수
+    @param interval: 분봉 간격 (분)
+    @param tz: 시간대 (None이면 naive)
+    @param volatility: 캔들별 수익률 표준편차
+    @param drop_ratio: 임의로 제거할 캔들 비율 (시간 공백)
+    @param zero_ratio: 종가를 0으로 만들 캔들 비율
+    @return: OHLCV 데이터프레임 (Date 오름차순)
+    """
+    rng = np.random.default_rng(seed)
+    frames = []
+    for day in pd.bdate_range(start, periods=days):
+        stamps = pd.date_range(f"{day.date()} {open_time}", f"{day.date()} {close_time}", freq=f"{interval}min")
+        frames.append(pd.Series(stamps))
+    dates = pd.concat(frames, ignore_index=True).dt.as_unit('ns')  # Yahoo Finance 결과와 같은 ns 단위
+    if drop_ratio:
+        dates = dates[rng.random(len(dates)) >= drop_ratio].reset_index(drop=True)
+    if tz is not None:
+        dates = dates.dt.tz_localize(tz)
+
+    close = 50000 * np.exp(np.cumsum(rng.normal(0, volatility, len(dates))))
+    close = np.round(close, -1)
+    if zero_ratio:
+        close[rng.random(len(dates)) < zero_ratio] = 0.0
+    return pd.DataFrame({
+        'Date': dates,
+        'Open': close,
+        'High': close * 1.001,
+        'Low': close * 0.999,
+        'Close': close,
+        'Volume': rng.integers(100, 10000, len(dates))
+    })
+
+
+# ===== 전략 1/2 (일자 groupby + 캔들 순회) =====
+
+def find_nearest_candle(day_data: pd.DataFrame, target_time: str, direction: str = 'backward') -> Optional[pd.Series]:
+    """정확 일치 → backward: 목표 이하 마지막(없으면 첫 캔들) / forward: 목표 이상 첫 캔들(없으면 마지막 캔들)"""
+    if day_data.empty:
+        return None
+    exact = day_data[day_data['time_str'] == target_time]
+    if not exact.empty:
+        return exact.iloc[0]
+    if direction == 'backward':
+        candidates = day_data[day_data['time_str'] <= target_time]
+        return candidates.iloc[-1] if not candidates.empty else day_data.iloc[0]
+    candidates = day_data[day_data['time_str'] >= target_time]
+    return candidates.iloc[0] if not candidates.empty else day_data.iloc[-1]
+
+
+def _with_time_columns(ohlc_data: pd.DataFrame) -> pd.DataFrame:
+    ohlc_data = ohlc_data.copy()
+    ohlc_data['Date'] = pd.to_datetime(ohlc_data['Date'])
+    ohlc_data['trade_date'] = ohlc_data['Date'].dt.date
+    ohlc_data['time_str'] = ohlc_data['Date'].dt.strftime('%H:%M')
+    return ohlc_data
+
+
+def _costs(buy_price: float, sell_price: float, buy_amount: float):
+    gross_profit = (sell_price - buy_price) * (buy_amount / buy_price)
+    sell_total = sell_price * (buy_amount / buy_price)
+    cost = sell_total * 0.2 / 100 + sell_total * 0.011 / 100
+    return gross_profit, cost, gross_profit - cost
+
+
+def strategy1_trades(buy_time: str, sell_time: str, ohlc_data: pd.DataFrame, seed_money: float) -> List[Dict]:
+    """전략 1 (고정시간 매수/매도) 일자별 실행 → 거래 딕셔너리 목록"""
+    trades = []
+    balance = seed_money
+    loss_amount = 0.0
+    for _, day_data in _with_time_columns(ohlc_data).groupby('trade_date'):
+        day_data = day_data.sort_values('Date')
+        buy_candle = find_nearest_candle(day_data, buy_time, direction='forward')
+        buy_price = float(buy_candle['Close'])
+        if buy_price <= 0:
+            continue
+        buy_amount = balance - loss_amount
+        if buy_amount <= 0:
+            continue
+        sell_candle = find_nearest_candle(day_data, sell_time, direction='backward')
+        sell_price = float(sell_candle['Close'])
+        if sell_price <= 0:
+            continue
+
+        gross_profit, cost, net_profit = _costs(buy_price, sell_price, buy_amount)
+        balance += net_profit
+        if net_profit < 0:
+            loss_amount += abs(net_profit)
+        trades.append({
+            'buy_time': str(buy_candle['Date']), 'buy_price': buy_price,
+            'sell_time': str(sell_candle['Date']), 'sell_price': sell_price,
+            'buy_amount': buy_amount, 'gross_profit': gross_profit, 'cost': cost,
+            'profit': net_profit, 'balance_after': balance
+        })
+    return trades
+
+
+def strategy2_trades(buy_time: str, min_profit_pct: float, profit_cutoff_pct: float, loss_cutoff_time: str,
+                     ohlc_data: pd.DataFrame, seed_money: float) -> List[Dict]:
+    """전략 2 (당일 매수 → 다음날 Trailing Stop) 캔들 단위 실행 → 거래 딕셔너리 목록"""
+    trades = []
+    balance = seed_money
+    loss_amount = 0.0
+    ohlc_data = _with_time_columns(ohlc_data)
+    dates_list = sorted(ohlc_data['trade_date'].unique())
+    drop_threshold = 1.0 - profit_cutoff_pct / 100.0
+
+    for day_idx in range(len(dates_list) - 1):
+        current_day = ohlc_data[ohlc_data['trade_date'] == dates_list[day_idx]].sort_values('Date')
+        next_day = ohlc_data[ohlc_data['trade_date'] == dates_list[day_idx + 1]].sort_values('Date')
+
+        buy_candle = find_nearest_candle(current_day, buy_time, direction='backward')
+        buy_price = float(buy_candle['Close'])
+        if buy_price <= 0:
+            continue
+        buy_amount = balance - loss_amount
+        if buy_amount <= 0:
+            continue
+
+        sell_price = None
+        sell_time = None
+        sell_reason = ''
+        highest_price = buy_price
+        max_profit_pct = 0.0
+        min_profit_reached = False
+        for _, candle in next_day.iterrows():
+            candle_price = float(candle['Close'])
+            if candle_price <= 0:
+                continue
+            profit_rate = (candle_price - buy_price) / buy_price * 100
+            if profit_rate >= min_profit_pct:
+                min_profit_reached = True
+                if candle_price > highest_price:
+                    highest_price = candle_price
+                max_profit_pct = max(max_profit_pct, profit_rate)
+
+            if candle['time_str'] >= loss_cutoff_time and not min_profit_reached:
+                cutoff_candle = find_nearest_candle(next_day, loss_cutoff_time, direction='backward')
+                sell_price = float(cutoff_candle['Close'])
+                sell_time = str(cutoff_candle['Date'])
+                sell_reason = 'loss_cutoff'
+                break
+
+            if min_profit_reached and highest_price > 0:
+                if (highest_price - candle_price) / highest_price > drop_threshold:
+                    sell_price = candle_price
+                    sell_time = str(candle['Date'])
+                    sell_reason = 'trailing_stop'
+                    break
+
+        if sell_price is None:
+            last_candle = next_day.iloc[-1]
+            sell_price = float(last_candle['Close'])
+            sell_time = str(last_candle['Date'])
+            sell_reason = 'end_of_day'
+        if sell_price <= 0:
+            continue
+
+        gross_profit, cost, net_profit = _costs(buy_price, sell_price, buy_amount)
+        balance += net_profit
+        if net_profit < 0:
+            loss_amount += abs(net_profit)
+        trades.append({
+            'buy_time': str(buy_candle['Date']), 'buy_price': buy_price,
+            'sell_time': sell_time, 'sell_price': sell_price,
+            'buy_amount': buy_amount, 'gross_profit': gross_profit, 'cost': cost,
+            'profit': net_profit, 'balance_after': balance,
+            'sell_reason': sell_reason, 'highest_price': highest_price, 'max_profit_pct': max_profit_pct
+        })
+    return trades
+
+
+# ===== 매매 신호 (SignalGenerator 행 단위 iloc / BacktestEngine.generate_signals 행 단위 iterrows) =====
+
+def simple_time_signals(prices: pd.DataFrame, strategy: Dict):
+    buy_signals, sell_signals = [], []
+    buy_time = strategy.get('buy_time', '09:30')
+    sell_time = strategy.get('sell_time', '15:50')
+    for idx, row in prices.iterrows():
+        date = row['Date']
+        time_str = date.strftime('%H:%M') if hasattr(date, 'strftime') else str(date)[11:16]
+        if time_str == buy_time:
+            buy_signals.append(idx)
+        elif time_str == sell_time:
+            sell_signals.append(idx)
+    if not buy_signals:
+        buy_signals = [i for i in range(0, len(prices), max(1, len(prices) // 20))]
+    if not sell_signals:
+        sell_signals = [i for i in range(1, len(prices), max(1, len(prices) // 20))]
+    return buy_signals, sell_signals
+
+
+def bollinger_band_signals(prices: pd.DataFrame, strategy: Dict):
+    prices = prices.copy()
+    period = strategy.get('bb_period', 20)
+    std_dev = strategy.get('bb_std', 2)
+    prices['MA'] = prices['Close'].rolling(window=period).mean()
+    prices['STD'] = prices['Close'].rolling(window=period).std()
+    prices['Upper'] = prices['MA'] + (std_dev * prices['STD'])
+    prices['Lower'] = prices['MA'] - (std_dev * prices['STD'])
+    buy_signals, sell_signals = [], []
+    for idx in range(period, len(prices)):
+        close = prices.iloc[idx]['Close']
+        lower = prices.iloc[idx]['Lower']
+        upper = prices.iloc[idx]['Upper']
+        if close <= lower and not np.isnan(lower):
+            buy_signals.append(idx)
+        elif close >= upper and not np.isnan(upper):
+            sell_signals.append(idx)
+    return buy_signals, sell_signals
+
+
+def moving_average_signals(prices: pd.DataFrame, strategy: Dict):
+    prices = prices.copy()
+    short_period = strategy.get('ma_short', 5)
+    long_period = strategy.get('ma_long', 20)
+    prices['MA_Short'] = prices['Close'].rolling(window=short_period).mean()
+    prices['MA_Long'] = prices['Close'].rolling(window=long_period).mean()
+    buy_signals, sell_signals = [], []
+    prev_short = prev_long = None
+    for idx in range(long_period, len(prices)):
+        short_ma = prices.iloc[idx]['MA_Short']
+        long_ma = prices.iloc[idx]['MA_Long']
+        if np.isnan(short_ma) or np.isnan(long_ma):
+            continue
+        if prev_short is not None and prev_long is not None:
+            if prev_short <= prev_long and short_ma > long_ma:
+                buy_signals.append(idx)
+            elif prev_short >= prev_long and short_ma < long_ma:
+                sell_signals.append(idx)
+        prev_short, prev_long = short_ma, long_ma
+    return buy_signals, sell_signals
+
+
+def legacy_signals(prices: pd.DataFrame, strategy: Dict):
+    """BacktestEngine.generate_signals (행별 strftime 비교 + 30%/70% fallback)"""
+    buy_signals, sell_signals = [], []
+    buy_time = strategy.get('buy_time', '09:30')
+    sell_time = strategy.get('sell_time', '15:50')
+    for idx, row in prices.iterrows():
+        try:
+            date = row['Date']
+            if isinstance(date, str):
+                date = pd.to_datetime(date)
+            time_str = date.strftime('%H:%M') if hasattr(date, 'strftime') else str(date)[11:16]
+            if time_str == buy_time:
+                buy_signals.append(idx)
+            elif time_str == sell_time:
+                sell_signals.append(idx)
+        except Exception:
+            continue
+    if not buy_signals and len(prices) > 1:
+        buy_signals = list(range(0, max(1, len(prices) // 3)))
+    if not sell_signals and len(prices) > 1:
+        sell_signals = list(range(max(1, len(prices) // 3), len(prices)))
+    return buy_signals, sell_signals
+
+
+# ===== 레거시 신호 기반 백테스트 (행 단위 iterrows) =====
+
+@dataclass
+class _Trade:
+    date: str
+    type: str
+    price: float
+    quantity: int
+    cost_or_proceeds: float
+    profit: Optional[float] = None
+    profit_rate: Optional[float] = None
+    cash_remaining: float = 0
+
+
+def legacy_trading_log(prices: pd.DataFrame, buy_signals, sell_signals, initial_capital: float) -> List[Dict]:
+    """행 단위 순회 + 최대 수량 매수 / FIFO 매도 → 거래 기록 딕셔너리 목록"""
+    cash = initial_capital
+    positions = []
+    log = []
+    for idx, row in prices.iterrows():
+        date = row['Date'].strftime('%Y-%m-%d %H:%M:%S') if hasattr(row['Date'], 'strftime') else str(row['Date'])
+        price = float(row['Close'])
+        if idx in buy_signals:
+            quantity = int(cash / price)
+            cost = price * quantity
+            if quantity > 0 and cash >= cost:
+                cash -= cost
+                positions.append((price, quantity))
+                log.append(_Trade(date, 'BUY', price, quantity, cost, cash_remaining=cash))
+        elif idx in sell_signals and positions:
+            entry_price, quantity = positions.pop(0)
+            proceeds = price * quantity
+            cost = entry_price * quantity
+            profit = proceeds - cost
+            cash += proceeds
+            log.append(_Trade(date, 'SELL', price, quantity, proceeds, profit=profit,
+                              profit_rate=(profit / cost * 100) if cost > 0 else 0, cash_remaining=cash))
+    return [asdict(t) for t in log]
+
+
+# ===== PerformanceCalculator (리스트 순회) =====
+
+def mdd(equity_curve: List[float]) -> float:
+    if equity_curve is None or len(equity_curve) < 2:
+        return 0.0
+    peak = equity_curve[0]
+    result = 0.0
+    for value in equity_curve:
+        if value > peak:
+            peak = value
+        dd = (peak - value) / peak * 100 if peak > 0 else 0
+        if dd > result:
+            result = dd
+    return result
+
+
+def _returns(equity_curve: List[float]) -> np.ndarray:
+    return np.diff(equity_curve) / np.array(equity_curve[:-1])
+
+
+def volatility(equity_curve: List[float]) -> float:
+    if len(equity_curve) < 2:
+        return 0.0
+    return np.std(_returns(equity_curve))
+
+
+def sharpe_ratio(equity_curve: List[float], risk_free_rate: float = 0.02) -> float:
+    if len(equity_curve) < 2:
+        return 0.0
+    returns = _returns(equity_curve)
+    vol = np.std(returns) * np.sqrt(252)
+    if vol == 0:
+        return 0.0
+    return (np.mean(returns) * 252 - risk_free_rate) / vol
+
+
+def sortino_ratio(equity_curve: List[float], risk_free_rate: float = 0.02) -> float:
+    if len(equity_curve) < 2:
+        return 0.0
+    returns = _returns(equity_curve)
+    downside = returns[returns < 0]
+    downside_vol = np.std(downside) * np.sqrt(252) if len(downside) > 0 else 0
+    if downside_vol == 0:
+        return 0.0
+    return (np.mean(returns) * 252 - risk_free_rate) / downside_vol
+
+
+def annual_return(final_value: float, initial_value: float, trading_days: int) -> float:
+    if initial_value == 0 or trading_days == 0:
+        return 0.0
+    years = trading_days / 252
+    return ((final_value / initial_value) ** (1 / years) - 1) * 100 if years > 0 else 0
+
+
+def calmar_ratio(equity_curve: List[float], trading_days: int) -> float:
+    if len(equity_curve) < 2:
+        return 0.0
+    value = mdd(equity_curve)
+    if value == 0 or value < 0.01:
+        return 0.0
+    return annual_return(equity_curve[-1], equity_curve[0], trading_days) / value
+
+
+def trade_metrics(closing_trades: List[Dict]) -> Dict[str, float]:
+    """승률 / Profit Factor / 평균 수익·손실 / 기댓값 (SELL 딕셔너리 목록 기준)"""
+    profits = [t.get('profit', 0) or 0 for t in closing_trades]
+    wins = [p for p in profits if p > 0]
+    losses = [p for p in profits if p <= 0]
+    win_rate = len(wins) / len(profits) * 100 if profits else 0.0
+    total_loss = abs(sum(losses))
+    avg_win = sum(wins) / len(wins) if wins else 0.0
+    avg_loss = sum(abs(p) for p in losses) / len(losses) if losses else 0.0
+    return {
+        'win_rate': win_rate,
+        'profit_factor': (sum(wins) / total_loss if sum(wins) > 0 else 0.0) if total_loss else 0.0,
+        'avg_win': avg_win,
+        'avg_loss': avg_loss,
+        'expectancy': (win_rate / 100) * avg_win - (1 - win_rate / 100) * avg_loss
+    }
@@ -0,0 +1,156 @@
+"""DataCache: 컬럼형 디스크 저장소 왕복 (feather / raw) + 동시 미스 병합 (single-flight)"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import reference
+from data_cache import HAS_PYARROW, SingleFlight, frame_fingerprint
+
+FORMATS = [
+    pytest.param('feather', marks=pytest.mark.skipif(not HAS_PYARROW, reason='pyarrow is not installed')),
+    'raw',
+]
+
+
+@pytest.mark.parametrize('storage_format', FORMATS)
+@pytest.mark.parametrize('tz', [None, 'Asia/Seoul', 'UTC'])
+def test_disk_round_trip(open_cache, storage_format, tz):
+    prices = reference.make_prices(31, days=5, tz=tz, drop_ratio=0.1)
+    prices.loc[3, 'Close'] = np.nan
+    open_cache(storage_format).put('005930', prices)
+
+    # 새 인스턴스 (메모리 캐시 없음) → 디스크 파일 memory-map
+    loaded, tier = open_cache(storage_format).lookup('005930')
+    assert tier == 'disk'
+    pd.testing.assert_frame_equal(loaded, prices)
+    assert frame_fingerprint(loaded) == frame_fingerprint(prices)
+
+
+@pytest.mark.parametrize('storage_format', FORMATS)
+def test_lookup_tiers(open_cache, storage_format):
+    cache = open_cache(storage_format)
+    prices = reference.make_prices(32, days=2)
+    assert cache.lookup('005930') == (None, 'miss')
+
+    cache.put('005930', prices)
+    loaded, tier = cache.lookup('005930')
+    assert tier == 'memory'
+    pd.testing.assert_frame_equal(loaded, prices)
+    assert cache.peek('000660') is None
+    assert cache.get_stats()['memory_hits'] == 1
+
+
+def test_put_many_and_invalidate(open_cache):
+    cache = open_cache()
+    frames = {code: reference.make_prices(seed, days=2) for seed, code in enumerate(['005930', '000660'])}
+    assert sorted(cache.put_many(frames)) == ['000660', '005930']
+
+    reopened = open_cache()
+    for code, prices in frames.items():
+        pd.testing.assert_frame_equal(reopened.get(code), prices)
+
+    reopened.invalidate('005930')
+    assert open_cache().get('005930') is None
+    assert open_cache().get('000660') is not None
+
+
+def test_layout_is_cached_with_entry(open_cache):
+    cache = open_cache()
+    cache.put('005930', reference.make_prices(33, days=3))
+    prices = cache.get('005930')
+    layout = cache.get_layout('005930', prices)
+    assert layout is not None and layout.num_days == 3
+    assert cache.get_layout('005930', prices) is layout
+    assert cache.get_layout('005930', prices.copy()) is None
+
+
+def _concurrent(count: int, call):
+    """count개 스레드에서 동시에 call() 실행 → (결과 목록, 예외 목록)"""
+    results, errors = [], []
+    lock = threading.Lock()
+
+    def worker():
+        try:
+            value = call()
+            with lock:
+                results.append(value)
+        except Exception as e:
+            with lock:
+                errors.append(e)
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    return results, errors
+
+
+def test_single_flight_runs_once_and_shares_result():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        return object()
+
+    waiter = threading.Timer(0.2, release.set)
+    waiter.start()
+    results, errors = _concurrent(8, lambda: flights.do('price:005930', slow))
+    waiter.join()
+
+    assert errors == [] and len(calls) == 1
+    assert len(results) == 8 and all(r is results[0] for r in results)
+    assert flights.shared == 7
+
+    # 완료 후 같은 키는 다시 실행
+    flights.do('price:005930', slow)
+    assert len(calls) == 2
+
+
+def test_single_flight_shares_exception():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def failing():
+        calls.append(1)
+        release.wait(5)
+        raise ValueError('no data')
+
+    waiter = threading.Timer(0.2, release.set)
+    waiter.start()
+    results, errors = _concurrent(4, lambda: flights.do('ticker:005930', failing))
+    waiter.join()
+
+    assert results == [] and len(calls) == 1
+    assert len(errors) == 4 and all(isinstance(e, ValueError) for e in errors)
+
+
+def test_load_once_merges_concurrent_misses(open_cache):
+    cache = open_cache()
+    prices = reference.make_prices(34, days=2)
+    release = threading.Event()
+    loads = []
+
+    def loader():
+        loads.append(1)
+        release.wait(5)
+        cache.put('005930', prices)
+        return cache.get('005930')
+
+    waiter = threading.Timer(0.2, release.set)
+    waiter.start()
+    results, errors = _concurrent(6, lambda: cache.load_once('005930', loader))
+    waiter.join()
+
+    assert errors == [] and len(loads) == 1
+    for result in results:
+        pd.testing.assert_frame_equal(result, prices)
+    # 캐시가 채워진 뒤의 load_once는 loader를 실행하지 않음
+    cache.load_once('005930', loader)
+    assert len(loads) == 1
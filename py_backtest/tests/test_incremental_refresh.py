@@ -0,0 +1,126 @@
+"""증분 갱신: DataCache.append 병합 규칙 + BacktestEngine._refresh_incremental 전체 재수집 조건"""
+
+import pandas as pd
+import pytest
+
+import backtest_engine
+import reference
+from backtest_engine import BacktestEngine
+
+CODE = '005930'
+
+
+def _merged_reference(base: pd.DataFrame, new: pd.DataFrame, period: int) -> pd.DataFrame:
+    """기존 봉 중 새 데이터와 겹치지 않는 봉 + 새 봉 → 시각 정렬 → 마지막 봉 기준 period일 유지"""
+    kept = base[~base['Date'].isin(new['Date'])]
+    merged = pd.concat([kept, new], ignore_index=True).sort_values('Date').reset_index(drop=True)
+    cutoff = merged['Date'].iloc[-1] - pd.Timedelta(days=period)
+    return merged[merged['Date'] >= cutoff].reset_index(drop=True)
+
+
+def _recent_prices(seed: int, first_day: pd.Timestamp, last_day: pd.Timestamp, tz: str = 'Asia/Seoul'):
+    days = len(pd.bdate_range(first_day.date(), last_day.date()))
+    return reference.make_prices(seed, days=days, start=str(first_day.date()), tz=tz)
+
+
+def test_append_replaces_overlap_and_trims_period(open_cache):
+    cache = open_cache()
+    base = reference.make_prices(41, days=10)
+    cache.put(CODE, base)
+
+    # 마지막 날 전체(미완성 봉 포함) + 다음 2일
+    last_day = base['Date'].iloc[-1].normalize()
+    new = reference.make_prices(42, days=3, start=str(last_day.date()))
+    merged = cache.append(CODE, new, period=7)
+
+    expected = _merged_reference(base, new, period=7)
+    pd.testing.assert_frame_equal(merged, expected)
+    pd.testing.assert_frame_equal(open_cache().get(CODE), expected)
+    assert cache.get_coverage(CODE) == {
+        'fetch_date': cache._today_str(),
+        'first_bar': expected['Date'].iloc[0].isoformat(),
+        'last_bar': expected['Date'].iloc[-1].isoformat(),
+        'num_rows': len(expected),
+        'mode': 'incremental'
+    }
+
+
+def test_append_aligns_timezone_to_base(open_cache):
+    cache = open_cache()
+    base = reference.make_prices(43, days=4, tz='Asia/Seoul')
+    cache.put(CODE, base)
+
+    new = reference.make_prices(44, days=2, start=str(base['Date'].iloc[-1].date()), tz='Asia/Seoul')
+    merged = cache.append(CODE, new.assign(Date=new['Date'].dt.tz_convert('UTC')), period=30)
+
+    assert str(merged['Date'].dt.tz) == 'Asia/Seoul'
+    pd.testing.assert_frame_equal(merged, _merged_reference(base, new, period=30))
+
+
+def test_append_without_base_or_new_rows(open_cache):
+    cache = open_cache()
+    assert cache.append(CODE, reference.make_prices(45, days=1)) is None
+
+    base = reference.make_prices(46, days=3)
+    cache.put(CODE, base)
+    pd.testing.assert_frame_equal(cache.append(CODE, base.iloc[0:0], period=30), base)
+
+
+class FakeYahoo:
+    """yf 모듈 대역: Ticker(t).history(...) 호출 기록 + 지정한 DataFrame 반환"""
+
+    def __init__(self, history: pd.DataFrame):
+        self.history_frame = history
+        self.calls = []
+
+    def Ticker(self, ticker):
+        fake = self
+
+        class _Ticker:
+            def history(self, **kwargs):
+                fake.calls.append((ticker, kwargs))
+                return fake.history_frame.set_index('Date').rename_axis('Datetime')
+        return _Ticker()
+
+
+@pytest.fixture
+def engine(open_cache, monkeypatch):
+    cache = open_cache()
+    engine = BacktestEngine(CODE)
+    monkeypatch.setattr(engine, '_convert_to_ticker_safe', lambda code, market=None: f'{code}.KS')
+    return engine, cache
+
+
+def _use_yahoo(monkeypatch, history: pd.DataFrame) -> FakeYahoo:
+    fake = FakeYahoo(history)
+    monkeypatch.setattr(backtest_engine, 'yf', fake)
+    return fake
+
+
+def test_refresh_fetches_from_last_bar(engine, monkeypatch):
+    engine, cache = engine
+    today = pd.Timestamp.now(tz='Asia/Seoul').normalize()
+    base = _recent_prices(51, today - pd.Timedelta(days=30), today - pd.Timedelta(days=3))
+    cache.put(CODE, base)
+    last_day = base['Date'].iloc[-1].normalize()
+    new = _recent_prices(52, last_day, last_day + pd.Timedelta(days=1))
+    fake = _use_yahoo(monkeypatch, new)
+
+    merged = engine._refresh_incremental(cache, period=30)
+
+    assert fake.calls == [(f'{CODE}.KS', {'start': str(last_day.date()), 'interval': '2m'})]
+    pd.testing.assert_frame_equal(merged, _merged_reference(base, new, period=30))
+
+
+@pytest.mark.parametrize('first_ago, last_ago', [
+    (10, 3),    # 더 짧은 period로 수집된 기준 캐시 → 요청 기간 앞부분 없음
+    (120, 70),  # 마지막 봉이 period보다 오래됨
+])
+def test_refresh_falls_back_to_full_fetch(engine, monkeypatch, first_ago, last_ago):
+    engine, cache = engine
+    today = pd.Timestamp.now(tz='Asia/Seoul').normalize()
+    cache.put(CODE, _recent_prices(53, today - pd.Timedelta(days=first_ago), today - pd.Timedelta(days=last_ago)))
+    fake = _use_yahoo(monkeypatch, reference.make_prices(54, days=1))
+
+    assert engine._refresh_incremental(cache, period=60) is None
+    assert fake.calls == []
@@ -0,0 +1,69 @@
+"""json_codec: 표준 json / orjson 인코더 출력 일치 (NaN/Infinity → null)"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import json_codec
+from trade_log import TradeLog, STRATEGY1_FIELDS
+
+
+def _trade_log() -> TradeLog:
+    times = pd.DatetimeIndex(['2026-01-05 09:30', '2026-01-06 09:30']).tz_localize('Asia/Seoul')
+    columns = {name: np.array([1.5, np.nan]) for name in STRATEGY1_FIELDS}
+    columns['buy_time'] = times
+    columns['sell_time'] = times + pd.Timedelta(hours=5)
+    return TradeLog('strategy1', columns)
+
+
+def _payload():
+    return {
+        'status': 'success',
+        'nan': float('nan'),
+        'inf': float('inf'),
+        'ninf': float('-inf'),
+        'np_nan': np.float64('nan'),
+        'np_f32': np.float32('inf'),
+        'np_int': np.int64(7),
+        'array': np.array([1.25, np.nan, np.inf, -np.inf]),
+        'nested': [{'value': float('nan')}, (1.0, float('inf'))],
+        'data': {'trading_log': _trade_log(), 'sharpe_ratio': 1.5}
+    }
+
+
+def _encode_with(monkeypatch, encoder: str, payload, response_format: str) -> bytes:
+    monkeypatch.setattr(json_codec, 'ENCODER', encoder)
+    return json_codec.encode(payload, response_format)
+
+
+def _strict_loads(body: bytes):
+    """NaN/Infinity 토큰이 있으면 실패 (JSON.parse와 같은 기준)"""
+    def reject(token):
+        raise ValueError(f"non-standard JSON token: {token}")
+    return json.loads(body, parse_constant=reject)
+
+
+@pytest.mark.parametrize('response_format', json_codec.RESPONSE_FORMATS)
+def test_stdlib_encoder_emits_null_for_non_finite(monkeypatch, response_format):
+    decoded = _strict_loads(_encode_with(monkeypatch, 'json', _payload(), response_format))
+    assert decoded['nan'] is None and decoded['inf'] is None and decoded['ninf'] is None
+    assert decoded['np_nan'] is None and decoded['np_f32'] is None
+    assert decoded['array'] == [1.25, None, None, None]
+    assert decoded['nested'] == [{'value': None}, [1.0, None]]
+    assert decoded['np_int'] == 7
+
+
+def test_stdlib_encoder_finite_payload_unchanged(monkeypatch):
+    payload = {'a': [1.5, 2], 'b': {'c': 'NaN'}, 'd': np.array([0.1, 0.2])}
+    body = _encode_with(monkeypatch, 'json', payload, 'rows')
+    assert body == b'{"a": [1.5, 2], "b": {"c": "NaN"}, "d": [0.1, 0.2]}'
+
+
+@pytest.mark.skipif(not json_codec.HAS_ORJSON, reason="orjson not installed")
+@pytest.mark.parametrize('response_format', json_codec.RESPONSE_FORMATS)
+def test_encoders_produce_same_json(monkeypatch, response_format):
+    stdlib = _strict_loads(_encode_with(monkeypatch, 'json', _payload(), response_format))
+    fast = _strict_loads(_encode_with(monkeypatch, 'orjson', _payload(), response_format))
+    assert stdlib == fast
@@ -0,0 +1,69 @@
+"""레거시 백테스트: 이벤트 기반 신호 체결 == 기존 행 단위 순회 (최대 수량 매수 / FIFO 매도)"""
+
+from dataclasses import asdict
+
+import numpy as np
+import pytest
+
+import reference
+from backtest_engine import BacktestEngine
+
+
+def _engine(prices, capital):
+    engine = BacktestEngine('005930', capital)
+    engine.use_price_data(prices)
+    return engine
+
+
+@pytest.mark.parametrize('strategy', [
+    {'type': 'MA20_50', 'buy_time': '09:30', 'sell_time': '15:00'},
+    {'type': 'MA5_20', 'buy_time': '10:00', 'sell_time': '15:51'},   # 매도 신호 fallback (남은 70%)
+    {'type': 'MA5_20', 'buy_time': '07:00', 'sell_time': '08:00'},   # 매수/매도 모두 fallback
+])
+@pytest.mark.parametrize('capital', [10_000_000, 120_000])
+def test_run_backtest_matches_row_loop(strategy, capital):
+    prices = reference.make_prices(71, days=6, volatility=0.01)
+    expected = reference.legacy_trading_log(prices, *reference.legacy_signals(prices, strategy), capital)
+
+    result = _engine(prices, capital).run_backtest(strategy)
+    assert result['trading_log'] == expected
+    assert result['equity_curve'] == [capital] + [t['cash_remaining'] for t in expected]
+    assert result['total_trades'] == sum(t['type'] == 'SELL' for t in expected)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_random_signals_fifo_fills(seed):
+    # 적은 자본 + 큰 변동성 → 현금 부족 매수 신호 / 여러 포지션 동시 보유(FIFO) / 같은 행 매수·매도 신호
+    prices = reference.make_prices(80 + seed, days=3, volatility=0.02)
+    prices.index = prices.index * 2 + 7
+    rng = np.random.default_rng(seed)
+    buy_signals = sorted(rng.choice(prices.index, size=60, replace=False).tolist())
+    sell_signals = sorted(rng.choice(prices.index, size=40, replace=False).tolist())
+
+    expected = reference.legacy_trading_log(prices, buy_signals, sell_signals, 150_000)
+    assert any(t['type'] == 'BUY' for t in expected) and any(t['type'] == 'SELL' for t in expected)
+
+    engine = _engine(prices, 150_000)
+    engine._execute_signal_events(prices, buy_signals, sell_signals)
+    assert [asdict(t) for t in engine.trading_log] == expected
+    assert len(engine.positions) == sum(t['type'] == 'BUY' for t in expected) - \
+        sum(t['type'] == 'SELL' for t in expected)
+
+
+@pytest.mark.parametrize('bad_close, error', [(0.0, ZeroDivisionError), (np.nan, ValueError)])
+def test_invalid_close_on_buy_signal(bad_close, error):
+    prices = reference.make_prices(90, days=2)
+    buy_signals = list(range(0, len(prices), 20))
+    sell_signals = list(range(10, len(prices), 20))
+    prices.loc[buy_signals[4], 'Close'] = bad_close
+
+    with pytest.raises(error):
+        reference.legacy_trading_log(prices, buy_signals, sell_signals, 1_000_000)
+    engine = _engine(prices, 1_000_000)
+    with pytest.raises(error):
+        engine._execute_signal_events(prices, buy_signals, sell_signals)
+
+    # 예외 이전 체결분은 행 단위 처리와 같음
+    before = prices.iloc[:buy_signals[4]]
+    assert [asdict(t) for t in engine.trading_log] == \
+        reference.legacy_trading_log(before, buy_signals, sell_signals, 1_000_000)
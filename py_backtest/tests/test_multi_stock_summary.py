@@ -0,0 +1,34 @@
+"""PythonWorkerServer._summarize_multi_stock: 종목별 결과 집계"""
+
+import pytest
+
+from worker import PythonWorkerServer
+
+
+def _result(return_rate: float, trades: int = 2):
+    return {'return_rate': return_rate, 'total_profit': return_rate * 1000, 'mdd': abs(return_rate),
+            'win_rate': 50.0, 'profit_factor': 1.0, 'total_trades': trades,
+            'final_capital': 10_000_000 * (1 + return_rate / 100), 'strategy': 'strategy1_daily'}
+
+
+@pytest.mark.parametrize('rates, median', [
+    ([3.0, -1.0, 2.0], 2.0),
+    ([4.0, 1.0, -2.0, 3.0], 2.0),   # 짝수 개: 가운데 두 값의 평균
+    ([5.0], 5.0),
+])
+def test_median_return_rate(rates, median):
+    codes = [f'{i:06d}' for i in range(len(rates))]
+    summary = PythonWorkerServer._summarize_multi_stock(
+        codes, {code: _result(rate) for code, rate in zip(codes, rates)}, []
+    )
+    assert summary['median_return_rate'] == pytest.approx(median)
+    assert summary['avg_return_rate'] == pytest.approx(sum(rates) / len(rates))
+    assert summary['best']['return_rate'] == max(rates)
+    assert summary['worst']['return_rate'] == min(rates)
+
+
+def test_summary_without_results():
+    summary = PythonWorkerServer._summarize_multi_stock(['005930'], {}, [{'stock_code': '005930', 'error': 'x'}])
+    assert summary['median_return_rate'] == 0.0
+    assert summary['succeeded'] == 0 and summary['failed'] == 1
+    assert summary['best'] is None and summary['results'] == []
@@ -0,0 +1,62 @@
+"""파라미터 스윕: 조합별 지표 == 같은 파라미터의 run_backtest 단일 실행 결과"""
+
+import pytest
+
+import reference
+from backtest_engine import BacktestEngine
+from parameter_sweep import expand_range
+
+SEED_MONEY = 10_000_000
+METRICS = ('total_trades', 'winning_trades', 'losing_trades', 'total_profit', 'return_rate',
+           'win_rate', 'profit_factor', 'mdd', 'total_cost', 'final_capital')
+
+
+def _engine(prices):
+    engine = BacktestEngine('005930', SEED_MONEY)
+    engine.use_price_data(prices)
+    return engine
+
+
+def _assert_matches_single_runs(prices, strategy, results):
+    for row in results:
+        params = {name: row[name] for name in strategy if name != 'type'}
+        single = _engine(prices).run_backtest(dict(type=strategy['type'], **params))
+        for name in METRICS:
+            assert row[name] == pytest.approx(single[name], rel=1e-12, abs=1e-9), (params, name)
+
+
+def test_strategy1_sweep_matches_single_runs():
+    prices = reference.make_prices(21, drop_ratio=0.3, volatility=0.008)
+    strategy = {'type': 'daily_trading',
+                'buy_time': {'start': '09:00', 'end': '10:00', 'step': 15},
+                'sell_time': ['14:00', '15:01', '16:00']}
+    result = _engine(prices).run_parameter_sweep(strategy)
+    assert result['combinations'] == 15
+    _assert_matches_single_runs(prices, strategy, result['results'])
+
+
+def test_strategy2_sweep_matches_single_runs():
+    prices = reference.make_prices(22, volatility=0.006, drop_ratio=0.2)
+    strategy = {'type': 'trailing_stop', 'buy_time': ['15:00', '15:30'], 'min_profit_pct': [0.5, 1.0],
+                'profit_cutoff_pct': [97.0, 99.5], 'loss_cutoff_time': '13:00'}
+    result = _engine(prices).run_parameter_sweep(strategy)
+    assert result['combinations'] == 8
+    _assert_matches_single_runs(prices, strategy, result['results'])
+
+
+def test_ranking_order():
+    prices = reference.make_prices(23, volatility=0.008)
+    strategy = {'type': 'daily_trading', 'buy_time': ['09:00', '10:00', '11:00'], 'sell_time': ['14:00', '15:00']}
+    by_return = _engine(prices).run_parameter_sweep(strategy)['results']
+    by_mdd = _engine(prices).run_parameter_sweep(strategy, sort_by='mdd', top_n=2)['results']
+    assert [r['return_rate'] for r in by_return] == sorted((r['return_rate'] for r in by_return), reverse=True)
+    assert [r['rank'] for r in by_return] == list(range(1, 7))
+    assert len(by_mdd) == 2 and by_mdd[0]['mdd'] == min(r['mdd'] for r in by_return)
+
+
+def test_expand_range():
+    assert expand_range({'start': '09:00', 'end': '09:30', 'step': 10}) == ['09:00', '09:10', '09:20', '09:30']
+    assert expand_range({'start': 0.5, 'end': 2.0, 'step': 0.5}) == [0.5, 1.0, 1.5, 2.0]
+    assert expand_range('10:00') == ['10:00']
+    with pytest.raises(ValueError):
+        expand_range({'start': 1.0, 'end': 2.0, 'step': -0.5})
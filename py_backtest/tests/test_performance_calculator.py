@@ -0,0 +1,94 @@
+"""PerformanceCalculator: 중간 결과 1회 계산 기반 지표 == 기존 리스트 순회 공식 (MDD/Sharpe/Sortino 등)"""
+
+import numpy as np
+import pytest
+
+import reference
+from performance_calculator import PerformanceCalculator
+from trade_log import TradeLog
+
+EQUITY_CURVES = {
+    'random_walk': (10_000_000 * np.exp(np.cumsum(np.random.default_rng(1).normal(0, 0.01, 300)))).tolist(),
+    'rising': [100.0, 101.0, 103.0, 103.0, 110.0],
+    'flat': [100.0] * 10,
+    'crash_and_recover': [100.0, 120.0, 60.0, 90.0, 130.0, 65.0, 140.0],
+    'non_positive_peak': [-50.0, -20.0, -80.0, -10.0, 40.0, 10.0],
+    'single': [100.0],
+}
+
+
+@pytest.mark.parametrize('as_array', [False, True])
+@pytest.mark.parametrize('name', list(EQUITY_CURVES))
+def test_equity_metrics(name, as_array):
+    curve = EQUITY_CURVES[name]
+    value = np.array(curve) if as_array else curve
+    calc = PerformanceCalculator()
+
+    assert calc.calculate_mdd(value) == pytest.approx(reference.mdd(curve), rel=1e-12, abs=1e-12)
+    assert calc.calculate_volatility(value) == pytest.approx(reference.volatility(curve), rel=1e-12, abs=1e-15)
+    assert calc.calculate_sharpe_ratio(value) == pytest.approx(reference.sharpe_ratio(curve), rel=1e-12)
+    assert calc.calculate_sortino_ratio(value, 0.03) == \
+        pytest.approx(reference.sortino_ratio(curve, 0.03), rel=1e-12)
+    assert calc.calculate_calmar_ratio(value, len(curve)) == \
+        pytest.approx(reference.calmar_ratio(curve, len(curve)), rel=1e-12)
+
+
+def test_mdd_skips_nan_like_sequential_update():
+    curve = [100.0, 120.0, float('nan'), 90.0, float('nan'), 130.0, 100.0]
+    assert PerformanceCalculator().calculate_mdd(curve) == pytest.approx(reference.mdd(curve))
+    starts_nan = [float('nan'), 100.0, 50.0]
+    assert PerformanceCalculator().calculate_mdd(starts_nan) == reference.mdd(starts_nan)
+
+
+CLOSING_TRADES = [
+    {'type': 'SELL', 'profit': 1200.0}, {'type': 'SELL', 'profit': -300.0}, {'type': 'SELL', 'profit': None},
+    {'type': 'SELL', 'profit': 0.0}, {'type': 'SELL', 'profit': 450.5}, {'type': 'SELL'},
+    {'type': 'SELL', 'profit': -0.1},
+]
+
+
+@pytest.mark.parametrize('trades', [
+    CLOSING_TRADES,
+    [{'type': 'SELL', 'profit': 10.0}, {'type': 'SELL', 'profit': 5.0}],       # 손실 없음 → PF 0
+    [{'type': 'SELL', 'profit': -10.0}, {'type': 'SELL', 'profit': 0.0}],      # 수익 없음
+    [],
+])
+def test_trade_metrics(trades):
+    expected = reference.trade_metrics(trades)
+    profits = np.array([t.get('profit', 0) or 0 for t in trades], dtype=np.float64)
+    calc = PerformanceCalculator()
+    for closing in (trades, profits):
+        assert calc.calculate_win_rate(closing) == pytest.approx(expected['win_rate'])
+        assert calc.calculate_profit_factor(closing) == pytest.approx(expected['profit_factor'])
+        assert calc.calculate_average_win(closing) == pytest.approx(expected['avg_win'])
+        assert calc.calculate_average_loss(closing) == pytest.approx(expected['avg_loss'])
+        assert calc.calculate_expectancy(closing) == pytest.approx(expected['expectancy'])
+
+
+def test_all_metrics_for_legacy_result():
+    prices = reference.make_prices(95, days=6, volatility=0.01)
+    strategy = {'buy_time': '09:30', 'sell_time': '15:00'}
+    trading_log = reference.legacy_trading_log(prices, *reference.legacy_signals(prices, strategy), 1_000_000)
+    equity = [1_000_000] + [t['cash_remaining'] for t in trading_log]
+    closing = [t for t in trading_log if t['type'] == 'SELL']
+
+    expected = {
+        'total_return': (equity[-1] - 1_000_000) / 1_000_000 * 100,
+        'annual_return': reference.annual_return(equity[-1], 1_000_000, len(equity)),
+        'volatility': reference.volatility(equity),
+        'annual_volatility': reference.volatility(equity) * np.sqrt(252),
+        'mdd': reference.mdd(equity),
+        'sharpe_ratio': reference.sharpe_ratio(equity),
+        'sortino_ratio': reference.sortino_ratio(equity),
+        'calmar_ratio': reference.calmar_ratio(equity, len(equity)),
+        **reference.trade_metrics(closing)
+    }
+    metrics = PerformanceCalculator().calculate_all_metrics(equity, trading_log, 1_000_000)
+    assert metrics == pytest.approx(expected, rel=1e-12)
+
+    # 전략 1/2 TradeLog는 거래 지표를 엔진 결과에 이미 포함 → 자산 곡선 지표만 계산
+    curve_only = PerformanceCalculator().calculate_all_metrics(
+        np.array(equity), TradeLog.empty('strategy1'), 1_000_000
+    )
+    trade_keys = reference.trade_metrics([]).keys()
+    assert curve_only == pytest.approx({k: v for k, v in expected.items() if k not in trade_keys}, rel=1e-12)
@@ -0,0 +1,57 @@
+"""replay: worker 종료/무응답 시 closed-loop 재생이 멈추지 않고 남은 요청을 오류로 집계"""
+
+import os
+import textwrap
+
+import pytest
+
+import replay
+
+# 요청 FAKE_LIMIT건에 응답한 뒤 종료(exit)하거나 이후 요청에 응답하지 않는(hang) 가짜 worker
+FAKE_WORKER = textwrap.dedent('''
+    import json, os, sys
+    mode, limit = os.environ['FAKE_MODE'], int(os.environ['FAKE_LIMIT'])
+    for count, line in enumerate(sys.stdin):
+        if count >= limit:
+            if mode == 'exit':
+                sys.exit(1)
+            continue
+        request = json.loads(line)
+        sys.stdout.write(json.dumps({'request_id': request['request_id'], 'status': 'success'}) + '\\n')
+        sys.stdout.flush()
+''')
+
+
+@pytest.fixture
+def fake_worker(tmp_path, monkeypatch):
+    script = tmp_path / 'fake_worker.py'
+    script.write_text(FAKE_WORKER)
+    monkeypatch.setattr(replay, 'WORKER_SCRIPT', str(script))
+    monkeypatch.setattr(replay, 'LIVENESS_POLL_SEC', 0.05)
+
+    def env(mode: str, limit: int):
+        return dict(os.environ, FAKE_MODE=mode, FAKE_LIMIT=str(limit))
+    return env
+
+
+def _requests(count: int):
+    return [{'stock_code': f'{i:06d}'} for i in range(count)], [0.0] * count
+
+
+def test_closed_loop_stops_when_workers_exit(fake_worker):
+    requests, offsets = _requests(10)
+    report = replay.replay(requests, offsets, workers=1, concurrency=2,
+                           env=fake_worker('exit', 2), response_timeout=None)
+    assert report['completed'] == 2
+    assert report['errors'] >= 1
+    assert report['errors'] + report['unsent'] == 8
+    assert all(e['error'] == 'no response (worker exited)' for e in report['error_samples'])
+
+
+def test_closed_loop_times_out_unanswered_requests(fake_worker):
+    requests, offsets = _requests(5)
+    report = replay.replay(requests, offsets, workers=1, concurrency=2,
+                           env=fake_worker('hang', 3), response_timeout=0.3)
+    assert report['completed'] == 3
+    assert report['errors'] == 2
+    assert report['unsent'] == 0
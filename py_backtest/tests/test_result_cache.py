@@ -0,0 +1,119 @@
+"""ResultCache: 키 정규화, 메모리/디스크 적중, 시세 갱신 시 이전 결과 삭제, 무효화, 요청별 사용 안 함"""
+
+import pytest
+
+import reference
+import backtest_engine
+import worker
+from backtest_engine import BacktestEngine
+from result_cache import ResultCache, result_key
+
+CODE = '005930'
+STRATEGY = {'type': 'trailing_stop', 'buy_time': '15:20', 'min_profit_pct': 1.0, 'profit_cutoff_pct': 80}
+
+
+@pytest.fixture
+def open_results(tmp_path):
+    caches = []
+
+    def open_(**kwargs) -> ResultCache:
+        cache = ResultCache(str(tmp_path / 'result_cache.db'), **kwargs)
+        caches.append(cache)
+        return cache
+    yield open_
+    for cache in caches:
+        cache.close()
+
+
+def _key(fingerprint='fp-a', strategy=None, capital=10_000_000, period=60, stock_code=CODE):
+    return result_key(stock_code, fingerprint, STRATEGY if strategy is None else strategy, capital, period)
+
+
+def test_key_canonicalization():
+    reordered = {'profit_cutoff_pct': 80.0, 'min_profit_pct': 1, 'buy_time': '15:20', 'type': 'trailing_stop'}
+    assert _key(strategy=reordered, capital=10_000_000.0) == _key()
+    assert _key(strategy=dict(STRATEGY, levels=(1, 2.0))) == _key(strategy=dict(STRATEGY, levels=[1.0, 2]))
+
+    variants = [
+        _key(fingerprint='fp-b'),
+        _key(strategy=dict(STRATEGY, min_profit_pct=1.5)),
+        _key(capital=5_000_000),
+        _key(period=30),
+        _key(stock_code='000660'),
+    ]
+    assert len(set(variants + [_key()])) == len(variants) + 1
+
+
+def test_memory_and_disk_hits(open_results):
+    cache = open_results()
+    assert cache.lookup(_key()) == (None, 'miss')
+
+    cache.put(_key(), CODE, 'fp-a', {'return_rate': 1.5, 'timings': {'x_ms': 1.0}, 'cache_stats': {}})
+    result, tier = cache.lookup(_key())
+    assert (result, tier) == ({'return_rate': 1.5}, 'memory')
+    result['return_rate'] = 99.0   # 얕은 복사본 → 캐시에 영향 없음
+    assert cache.lookup(_key())[0] == {'return_rate': 1.5}
+
+    assert open_results().lookup(_key()) == ({'return_rate': 1.5}, 'disk')
+    assert cache.get_stats()['memory_hits'] == 2 and cache.get_stats()['misses'] == 1
+
+
+def test_memory_lru_capacity(open_results):
+    cache = open_results(memory_entries=2)
+    for n in range(3):
+        cache.put(_key(period=n), CODE, 'fp-a', {'n': n})
+    assert cache.get_stats()['memory_entries'] == 2
+    assert cache.lookup(_key(period=0)) == ({'n': 0}, 'disk')
+    assert cache.lookup(_key(period=2)) == ({'n': 2}, 'memory')
+
+    no_memory = open_results(memory_entries=0)
+    no_memory.put(_key(period=9), CODE, 'fp-a', {'n': 9})
+    assert no_memory.lookup(_key(period=9)) == ({'n': 9}, 'disk')
+
+
+def test_refreshed_prices_purge_stale_results(open_results):
+    cache = open_results()
+    cache.put(_key('fp-old'), CODE, 'fp-old', {'v': 'old'})
+    cache.put(_key('fp-inline'), CODE, 'fp-inline', {'v': 'inline'}, source='inline')
+    cache.put(_key('fp-other', stock_code='000660'), '000660', 'fp-other', {'v': 'other'})
+
+    cache.put(_key('fp-new'), CODE, 'fp-new', {'v': 'new'})
+    assert cache.get_stats()['purged'] == 2   # 메모리 + 디스크
+
+    for reader in (cache, open_results()):
+        assert reader.lookup(_key('fp-old')) == (None, 'miss')
+        assert reader.lookup(_key('fp-new'))[0] == {'v': 'new'}
+        assert reader.lookup(_key('fp-inline'))[0] == {'v': 'inline'}
+        assert reader.lookup(_key('fp-other', stock_code='000660'))[0] == {'v': 'other'}
+
+
+def test_invalidate(open_results):
+    cache = open_results()
+    cache.put(_key(), CODE, 'fp-a', {'v': 1})
+    cache.put(_key(stock_code='000660'), '000660', 'fp-a', {'v': 2})
+
+    cache.invalidate(CODE)
+    assert cache.lookup(_key()) == (None, 'miss')
+    assert cache.lookup(_key(stock_code='000660'))[0] == {'v': 2}
+
+    cache.invalidate()
+    assert open_results().lookup(_key(stock_code='000660')) == (None, 'miss')
+
+
+def test_worker_request_result_cache_flag(open_cache, open_results, monkeypatch):
+    cache = open_cache()
+    monkeypatch.setattr(worker, 'get_cache', lambda: cache)
+    monkeypatch.setattr(backtest_engine, 'get_cache', lambda: cache)
+    monkeypatch.setattr(worker, 'get_result_cache', lambda cache_dir: open_results())
+    server = worker.PythonWorkerServer()
+
+    prices = BacktestEngine.to_prices_dict(reference.make_prices(97, days=5))
+    request = {'stock_code': CODE, 'strategy': {'buy_time': '10:00', 'sell_time': '15:00'}, 'prices': prices}
+
+    first = server.process_request(dict(request))
+    second = server.process_request(dict(request))
+    skipped = server.process_request(dict(request, result_cache=False))
+
+    assert [r['timings'].get('result_cache') for r in (first, second, skipped)] == ['miss', 'memory', None]
+    assert first['data']['return_rate'] == second['data']['return_rate'] == skipped['data']['return_rate']
+    assert server.result_cache.get_stats()['stores'] == 1
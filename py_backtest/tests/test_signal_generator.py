@@ -0,0 +1,72 @@
+"""매매 신호: 배열 마스크 기반 신호 == 기존 행 단위 신호 (fallback 신호 목록 포함)"""
+
+import numpy as np
+import pytest
+
+import reference
+from backtest_engine import BacktestEngine
+from signal_generator import SignalGenerator
+
+
+def _prices(seed: int, **kwargs):
+    prices = reference.make_prices(seed, days=4, volatility=0.003, **kwargs)
+    prices.loc[[5, 40], 'Close'] = np.nan
+    return prices
+
+
+def _as_lists(signals):
+    return [list(np.asarray(s).tolist()) for s in signals]
+
+
+@pytest.mark.parametrize('strategy', [
+    {'signal_type': 'bollinger_band'},
+    {'signal_type': 'bollinger_band', 'bb_period': 10, 'bb_std': 1.5},
+    {'signal_type': 'moving_average'},
+    {'signal_type': 'moving_average', 'ma_short': 3, 'ma_long': 8},
+])
+@pytest.mark.parametrize('seed', [61, 62])
+def test_indicator_signals(seed, strategy):
+    prices = _prices(seed)
+    before = prices.copy()
+    oracle = reference.bollinger_band_signals if strategy['signal_type'] == 'bollinger_band' \
+        else reference.moving_average_signals
+
+    signals = SignalGenerator().generate_signals(prices, strategy)
+    assert _as_lists(signals) == _as_lists(oracle(before, strategy))
+    assert sum(len(s) for s in signals) > 0
+    assert prices.equals(before)   # 입력 DataFrame에 지표 컬럼을 추가하지 않음
+
+
+@pytest.mark.parametrize('strategy', [
+    {},                                              # 기본 09:30 / 15:50 (15:50 없음 → 매도 fallback)
+    {'buy_time': '10:00', 'sell_time': '15:00'},
+    {'buy_time': '10:00', 'sell_time': '10:00'},     # 같은 시간 → 매수 우선
+    {'buy_time': '10:01', 'sell_time': '25:00'},     # 일치 없음 → 매수/매도 fallback
+])
+@pytest.mark.parametrize('dates', ['datetime', 'tz', 'string'])
+def test_simple_time_signals(strategy, dates):
+    prices = _prices(63, tz='Asia/Seoul' if dates == 'tz' else None)
+    if dates == 'string':
+        prices['Date'] = prices['Date'].astype(str)
+    prices.index = prices.index + 100   # 라벨 신호와 행 번호 fallback 구분
+
+    expected = reference.simple_time_signals(prices, strategy)
+    assert _as_lists(SignalGenerator().generate_signals(prices, dict(strategy, signal_type='simple_time'))) \
+        == _as_lists(expected)
+
+
+@pytest.mark.parametrize('strategy', [
+    {'buy_time': '09:30', 'sell_time': '15:00'},
+    {'buy_time': '09:30', 'sell_time': '15:51'},     # 매도 신호 없음 → 남은 70% 구간 fallback
+    {'buy_time': '07:00', 'sell_time': '08:00'},     # 둘 다 없음 → 30% / 70% fallback
+])
+@pytest.mark.parametrize('dates', ['datetime', 'tz', 'string', 'mixed'])
+def test_engine_generate_signals(strategy, dates):
+    prices = _prices(64, tz='Asia/Seoul' if dates == 'tz' else None)
+    if dates in ('string', 'mixed'):
+        prices['Date'] = prices['Date'].astype(str)
+    if dates == 'mixed':
+        prices.loc[[0, 7], 'Date'] = 'not a date'   # 해석할 수 없는 행은 건너뜀
+
+    expected = reference.legacy_signals(prices, strategy)
+    assert _as_lists(BacktestEngine('005930').generate_signals(prices, strategy)) == _as_lists(expected)
@@ -0,0 +1,54 @@
+"""전략 1: 일자 배열 기반 실행 == 기존 일자별 groupby 실행 (근접 캔들 fallback 포함)"""
+
+import pandas as pd
+import pytest
+
+import reference
+from backtest_engine import BacktestEngine
+from strategy_kernels import build_session_index, nearest_candle_indices
+
+SEED_MONEY = 10_000_000
+
+
+def _run(prices: pd.DataFrame, buy_time: str, sell_time: str):
+    engine = BacktestEngine('005930', SEED_MONEY)
+    return engine.execute_strategy1(buy_time, sell_time, ohlc_data=prices, seed_money=SEED_MONEY).to_dicts()
+
+
+@pytest.mark.parametrize('buy_time, sell_time', [
+    ('10:00', '15:00'),   # 정확 일치
+    ('10:01', '14:59'),   # 2분봉 사이 → 근접 캔들
+    ('08:00', '16:00'),   # 장 시작 전/마감 후 → forward/backward 탐색 결과
+    ('16:00', '08:00'),   # 당일 범위 밖 → 마지막/첫 캔들 fallback
+    ('9:30', '15:3'),     # 비정규 문자열 (사전식 비교 결과 유지)
+])
+@pytest.mark.parametrize('seed', [1, 2])
+def test_matches_per_day_reference(seed, buy_time, sell_time):
+    prices = reference.make_prices(seed, drop_ratio=0.3, volatility=0.01)
+    expected = reference.strategy1_trades(buy_time, sell_time, prices, SEED_MONEY)
+    assert len(expected) > 0
+    assert _run(prices, buy_time, sell_time) == expected
+
+
+def test_zero_prices_and_tz_aware_dates():
+    prices = reference.make_prices(3, tz='Asia/Seoul', drop_ratio=0.5, zero_ratio=0.2)
+    expected = reference.strategy1_trades('09:30', '15:00', prices, SEED_MONEY)
+    assert _run(prices, '09:30', '15:00') == expected
+
+
+def test_unsorted_input():
+    prices = reference.make_prices(4, drop_ratio=0.2)
+    shuffled = prices.sample(frac=1.0, random_state=0)
+    assert _run(shuffled, '10:00', '15:00') == reference.strategy1_trades('10:00', '15:00', prices, SEED_MONEY)
+
+
+@pytest.mark.parametrize('direction', ['forward', 'backward'])
+@pytest.mark.parametrize('target', ['08:59', '09:00', '11:11', '12:00', '15:30', '15:31', '9:00'])
+def test_nearest_candle_indices(direction, target):
+    prices = reference.make_prices(5, days=6, drop_ratio=0.6)
+    session = build_session_index(prices)
+    indices = nearest_candle_indices(session, target, direction=direction)
+
+    days = reference._with_time_columns(prices).groupby('trade_date')
+    expected = [str(reference.find_nearest_candle(day, target, direction)['Date']) for _, day in days]
+    assert [str(session.dates.iloc[i]) for i in indices] == expected
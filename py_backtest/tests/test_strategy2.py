@@ -0,0 +1,57 @@
+"""전략 2: 다음날 매도 탐색 커널 == 기존 캔들 단위 Trailing Stop 루프"""
+
+import pytest
+
+import reference
+import strategy_kernels
+from backtest_engine import BacktestEngine
+
+SEED_MONEY = 10_000_000
+
+EXIT_KERNELS = [
+    pytest.param(strategy_kernels._strategy2_exit_loop, id='loop'),
+    pytest.param(strategy_kernels._strategy2_exit_vectorized, id='vectorized'),
+    pytest.param(strategy_kernels.strategy2_exit, id='default'),
+]
+
+
+@pytest.fixture(params=EXIT_KERNELS)
+def exit_kernel(request, monkeypatch):
+    monkeypatch.setattr(strategy_kernels, 'strategy2_exit', request.param)
+    return request.param
+
+
+def _run(prices, buy_time, min_profit_pct, profit_cutoff_pct, loss_cutoff_time):
+    engine = BacktestEngine('005930', SEED_MONEY)
+    return engine.execute_strategy2(buy_time, min_profit_pct, profit_cutoff_pct, loss_cutoff_time,
+                                    ohlc_data=prices, seed_money=SEED_MONEY).to_dicts()
+
+
+@pytest.mark.parametrize('buy_time, min_profit_pct, profit_cutoff_pct, loss_cutoff_time', [
+    ('15:30', 0.5, 99.5, '14:00'),   # 고점 대비 0.5% 하락 → trailing stop
+    ('15:29', 1.0, 80.0, '14:01'),   # 근접 캔들 매수/손절
+    ('10:00', 0.0, 100.0, '09:00'),  # 최소 수익률 0% / 하락 즉시 매도
+    ('15:30', 5.0, 99.0, '16:00'),   # 손절 시간 없음 → end_of_day 위주
+    ('9:30', 0.3, 99.8, '9:45'),     # 비정규 시간 문자열
+])
+@pytest.mark.parametrize('seed', [11, 12])
+def test_matches_per_candle_reference(exit_kernel, seed, buy_time, min_profit_pct, profit_cutoff_pct,
+                                      loss_cutoff_time):
+    prices = reference.make_prices(seed, days=15, volatility=0.006, drop_ratio=0.3)
+    expected = reference.strategy2_trades(buy_time, min_profit_pct, profit_cutoff_pct, loss_cutoff_time,
+                                          prices, SEED_MONEY)
+    assert len(expected) > 0
+    assert _run(prices, buy_time, min_profit_pct, profit_cutoff_pct, loss_cutoff_time) == expected
+
+
+def test_covers_every_sell_reason(exit_kernel):
+    prices = reference.make_prices(13, days=30)
+    expected = reference.strategy2_trades('15:30', 0.5, 97.0, '13:00', prices, SEED_MONEY)
+    assert {t['sell_reason'] for t in expected} == set(strategy_kernels.SELL_REASONS)
+    assert _run(prices, '15:30', 0.5, 97.0, '13:00') == expected
+
+
+def test_zero_prices_and_tz_aware_dates(exit_kernel):
+    prices = reference.make_prices(14, days=15, tz='Asia/Seoul', volatility=0.006, drop_ratio=0.4, zero_ratio=0.1)
+    expected = reference.strategy2_trades('15:00', 0.5, 99.5, '14:00', prices, SEED_MONEY)
+    assert _run(prices, '15:00', 0.5, 99.5, '14:00') == expected
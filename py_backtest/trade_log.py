@@ -0,0 +1,245 @@
+"""
+TradeLog - 컬럼형(struct-of-arrays) 거래 기록
+역할: 전략 1/2 체결 결과를 거래별 객체/딕셔너리 대신 NumPy 컬럼으로 보관
+
+  - 수치 컬럼: float64 배열 (매수가, 투입 금액, 순수익, 거래 후 잔고 ...)
+  - 시각 컬럼: DatetimeIndex (int64 기반, 문자열은 JSON 변환 시점에만 생성)
+  - 매도 사유: int8 코드 (SELL_REASONS 인덱스)
+
+성과 지표 계산/CSV 변환은 컬럼을 직접 읽고, 거래별 딕셔너리는 최종 JSON 출력(json_default)에서만 만든다.
+기존 Strategy1Trade/Strategy2Trade 사용 코드와의 호환을 위해 인덱싱/순회 시 TradeRow(속성 접근 뷰)를 반환한다.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    from strategy_kernels import SELL_REASONS
+except ImportError:
+    from .strategy_kernels import SELL_REASONS
+
+# 거래 기록 종류별 필드 (Strategy1Trade / Strategy2Trade 필드 순서와 동일)
+STRATEGY1_FIELDS: Tuple[str, ...] = (
+    'buy_time', 'buy_price', 'sell_time', 'sell_price', 'buy_amount',
+    'gross_profit', 'cost', 'profit', 'balance_after'
+)
+STRATEGY2_FIELDS: Tuple[str, ...] = STRATEGY1_FIELDS + ('sell_reason', 'highest_price', 'max_profit_pct')
+
+TRADE_LOG_FIELDS: Dict[str, Tuple[str, ...]] = {
+    'strategy1': STRATEGY1_FIELDS,
+    'strategy2': STRATEGY2_FIELDS
+}
+
+_TIME_FIELDS = ('buy_time', 'sell_time')
+
+
+class TradeRow:
+    """TradeLog 거래 1건 뷰 (Strategy1Trade/Strategy2Trade와 같은 속성 이름)"""
+    __slots__ = ('_log', '_index')
+
+    def __init__(self, log: 'TradeLog', index: int):
+        self._log = log
+        self._index = index
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('_') or name not in self._log.fields:
+            raise AttributeError(name)
+        return self._log.value(name, self._index)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """딕셔너리 호환 조회 (asdict() 결과를 다루던 코드용)"""
+        if name not in self._log.fields:
+            return default
+        return self._log.value(name, self._index)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """asdict()와 같은 형식의 딕셔너리"""
+        return {name: self._log.value(name, self._index) for name in self._log.fields}
+
+    def __repr__(self) -> str:
+        return f"TradeRow({self.to_dict()})"
+
+
+class TradeLog:
+    """
+    컬럼형 거래 기록
+
+    @param kind: 'strategy1' 또는 'strategy2'
+    @param columns: 필드별 컬럼 (시각: DatetimeIndex 또는 datetime 배열, 매도 사유: int8 코드, 나머지: 수치 배열)
+    """
+
+    def __init__(self, kind: str, columns: Dict[str, Any]):
+        if kind not in TRADE_LOG_FIELDS:
+            raise ValueError(f"Unknown trade log kind: {kind}")
+        self.kind = kind
+        self.fields = TRADE_LOG_FIELDS[kind]
+        self._columns: Dict[str, Any] = {}
+        for name in self.fields:
+            values = columns[name]
+            if name in _TIME_FIELDS:
+                self._columns[name] = pd.DatetimeIndex(values)
+            elif name == 'sell_reason':
+                self._columns[name] = np.asarray(values, dtype=np.int8)
+            else:
+                self._columns[name] = np.asarray(values, dtype=np.float64)
+
+        lengths = {len(col) for col in self._columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"TradeLog columns have different lengths: {sorted(lengths)}")
+        self._length = lengths.pop() if lengths else 0
+
+    @classmethod
+    def empty(cls, kind: str) -> 'TradeLog':
+        """거래 없는 TradeLog"""
+        return cls(kind, {name: [] for name in TRADE_LOG_FIELDS[kind]})
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[TradeRow]:
+        for index in range(self._length):
+            yield TradeRow(self, index)
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[TradeRow, 'TradeLog']:
+        if isinstance(key, slice):
+            return TradeLog(self.kind, {name: col[key] for name, col in self._columns.items()})
+        index = int(key)
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("TradeLog index out of range")
+        return TradeRow(self, index)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        컬럼 배열 (복사 없음, 수정 금지)
+
+        @param name: 필드 이름 (시각 컬럼은 DatetimeIndex, sell_reason은 int8 코드)
+        """
+        return self._columns[name]
+
+    def value(self, name: str, index: int) -> Any:
+        """거래 1건의 필드 값 (asdict() 결과와 같은 Python 타입)"""
+        col = self._columns[name]
+        if name in _TIME_FIELDS:
+            return str(col[index])
+        if name == 'sell_reason':
+            return SELL_REASONS[int(col[index])]
+        return float(col[index])
+
+    def equity_curve(self, initial_capital: float) -> np.ndarray:
+        """자산 곡선 (초기 자본 + 거래별 거래 후 잔고)"""
+        curve = np.empty(self._length + 1, dtype=np.float64)
+        curve[0] = initial_capital
+        curve[1:] = self._columns['balance_after']
+        return curve
+
+    def sell_reason_counts(self) -> Dict[str, int]:
+        """매도 사유별 거래 수 (처음 등장한 순서)"""
+        if 'sell_reason' not in self._columns or self._length == 0:
+            return {}
+        codes = self._columns['sell_reason']
+        unique, first, counts = np.unique(codes, return_index=True, return_counts=True)
+        order = np.argsort(first, kind='stable')
+        return {SELL_REASONS[int(unique[i])]: int(counts[i]) for i in order}
+
+    @property
+    def nbytes(self) -> int:
+        """컬럼 메모리 크기 (bytes)"""
+        return int(sum(col.nbytes for col in self._columns.values()))
+
+    def values(self, name: str, start: int = 0, stop: Optional[int] = None) -> List[Any]:
+        """
+        컬럼 값 리스트 (asdict() 결과와 같은 Python 타입: 시각 문자열, 매도 사유 문자열, float)
+
+        @param name: 필드 이름
+        @param start: 시작 거래 번호
+        @param stop: 끝 거래 번호 (미포함, None이면 끝까지)
+        """
+        col = self._columns[name][start:stop]
+        if name in _TIME_FIELDS:
+            return format_timestamps(col)
+        if name == 'sell_reason':
+            return [SELL_REASONS[code] for code in col.tolist()]
+        return col.tolist()
+
+    def to_dicts(self, start: int = 0, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        거래별 딕셔너리 리스트 (asdict() 결과와 동일, JSON 출력 시점에만 사용)
+
+        @param start: 시작 거래 번호
+        @param stop: 끝 거래 번호 (미포함, None이면 끝까지)
+        """
+        values = [self.values(name, start, stop) for name in self.fields]
+        return [dict(zip(self.fields, row)) for row in zip(*values)]
+
+    def to_columns(self, numeric_arrays: bool = False) -> Dict[str, Any]:
+        """
+        컬럼형 응답 형식 (필드별 병렬 배열, 거래별 딕셔너리 없음)
+
+        @param numeric_arrays: True면 수치 컬럼을 ndarray 그대로 반환 (NumPy 직렬화를 지원하는 인코더용)
+        @return: {"format": "columnar", "length": n, "fields": [...], "columns": {필드: 값 배열}}
+        """
+        columns = {}
+        for name in self.fields:
+            if numeric_arrays and name not in _TIME_FIELDS and name != 'sell_reason':
+                columns[name] = self._columns[name]
+            else:
+                columns[name] = self.values(name)
+        return {
+            'format': 'columnar',
+            'length': self._length,
+            'fields': list(self.fields),
+            'columns': columns
+        }
+
+    def __repr__(self) -> str:
+        return f"TradeLog(kind={self.kind!r}, trades={self._length})"
+
+
+def format_timestamps(index: pd.DatetimeIndex) -> List[str]:
+    """
+    시각 배열 → str(Timestamp)과 같은 문자열 리스트 (예: '2026-01-05 09:30:00+09:00')
+
+    초 단위 이하 값/NaT/분 단위가 아닌 UTC 오프셋이 없으면 NumPy로 일괄 변환하고,
+    그 외에는 Timestamp별 str()을 사용한다.
+    """
+    if len(index) == 0:
+        return []
+    if index.hasnans:
+        return [str(ts) for ts in index]
+
+    index = index.as_unit('ns')
+    utc_ns = index.asi8
+    wall_ns = index.tz_localize(None).asi8 if index.tz is not None else utc_ns
+    if np.any(wall_ns % 1_000_000_000):
+        return [str(ts) for ts in index]
+
+    text = np.char.replace(np.datetime_as_string(wall_ns.view('datetime64[ns]'), unit='s'), 'T', ' ')
+    if index.tz is not None:
+        offset_ns = wall_ns - utc_ns
+        if np.any(offset_ns % 60_000_000_000):
+            return [str(ts) for ts in index]
+        offsets, inverse = np.unique(offset_ns // 60_000_000_000, return_inverse=True)
+        suffixes = np.array([
+            f"{'-' if m < 0 else '+'}{abs(m) // 60:02d}:{abs(m) % 60:02d}" for m in offsets.tolist()
+        ])
+        text = np.char.add(text, suffixes[inverse])
+    return text.tolist()
+
+
+def json_default(obj: Any) -> Any:
+    """
+    json.dumps(default=...) 변환 함수 (JSON 출력 경계에서 컬럼형 결과를 리스트로 변환)
+
+    TradeLog → 거래별 딕셔너리 리스트, NumPy 배열/스칼라 → Python 리스트/스칼라
+    """
+    if isinstance(obj, TradeLog):
+        return obj.to_dicts()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -3,20 +3,151 @@ Python Worker Server - Node.js와의 인터페이스
 역할: stdin에서 JSON 데이터 수신 → 백테스팅 실행 → JSON 결과 출력
 """
 
+import asyncio
 import json
+import multiprocessing
+import os
+import statistics
 import sys
+import threading
+import time
 import logging
-from typing import Dict, Any
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Optional, Callable, List, Tuple
 from backtest_engine import BacktestEngine
 from performance_calculator import PerformanceCalculator
-from data_cache import get_cache
+from data_cache import get_cache, frame_fingerprint
+from prefetch import prefetch_prices
+from json_codec import encode, ENCODER, RESPONSE_FORMATS
+from replay import RequestRecorder, request_kind
+from metrics import PhaseTimings, WorkerMetrics, PROMETHEUS_CONTENT_TYPE
+from log_config import configure_logging, lazy_json, Lazy
+from result_cache import get_result_cache, result_key, RESULT_CACHE_ENABLED
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# 로그 핸들러는 백그라운드 스레드에서 실행 (WORKER_LOG_LEVEL / WORKER_LOG_QUEUE / TRADE_LOG_SAMPLE)
+configure_logging()
 logger = logging.getLogger(__name__)
 
+# 백테스팅(CPU) 프로세스 풀 크기 (기본값: CPU 코어 수)
+DEFAULT_POOL_WORKERS = int(os.environ.get('BACKTEST_POOL_WORKERS', '0')) or os.cpu_count() or 1
+
+# 시세 조회(I/O) 스레드 수 / 동시 처리 요청 수 상한
+IO_THREADS = int(os.environ.get('WORKER_IO_THREADS', '8'))
+MAX_CONCURRENT_REQUESTS = int(os.environ.get('WORKER_MAX_CONCURRENCY', '32'))
+
+# 요청 기록 경로 (설정 시 요청 + 사용한 시세 스냅샷을 JSONL로 기록, replay.py로 재생)
+CAPTURE_PATH = os.environ.get('WORKER_CAPTURE_PATH')
+
+
+def run_backtest_job(job: Dict[str, Any],
+                     progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    단일 종목 백테스팅 작업 (프로세스 풀에서 실행되는 최상위 함수)
+    
+    @param job: {"stock_code", "strategy", "initial_capital", "period", "prices", "price_frame", "session_layout"}
+                price_frame: 미리 로드된 OHLCV 데이터프레임 (있으면 시세 조회 생략)
+                session_layout: price_frame의 일자/분 인덱스 (있으면 재계산 생략)
+    @param progress: 전략 실행 중 progress/trades 프레임 수신 함수 (스트리밍 모드, 같은 프로세스에서만)
+    @return: 백테스팅 결과 (metrics, 단계별 소요 시간 timings 포함 - Worker가 응답 최상위로 옮김)
+    """
+    engine = BacktestEngine(job['stock_code'], job['initial_capital'])
+    if progress is not None:
+        engine.stream_progress(progress)
+    if job.get('price_frame') is not None:
+        engine.use_price_data(job['price_frame'], job.get('session_layout'))
+    # strategy: 전략 실행 시간 (시세 조회/변환 단계는 engine.timings에 따로 기록되어 제외)
+    with engine.timings.phase('strategy'):
+        result = engine.run_backtest(dict(job['strategy']), job.get('prices'), period=job['period'])
+    with engine.timings.phase('performance'):
+        result['metrics'] = PerformanceCalculator().calculate_all_metrics(
+            result.get('equity_curve', []),
+            result.get('trading_log', []),
+            job['initial_capital']
+        )
+    result['timings'] = engine.timings.to_dict()
+    return result
+
+
+def run_relayed_backtest_job(job: Dict[str, Any], relay_queue, token: int) -> Dict[str, Any]:
+    """
+    스트리밍 모드 단일 종목 백테스팅 작업 (프로세스 풀에서 실행, progress/trades 프레임을 큐로 전달)
+    
+    @param job: run_backtest_job 작업 정의
+    @param relay_queue: ProgressRelay 큐 (Manager 프록시, (token, frame) 전달)
+    @param token: 요청 식별자 (작업 종료 시 (token, None) 전달)
+    @return: run_backtest_job 결과
+    """
+    try:
+        return run_backtest_job(job, progress=lambda frame: relay_queue.put((token, frame)))
+    finally:
+        relay_queue.put((token, None))
+
+
+class ProgressRelay:
+    """
+    프로세스 풀 작업의 progress/trades 프레임 → 부모 프로세스 emit 전달
+    
+    Manager 큐 1개를 모든 스트리밍 요청이 공유하고, 부모의 전달 스레드가 token별 emit으로 나눠 출력한다.
+    작업이 끝나면 자식이 (token, None)을 넣으므로, 그 뒤에 최종 응답을 출력하면 프레임 순서가 유지된다.
+    """
+    
+    def __init__(self):
+        self._manager = multiprocessing.get_context('spawn').Manager()
+        self.queue = self._manager.Queue()
+        self._lock = threading.Lock()
+        self._listeners: Dict[int, Tuple[Callable[[Dict[str, Any]], None], threading.Event]] = {}
+        self._next_token = 0
+        self._thread = threading.Thread(target=self._dispatch, name='worker-relay', daemon=True)
+        self._thread.start()
+    
+    def register(self, emit: Callable[[Dict[str, Any]], None]) -> Tuple[int, threading.Event]:
+        """
+        @param emit: 프레임 출력 함수
+        @return: (token, 작업 종료 이벤트 - 해당 token의 프레임을 모두 출력하면 set)
+        """
+        done = threading.Event()
+        with self._lock:
+            self._next_token += 1
+            token = self._next_token
+            self._listeners[token] = (emit, done)
+        return token, done
+    
+    def unregister(self, token: int):
+        """작업이 자식 프로세스에서 실행되지 못한 경우 등 리스너 제거"""
+        with self._lock:
+            listener = self._listeners.pop(token, None)
+        if listener is not None:
+            listener[1].set()
+    
+    def _dispatch(self):
+        while True:
+            try:
+                token, frame = self.queue.get()
+            except (EOFError, OSError):
+                break  # Manager 종료
+            if token is None:
+                break
+            if frame is None:
+                self.unregister(token)
+                continue
+            with self._lock:
+                listener = self._listeners.get(token)
+            if listener is not None:
+                try:
+                    listener[0](frame)
+                except Exception as e:
+                    logger.warning(f"Progress frame relay failed: {str(e)}")
+    
+    def close(self):
+        """전달 스레드 / Manager 프로세스 종료"""
+        try:
+            self.queue.put((None, None))
+            self._thread.join(timeout=5)
+        except (EOFError, OSError):
+            pass
+        self._manager.shutdown()
+
 
 class PythonWorkerServer:
     """
@@ -30,13 +161,37 @@ class PythonWorkerServer:
         self.engine = None
         self.calculator = None
         
+        # 백테스팅(CPU)용 프로세스 풀 / 시세 조회(I/O)용 스레드 풀 (최초 요청 시 생성)
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._io_executor: Optional[ThreadPoolExecutor] = None
+        # 스트리밍 요청의 프로세스 풀 → 부모 프레임 전달 (최초 스트리밍 요청 시 생성)
+        self._relay: Optional[ProgressRelay] = None
+        
+        # stdout 출력 직렬화 (동시 처리 시 응답 줄이 섞이지 않도록)
+        self._write_lock = threading.Lock()
+        
         # 데이터 캐시 초기화 (SRS NFR-301: 일일 1회 수집)
         self.cache = get_cache()
         self.cache.cleanup_old_cache(keep_days=3)  # 3일 이전 캐시 정리
         
+        # 백테스팅 결과 캐시 (시세 해시 + 파라미터가 같은 요청은 재계산하지 않음, DataCache와 같은 디렉터리)
+        self.result_cache = (
+            get_result_cache(os.path.dirname(self.cache.cache_db_path)) if RESULT_CACHE_ENABLED else None
+        )
+        if self.result_cache is not None:
+            self.result_cache.cleanup(keep_days=3)
+        
+        # 요청 기록 (부하 재생용 코퍼스)
+        self.recorder: Optional[RequestRecorder] = RequestRecorder(CAPTURE_PATH, self.cache) if CAPTURE_PATH else None
+        
+        # 단계별 지연 히스토그램 / 요청 수 ({"type": "metrics"} 요청으로 조회)
+        self.metrics = WorkerMetrics()
+        
         logger.info(f"Python Worker Server initialized (cache stats: {self.cache.get_stats()})")
     
-    def process_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+    def process_request(self, request: Dict[str, Any],
+                        emit: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
         """
         요청 처리 및 응답 생성
         
@@ -45,70 +200,617 @@ class PythonWorkerServer:
             "strategy": {"buy_time": "09:30", "sell_time": "15:50"},
             "initial_capital": 10000000,
             "start_date": "2025-12-01",
-            "end_date": "2026-01-31"
+            "end_date": "2026-01-31",
+            "stream": true,   // 선택: 전략 실행 중 progress/trades partial 응답 출력
+            "result_cache": false  // 선택: 결과 캐시 사용 안 함 (기본값: 사용)
         }
-        @return: 백테스팅 결과 JSON
+        @param emit: 중간 응답(partial) 출력 함수 (다종목 종목별 결과, 스트리밍 모드 progress/trades)
+        @return: 백테스팅 결과 JSON (스트리밍 모드는 type="summary", 단계별 소요 시간은 timings)
         """
         try:
             # 디버깅: 요청 필드 확인
-            logger.info(f"Received request keys: {list(request.keys())}")
+            logger.info("Received request keys: %s", Lazy(list, request.keys()))
+            
+            # 파라미터 스윕 요청
+            if request.get('type') == 'sweep':
+                return self.process_sweep_request(request)
+            
+            # 다종목 백테스팅 요청 (프로세스 풀)
+            if request.get('type') == 'multi_stock':
+                return self.process_multi_stock_request(request, emit=emit)
+            
+            # 캐시 예열 요청 (장 시작 전 일괄 수집)
+            if request.get('type') == 'prefetch':
+                return self.process_prefetch_request(request)
+            
+            # 지표 조회 요청
+            if request.get('type') == 'metrics':
+                return self.process_metrics_request(request)
+            
+            job = self._prepare_backtest(request)
+            streaming = bool(request.get('stream')) and emit is not None
+            
+            # 1. 시세 로드 (prices가 없으면 캐시 / Yahoo Finance에서 조회)
+            loader = BacktestEngine(job['stock_code'], job['initial_capital'])
+            job['price_frame'], job['session_layout'] = loader.load_price_data(job['prices'], job['period'], True)
+            job['prices'] = None
+            timings = loader.timings
+            
+            # 2. 결과 캐시 조회 → 미스면 백테스팅 실행 + PerformanceCalculator 추가 지표
+            #    (결과 캐시 적중 시 스트리밍 모드도 progress/trades 없이 summary만 출력)
+            memo, result = self._result_cache_lookup(job, timings)
+            if result is None:
+                result = run_backtest_job(job, progress=self._partial_emitter(emit) if streaming else None)
+                timings.merge(result.pop('timings', None))
+                self._result_cache_store(job['stock_code'], memo, result)
+            
+            # 캐시 통계 추가
+            result['cache_stats'] = self.cache.get_stats()
             
+            response = {
+                'status': 'success',
+                'data': result,
+                'error': None,
+                'timings': timings.to_dict()
+            }
+            if streaming:
+                response['type'] = 'summary'
+            return response
+        
+        except Exception as e:
+            logger.error(f"Error processing request: {str(e)}", exc_info=True)
+            return {
+                'status': 'error',
+                'data': None,
+                'error': str(e)
+            }
+    
+    @staticmethod
+    def _partial_emitter(emit: Callable[[Dict[str, Any]], None]) -> Callable[[Dict[str, Any]], None]:
+        """엔진 progress/trades 프레임 → partial 응답 출력 함수"""
+        def emit_partial(frame: Dict[str, Any]):
+            emit(dict(frame, status='partial'))
+        return emit_partial
+    
+    def _prepare_backtest(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        단일 종목 백테스팅 요청 → run_backtest_job 작업 정의
+        
+        @param request: 백테스팅 요청
+        @return: {"stock_code", "strategy", "initial_capital", "period", "prices", "memoize"}
+        """
+        stock_code = request.get('stock_code')
+        strategy = request.get('strategy', {})
+        prices = request.get('prices')  # None if not provided
+        initial_capital = request.get('initial_capital', 10000000)
+        start_date = request.get('start_date')
+        end_date = request.get('end_date')
+        
+        # strategy에 type이 없으면 buy_time/sell_time이 있을 때 daily_trading으로 자동 설정
+        if 'type' not in strategy and 'signal_type' not in strategy:
+            if 'buy_time' in strategy and 'sell_time' in strategy:
+                strategy['type'] = 'daily_trading'
+                logger.info(f"Auto-detected strategy type: daily_trading (buy_time/sell_time present)")
+        
+        period = self._resolve_period(start_date, end_date)
+        
+        logger.info(
+            "Processing backtest | stock=%s | capital=%s | period=%sd (%s~%s) | strategy=%s",
+            stock_code, Lazy('{:,.0f}'.format, initial_capital), period, start_date, end_date,
+            lazy_json(strategy)
+        )
+        
+        return {
+            'stock_code': stock_code,
+            'strategy': strategy,
+            'initial_capital': initial_capital,
+            'period': period,
+            'prices': prices,
+            'memoize': request.get('result_cache', True) is not False
+        }
+    
+    def _result_cache_lookup(self, job: Dict[str, Any], timings: PhaseTimings,
+                             frame=None) -> Tuple[Optional[Tuple[str, str, str]], Optional[Dict[str, Any]]]:
+        """
+        결과 캐시 조회 (job['price_frame'] 로드 이후)
+        
+        DataCache 적중 시세(memory/disk)와 요청에 포함된 시세(inline)만 대상으로 한다
+        (Yahoo Finance 조회 직후 시세는 저장하지 않고, 다음 요청부터 캐시 시세로 저장).
+        
+        @param job: run_backtest_job 작업 정의
+        @param timings: 요청 단계별 소요 시간 (result_cache 단계/계층 기록)
+        @param frame: DataCache 시세 (다종목: 시세를 로드하지 않고 캐시에 있는 종목만 조회할 때)
+        @return: (저장 정보 (key, fingerprint, source) 또는 None, 캐시된 결과 또는 None)
+        """
+        if self.result_cache is None or not job.get('memoize'):
+            return None, None
+        if frame is not None:
+            source = 'cache'
+        elif timings.cache_tier in ('memory', 'disk', 'inline'):
+            source = 'inline' if timings.cache_tier == 'inline' else 'cache'
+            frame = job['price_frame']
+        else:
+            return None, None
+        
+        with timings.phase('result_cache'):
+            if source == 'inline':
+                fingerprint = frame_fingerprint(frame)
+            else:
+                fingerprint = self.cache.get_fingerprint(job['stock_code'], frame)
+            key = result_key(job['stock_code'], fingerprint, job['strategy'], job['initial_capital'], job['period'])
+            result, tier = self.result_cache.lookup(key)
+        timings.result_cache = tier
+        return (key, fingerprint, source), result
+    
+    def _result_cache_store(self, stock_code: str, memo: Optional[Tuple[str, str, str]], result: Dict[str, Any]):
+        """결과 캐시 저장 (_result_cache_lookup 저장 정보가 있을 때만, 실패해도 응답에는 영향 없음)"""
+        if memo is None:
+            return
+        key, fingerprint, source = memo
+        try:
+            self.result_cache.put(key, stock_code, fingerprint, result, source=source)
+        except Exception as e:
+            logger.warning(f"Result cache store failed for {stock_code}: {str(e)}")
+    
+    def process_sweep_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        파라미터 스윕 요청 처리 (주가 데이터 1회 로드 → 전체 조합 평가)
+        
+        @param request: {
+            "type": "sweep",
+            "stock_code": "005930",
+            "strategy": {
+                "type": "daily_trading",
+                "buy_time": {"start": "09:00", "end": "11:00", "step": 10},
+                "sell_time": ["14:00", "15:00", "15:20"]
+            },
+            "initial_capital": 10000000,
+            "start_date": "2025-12-01",
+            "end_date": "2026-01-31",
+            "sort_by": "return_rate",
+            "top_n": 50
+        }
+        @return: 조합별 성과 순위표 (return_rate, mdd, win_rate, profit_factor ...)
+        """
+        try:
             stock_code = request.get('stock_code')
             strategy = request.get('strategy', {})
-            prices = request.get('prices')  # None if not provided
             initial_capital = request.get('initial_capital', 10000000)
-            start_date = request.get('start_date')
-            end_date = request.get('end_date')
+            period = self._resolve_period(request.get('start_date'), request.get('end_date'))
             
-            # strategy에 type이 없으면 buy_time/sell_time이 있을 때 daily_trading으로 자동 설정
             if 'type' not in strategy and 'signal_type' not in strategy:
                 if 'buy_time' in strategy and 'sell_time' in strategy:
                     strategy['type'] = 'daily_trading'
-                    logger.info(f"Auto-detected strategy type: daily_trading (buy_time/sell_time present)")
-            
-            # start_date/end_date로부터 period(일 수) 계산
-            period = 60  # 기본값
-            if start_date and end_date:
-                from datetime import datetime as dt
-                try:
-                    d_start = dt.strptime(start_date, '%Y-%m-%d')
-                    d_end = dt.strptime(end_date, '%Y-%m-%d')
-                    period = max((d_end - d_start).days, 1)
-                    logger.info(f"Calculated period from dates: {period} days ({start_date} ~ {end_date})")
-                except ValueError:
-                    logger.warning(f"Invalid date format: start={start_date}, end={end_date}. Using default period=60")
             
             logger.info(
-                f"Processing backtest | stock={stock_code} | capital={initial_capital:,.0f} | "
-                f"period={period}d ({start_date}~{end_date}) | "
-                f"strategy={json.dumps(strategy, ensure_ascii=False)}"
+                "Processing sweep | stock=%s | capital=%s | period=%sd | strategy=%s",
+                stock_code, Lazy('{:,.0f}'.format, initial_capital), period, lazy_json(strategy)
             )
             
-            # BacktestEngine 인스턴스 생성
-            self.engine = BacktestEngine(stock_code, initial_capital)
+            # 동시 처리 시 요청 간 상태가 섞이지 않도록 요청마다 엔진 생성
+            engine = BacktestEngine(stock_code, initial_capital)
+            with engine.timings.phase('strategy'):
+                result = engine.run_parameter_sweep(
+                    strategy,
+                    request.get('prices'),
+                    period=period,
+                    sort_by=request.get('sort_by', 'return_rate'),
+                    top_n=request.get('top_n')
+                )
+            result['cache_stats'] = self.cache.get_stats()
             
-            # 백테스팅 실행 (prices가 없으면 Yahoo Finance에서 직접 조회)
-            result = self.engine.run_backtest(strategy, prices, period=period)
+            return {
+                'status': 'success',
+                'data': result,
+                'error': None,
+                'timings': engine.timings.to_dict()
+            }
+        
+        except Exception as e:
+            logger.error(f"Error processing sweep request: {str(e)}", exc_info=True)
+            return {
+                'status': 'error',
+                'data': None,
+                'error': str(e)
+            }
+    
+    def process_prefetch_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        캐시 예열 요청 처리 (종목 목록 일괄 수집 → DataCache 저장)
+        
+        @param request: {
+            "type": "prefetch",
+            "stock_codes": ["005930", "000660", ...],
+            "period": 60,
+            "batch_size": 20,
+            "max_workers": 4,
+            "force": false
+        }
+        @return: {"requested", "already_cached", "fetched", "failed", "tickers", "elapsed_sec"}
+        """
+        try:
+            stock_codes = request.get('stock_codes') or []
+            if not stock_codes:
+                raise ValueError("stock_codes is required for prefetch request")
             
-            # PerformanceCalculator로 추가 지표 계산
-            self.calculator = PerformanceCalculator()
-            additional_metrics = self.calculator.calculate_all_metrics(
-                result.get('equity_curve', []),
-                result.get('trading_log', []),
-                initial_capital
+            options = {
+                key: request[key]
+                for key in ('batch_size', 'max_workers', 'retries', 'force')
+                if request.get(key) is not None
+            }
+            result = prefetch_prices(stock_codes, period=int(request.get('period') or 60),
+                                     cache=self.cache, **options)
+            result['cache_stats'] = self.cache.get_stats()
+            
+            return {
+                'status': 'success',
+                'data': result,
+                'error': None
+            }
+        
+        except Exception as e:
+            logger.error(f"Error processing prefetch request: {str(e)}", exc_info=True)
+            return {
+                'status': 'error',
+                'data': None,
+                'error': str(e)
+            }
+    
+    def process_multi_stock_request(self, request: Dict[str, Any],
+                                    emit: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        다종목 백테스팅 요청 처리 (ProcessPoolExecutor 병렬 실행)
+        
+        종목별 BacktestEngine.run_backtest를 프로세스 풀에 분배하고,
+        완료되는 순서대로 종목별 결과를 partial 응답으로 내보낸 뒤 집계 요약을 반환한다.
+        
+        @param request: {
+            "type": "multi_stock",
+            "stock_codes": ["005930", "000660", ...],
+            "strategy": {...},
+            "initial_capital": 10000000,
+            "start_date": "2025-12-01",
+            "end_date": "2026-01-31",
+            "max_workers": 16
+        }
+        @param emit: 종목별 partial 응답 출력 함수 (None이면 최종 응답에 전체 결과 포함)
+        @return: 집계 요약 (종목별 핵심 지표 + 전체 평균/최고/최저)
+        """
+        try:
+            stock_codes = list(dict.fromkeys(request.get('stock_codes') or []))
+            if not stock_codes:
+                raise ValueError("stock_codes is required for multi_stock request")
+            
+            strategy = request.get('strategy', {})
+            initial_capital = request.get('initial_capital', 10000000)
+            period = self._resolve_period(request.get('start_date'), request.get('end_date'))
+            prices_by_code = request.get('prices_by_code') or {}
+            
+            if 'type' not in strategy and 'signal_type' not in strategy:
+                if 'buy_time' in strategy and 'sell_time' in strategy:
+                    strategy['type'] = 'daily_trading'
+            
+            memoize = request.get('result_cache', True) is not False
+            max_workers = int(request.get('max_workers') or DEFAULT_POOL_WORKERS)
+            max_workers = max(1, min(max_workers, len(stock_codes)))
+            
+            logger.info(
+                "Processing multi-stock backtest | stocks=%s | workers=%s | period=%sd | strategy=%s",
+                len(stock_codes), max_workers, period, lazy_json(strategy)
             )
             
-            # 결과에 추가 지표 합병
-            result['metrics'] = additional_metrics
+            started = time.perf_counter()
+            pool = self._get_process_pool()
+            pending_codes = list(stock_codes)
+            in_flight = {}
+            # Future → (결과 캐시 저장 정보, 종목 단계별 소요 시간)
+            memos: Dict[Future, Tuple[Optional[Tuple[str, str, str]], PhaseTimings]] = {}
             
-            # 캐시 통계 추가
-            result['cache_stats'] = self.cache.get_stats()
+            def submit_next():
+                code = pending_codes.pop(0)
+                job = {
+                    'stock_code': code,
+                    'strategy': strategy,
+                    'initial_capital': initial_capital,
+                    'period': period,
+                    'prices': prices_by_code.get(code),
+                    'memoize': memoize
+                }
+                # DataCache에 당일 시세가 있는 종목은 결과 캐시 조회 (적중하면 프로세스 풀에 제출하지 않음)
+                stock_timings = PhaseTimings()
+                memo, cached = None, None
+                if not job['prices']:
+                    frame = self.cache.peek(code)
+                    if frame is not None:
+                        memo, cached = self._result_cache_lookup(job, stock_timings, frame=frame)
+                if cached is not None:
+                    future = Future()
+                    future.set_result(cached)
+                else:
+                    future = pool.submit(run_backtest_job, job)
+                in_flight[future] = code
+                memos[future] = (memo, stock_timings)
+            
+            # 동시 실행 종목 수를 max_workers로 제한 (공유 프로세스 풀 위에서 윈도우 방식 제출)
+            while pending_codes and len(in_flight) < max_workers:
+                submit_next()
+            
+            stock_results: Dict[str, Dict] = {}
+            errors: List[Dict[str, str]] = []
+            # 종목별 단계 시간 합계 / 시세 조회·결과 캐시 계층별 종목 수
+            timings = PhaseTimings()
+            cache_tiers: Dict[str, int] = {}
+            result_cache_tiers: Dict[str, int] = {}
+            completed = 0
+            total_trades = 0
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    code = in_flight.pop(future)
+                    memo, lookup_timings = memos.pop(future)
+                    completed += 1
+                    try:
+                        result = future.result()
+                        if 'timings' in result:
+                            # 프로세스 풀 실행 결과 (결과 캐시 미스) → 저장
+                            lookup_timings.merge(result.pop('timings'))
+                            self._result_cache_store(code, memo, result)
+                        stock_timings = lookup_timings.to_dict()
+                        stock_results[code] = result
+                        total_trades += int(result.get('total_trades', 0))
+                        timings.merge(stock_timings)
+                        tier = stock_timings.get('cache_tier')
+                        if tier:
+                            cache_tiers[tier] = cache_tiers.get(tier, 0) + 1
+                        tier = stock_timings.get('result_cache')
+                        if tier:
+                            result_cache_tiers[tier] = result_cache_tiers.get(tier, 0) + 1
+                        frame = {'status': 'partial', 'type': 'stock_result', 'stock_code': code,
+                                 'data': result, 'error': None, 'timings': stock_timings}
+                    except Exception as e:
+                        if isinstance(e, BrokenProcessPool):
+                            self._shutdown_process_pool()
+                            pool = self._get_process_pool()
+                        logger.error(f"Multi-stock backtest failed for {code}: {str(e)}")
+                        errors.append({'stock_code': code, 'error': str(e)})
+                        frame = {'status': 'partial', 'type': 'stock_result', 'stock_code': code,
+                                 'data': None, 'error': str(e)}
+                    
+                    frame['completed'] = completed
+                    frame['total'] = len(stock_codes)
+                    if emit is not None:
+                        emit(frame)
+                        emit({
+                            'status': 'partial',
+                            'type': 'progress',
+                            'completed': completed,
+                            'total': len(stock_codes),
+                            'percent': round(completed / len(stock_codes) * 100, 1),
+                            'trades': total_trades
+                        })
+                    
+                    if pending_codes:
+                        submit_next()
+            
+            summary = self._summarize_multi_stock(stock_codes, stock_results, errors)
+            summary['max_workers'] = max_workers
+            summary['elapsed_sec'] = round(time.perf_counter() - started, 3)
+            if emit is None:
+                summary['stock_results'] = stock_results
+            summary['cache_stats'] = self.cache.get_stats()
+            
+            logger.info(
+                f"Multi-stock backtest finished | succeeded={summary['succeeded']} | "
+                f"failed={summary['failed']} | elapsed={summary['elapsed_sec']}s"
+            )
+            
+            # 다종목 timings: 종목별 단계 시간의 합 (병렬 실행이므로 total보다 클 수 있음)
+            timings.cache_tier = None
+            timings.result_cache = None
+            multi_timings = timings.to_dict()
+            multi_timings['cache_tiers'] = cache_tiers
+            multi_timings['result_cache_tiers'] = result_cache_tiers
             
             return {
+                'status': 'success',
+                'data': summary,
+                'error': None,
+                'timings': multi_timings
+            }
+        
+        except Exception as e:
+            logger.error(f"Error processing multi-stock request: {str(e)}", exc_info=True)
+            return {
+                'status': 'error',
+                'data': None,
+                'error': str(e)
+            }
+    
+    def process_metrics_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        지표 조회 요청 처리 (단계별 지연 히스토그램 + 캐시 적중률, Prometheus 텍스트 형식)
+        
+        @param request: {"type": "metrics"}
+        @return: {"content_type": "text/plain; version=0.0.4; ...", "text": Prometheus 텍스트, "cache_stats": {...}}
+        """
+        cache_stats = self.cache.get_stats()
+        return {
+            'status': 'success',
+            'data': {
+                'content_type': PROMETHEUS_CONTENT_TYPE,
+                'text': self.metrics.render_prometheus(
+                    cache_stats, self.result_cache.get_stats() if self.result_cache is not None else None
+                ),
+                'cache_stats': cache_stats
+            },
+            'error': None
+        }
+    
+    @staticmethod
+    def _summarize_multi_stock(stock_codes: List[str], stock_results: Dict[str, Dict],
+                               errors: List[Dict[str, str]]) -> Dict[str, Any]:
+        """종목별 결과 → 집계 요약 (수익률 내림차순)"""
+        rows = []
+        for code in stock_codes:
+            result = stock_results.get(code)
+            if result is None:
+                continue
+            rows.append({
+                'stock_code': code,
+                'return_rate': float(result.get('return_rate', 0.0)),
+                'total_profit': float(result.get('total_profit', 0.0)),
+                'mdd': float(result.get('mdd', 0.0)),
+                'win_rate': float(result.get('win_rate', 0.0)),
+                'profit_factor': float(result.get('profit_factor', 0.0)),
+                'total_trades': int(result.get('total_trades', 0)),
+                'final_capital': float(result.get('final_capital', 0.0))
+            })
+        rows.sort(key=lambda r: r['return_rate'], reverse=True)
+        
+        count = len(rows)
+        return_rates = [r['return_rate'] for r in rows]
+        return {
+            'strategy': next(iter(stock_results.values())).get('strategy') if stock_results else None,
+            'stock_count': len(stock_codes),
+            'succeeded': count,
+            'failed': len(errors),
+            'avg_return_rate': sum(return_rates) / count if count else 0.0,
+            'median_return_rate': statistics.median(return_rates) if count else 0.0,
+            'avg_win_rate': sum(r['win_rate'] for r in rows) / count if count else 0.0,
+            'avg_mdd': sum(r['mdd'] for r in rows) / count if count else 0.0,
+            'max_mdd': max((r['mdd'] for r in rows), default=0.0),
+            'total_trades': sum(r['total_trades'] for r in rows),
+            'profitable_stocks': sum(1 for r in rows if r['return_rate'] > 0),
+            'best': rows[0] if rows else None,
+            'worst': rows[-1] if rows else None,
+            'results': rows,
+            'errors': errors
+        }
+    
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """백테스팅 프로세스 풀 반환 (최초 호출 시 생성, 모든 요청이 공유)"""
+        with self._pool_lock:
+            if self._process_pool is None:
+                # 스레드가 떠 있는 프로세스에서 fork하지 않도록 spawn 사용
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=DEFAULT_POOL_WORKERS,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                logger.info(f"Process pool started ({DEFAULT_POOL_WORKERS} workers)")
+            return self._process_pool
+    
+    def _get_io_executor(self) -> ThreadPoolExecutor:
+        """시세 조회(I/O) 스레드 풀 반환"""
+        with self._pool_lock:
+            if self._io_executor is None:
+                self._io_executor = ThreadPoolExecutor(max_workers=IO_THREADS, thread_name_prefix='worker-io')
+            return self._io_executor
+    
+    def _get_relay(self) -> ProgressRelay:
+        """스트리밍 프레임 전달기 반환 (최초 호출 시 Manager 프로세스 시작)"""
+        with self._pool_lock:
+            if self._relay is None:
+                self._relay = ProgressRelay()
+            return self._relay
+    
+    def _shutdown_process_pool(self):
+        """프로세스 풀 종료"""
+        with self._pool_lock:
+            if self._process_pool is not None:
+                self._process_pool.shutdown(wait=False)
+                self._process_pool = None
+    
+    @staticmethod
+    def _resolve_period(start_date: Optional[str], end_date: Optional[str]) -> int:
+        """start_date/end_date로부터 period(일 수) 계산 (기본값: 60일)"""
+        period = 60
+        if start_date and end_date:
+            from datetime import datetime as dt
+            try:
+                d_start = dt.strptime(start_date, '%Y-%m-%d')
+                d_end = dt.strptime(end_date, '%Y-%m-%d')
+                period = max((d_end - d_start).days, 1)
+                logger.info(f"Calculated period from dates: {period} days ({start_date} ~ {end_date})")
+            except ValueError:
+                logger.warning(f"Invalid date format: start={start_date}, end={end_date}. Using default period=60")
+        return period
+    
+    async def process_request_async(self, request: Dict[str, Any],
+                                    emit: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        요청 비동기 처리 (동시 처리용)
+        
+        - 단일 종목 백테스팅: 시세 로드(I/O)는 스레드 풀, 전략 실행(CPU)은 프로세스 풀
+          (캐시 시세는 프로세스 풀에서 저장 파일을 직접 memory-map, 요청에 포함된 시세 등만 DataFrame 전달)
+        - 스윕/다종목/캐시 예열 요청: 스레드 풀에서 process_request 실행 (다종목은 내부에서 프로세스 풀 사용)
+        - 스트리밍 요청(stream=true): 프로세스 풀에서 실행, progress/trades 프레임은 ProgressRelay로 받아 출력
+        - 지표 조회 요청: 이벤트 루프에서 바로 처리
+        - 결과 캐시 적중 시 전략 실행(프로세스 풀) 생략
+        
+        @param request: 요청
+        @param emit: 중간 응답 출력 함수
+        @return: 응답
+        """
+        if request.get('type') == 'metrics':
+            return self.process_metrics_request(request)
+        
+        loop = asyncio.get_running_loop()
+        io_executor = self._get_io_executor()
+        
+        if request.get('type') in ('sweep', 'multi_stock', 'prefetch'):
+            return await loop.run_in_executor(io_executor, self.process_request, request, emit)
+        
+        try:
+            logger.info("Received request keys: %s", Lazy(list, request.keys()))
+            job = self._prepare_backtest(request)
+            streaming = bool(request.get('stream')) and emit is not None
+            
+            # 1. 시세 로드 (캐시 / Yahoo Finance - I/O 바운드)
+            loader = BacktestEngine(job['stock_code'], job['initial_capital'])
+            job['price_frame'], job['session_layout'] = await loop.run_in_executor(
+                io_executor, loader.load_price_data, job['prices'], job['period'], True
+            )
+            job['prices'] = None
+            timings = loader.timings
+            
+            # 2. 결과 캐시 조회 (시세 해시 계산 + 메모리/디스크 조회)
+            memo, result = await loop.run_in_executor(io_executor, self._result_cache_lookup, job, timings)
+            
+            # 3. 미스면 전략 실행 + 성과 지표 (CPU 바운드)
+            if result is None:
+                if timings.cache_tier in ('memory', 'disk'):
+                    # 캐시 시세: 종목/기간만 전달 → 자식 프로세스가 같은 저장 파일을 memory-map
+                    # (DataFrame을 pickle로 보내면 프로세스마다 사본이 생겨 페이지 캐시 공유가 깨짐)
+                    pool_job = dict(job, price_frame=None, session_layout=None)
+                else:
+                    pool_job = job
+                try:
+                    if streaming:
+                        result = await self._run_streaming_job(pool_job, emit)
+                    else:
+                        result = await loop.run_in_executor(self._get_process_pool(), run_backtest_job, pool_job)
+                except BrokenProcessPool:
+                    logger.error("Process pool is broken, restarting and running in thread")
+                    self._shutdown_process_pool()
+                    progress = self._partial_emitter(emit) if streaming else None
+                    result = await loop.run_in_executor(io_executor, run_backtest_job, job, progress)
+                
+                # 시세 로드 단계(I/O 스레드) + 전략/성과 지표 단계(프로세스 풀)
+                timings.merge(result.pop('timings', None))
+                
+                # 결과 캐시 저장 (응답 출력을 기다리게 하지 않도록 I/O 스레드에서, 응답용 키 추가 전 스냅샷)
+                loop.run_in_executor(io_executor, self._result_cache_store, job['stock_code'], memo, dict(result))
+            
+            result['cache_stats'] = self.cache.get_stats()
+            response = {
                 'status': 'success',
                 'data': result,
-                'error': None
+                'error': None,
+                'timings': timings.to_dict()
             }
+            if streaming:
+                response['type'] = 'summary'
+            return response
         
         except Exception as e:
             logger.error(f"Error processing request: {str(e)}", exc_info=True)
@@ -118,48 +820,168 @@ class PythonWorkerServer:
                 'error': str(e)
             }
     
-    def run(self):
+    async def _run_streaming_job(self, job: Dict[str, Any],
+                                 emit: Callable[[Dict[str, Any]], None]) -> Dict[str, Any]:
         """
-        메인 루프: stdin에서 JSON 읽기 → 처리 → stdout으로 JSON 출력
+        스트리밍 모드 작업을 프로세스 풀에서 실행 (progress/trades 프레임은 ProgressRelay가 emit으로 출력)
+        
+        @return: run_backtest_job 결과 (해당 요청의 프레임을 모두 출력한 뒤 반환)
         """
-        logger.info("Python Worker Server started, waiting for requests on stdin...")
+        loop = asyncio.get_running_loop()
+        relay = self._get_relay()
+        token, done = relay.register(self._partial_emitter(emit))
+        try:
+            result = await loop.run_in_executor(
+                self._get_process_pool(), run_relayed_backtest_job, job, relay.queue, token
+            )
+            # 자식이 넣은 종료 표시까지 전달 스레드가 처리할 때까지 대기 (summary가 마지막 프레임이 되도록)
+            await loop.run_in_executor(self._get_io_executor(), done.wait, 30)
+            return result
+        finally:
+            relay.unregister(token)
+    
+    async def _handle_line(self, line: str, slots: asyncio.Semaphore):
+        """요청 1줄 처리 → request_id를 붙여 응답 출력 (완료 순서대로)"""
+        request_id = None
+        response_format = 'rows'
+        kind = 'invalid'
+        captured = None
+        received_at = time.monotonic()
+        started = time.perf_counter()
+        try:
+            try:
+                request = json.loads(line.strip())
+            except json.JSONDecodeError as e:
+                logger.error(f"Invalid JSON: {str(e)}")
+                response = {
+                    'status': 'error',
+                    'data': None,
+                    'error': f'Invalid JSON: {str(e)}'
+                }
+            else:
+                request_id = request.get('request_id', request.get('backtest_id'))
+                kind = request_kind(request)
+                if self.recorder is not None and kind != 'metrics':
+                    captured = json.loads(line)  # 처리 중 변경(strategy type 자동 설정 등) 전 원문
+                response_format = request.get('response_format') or 'rows'
+                if response_format not in RESPONSE_FORMATS:
+                    logger.warning(f"Unknown response_format '{response_format}', using 'rows'")
+                    response_format = 'rows'
+                
+                def emit(frame: Dict[str, Any]):
+                    self._write_response(frame, request_id, response_format)
+                
+                response = await self.process_request_async(request, emit=emit)
+        except Exception as e:
+            logger.error(f"Unexpected error: {str(e)}", exc_info=True)
+            response = {
+                'status': 'error',
+                'data': None,
+                'error': str(e)
+            }
+        finally:
+            slots.release()
+        
+        timings = dict(response.pop('timings', None) or {})
+        self._write_response(response, request_id, response_format, timings=timings, started=started)
+        self.metrics.observe(kind, response.get('status') or 'error', timings)
+        
+        if captured is not None:
+            elapsed = time.monotonic() - received_at
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(self._get_io_executor(), self.recorder.record,
+                                           captured, received_at, elapsed, response.get('status'))
+            except Exception as e:
+                logger.warning(f"Request capture failed: {str(e)}")
+    
+    async def _serve(self):
+        """stdin 요청을 동시 처리 (요청별 task, 응답은 준비되는 즉시 출력)"""
+        loop = asyncio.get_running_loop()
+        stdin_reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix='worker-stdin')
+        slots = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        tasks = set()
         
         try:
-            for line in sys.stdin:
-                try:
-                    # JSON 요청 파싱
-                    request = json.loads(line.strip())
-                    
-                    # 요청 처리
-                    response = self.process_request(request)
-                    
-                    # JSON 응답 출력
-                    print(json.dumps(response))
-                    sys.stdout.flush()
-                    
-                except json.JSONDecodeError as e:
-                    logger.error(f"Invalid JSON: {str(e)}")
-                    print(json.dumps({
-                        'status': 'error',
-                        'data': None,
-                        'error': f'Invalid JSON: {str(e)}'
-                    }))
-                    sys.stdout.flush()
-                except Exception as e:
-                    logger.error(f"Unexpected error: {str(e)}", exc_info=True)
-                    print(json.dumps({
-                        'status': 'error',
-                        'data': None,
-                        'error': str(e)
-                    }))
-                    sys.stdout.flush()
+            while True:
+                line = await loop.run_in_executor(stdin_reader, sys.stdin.readline)
+                if not line:
+                    break  # EOF
+                if not line.strip():
+                    continue
+                
+                await slots.acquire()
+                task = asyncio.create_task(self._handle_line(line, slots))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            stdin_reader.shutdown(wait=False)
+    
+    def run(self):
+        """
+        메인 루프: stdin에서 JSON 읽기 → 동시 처리 → stdout으로 JSON 출력
+        
+        - 모든 응답에 요청의 request_id(없으면 backtest_id)를 포함
+        - 응답은 요청 순서가 아니라 처리가 끝나는 순서대로 출력 (head-of-line blocking 제거)
+        """
+        logger.info(
+            f"Python Worker Server started, waiting for requests on stdin... "
+            f"(concurrency={MAX_CONCURRENT_REQUESTS}, io_threads={IO_THREADS}, processes={DEFAULT_POOL_WORKERS}, "
+            f"json={ENCODER})"
+        )
         
+        try:
+            asyncio.run(self._serve())
         except KeyboardInterrupt:
             logger.info("Server interrupted by user")
             sys.exit(0)
         except Exception as e:
             logger.error(f"Fatal error: {str(e)}", exc_info=True)
             sys.exit(1)
+        finally:
+            self._shutdown_process_pool()
+            if self._relay is not None:
+                self._relay.close()
+            if self._io_executor is not None:
+                self._io_executor.shutdown(wait=False)
+            if self.recorder is not None:
+                self.recorder.close()
+    
+    def _write_response(self, response: Dict[str, Any], request_id: Optional[str] = None,
+                        response_format: str = 'rows', timings: Optional[Dict[str, Any]] = None,
+                        started: Optional[float] = None):
+        """
+        응답 1줄(JSON) 출력 (request_id 포함, 스레드 안전)
+        
+        TradeLog/ndarray는 이 시점에 JSON으로 변환 (json_codec: orjson 또는 표준 json)
+        
+        @param response_format: 'rows' (거래별 딕셔너리) 또는 'columnar' (필드별 병렬 배열)
+        @param timings: 최종 응답의 단계별 소요 시간 (json_encode_ms/total_ms를 채워 응답 timings 키로 출력)
+        @param started: 요청 수신 시각 (time.perf_counter, total_ms 기준)
+        """
+        if request_id is not None:
+            response = dict(response, request_id=request_id)
+        encode_started = time.perf_counter()
+        body = encode(response, response_format)
+        if timings is not None:
+            # 본문 직렬화 시간까지 포함하도록 직렬화 후 timings를 마지막 키로 덧붙임
+            finished = time.perf_counter()
+            timings['json_encode_ms'] = round((finished - encode_started) * 1000, 3)
+            if started is not None:
+                timings['total_ms'] = round((finished - started) * 1000, 3)
+            body = body[:-1] + b',"timings":' + encode(timings) + b'}'
+        line = body + b'\n'
+        with self._write_lock:
+            stdout = getattr(sys.stdout, 'buffer', None)
+            if stdout is None:
+                sys.stdout.write(line.decode('utf-8'))
+                sys.stdout.flush()
+            else:
+                stdout.write(line)
+                stdout.flush()
 
 
 def main():